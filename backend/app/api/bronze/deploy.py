@@ -3,12 +3,46 @@
 from fastapi import APIRouter, Depends, HTTPException
 
 from app.dependencies import get_deploy_service, require_databricks_service
-from app.models.responses import SourceCreateResponse
+from app.models.responses import SourceCreateResponse, WorkspaceSyncResponse
 from app.services.deploy_service import DeployService
 
 router = APIRouter()
 
 
+@router.post(
+    "/sources/sync",
+    response_model=WorkspaceSyncResponse,
+    dependencies=[Depends(require_databricks_service)],
+)
+def sync_sources(
+    dry_run: bool = False,
+    prune: bool = True,
+    deploy_svc: DeployService = Depends(get_deploy_service),
+):
+    """Publish all source YAMLs to the workspace, uploading only what changed."""
+    try:
+        return deploy_svc.sync_workspace(prune=prune, dry_run=dry_run)
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+@router.post(
+    "/sources/repack",
+    dependencies=[Depends(require_databricks_service)],
+)
+def repack_jobs(deploy_svc: DeployService = Depends(get_deploy_service)):
+    """Regroup scheduled sources into shared pack jobs (or back into one job each)."""
+    try:
+        packs = deploy_svc.repack_jobs()
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    packed = sum(len(members) for members in packs.values())
+    return {
+        "packs": packs,
+        "message": f"{packed} sources in {len(packs)} pack jobs",
+    }
+
+
 @router.post(
     "/sources/{name}/deploy",
     response_model=SourceCreateResponse,
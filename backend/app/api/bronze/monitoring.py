@@ -1,7 +1,13 @@
 """Monitoring endpoints: run history, dead letters, dashboard stats."""
 
+import json
+import logging
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
+from app.config import settings
 from app.dependencies import get_audit_service, get_config_service
 from app.models.responses import (
     DashboardStats,
@@ -9,19 +15,44 @@ from app.models.responses import (
     RunHistoryResponse,
     RunRecord,
 )
-from app.services.audit_service import AuditService
+from app.services.audit_service import AuditService, dead_letter_cursor
 from app.services.config_service import ConfigService
+from app.services.run_history_store import catalog_of, catalogs_of
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def run_record(row: dict, name: str) -> RunRecord:
+    """RunRecord of one ``ingestion_audit_log`` row."""
+    return RunRecord(
+        source_name=row.get("source_name", name),
+        environment=row.get("environment") or "",
+        start_time=str(row["start_time"]) if row.get("start_time") else None,
+        end_time=str(row["end_time"]) if row.get("end_time") else None,
+        status=row.get("status", "UNKNOWN"),
+        records_read=int(row.get("records_read") or 0),
+        records_written=int(row.get("records_written") or 0),
+        records_quarantined=int(row.get("records_quarantined") or 0),
+        error=row.get("error"),
+    )
+
+
 @router.get("/sources/{name}/runs", response_model=RunHistoryResponse)
 def get_run_history(
     name: str,
     limit: int = Query(default=50, le=200),
+    status: Optional[str] = Query(default=None, description="e.g. SUCCESS or FAILURE"),
+    since: Optional[str] = Query(default=None, description="Earliest start_time (inclusive)"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
     config_svc: ConfigService = Depends(get_config_service),
     audit_svc: AuditService = Depends(get_audit_service),
 ):
+    """Newest-first run history, filtered by status and time range.
+
+    Pages of ``limit`` runs: pass ``next_cursor`` back as ``cursor``.
+    """
     source = config_svc.get_source(name)
     if not source:
         raise HTTPException(status_code=404, detail=f"Source '{name}' not found")
@@ -30,70 +61,120 @@ def get_run_history(
     if not catalog:
         return RunHistoryResponse(source_name=name, runs=[], total=0)
 
-    rows = audit_svc.get_run_history(name, catalog, limit)
-    runs = [
-        RunRecord(
-            source_name=row.get("source_name", name),
-            environment=row.get("environment", ""),
-            start_time=row.get("start_time"),
-            end_time=row.get("end_time"),
-            status=row.get("status", "UNKNOWN"),
-            records_read=int(row.get("records_read", 0)),
-            records_written=int(row.get("records_written", 0)),
-            records_quarantined=int(row.get("records_quarantined", 0)),
-            error=row.get("error"),
-        )
-        for row in rows
-    ]
-    return RunHistoryResponse(source_name=name, runs=runs, total=len(runs))
+    rows = audit_svc.get_run_history(name, catalog, limit, status=status, since=since, before=cursor)
+    runs = [run_record(row, name) for row in rows]
+    next_cursor = runs[-1].start_time if runs and len(runs) == limit else None
+    return RunHistoryResponse(source_name=name, runs=runs, total=len(runs), next_cursor=next_cursor)
+
+
+def _dead_letter_table(config_svc: ConfigService, name: str) -> tuple[str, str]:
+    source = config_svc.get_source(name)
+    if not source:
+        raise HTTPException(status_code=404, detail=f"Source '{name}' not found")
+    return source.target.get("catalog", ""), source.target.get("table", "")
 
 
 @router.get("/sources/{name}/dead-letters", response_model=DeadLetterResponse)
 def get_dead_letters(
     name: str,
     limit: int = Query(default=20, le=100),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
+    since: Optional[str] = Query(default=None, description="Earliest _ingest_timestamp (inclusive)"),
+    until: Optional[str] = Query(default=None, description="Latest _ingest_timestamp (exclusive)"),
+    reason: Optional[str] = Query(default=None, description="Rejection reason prefix, e.g. null_primary_key"),
     config_svc: ConfigService = Depends(get_config_service),
     audit_svc: AuditService = Depends(get_audit_service),
 ):
-    source = config_svc.get_source(name)
-    if not source:
-        raise HTTPException(status_code=404, detail=f"Source '{name}' not found")
+    """Newest-first quarantined records, filtered by time range and rejection reason.
 
-    catalog = source.target.get("catalog", "")
-    table = source.target.get("table", "")
+    Pages of ``limit`` records: pass ``next_cursor`` back as ``cursor``.
+    ``total_count`` counts every match and is cached for a few minutes.
+    """
+    catalog, table = _dead_letter_table(config_svc, name)
     if not catalog or not table:
         return DeadLetterResponse(source_name=name, total_count=0, recent_records=[])
 
-    count = audit_svc.get_dead_letter_count(name, catalog, table)
-    records = audit_svc.get_dead_letter_records(name, catalog, table, limit)
-    return DeadLetterResponse(source_name=name, total_count=count, recent_records=records)
+    try:
+        records = audit_svc.get_dead_letter_records(
+            name, catalog, table, limit + 1, cursor=cursor, since=since, until=until, reason=reason,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    count = audit_svc.get_dead_letter_count(name, catalog, table, since=since, until=until, reason=reason)
+    next_cursor = dead_letter_cursor(records[limit - 1]) if limit > 0 and len(records) > limit else None
+    return DeadLetterResponse(
+        source_name=name, total_count=count, recent_records=records[:limit], next_cursor=next_cursor,
+    )
+
+
+@router.get("/sources/{name}/dead-letters/export")
+def export_dead_letters(
+    name: str,
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    reason: Optional[str] = None,
+    config_svc: ConfigService = Depends(get_config_service),
+    audit_svc: AuditService = Depends(get_audit_service),
+) -> StreamingResponse:
+    """Stream every matching dead letter as NDJSON (same filters and order as the list)."""
+    catalog, table = _dead_letter_table(config_svc, name)
+    if not catalog or not table:
+        rows = iter(())
+    else:
+        try:
+            rows = audit_svc.iter_dead_letters(catalog, table, cursor=cursor, since=since, until=until, reason=reason)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    def lines():
+        try:
+            for row in rows:
+                yield json.dumps(row, default=str) + "\n"
+        except RuntimeError as e:
+            # Headers are already sent, so end with a marker line rather than
+            # letting the client take a short file for the whole export.
+            logger.warning("Dead-letter export of '%s' stopped: %s", name, e)
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{name}_dead_letters.ndjson"'},
+    )
 
 
 @router.get("/stats", response_model=DashboardStats)
 def get_dashboard_stats(
+    window_hours: Optional[int] = Query(default=None, ge=1, le=720, description="Run look-back window"),
     config_svc: ConfigService = Depends(get_config_service),
     audit_svc: AuditService = Depends(get_audit_service),
 ):
+    """Source counts plus run figures across every catalog the sources write to."""
     sources = config_svc.list_sources()
     enabled = sum(1 for s in sources if s.enabled)
     by_type: dict[str, int] = {}
     for s in sources:
         by_type[s.source_type.value] = by_type.get(s.source_type.value, 0) + 1
 
-    # Try to get run stats from Databricks
-    run_stats = {"recent_runs": 0, "recent_failures": 0}
-    if sources:
-        # Use first source's catalog for audit query
-        first_source = config_svc.get_source(sources[0].name)
-        if first_source:
-            catalog = first_source.target.get("catalog", "")
-            if catalog:
-                run_stats = audit_svc.get_dashboard_stats(catalog)
+    window = window_hours or settings.dashboard_stats_window_hours
+    catalogs = catalogs_of(sources)
+    run_stats = {}
+    failing: list[str] = []
+    if catalogs:
+        run_stats = audit_svc.get_dashboard_stats(
+            catalogs, {s.name: s.source_type.value for s in sources}, window,
+        )
+        latest = audit_svc.get_latest_runs({s.name: catalog_of(s) for s in sources}, limit=1)
+        failing = sorted(name for name, runs in latest.items() if runs and runs[0].get("status") == "FAILURE")
 
     return DashboardStats(
         total_sources=len(sources),
         enabled_sources=enabled,
         disabled_sources=len(sources) - enabled,
         sources_by_type=by_type,
+        window_hours=window,
+        catalogs=catalogs,
+        failing_sources=failing,
         **run_stats,
     )
@@ -4,19 +4,29 @@ import logging
 import threading
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-
-from app.dependencies import get_config_service, get_deploy_service, get_testing_service
-from app.models.requests import SourceCreateRequest, SourceUpdateRequest
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+
+from app.api.bronze.monitoring import run_record
+from app.api.common.auth import get_current_tenant
+from app.api.common.conditional import not_modified
+from app.api.common.operations import accepted
+from app.config import settings
+from app.dependencies import get_audit_service, get_config_service, get_deploy_service, get_testing_service
+from app.models.requests import SourceBulkCreateRequest, SourceCreateRequest, SourceUpdateRequest
 from app.models.responses import (
+    OperationResponse,
+    SourceBulkCreateResponse,
     SourceCreateResponse,
     SourceDeleteResponse,
     SourceDetail,
     SourceListResponse,
     ValidationResponse,
 )
+from app.services.audit_service import AuditService
 from app.services.config_service import ConfigService
+from app.services.deploy_queue import get_deploy_queue
 from app.services.deploy_service import DeployService
+from app.services.run_history_store import catalog_of
 from app.services.testing_service import TestingService
 
 logger = logging.getLogger(__name__)
@@ -35,37 +45,108 @@ def _generate_suite_background(testing_svc: TestingService, source_name: str) ->
 
 @router.get("/sources", response_model=SourceListResponse)
 def list_sources(
+    request: Request,
+    response: Response,
     source_type: Optional[str] = None,
     domain: Optional[str] = None,
     enabled: Optional[bool] = None,
+    tag_key: Optional[str] = None,
+    tag_value: Optional[str] = None,
+    cdc_mode: Optional[str] = None,
+    load_type: Optional[str] = None,
+    has_schedule: Optional[bool] = None,
+    name_prefix: Optional[str] = None,
+    sort: str = "name",
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    include_last_run: bool = False,
     config_svc: ConfigService = Depends(get_config_service),
+    audit_svc: AuditService = Depends(get_audit_service),
 ):
-    sources = config_svc.list_sources(source_type=source_type, domain=domain, enabled=enabled)
-    return SourceListResponse(sources=sources, total=len(sources))
+    """List sources, optionally filtered and paginated.
+
+    Without ``limit`` every match is returned. With ``limit``, pass the
+    returned ``next_cursor`` back as ``cursor`` to fetch the next page;
+    ``total`` always counts all matches. ``include_last_run`` adds each
+    source's latest run, fetched for the whole page in one audit query
+    (such responses carry no ETag — runs change without the config).
+    """
+    if not include_last_run:
+        cached = not_modified(request, response, config_svc.sources_version())
+        if cached is not None:
+            return cached
+    try:
+        sources, total, next_cursor = config_svc.query_sources(
+            source_type=source_type,
+            domain=domain,
+            enabled=enabled,
+            tag_key=tag_key,
+            tag_value=tag_value,
+            cdc_mode=cdc_mode,
+            load_type=load_type,
+            has_schedule=has_schedule,
+            name_prefix=name_prefix,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if include_last_run and sources:
+        try:
+            latest = audit_svc.get_latest_runs({s.name: catalog_of(s) for s in sources}, limit=1)
+        except Exception as e:
+            logger.warning("Could not fetch last runs for the source list: %s", e)
+            latest = {}
+        sources = [
+            s.model_copy(update={"last_run": run_record(latest[s.name][0], s.name)}) if latest.get(s.name) else s
+            for s in sources
+        ]
+    return SourceListResponse(sources=sources, total=total, next_cursor=next_cursor)
 
 
 @router.get("/sources/{name}", response_model=SourceDetail)
 def get_source(
     name: str,
+    request: Request,
+    response: Response,
     config_svc: ConfigService = Depends(get_config_service),
 ):
+    cached = not_modified(request, response, config_svc.sources_version(name))
+    if cached is not None:
+        return cached
     source = config_svc.get_source(name)
     if not source:
         raise HTTPException(status_code=404, detail=f"Source '{name}' not found")
     return source
 
 
-@router.post("/sources", response_model=SourceCreateResponse, status_code=201)
+_QUEUED = {202: {"model": OperationResponse, "description": "Publish queued (deploy queue enabled)"}}
+
+
+@router.post("/sources", response_model=SourceCreateResponse, status_code=201, responses=_QUEUED)
 def create_source(
     req: SourceCreateRequest,
     deploy_svc: DeployService = Depends(get_deploy_service),
     config_svc: ConfigService = Depends(get_config_service),
     testing_svc: TestingService = Depends(get_testing_service),
+    tenant_id: str = Depends(get_current_tenant),
+    idempotency_key: Optional[str] = Header(default=None),
 ):
+    """Create a source. With the deploy queue enabled only the YAML is written
+    here; the response is 202 with the operation that publishes it."""
+    queued = settings.deploy_queue_enabled
+    if queued and idempotency_key:
+        previous = get_deploy_queue().find_by_key(tenant_id, idempotency_key)
+        if previous is not None:
+            return accepted(previous)
     if config_svc.source_exists(req.name):
         raise HTTPException(status_code=409, detail=f"Source '{req.name}' already exists")
     try:
-        result = deploy_svc.create_source(req)
+        if queued:
+            result = accepted(deploy_svc.queue_create(req, tenant_id, idempotency_key))
+        else:
+            result = deploy_svc.create_source(req)
         # Auto-generate test suite scaffold in background (non-blocking)
         threading.Thread(
             target=_generate_suite_background,
@@ -79,16 +160,48 @@ def create_source(
         raise HTTPException(status_code=409, detail=f"Source '{req.name}' could not be created: {e}")
 
 
-@router.put("/sources/{name}", response_model=SourceCreateResponse)
+def _generate_suites_background(testing_svc: TestingService, source_names: list[str]) -> None:
+    for name in source_names:
+        _generate_suite_background(testing_svc, name)
+
+
+@router.post("/sources/bulk", response_model=SourceBulkCreateResponse)
+def create_sources_bulk(
+    req: SourceBulkCreateRequest,
+    deploy_svc: DeployService = Depends(get_deploy_service),
+    testing_svc: TestingService = Depends(get_testing_service),
+):
+    """Onboard many sources in one call; see ``results`` for per-source outcome."""
+    result = deploy_svc.create_sources_bulk(req.sources)
+    created = [r.name for r in result.results if r.status == "created"]
+    if created:
+        threading.Thread(
+            target=_generate_suites_background,
+            args=(testing_svc, created),
+            daemon=True,
+        ).start()
+    return result
+
+
+@router.put("/sources/{name}", response_model=SourceCreateResponse, responses=_QUEUED)
 def update_source(
     name: str,
     req: SourceUpdateRequest,
     deploy_svc: DeployService = Depends(get_deploy_service),
     config_svc: ConfigService = Depends(get_config_service),
+    tenant_id: str = Depends(get_current_tenant),
+    idempotency_key: Optional[str] = Header(default=None),
 ):
+    queued = settings.deploy_queue_enabled
+    if queued and idempotency_key:
+        previous = get_deploy_queue().find_by_key(tenant_id, idempotency_key)
+        if previous is not None:
+            return accepted(previous)
     if not config_svc.source_exists(name):
         raise HTTPException(status_code=404, detail=f"Source '{name}' not found")
     try:
+        if queued:
+            return accepted(deploy_svc.queue_update(name, req, tenant_id, idempotency_key))
         return deploy_svc.update_source(name, req)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
@@ -19,6 +19,7 @@ from app.models.tenant import (
     SelectedModelUpdate,
 )
 from app.services import ai_client_service
+from app.services.databricks_client_cache import databricks_clients
 from app.services.databricks_service import DatabricksService
 from app.services.tenant_service import TenantService
 
@@ -184,6 +185,7 @@ def set_databricks_credentials(
     tenant_svc.set_databricks_credentials(
         tenant_id, host=body.host, token=body.token, warehouse_id=body.warehouse_id
     )
+    databricks_clients.invalidate(tenant_id)
     return _build_response(tenant_id, tenant_svc)
 
 
@@ -193,6 +195,7 @@ def delete_databricks_credentials(
     tenant_svc: TenantService = Depends(get_tenant_service),
 ) -> AccountSettingsResponse:
     tenant_svc.clear_databricks_credentials(tenant_id)
+    databricks_clients.invalidate(tenant_id)
     return _build_response(tenant_id, tenant_svc)
 
 
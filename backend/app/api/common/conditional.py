@@ -0,0 +1,46 @@
+"""ETag / If-None-Match support for config read endpoints.
+
+Routes compute a content version from the service (a digest of the YAML on
+disk) before building the response body. When the client already holds that
+version the route returns an empty 304 without parsing or serializing
+anything; otherwise the ETag is attached to the normal response.
+"""
+
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def _etag(version: str) -> str:
+    # Weak: the digest covers the YAML, not the exact JSON bytes we send
+    return f'W/"{version}"'
+
+
+def _matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:]
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified(request: Request, response: Response, version: Optional[str]) -> Optional[Response]:
+    """Return a 304 response if ``If-None-Match`` matches ``version``.
+
+    Otherwise set the ETag on ``response`` and return None so the route
+    carries on. A ``version`` of None (resource missing) is a no-op.
+    """
+    if version is None:
+        return None
+    etag = _etag(version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,32 @@
+"""Server-sent events: live run state transitions and test-case progress.
+
+One ``EventSource('/api/v1/events')`` per page replaces polling the run
+history and latest test results. See ``app.services.run_events`` for the
+event types and how they are produced.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+
+from app.dependencies import get_databricks_service
+from app.services.databricks_service import DatabricksService
+from app.services.run_events import run_event_hub
+
+router = APIRouter()
+
+
+@router.get("/events")
+def stream_events(
+    source: Optional[str] = Query(None, description="Only events about this Bronze source"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    db: DatabricksService = Depends(get_databricks_service),
+) -> StreamingResponse:
+    """Stream the tenant's ``job_run``, ``run`` and ``test_progress`` events."""
+    resume = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    return StreamingResponse(
+        run_event_hub.stream(db, last_event_id=resume, source=source),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
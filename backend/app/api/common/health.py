@@ -1,9 +1,13 @@
 """Health check endpoint."""
 
+from typing import Dict
+
 from fastapi import APIRouter
 
 from app.config import settings
 from app.models.responses import HealthResponse
+from app.services.databricks_client_cache import databricks_clients
+from app.services.query_cache import query_cache
 
 router = APIRouter()
 
@@ -16,3 +20,12 @@ def health_check():
         sources_dir_exists=settings.sources_dir.exists(),
         databricks_configured=bool(settings.databricks_host and settings.databricks_token),
     )
+
+
+@router.get("/health/caches", response_model=Dict[str, Dict[str, int]])
+def cache_stats():
+    """Hit / miss counters for the in-process caches."""
+    return {
+        "sql_results": query_cache.stats(),
+        "databricks_clients": databricks_clients.stats(),
+    }
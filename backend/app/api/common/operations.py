@@ -0,0 +1,39 @@
+"""Deploy operation status — progress of publishes queued by the deploy queue."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from app.api.common.auth import get_current_tenant
+from app.models.responses import OperationListResponse, OperationResponse
+from app.services.deploy_queue import DeployOperation, get_deploy_queue
+
+router = APIRouter()
+
+
+def accepted(op: DeployOperation) -> JSONResponse:
+    """202 Accepted for a queued operation, pointing at its status URL."""
+    return JSONResponse(
+        status_code=202,
+        content=op.to_dict(),
+        headers={"Location": f"/api/v1/operations/{op.id}"},
+    )
+
+
+@router.get("/operations", response_model=OperationListResponse)
+def list_operations(
+    status: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    tenant_id: str = Depends(get_current_tenant),
+):
+    ops = get_deploy_queue().recent(tenant_id, status=status, limit=limit)
+    return OperationListResponse(operations=[op.to_dict() for op in ops])
+
+
+@router.get("/operations/{operation_id}", response_model=OperationResponse)
+def get_operation(operation_id: str, tenant_id: str = Depends(get_current_tenant)):
+    op = get_deploy_queue().get(operation_id, tenant_id=tenant_id)
+    if op is None:
+        raise HTTPException(status_code=404, detail=f"Operation '{operation_id}' not found")
+    return op.to_dict()
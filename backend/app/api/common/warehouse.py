@@ -0,0 +1,50 @@
+"""SQL warehouse state — read it, or start the warehouse and wait until it is up.
+
+Callers that are about to run queries after a quiet period (dashboards,
+readiness checks) can ``POST /warehouse/start?wait=true`` first instead of
+letting their first statement time out against a stopped warehouse.
+"""
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.dependencies import require_databricks_service
+from app.services.databricks_service import DatabricksService
+from app.services.warehouse_warmer import warehouse_warmer
+
+router = APIRouter()
+
+
+def _state(db: DatabricksService, state: Optional[str]) -> Dict[str, Any]:
+    return {
+        "warehouse_id": db._warehouse_id,
+        "state": state,
+        "ready": state == "RUNNING",
+        "warmer": warehouse_warmer.status(db._scope),
+    }
+
+
+@router.get("/warehouse", response_model=Dict[str, Any])
+def get_warehouse(db: DatabricksService = Depends(require_databricks_service)) -> Dict[str, Any]:
+    state = db.warehouse_state()
+    if state is None:
+        raise HTTPException(status_code=502, detail="Could not read the SQL warehouse state")
+    return _state(db, state)
+
+
+@router.post("/warehouse/start", response_model=Dict[str, Any])
+def start_warehouse(
+    wait: bool = Query(False, description="Block until RUNNING (or the timeout)"),
+    timeout: Optional[int] = Query(None, ge=1, le=1800, description="Seconds to wait"),
+    db: DatabricksService = Depends(require_databricks_service),
+) -> Dict[str, Any]:
+    if wait:
+        state = db.wait_for_warehouse(timeout)
+    else:
+        state = db.warehouse_state()
+        if state in ("STOPPED", "STOPPING") and db.start_warehouse():
+            state = "STARTING"
+    if state is None:
+        raise HTTPException(status_code=502, detail="Could not read the SQL warehouse state")
+    return _state(db, state)
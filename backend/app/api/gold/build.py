@@ -0,0 +1,71 @@
+"""Medallion build endpoints — refresh a mart's Bronze/Silver inputs in waves.
+
+``/build/plan`` shows the waves without running anything; ``/build`` starts
+the refresh in the background (202) and ``/builds/{build_id}`` reports
+per-job progress.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+
+from app.api.common.auth import get_current_tenant
+from app.dependencies import get_medallion_build_service, require_databricks_service
+from app.services.medallion_build_service import MedallionBuildService, get_build
+
+router = APIRouter()
+
+
+class BuildRequest(BaseModel):
+    ir: Dict[str, Any] = Field(..., description="Gold mart IR (from /preview)")
+
+
+@router.post("/build/plan", response_model=Dict[str, Any])
+def plan_build(
+    body: BuildRequest,
+    svc: MedallionBuildService = Depends(get_medallion_build_service),
+) -> Dict[str, Any]:
+    if not body.ir:
+        raise HTTPException(status_code=400, detail="IR is required")
+    try:
+        plan = svc.plan(body.ir)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {
+        "mart": plan.mart,
+        "waves": plan.waves,
+        "nodes": {key: asdict(node) for key, node in plan.nodes.items()},
+        "unresolved": plan.unresolved,
+    }
+
+
+@router.post(
+    "/build",
+    response_model=Dict[str, Any],
+    status_code=202,
+    dependencies=[Depends(require_databricks_service)],
+)
+def start_build(
+    body: BuildRequest,
+    svc: MedallionBuildService = Depends(get_medallion_build_service),
+    tenant_id: str = Depends(get_current_tenant),
+) -> Dict[str, Any]:
+    if not body.ir:
+        raise HTTPException(status_code=400, detail="IR is required")
+    try:
+        status = svc.start(body.ir, tenant_id=tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return status.to_dict()
+
+
+@router.get("/builds/{build_id}", response_model=Dict[str, Any])
+def get_build_status(build_id: str, tenant_id: str = Depends(get_current_tenant)) -> Dict[str, Any]:
+    status = get_build(build_id, tenant_id=tenant_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Build '{build_id}' not found")
+    return status.to_dict()
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from typing import Any, Dict, List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from app.api.common.conditional import not_modified
 
 from app.dependencies import get_gold_config_service
 from app.services.gold_config_service import GoldConfigService
@@ -13,12 +15,27 @@ router = APIRouter()
 
 
 @router.get("/marts", response_model=List[Dict[str, Any]])
-def list_marts(svc: GoldConfigService = Depends(get_gold_config_service)) -> List[Dict[str, Any]]:
+def list_marts(
+    request: Request,
+    response: Response,
+    svc: GoldConfigService = Depends(get_gold_config_service),
+) -> Any:
+    cached = not_modified(request, response, svc.mart_version())
+    if cached is not None:
+        return cached
     return svc.list_marts()
 
 
 @router.get("/marts/{name}", response_model=Dict[str, Any])
-def get_mart(name: str, svc: GoldConfigService = Depends(get_gold_config_service)) -> Dict[str, Any]:
+def get_mart(
+    name: str,
+    request: Request,
+    response: Response,
+    svc: GoldConfigService = Depends(get_gold_config_service),
+) -> Any:
+    cached = not_modified(request, response, svc.mart_version(name))
+    if cached is not None:
+        return cached
     try:
         return svc.get_mart(name)
     except FileNotFoundError as e:
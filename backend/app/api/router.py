@@ -1,17 +1,21 @@
 """Top-level API router aggregating all sub-routers."""
 
-import yaml
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
 from app.api.bronze.deploy import router as deploy_router
 from app.api.bronze.monitoring import router as monitoring_router
 from app.api.bronze.sources import router as sources_router
+from app.api.gold.build import router as gold_build_router
 from app.api.gold.ingest import router as gold_ingest_router
 from app.api.gold.marts import router as gold_marts_router
 from app.api.gold.readiness import router as gold_readiness_router
 from app.api.common.account import router as account_router
 from app.api.common.auth_routes import router as auth_router
+from app.api.common.conditional import not_modified
+from app.api.common.events import router as events_router
 from app.api.common.health import router as health_router
+from app.api.common.operations import router as operations_router
+from app.api.common.warehouse import router as warehouse_router
 from app.api.rag.chat import router as rag_chat_router
 from app.api.rag.index import router as rag_index_router
 from app.api.silver.deploy import router as silver_deploy_router
@@ -21,6 +25,7 @@ from app.api.silver.sources import router as silver_sources_router
 from app.api.testing.suites import router as testing_suites_router
 from app.config import settings
 from app.models.responses import EnvironmentInfo
+from app.services.yaml_catalog import YamlDocCache, combine_digests
 
 api_router = APIRouter(prefix="/api/v1")
 
@@ -28,6 +33,9 @@ api_router = APIRouter(prefix="/api/v1")
 api_router.include_router(health_router, tags=["health"])
 api_router.include_router(auth_router, tags=["auth"])
 api_router.include_router(account_router, tags=["account"])
+api_router.include_router(warehouse_router, tags=["warehouse"])
+api_router.include_router(operations_router, tags=["operations"])
+api_router.include_router(events_router, tags=["events"])
 
 # Bronze
 api_router.include_router(sources_router, prefix="/bronze", tags=["bronze-sources"])
@@ -44,6 +52,7 @@ api_router.include_router(silver_modeling_router, prefix="/silver", tags=["silve
 api_router.include_router(gold_marts_router, prefix="/gold", tags=["gold-marts"])
 api_router.include_router(gold_ingest_router, prefix="/gold", tags=["gold-ingest"])
 api_router.include_router(gold_readiness_router, prefix="/gold", tags=["gold-readiness"])
+api_router.include_router(gold_build_router, prefix="/gold", tags=["gold-build"])
 
 # RAG Assistant
 api_router.include_router(rag_chat_router, prefix="/rag", tags=["rag-assistant"])
@@ -53,13 +62,21 @@ api_router.include_router(rag_index_router, prefix="/rag", tags=["rag-index"])
 api_router.include_router(testing_suites_router, prefix="/testing/suites", tags=["testing"])
 
 
+# Environment files are small and rarely change — parse once per file version
+_environment_docs = YamlDocCache()
+
+
 @api_router.get("/environments", response_model=list[EnvironmentInfo], tags=["environments"])
-def list_environments():
-    envs = []
+def list_environments(request: Request, response: Response):
     env_dir = settings.environments_dir
-    if env_dir.exists():
-        for env_file in sorted(env_dir.glob("*.yaml")):
-            with open(env_file, "r") as f:
-                variables = yaml.safe_load(f) or {}
-            envs.append(EnvironmentInfo(name=env_file.stem, variables=variables))
-    return envs
+    env_files = sorted(env_dir.glob("*.yaml")) if env_dir.exists() else []
+    docs = [
+        d for d in (_environment_docs.load(f) for f in env_files)
+        if d is not None and d.error is None
+    ]
+    cached = not_modified(
+        request, response, combine_digests((d.path.name, d.digest) for d in docs)
+    )
+    if cached is not None:
+        return cached
+    return [EnvironmentInfo(name=d.path.stem, variables=d.data) for d in docs]
@@ -7,7 +7,17 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException
 
 from app.config import settings
-from app.dependencies import get_silver_deploy_service, require_databricks_service
+from app.dependencies import (
+    get_silver_deploy_service,
+    require_databricks_service,
+)
+from app.models.responses import WorkspaceSyncResponse
+from app.models.silver_responses import (
+    SilverDagDeployResponse,
+    SilverDagListResponse,
+    SilverDagPlan,
+    SilverDagTask,
+)
 from app.services.silver_deploy_service import SilverDeployService
 
 logger = logging.getLogger(__name__)
@@ -15,6 +25,68 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+@router.post(
+    "/entities/sync",
+    response_model=WorkspaceSyncResponse,
+    dependencies=[Depends(require_databricks_service)],
+)
+def sync_entities(
+    dry_run: bool = False,
+    prune: bool = True,
+    svc: SilverDeployService = Depends(get_silver_deploy_service),
+):
+    """Publish all Silver entity YAMLs to the workspace, uploading only what changed."""
+    try:
+        return svc.sync_workspace(prune=prune, dry_run=dry_run)
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+@router.get("/dags", response_model=SilverDagListResponse)
+def list_dags(svc: SilverDeployService = Depends(get_silver_deploy_service)):
+    """Preview how entities group into dependency-ordered DAG jobs."""
+    try:
+        dags = svc.plan_dags()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    plans = [
+        SilverDagPlan(
+            name=dag.name,
+            domains=dag.domains,
+            schedule=dag.schedule,
+            tasks=[
+                SilverDagTask(key=t.key, kind=t.kind, name=t.name, depends_on=t.depends_on)
+                for t in dag.tasks
+            ],
+            waves=dag.waves(),
+            trigger_tables=dag.trigger_tables,
+        )
+        for dag in dags
+    ]
+    return SilverDagListResponse(dags=plans, total=len(plans))
+
+
+@router.post(
+    "/dags/deploy",
+    response_model=SilverDagDeployResponse,
+    dependencies=[Depends(require_databricks_service)],
+)
+def deploy_dags(svc: SilverDeployService = Depends(get_silver_deploy_service)):
+    """Deploy every DAG job and retire the per-entity jobs they replace."""
+    try:
+        job_ids = svc.sync_dags()
+        dags = len(svc.plan_dags())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    return SilverDagDeployResponse(
+        job_ids=job_ids,
+        dags=dags,
+        message=f"{len(job_ids)} entities deployed, {dags} DAG jobs",
+    )
+
+
 @router.post(
     "/entities/{name}/deploy",
     dependencies=[Depends(require_databricks_service)],
@@ -4,16 +4,18 @@ import logging
 import re
 from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
-from app.dependencies import get_databricks_service, get_silver_config_service
+from app.dependencies import get_audit_service, get_silver_config_service
 from app.models.silver_responses import (
+    SilverBronzeConsumersResponse,
     SilverDashboardStats,
     SilverDiagramResponse,
+    SilverLineageResponse,
     SilverRunHistoryResponse,
     SilverRunRecord,
 )
-from app.services.databricks_service import DatabricksService
+from app.services.audit_service import AuditService
 from app.services.silver_config_service import SilverConfigService
 
 logger = logging.getLogger(__name__)
@@ -48,58 +50,51 @@ def get_silver_stats(
 @router.get("/entities/{name}/runs", response_model=SilverRunHistoryResponse)
 def get_entity_runs(
     name: str,
-    limit: int = 50,
+    limit: int = Query(default=50, le=200),
+    status: Optional[str] = Query(default=None, description="e.g. SUCCESS or FAILED"),
+    since: Optional[str] = Query(default=None, description="Earliest start_time (inclusive)"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
     config_svc: SilverConfigService = Depends(get_silver_config_service),
-    db: DatabricksService = Depends(get_databricks_service),
+    audit_svc: AuditService = Depends(get_audit_service),
 ):
     """Get run history for a Silver entity from the audit log.
 
     Requires Databricks connection — returns empty list if unavailable.
+    Pages of ``limit`` runs: pass ``next_cursor`` back as ``cursor``.
     """
     entity = config_svc.get_entity(name)
     if not entity:
         return SilverRunHistoryResponse(entity_name=name, runs=[], total=0)
 
-    # Query audit log via Databricks SQL
-    try:
-        if not db.available:
-            return SilverRunHistoryResponse(entity_name=name, runs=[], total=0)
-
-        catalog = entity.target.get("catalog", "")
-        if not catalog:
-            return SilverRunHistoryResponse(entity_name=name, runs=[], total=0)
-
-        audit_table = f"{catalog}.slv_meta.transformation_audit_log"
-        sql = (
-            f"SELECT * FROM {audit_table} "
-            f"WHERE entity_name = '{name}' "
-            f"ORDER BY start_time DESC LIMIT {limit}"
-        )
-        rows = db.query_sql(sql)
+    catalog = entity.target.get("catalog", "")
+    if not catalog:
+        return SilverRunHistoryResponse(entity_name=name, runs=[], total=0)
 
+    try:
+        rows = audit_svc.get_entity_runs(name, catalog, limit, status=status, since=since, before=cursor)
         runs = []
         for row in (rows or []):
             runs.append(SilverRunRecord(
                 entity_name=row.get("entity_name", name),
-                domain=row.get("domain", ""),
-                target_table=row.get("target_table", ""),
+                domain=row.get("domain") or "",
+                target_table=row.get("target_table") or "",
                 status=row.get("status", "UNKNOWN"),
                 start_time=str(row.get("start_time")) if row.get("start_time") else None,
                 end_time=str(row.get("end_time")) if row.get("end_time") else None,
-                records_read=int(row.get("records_read", 0)),
-                records_written=int(row.get("records_written", 0)),
-                records_skipped=int(row.get("records_skipped", 0)),
+                records_read=int(row.get("records_read") or 0),
+                records_written=int(row.get("records_written") or 0),
+                records_skipped=int(row.get("records_skipped") or 0),
                 error_message=row.get("error_message"),
-                scd_type=row.get("scd_type", ""),
-                bronze_sources=row.get("bronze_sources", ""),
+                scd_type=row.get("scd_type") or "",
+                bronze_sources=row.get("bronze_sources") or "",
             ))
-
-        return SilverRunHistoryResponse(entity_name=name, runs=runs, total=len(runs))
-
     except Exception as e:
         logger.warning("Failed to fetch Silver run history: %s", e)
         return SilverRunHistoryResponse(entity_name=name, runs=[], total=0)
 
+    next_cursor = runs[-1].start_time if runs and len(runs) == limit else None
+    return SilverRunHistoryResponse(entity_name=name, runs=runs, total=len(runs), next_cursor=next_cursor)
+
 
 def _sanitize_mermaid_name(name: str) -> str:
     """Make a name safe for Mermaid identifiers (alphanumeric + underscore only)."""
@@ -109,8 +104,15 @@ def _sanitize_mermaid_name(name: str) -> str:
     return cleaned or "unnamed"
 
 
-def _build_mermaid_diagram(entities_detail: list) -> str:
-    """Generate Mermaid ER diagram syntax from Silver entity details."""
+def _build_mermaid_diagram(
+    entities_detail: list,
+    bk_to_entity: Optional[dict[str, str]] = None,
+) -> str:
+    """Generate Mermaid ER diagram syntax from Silver entity details.
+
+    ``bk_to_entity`` is the lineage index's business key → owner map; it is
+    derived from ``entities_detail`` when not supplied.
+    """
     lines = ["erDiagram"]
 
     # Group entities by domain
@@ -119,12 +121,13 @@ def _build_mermaid_diagram(entities_detail: list) -> str:
         entities_by_domain.setdefault(entity.domain, []).append(entity)
 
     # Build business key ownership: bk_name -> entity_name (first entity that owns it)
-    bk_to_entity: dict[str, str] = {}
-    for entity in entities_detail:
-        target = entity.target
-        for bk in target.get("business_keys", []):
-            if bk not in bk_to_entity:
-                bk_to_entity[bk] = entity.name
+    if bk_to_entity is None:
+        bk_to_entity = {}
+        for entity in entities_detail:
+            target = entity.target
+            for bk in target.get("business_keys", []):
+                if bk not in bk_to_entity:
+                    bk_to_entity[bk] = entity.name
 
     # Collect unique target columns per entity
     entity_columns: dict[str, list[dict]] = {}
@@ -220,10 +223,36 @@ def get_silver_diagram(
             entities_detail.append(detail)
 
     domains = sorted(set(e.domain for e in entities_detail))
-    mermaid_text = _build_mermaid_diagram(entities_detail)
+    mermaid_text = _build_mermaid_diagram(entities_detail, config_svc.business_key_owners())
 
     return SilverDiagramResponse(
         mermaid=mermaid_text,
         entity_count=len(entities_detail),
         domains=domains,
     )
+
+
+@router.get("/lineage", response_model=SilverLineageResponse)
+def get_silver_lineage(
+    config_svc: SilverConfigService = Depends(get_silver_config_service),
+):
+    """Reverse lineage: bronze table → consuming entities, business key → owner.
+
+    Bronze tables are keyed without ``${...}`` placeholders (``bronze.orders``).
+    """
+    return SilverLineageResponse(
+        bronze_tables=config_svc.bronze_consumers(),
+        business_keys=config_svc.business_key_owners(),
+    )
+
+
+@router.get("/lineage/consumers", response_model=SilverBronzeConsumersResponse)
+def get_bronze_consumers(
+    bronze_table: str = Query(..., min_length=1),
+    config_svc: SilverConfigService = Depends(get_silver_config_service),
+):
+    """Which Silver entities read ``bronze_table``? Use before changing a bronze source."""
+    return SilverBronzeConsumersResponse(
+        bronze_table=bronze_table,
+        entities=config_svc.consumers_of(bronze_table),
+    )
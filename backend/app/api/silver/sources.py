@@ -2,9 +2,14 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 
+from app.api.common.auth import get_current_tenant
+from app.api.common.conditional import not_modified
+from app.api.common.operations import accepted
+from app.config import settings
 from app.dependencies import get_silver_config_service, get_silver_deploy_service
+from app.models.responses import OperationResponse
 from app.models.silver_requests import SilverEntityCreateRequest, SilverEntityUpdateRequest
 from app.models.silver_responses import (
     SilverEntityCreateResponse,
@@ -13,6 +18,7 @@ from app.models.silver_responses import (
     SilverEntityListResponse,
     SilverValidationResponse,
 )
+from app.services.deploy_queue import get_deploy_queue
 from app.services.silver_config_service import SilverConfigService
 from app.services.silver_deploy_service import SilverDeployService
 
@@ -21,11 +27,16 @@ router = APIRouter()
 
 @router.get("/entities", response_model=SilverEntityListResponse)
 def list_entities(
+    request: Request,
+    response: Response,
     domain: Optional[str] = None,
     enabled: Optional[bool] = None,
     scd_type: Optional[str] = None,
     config_svc: SilverConfigService = Depends(get_silver_config_service),
 ):
+    cached = not_modified(request, response, config_svc.entities_version())
+    if cached is not None:
+        return cached
     entities = config_svc.list_entities(domain=domain, enabled=enabled, scd_type=scd_type)
     return SilverEntityListResponse(entities=entities, total=len(entities))
 
@@ -33,38 +44,64 @@ def list_entities(
 @router.get("/entities/{name}", response_model=SilverEntityDetail)
 def get_entity(
     name: str,
+    request: Request,
+    response: Response,
     config_svc: SilverConfigService = Depends(get_silver_config_service),
 ):
+    cached = not_modified(request, response, config_svc.entities_version(name))
+    if cached is not None:
+        return cached
     entity = config_svc.get_entity(name)
     if not entity:
         raise HTTPException(status_code=404, detail=f"Silver entity '{name}' not found")
     return entity
 
 
-@router.post("/entities", response_model=SilverEntityCreateResponse, status_code=201)
+_QUEUED = {202: {"model": OperationResponse, "description": "Publish queued (deploy queue enabled)"}}
+
+
+@router.post("/entities", response_model=SilverEntityCreateResponse, status_code=201, responses=_QUEUED)
 def create_entity(
     req: SilverEntityCreateRequest,
     deploy_svc: SilverDeployService = Depends(get_silver_deploy_service),
     config_svc: SilverConfigService = Depends(get_silver_config_service),
+    tenant_id: str = Depends(get_current_tenant),
+    idempotency_key: Optional[str] = Header(default=None),
 ):
+    queued = settings.deploy_queue_enabled
+    if queued and idempotency_key:
+        previous = get_deploy_queue().find_by_key(tenant_id, idempotency_key)
+        if previous is not None:
+            return accepted(previous)
     if config_svc.entity_exists(req.name):
         raise HTTPException(status_code=409, detail=f"Silver entity '{req.name}' already exists")
     try:
+        if queued:
+            return accepted(deploy_svc.queue_create(req, tenant_id, idempotency_key))
         return deploy_svc.create_entity(req)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
 
-@router.put("/entities/{name}", response_model=SilverEntityCreateResponse)
+@router.put("/entities/{name}", response_model=SilverEntityCreateResponse, responses=_QUEUED)
 def update_entity(
     name: str,
     req: SilverEntityUpdateRequest,
     deploy_svc: SilverDeployService = Depends(get_silver_deploy_service),
     config_svc: SilverConfigService = Depends(get_silver_config_service),
+    tenant_id: str = Depends(get_current_tenant),
+    idempotency_key: Optional[str] = Header(default=None),
 ):
+    queued = settings.deploy_queue_enabled
+    if queued and idempotency_key:
+        previous = get_deploy_queue().find_by_key(tenant_id, idempotency_key)
+        if previous is not None:
+            return accepted(previous)
     if not config_svc.entity_exists(name):
         raise HTTPException(status_code=404, detail=f"Silver entity '{name}' not found")
     try:
+        if queued:
+            return accepted(deploy_svc.queue_update(name, req, tenant_id, idempotency_key))
         return deploy_svc.update_entity(name, req)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
@@ -29,6 +29,95 @@ class Settings(BaseSettings):
     databricks_cluster_id: Optional[str] = None
     databricks_spark_version: str = "14.3.x-scala2.12"
     databricks_node_type_id: str = "Standard_DS3_v2"
+    databricks_sql_timeout: int = 300  # seconds a SQL statement may run before it is cancelled
+    databricks_sql_max_concurrency: int = 8  # in-flight statements per warehouse (query_many)
+
+    # Per-tenant DatabricksService / credential cache
+    databricks_client_cache_size: int = 512
+    databricks_client_cache_ttl_seconds: int = 900
+    databricks_client_refresh_ahead_pct: int = 20  # rebuild in the background during the last N% of the TTL
+    databricks_credentials_ttl_seconds: int = 60
+
+    # Read-only SQL result cache (seconds per statement class; 0 disables that class)
+    sql_cache_enabled: bool = True
+    sql_cache_max_entries: int = 1024
+    sql_cache_ttl_describe: int = 600
+    sql_cache_ttl_show: int = 300
+    sql_cache_ttl_select: int = 60
+
+    # Run watcher — adaptive poll interval (seconds) and batched status lookups
+    run_watch_initial_interval: float = 2.0
+    run_watch_max_interval: float = 30.0
+    run_watch_backoff: float = 1.5
+    run_watch_batch_threshold: int = 4  # due runs per tick before switching to one list_runs call
+    run_watch_batch_max_pages: int = 2  # list_runs pages per tick; runs not reached fall back to get_run
+
+    # Job packing — scheduled Bronze sources sharing a cron + environment run as one
+    # multi-task job on a shared job cluster instead of one job (and cluster) each
+    databricks_job_packing: bool = False
+    databricks_pack_max_workers: int = 8  # autoscale ceiling of the shared pack cluster
+    databricks_pack_max_tasks: int = 25  # sources per pack job; larger packs split into pack-<digest>-<n>
+
+    # Silver DAG jobs — entities linked by bronze_table lineage and sharing a schedule
+    # run as depends_on-wired tasks of one job, optionally behind the unscheduled
+    # Bronze sources that feed them. Inputs refreshed on their own schedule start the
+    # job through a table-update trigger; entities without edges keep their own job
+    silver_dag_jobs: bool = False
+    silver_dag_bronze_tasks: bool = True
+
+    # Medallion build — per-run wait limit (seconds) and builds kept for progress polling
+    medallion_build_run_timeout: int = 7200
+    medallion_build_history: int = 100
+
+    # SQL warehouse warm-up — start ahead of scheduled / usually-busy hours, keep alive
+    # while users are active, and wait for a cold warehouse instead of timing out
+    warehouse_warmup_tick_seconds: int = 60  # <= 0 disables the background warmer
+    warehouse_warmup_lead_minutes: int = 5
+    warehouse_warmup_min_active_days: int = 2  # of the last 4 weeks, for an hour to count as busy
+    warehouse_keepalive_seconds: int = 300
+    warehouse_keepalive_idle_minutes: int = 15
+    warehouse_state_ttl_seconds: int = 120
+    warehouse_start_timeout: int = 300
+
+    # Deploy queue — create/update routes write the YAML and return 202; workers run the
+    # git commit, workspace upload and job create/update with retries
+    deploy_queue_enabled: bool = False
+    deploy_queue_workers: int = 2
+    deploy_queue_max_attempts: int = 5
+    deploy_queue_retry_seconds: float = 10.0  # doubled after every failed attempt
+    deploy_queue_lease_seconds: int = 600  # a running operation older than this is picked up again
+    deploy_queue_poll_seconds: float = 5.0
+
+    # Run-history store — local copy of the audit logs, synced by start_time watermark
+    # (sync interval: 0 = startup only, -1 = never; reads go live unless a sync is fresh)
+    run_history_db_path: str = str(Path(__file__).resolve().parents[1] / "data" / "run_history.db")
+    run_history_sync_seconds: int = 60
+    run_history_lookback_minutes: int = 60  # re-read recent rows so finished runs replace running ones
+    run_history_backfill_days: int = 30
+    dashboard_stats_window_hours: int = 24  # default window of /bronze/stats run figures
+
+    # Dead-letter browser — rejection-reason column of the quarantine tables and
+    # how long a (filtered) dead-letter count is reused before it is recounted
+    dead_letter_reason_column: str = "_rejection_reason"
+    dead_letter_count_ttl_seconds: int = 300
+
+    # Run events — SSE push of run state transitions and test progress. One latest-runs
+    # poll per tenant with open streams, shared by every tab (<= 0: pushed events only)
+    run_events_poll_seconds: int = 15
+    run_events_keepalive_seconds: int = 15
+    run_events_history: int = 500  # events kept per tenant for Last-Event-ID resume
+    run_events_max_stream_seconds: int = 3600  # streams then end; EventSource reconnects
+    run_events_retry_ms: int = 3000
+
+    # Job-id registry — full jobs.list reconcile interval (0 = startup only, -1 = never)
+    job_registry_reconcile_seconds: int = 3600
+
+    # Bulk deploy — bounded worker pool for validation / upload / job calls
+    deploy_max_workers: int = 8
+
+    # Framework validation — verdict cache size, optional process pool (0 = in-process)
+    validation_cache_size: int = 512
+    validation_process_workers: int = 0
 
     # Git
     git_enabled: bool = True
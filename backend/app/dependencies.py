@@ -7,11 +7,11 @@ configured credentials, ``get_databricks_service`` returns an *unavailable*
 instance — routes that genuinely need Databricks should call
 ``require_databricks_service`` instead, which raises HTTP 412.
 
-A small in-process cache reuses ``DatabricksService`` instances per tenant
-to avoid rebuilding the SDK ``WorkspaceClient`` on every request.
+An in-process cache (``databricks_clients``) reuses credentials and
+``DatabricksService`` instances per tenant to avoid a SQLite read and an SDK
+``WorkspaceClient`` rebuild on every request.
 """
 
-import time
 from functools import lru_cache
 from typing import Optional
 
@@ -19,6 +19,7 @@ from fastapi import Depends, HTTPException
 
 from app.services.audit_service import AuditService
 from app.services.config_service import ConfigService
+from app.services.databricks_client_cache import databricks_clients
 from app.services.databricks_service import DatabricksService
 from app.services.deploy_service import DeployService
 from app.services.embedding_service import EmbeddingService
@@ -27,12 +28,14 @@ from app.services.rag_service import RAGService
 from app.services.gold_config_service import GoldConfigService
 from app.services.gold_ingest_service import GoldIngestService
 from app.services.gold_readiness_service import GoldReadinessService
+from app.services.medallion_build_service import MedallionBuildService
 from app.services.silver_config_service import SilverConfigService
 from app.services.silver_deploy_service import SilverDeployService
 from app.services.silver_modeling_service import SilverModelingService
 from app.services.tenant_service import TenantService
 from app.services.tc_generator_service import TcGeneratorService
 from app.services.testing_service import TestingService
+from app.services.warehouse_warmer import warehouse_warmer
 
 
 @lru_cache
@@ -64,12 +67,8 @@ from app.api.common.auth import get_current_tenant  # noqa: E402
 
 
 # ── Per-tenant Databricks cache ──────────────────────────────────────────────
-
-# Cache key: (tenant_id, host, token_hash, warehouse_id) — token_hash so we
-# rebuild the WorkspaceClient when credentials are rotated.
-# Value: (DatabricksService, created_at_unix)
-_DATABRICKS_CACHE: dict[tuple, tuple[DatabricksService, float]] = {}
-_DATABRICKS_CACHE_TTL_SECONDS = 300  # 5 minutes
+# Credentials and DatabricksService instances are cached per tenant by
+# ``databricks_clients`` (LRU + TTL, refreshed ahead of expiry).
 
 
 def _get_or_build_databricks_service(
@@ -77,34 +76,7 @@ def _get_or_build_databricks_service(
     creds: Optional[dict],
 ) -> DatabricksService:
     """Return a cached DatabricksService for the tenant, or build a new one."""
-    if creds is None:
-        # Unavailable instance — pass None for everything so available == False.
-        return DatabricksService(host=None, token=None, warehouse_id=None)
-
-    key = (
-        tenant_id,
-        creds["host"],
-        # Hash the token rather than caching the literal in the dict key to
-        # reduce the risk of accidentally surfacing it via ``repr``.
-        hash(creds["token"]),
-        creds["warehouse_id"],
-    )
-    now = time.time()
-    cached = _DATABRICKS_CACHE.get(key)
-    if cached and now - cached[1] < _DATABRICKS_CACHE_TTL_SECONDS:
-        return cached[0]
-
-    svc = DatabricksService(
-        host=creds["host"],
-        token=creds["token"],
-        warehouse_id=creds["warehouse_id"],
-    )
-    _DATABRICKS_CACHE[key] = (svc, now)
-    # Best-effort eviction: drop oldest entries when the cache grows large.
-    if len(_DATABRICKS_CACHE) > 50:
-        oldest = min(_DATABRICKS_CACHE.items(), key=lambda kv: kv[1][1])
-        _DATABRICKS_CACHE.pop(oldest[0], None)
-    return svc
+    return databricks_clients.service(tenant_id, creds)
 
 
 def get_databricks_service(
@@ -117,8 +89,10 @@ def get_databricks_service(
     has not configured credentials. Use ``require_databricks_service`` to
     enforce a 412 Precondition Failed instead.
     """
-    creds = tenant_svc.get_databricks_credentials(tenant_id)
-    return _get_or_build_databricks_service(tenant_id, creds)
+    creds = databricks_clients.credentials(tenant_id, tenant_svc.get_databricks_credentials)
+    db = _get_or_build_databricks_service(tenant_id, creds)
+    warehouse_warmer.touch(db)
+    return db
 
 
 def require_databricks_service(
@@ -166,8 +140,9 @@ def get_silver_deploy_service(
     cfg: SilverConfigService = Depends(get_silver_config_service),
     git: GitService = Depends(get_git_service),
     db: DatabricksService = Depends(get_databricks_service),
+    bronze_cfg: ConfigService = Depends(get_config_service),
 ) -> SilverDeployService:
-    return SilverDeployService(cfg, git, db)
+    return SilverDeployService(cfg, git, db, bronze_cfg)
 
 
 def get_silver_modeling_service(
@@ -208,6 +183,22 @@ def get_gold_ingest_service() -> GoldIngestService:
     )
 
 
+def get_medallion_build_service(
+    bronze_cfg: ConfigService = Depends(get_config_service),
+    silver_cfg: SilverConfigService = Depends(get_silver_config_service),
+    deploy: DeployService = Depends(get_deploy_service),
+    silver_deploy: SilverDeployService = Depends(get_silver_deploy_service),
+    db: DatabricksService = Depends(get_databricks_service),
+) -> MedallionBuildService:
+    return MedallionBuildService(
+        bronze_config_service=bronze_cfg,
+        silver_config_service=silver_cfg,
+        deploy_service=deploy,
+        silver_deploy_service=silver_deploy,
+        databricks_service=db,
+    )
+
+
 def get_gold_readiness_service(
     bronze_cfg: ConfigService = Depends(get_config_service),
     silver_cfg: SilverConfigService = Depends(get_silver_config_service),
@@ -0,0 +1,10 @@
+"""Local Databricks stand-in for offline benchmarking and end-to-end tests.
+
+Start one with ``python -m app.emulator`` (or ``DatabricksEmulator`` in
+code) and point ``DATABRICKS_HOST`` at it; see ``server`` for the API
+subset covered.
+"""
+
+from app.emulator.server import DatabricksEmulator, EmulatorState
+
+__all__ = ["DatabricksEmulator", "EmulatorState"]
@@ -0,0 +1,48 @@
+"""CLI: ``python -m app.emulator --port 8765 --latency-ms 40``.
+
+Then run the portal with ``DATABRICKS_HOST=http://127.0.0.1:8765``, any
+``DATABRICKS_TOKEN`` and any ``DATABRICKS_WAREHOUSE_ID``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+
+from app.emulator.server import DatabricksEmulator
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Databricks API emulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db", default=":memory:", help="SQLite file backing the SQL warehouse")
+    parser.add_argument("--latency-ms", type=int, default=0, help="added to every API request")
+    parser.add_argument("--statement-latency-ms", type=int, default=0, help="added to every SQL statement")
+    parser.add_argument("--run-seconds", type=float, default=2.0, help="simulated job run duration")
+    parser.add_argument("--chunk-rows", type=int, default=1000, help="rows per SQL result chunk")
+    parser.add_argument("--seed", type=Path, action="append", default=[],
+                        help="SQL file(s) to execute at startup (';'-separated statements)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    emulator = DatabricksEmulator(
+        host=args.host,
+        port=args.port,
+        db_path=args.db,
+        latency_ms=args.latency_ms,
+        statement_latency_ms=args.statement_latency_ms,
+        run_seconds=args.run_seconds,
+        chunk_rows=args.chunk_rows,
+    )
+    for seed in args.seed:
+        for statement in seed.read_text(encoding="utf-8").split(";"):
+            if statement.strip():
+                emulator.state.warehouse.execute(statement)
+    print(f"Databricks emulator listening on {emulator.host}")
+    emulator.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
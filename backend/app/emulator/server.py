@@ -0,0 +1,758 @@
+"""HTTP server implementing the Databricks REST subset the portal calls.
+
+Covered endpoints (same paths and JSON shapes the SDK uses):
+
+- Statement Execution — submit (sync wait or ``wait_timeout=0s``), poll,
+  fetch chunk N, cancel. Results are split into ``chunk_rows``-row chunks
+  and served INLINE or as EXTERNAL_LINKS pointing back at this server.
+- Jobs 2.1 — create / get / list (name filter, pagination) / update /
+  reset / delete / run-now / runs get / runs list / runs cancel. Runs move
+  PENDING → RUNNING → TERMINATED over ``run_seconds``. A bronze run then
+  loads the NDJSON files under the source's ``extract.path`` (Files API)
+  into its target table and writes an ``ingestion_audit_log`` row, so the
+  testing-suite flow can assert on real rows.
+- Workspace — import (JSON or multipart), export, get-status, list,
+  mkdirs, delete.
+- Files — upload, download, delete, list directory.
+- SQL warehouses — get / start / stop. ``warehouse_state`` starts as
+  RUNNING; a started warehouse is STARTING for ``run_seconds``.
+- SCIM ``/Me`` for connection tests.
+
+Every request sleeps ``latency_ms`` first and is counted per route;
+``GET /emulator/stats`` returns the counters and ``POST /emulator/reset``
+zeroes them, so benchmarks can assert on round-trip counts.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+import yaml
+
+from app.emulator.sql import SqliteWarehouse, table_key
+
+logger = logging.getLogger(__name__)
+
+_WAIT_RE = re.compile(r"^(\d+)s$")
+_AUDIT_COLUMNS = (
+    "run_id", "source_name", "environment", "start_time", "end_time", "status",
+    "records_read", "records_written", "records_quarantined", "error",
+)
+
+
+class ApiError(Exception):
+    """Turned into a Databricks-style ``{"error_code", "message"}`` response."""
+
+    def __init__(self, status: int, error_code: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.error_code = error_code
+        self.message = message
+
+
+@dataclass
+class _Statement:
+    statement_id: str
+    sql: str
+    disposition: str
+    state: str = "PENDING"
+    columns: List[Tuple[str, str]] = field(default_factory=list)
+    rows: List[List[Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _iso(ms: int) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(ms / 1000))
+
+
+class EmulatorState:
+    """All emulated workspace state; shared by the request handler threads."""
+
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        latency_ms: int = 0,
+        statement_latency_ms: int = 0,
+        run_seconds: float = 2.0,
+        chunk_rows: int = 1000,
+    ) -> None:
+        self.warehouse = SqliteWarehouse(db_path)
+        self.latency_ms = latency_ms
+        self.statement_latency_ms = statement_latency_ms
+        self.run_seconds = run_seconds
+        self.chunk_rows = max(1, chunk_rows)
+        self.base_url = ""
+        self.counters: Counter = Counter()
+        self._lock = threading.RLock()
+        self._statements: Dict[str, _Statement] = {}
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="emulator-sql")
+        self._jobs: Dict[int, dict] = {}
+        self._runs: Dict[int, dict] = {}
+        self._next_job_id = 1000
+        self._next_run_id = 5000
+        self._workspace: Dict[str, bytes] = {}
+        self._workspace_dirs: set = {"/"}
+        self._files: Dict[str, Tuple[bytes, int]] = {}
+        self._file_dirs: set = {"/"}
+        self.warehouse_state = "RUNNING"
+        self._warehouse_started = 0.0
+
+    # ── Statement Execution ────────────────────────────────────────────────
+
+    def submit_statement(self, body: dict) -> dict:
+        sql = body.get("statement") or ""
+        st = _Statement(
+            statement_id=uuid.uuid4().hex,
+            sql=sql,
+            disposition=body.get("disposition") or "INLINE",
+        )
+        with self._lock:
+            self._statements[st.statement_id] = st
+        self._executor.submit(self._run_statement, st)
+        m = _WAIT_RE.match(str(body.get("wait_timeout") or "10s"))
+        wait = int(m.group(1)) if m else 10
+        if wait:
+            st.done.wait(wait)
+        return self._statement_json(st)
+
+    def get_statement(self, statement_id: str) -> dict:
+        return self._statement_json(self._statement(statement_id))
+
+    def get_chunk(self, statement_id: str, index: int) -> dict:
+        st = self._statement(statement_id)
+        if st.state != "SUCCEEDED" or index >= self._chunk_count(st):
+            raise ApiError(400, "INVALID_PARAMETER_VALUE", f"Chunk {index} is not available")
+        return self._chunk_json(st, index)
+
+    def chunk_rows_json(self, statement_id: str, index: int) -> List[List[Any]]:
+        st = self._statement(statement_id)
+        return self._chunk_slice(st, index)
+
+    def cancel_statement(self, statement_id: str) -> dict:
+        st = self._statement(statement_id)
+        if st.state in ("PENDING", "RUNNING"):
+            st.state = "CANCELED"
+            st.done.set()
+        return {}
+
+    def _statement(self, statement_id: str) -> _Statement:
+        with self._lock:
+            st = self._statements.get(statement_id)
+        if st is None:
+            raise ApiError(404, "RESOURCE_DOES_NOT_EXIST", f"Statement {statement_id} does not exist.")
+        return st
+
+    def _run_statement(self, st: _Statement) -> None:
+        st.state = "RUNNING"
+        if self.statement_latency_ms:
+            time.sleep(self.statement_latency_ms / 1000)
+        if st.state == "CANCELED":
+            return
+        try:
+            st.columns, st.rows = self.warehouse.execute(st.sql)
+            st.state = "SUCCEEDED"
+        except Exception as e:
+            st.error = str(e)
+            st.state = "FAILED"
+        st.done.set()
+
+    def _chunk_count(self, st: _Statement) -> int:
+        return (len(st.rows) + self.chunk_rows - 1) // self.chunk_rows
+
+    def _chunk_slice(self, st: _Statement, index: int) -> List[List[Any]]:
+        start = index * self.chunk_rows
+        return [
+            [None if v is None else str(v) for v in row]
+            for row in st.rows[start:start + self.chunk_rows]
+        ]
+
+    def _chunk_json(self, st: _Statement, index: int) -> dict:
+        rows = self._chunk_slice(st, index)
+        meta: Dict[str, Any] = {
+            "chunk_index": index,
+            "row_offset": index * self.chunk_rows,
+            "row_count": len(rows),
+        }
+        if index + 1 < self._chunk_count(st):
+            meta["next_chunk_index"] = index + 1
+            meta["next_chunk_internal_link"] = (
+                f"/api/2.0/sql/statements/{st.statement_id}/result/chunks/{index + 1}"
+            )
+        if st.disposition == "EXTERNAL_LINKS":
+            link = dict(meta)
+            link["external_link"] = f"{self.base_url}/emulator/results/{st.statement_id}/{index}"
+            link["expiration"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 900))
+            return {"external_links": [link]}
+        meta["data_array"] = rows
+        return meta
+
+    def _statement_json(self, st: _Statement) -> dict:
+        out: Dict[str, Any] = {"statement_id": st.statement_id, "status": {"state": st.state}}
+        if st.state == "FAILED":
+            out["status"]["error"] = {"error_code": "BAD_REQUEST", "message": st.error}
+        if st.state != "SUCCEEDED":
+            return out
+        chunks = self._chunk_count(st)
+        out["manifest"] = {
+            "format": "JSON_ARRAY",
+            "schema": {
+                "column_count": len(st.columns),
+                "columns": [
+                    {"name": name, "type_name": type_name, "type_text": type_name, "position": i}
+                    for i, (name, type_name) in enumerate(st.columns)
+                ],
+            },
+            "total_chunk_count": chunks,
+            "total_row_count": len(st.rows),
+            "chunks": [
+                {"chunk_index": i, "row_offset": i * self.chunk_rows,
+                 "row_count": len(st.rows[i * self.chunk_rows:(i + 1) * self.chunk_rows])}
+                for i in range(chunks)
+            ],
+        }
+        if chunks:
+            out["result"] = self._chunk_json(st, 0)
+        return out
+
+    # ── Jobs ───────────────────────────────────────────────────────────────
+
+    def create_job(self, body: dict) -> dict:
+        with self._lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "created_time": _now_ms(),
+                "creator_user_name": "emulator@example.com",
+                "settings": {k: v for k, v in body.items() if v is not None},
+            }
+        return {"job_id": job_id}
+
+    def get_job(self, job_id: Any) -> dict:
+        with self._lock:
+            job = self._jobs.get(int(job_id or 0))
+        if job is None:
+            raise ApiError(400, "RESOURCE_DOES_NOT_EXIST", f"Job {job_id} does not exist.")
+        return job
+
+    def list_jobs(self, query: Dict[str, str]) -> dict:
+        name = query.get("name")
+        with self._lock:
+            jobs = [j for j in self._jobs.values() if name is None or j["settings"].get("name") == name]
+        return self._page(jobs, query, "jobs")
+
+    def update_job(self, body: dict, reset: bool = False) -> dict:
+        job = self.get_job(body.get("job_id"))
+        with self._lock:
+            if reset:
+                job["settings"] = dict(body.get("new_settings") or {})
+            else:
+                job["settings"].update(body.get("new_settings") or {})
+                for key in body.get("fields_to_remove") or []:
+                    job["settings"].pop(key, None)
+        return {}
+
+    def delete_job(self, body: dict) -> dict:
+        job = self.get_job(body.get("job_id"))
+        with self._lock:
+            self._jobs.pop(job["job_id"], None)
+        return {}
+
+    def run_now(self, body: dict) -> dict:
+        job = self.get_job(body.get("job_id"))
+        with self._lock:
+            run_id = self._next_run_id
+            self._next_run_id += 1
+            number = 1 + sum(1 for r in self._runs.values() if r["job_id"] == job["job_id"])
+            self._runs[run_id] = {
+                "run_id": run_id,
+                "job_id": job["job_id"],
+                "number_in_job": number,
+                "run_name": job["settings"].get("name"),
+                "start_time": _now_ms(),
+                "state": {"life_cycle_state": "PENDING", "state_message": ""},
+                "_settings": json.loads(json.dumps(job["settings"])),
+            }
+            only = body.get("only")
+            if only:
+                run_settings = self._runs[run_id]["_settings"]
+                run_settings["tasks"] = [t for t in run_settings.get("tasks") or [] if t.get("task_key") in only]
+        return {"run_id": run_id, "number_in_job": number}
+
+    def get_run(self, run_id: Any) -> dict:
+        with self._lock:
+            run = self._runs.get(int(run_id or 0))
+        if run is None:
+            raise ApiError(400, "RESOURCE_DOES_NOT_EXIST", f"Run {run_id} does not exist.")
+        return self._public_run(self._advance(run))
+
+    def list_runs(self, query: Dict[str, str]) -> dict:
+        with self._lock:
+            runs = list(self._runs.values())
+        runs = [self._advance(r) for r in sorted(runs, key=lambda r: -r["run_id"])]
+        if query.get("job_id"):
+            runs = [r for r in runs if r["job_id"] == int(query["job_id"])]
+        if query.get("start_time_from"):
+            runs = [r for r in runs if r["start_time"] >= int(query["start_time_from"])]
+        if query.get("active_only") == "true":
+            runs = [r for r in runs if r["state"]["life_cycle_state"] in ("PENDING", "RUNNING")]
+        if query.get("completed_only") == "true":
+            runs = [r for r in runs if r["state"]["life_cycle_state"] not in ("PENDING", "RUNNING")]
+        return self._page([self._public_run(r) for r in runs], query, "runs")
+
+    def cancel_run(self, body: dict) -> dict:
+        with self._lock:
+            run = self._runs.get(int(body.get("run_id") or 0))
+            if run is None:
+                raise ApiError(400, "RESOURCE_DOES_NOT_EXIST", f"Run {body.get('run_id')} does not exist.")
+            if run["state"]["life_cycle_state"] in ("PENDING", "RUNNING"):
+                self._finish(run, "CANCELED", "Run cancelled via API")
+        return {}
+
+    @staticmethod
+    def _page(items: List[dict], query: Dict[str, str], key: str) -> dict:
+        limit = int(query.get("limit") or 25)
+        offset = int(query.get("page_token") or query.get("offset") or 0)
+        page = items[offset:offset + limit]
+        out: Dict[str, Any] = {key: page, "has_more": offset + limit < len(items)}
+        if out["has_more"]:
+            out["next_page_token"] = str(offset + limit)
+        return out
+
+    @staticmethod
+    def _public_run(run: dict) -> dict:
+        return {k: v for k, v in run.items() if not k.startswith("_")}
+
+    def _advance(self, run: dict) -> dict:
+        """Move a run along its simulated lifecycle based on elapsed time."""
+        with self._lock:
+            state = run["state"]
+            if state["life_cycle_state"] not in ("PENDING", "RUNNING"):
+                return run
+            elapsed = (_now_ms() - run["start_time"]) / 1000
+            if elapsed < self.run_seconds * 0.2:
+                return run
+            if elapsed < self.run_seconds:
+                state["life_cycle_state"] = "RUNNING"
+                return run
+            try:
+                self._execute_run(run)
+                self._finish(run, "SUCCESS", "")
+            except Exception as e:
+                logger.warning("Emulated run %s failed: %s", run["run_id"], e)
+                self._finish(run, "FAILED", str(e))
+        return run
+
+    @staticmethod
+    def _finish(run: dict, result_state: str, message: str) -> None:
+        run["end_time"] = _now_ms()
+        run["state"] = {
+            "life_cycle_state": "TERMINATED",
+            "result_state": result_state,
+            "state_message": message,
+        }
+
+    def _execute_run(self, run: dict) -> None:
+        """Bronze runs ingest the landing files; other runs just succeed."""
+        for task in run["_settings"].get("tasks") or []:
+            params = (task.get("notebook_task") or {}).get("base_parameters") or {}
+            if params.get("source_file"):
+                self._ingest(run, params)
+
+    def _ingest(self, run: dict, params: Dict[str, str]) -> None:
+        conf_dir = params.get("conf_dir", "").rstrip("/")
+        raw = self._workspace.get(f"{conf_dir}/sources/{params['source_file']}")
+        if raw is None:
+            raise RuntimeError(f"Source config {params['source_file']} not found in workspace")
+        config = yaml.safe_load(raw) or {}
+        target = config.get("target") or {}
+        landing = ((config.get("extract") or {}).get("path") or "").rstrip("/")
+        records: List[dict] = []
+        for path in sorted(p for p in self._files if landing and p.startswith(landing + "/")):
+            records.extend(_parse_records(self._files[path][0]))
+        written = self.warehouse.insert_records(
+            table_key(target.get("catalog", "dev"), target.get("schema", "bronze"), target.get("table", config.get("name", "t"))),
+            records,
+        )
+        audit = dict.fromkeys(_AUDIT_COLUMNS)
+        audit.update(
+            run_id=str(run["run_id"]),
+            source_name=config.get("name"),
+            environment=params.get("environment"),
+            start_time=_iso(run["start_time"]),
+            end_time=_iso(_now_ms()),
+            status="SUCCESS",
+            records_read=len(records),
+            records_written=written,
+            records_quarantined=0,
+        )
+        self.warehouse.insert_records(
+            table_key(target.get("catalog", "dev"), "bronze_meta", "ingestion_audit_log"), [audit],
+        )
+
+    # ── SQL warehouses ─────────────────────────────────────────────────────
+
+    def get_warehouse(self, warehouse_id: str) -> dict:
+        with self._lock:
+            if self.warehouse_state == "STARTING" and time.monotonic() - self._warehouse_started >= self.run_seconds:
+                self.warehouse_state = "RUNNING"
+            return {"id": warehouse_id, "name": "emulator", "state": self.warehouse_state}
+
+    def start_warehouse(self, warehouse_id: str) -> dict:
+        with self._lock:
+            if self.warehouse_state != "RUNNING":
+                self.warehouse_state = "STARTING"
+                self._warehouse_started = time.monotonic()
+        return {}
+
+    def stop_warehouse(self, warehouse_id: str) -> dict:
+        with self._lock:
+            self.warehouse_state = "STOPPED"
+        return {}
+
+    # ── Workspace ──────────────────────────────────────────────────────────
+
+    def workspace_import(self, path: str, content: bytes, overwrite: bool) -> dict:
+        with self._lock:
+            if path in self._workspace and not overwrite:
+                raise ApiError(400, "RESOURCE_ALREADY_EXISTS", f"{path} already exists.")
+            self._workspace[path] = content
+            self._add_dirs(self._workspace_dirs, path)
+        return {}
+
+    def workspace_export(self, path: str) -> dict:
+        with self._lock:
+            content = self._workspace.get(path)
+        if content is None:
+            raise ApiError(404, "RESOURCE_DOES_NOT_EXIST", f"Path ({path}) doesn't exist.")
+        return {"content": base64.b64encode(content).decode("ascii"), "file_type": path.rsplit(".", 1)[-1]}
+
+    def workspace_status(self, path: str) -> dict:
+        path = path.rstrip("/") or "/"
+        with self._lock:
+            if path in self._workspace:
+                return {"path": path, "object_type": "FILE", "size": len(self._workspace[path])}
+            if path in self._workspace_dirs:
+                return {"path": path, "object_type": "DIRECTORY"}
+        raise ApiError(404, "RESOURCE_DOES_NOT_EXIST", f"Path ({path}) doesn't exist.")
+
+    def workspace_list(self, path: str) -> dict:
+        path = path.rstrip("/") or "/"
+        self.workspace_status(path)
+        prefix = "/" if path == "/" else path + "/"
+        with self._lock:
+            objects = [
+                {"path": p, "object_type": "FILE", "size": len(c)}
+                for p, c in self._workspace.items()
+                if p.startswith(prefix) and "/" not in p[len(prefix):]
+            ] + [
+                {"path": d, "object_type": "DIRECTORY"}
+                for d in self._workspace_dirs
+                if d != path and d.startswith(prefix) and "/" not in d[len(prefix):]
+            ]
+        return {"objects": sorted(objects, key=lambda o: o["path"])}
+
+    def workspace_mkdirs(self, path: str) -> dict:
+        with self._lock:
+            self._add_dirs(self._workspace_dirs, path.rstrip("/") + "/_")
+        return {}
+
+    def workspace_delete(self, path: str, recursive: bool) -> dict:
+        path = path.rstrip("/")
+        with self._lock:
+            if path in self._workspace:
+                del self._workspace[path]
+                return {}
+            if path not in self._workspace_dirs:
+                raise ApiError(404, "RESOURCE_DOES_NOT_EXIST", f"Path ({path}) doesn't exist.")
+            children = [p for p in self._workspace if p.startswith(path + "/")]
+            if children and not recursive:
+                raise ApiError(400, "DIRECTORY_NOT_EMPTY", f"Folder ({path}) is not empty.")
+            for p in children:
+                del self._workspace[p]
+            self._workspace_dirs = {d for d in self._workspace_dirs if d != path and not d.startswith(path + "/")}
+        return {}
+
+    # ── Files ──────────────────────────────────────────────────────────────
+
+    def file_upload(self, path: str, content: bytes, overwrite: bool) -> dict:
+        with self._lock:
+            if path in self._files and not overwrite:
+                raise ApiError(409, "ALREADY_EXISTS", f"The file {path} already exists.")
+            self._files[path] = (content, _now_ms())
+            self._add_dirs(self._file_dirs, path)
+        return {}
+
+    def file_download(self, path: str) -> bytes:
+        with self._lock:
+            entry = self._files.get(path)
+        if entry is None:
+            raise ApiError(404, "NOT_FOUND", f"The file {path} does not exist.")
+        return entry[0]
+
+    def file_delete(self, path: str) -> dict:
+        with self._lock:
+            if self._files.pop(path, None) is None:
+                raise ApiError(404, "NOT_FOUND", f"The file {path} does not exist.")
+        return {}
+
+    def list_directory(self, path: str) -> dict:
+        path = path.rstrip("/") or "/"
+        prefix = "/" if path == "/" else path + "/"
+        with self._lock:
+            if path not in self._file_dirs:
+                raise ApiError(404, "NOT_FOUND", f"The directory {path} does not exist.")
+            entries = [
+                {"path": d, "name": d[len(prefix):], "is_directory": True}
+                for d in self._file_dirs
+                if d != path and d.startswith(prefix) and "/" not in d[len(prefix):]
+            ] + [
+                {"path": p, "name": p[len(prefix):], "is_directory": False,
+                 "file_size": len(content), "last_modified": modified}
+                for p, (content, modified) in self._files.items()
+                if p.startswith(prefix) and "/" not in p[len(prefix):]
+            ]
+        return {"contents": sorted(entries, key=lambda e: e["path"])}
+
+    @staticmethod
+    def _add_dirs(dirs: set, path: str) -> None:
+        parts = path.strip("/").split("/")[:-1]
+        for i in range(1, len(parts) + 1):
+            dirs.add("/" + "/".join(parts[:i]))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_records(payload: bytes) -> List[dict]:
+    text = payload.decode("utf-8").strip()
+    if not text:
+        return []
+    if text.startswith("["):
+        return [r for r in json.loads(text) if isinstance(r, dict)]
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+# ── HTTP layer ──────────────────────────────────────────────────────────────
+
+_Route = Tuple[str, "re.Pattern[str]", str, Callable[..., Any]]
+
+
+def _routes() -> List[_Route]:
+    def r(method: str, pattern: str, label: str, fn: Callable[..., Any]) -> _Route:
+        return method, re.compile(f"^{pattern}$"), label, fn
+
+    return [
+        r("POST", r"/api/2\.0/sql/statements/?", "sql.execute",
+          lambda s, h, m: s.submit_statement(h.json())),
+        r("GET", r"/api/2\.0/sql/statements/([^/]+)", "sql.get",
+          lambda s, h, m: s.get_statement(m.group(1))),
+        r("GET", r"/api/2\.0/sql/statements/([^/]+)/result/chunks/(\d+)", "sql.chunk",
+          lambda s, h, m: s.get_chunk(m.group(1), int(m.group(2)))),
+        r("POST", r"/api/2\.0/sql/statements/([^/]+)/cancel", "sql.cancel",
+          lambda s, h, m: s.cancel_statement(m.group(1))),
+        r("GET", r"/api/2\.0/sql/warehouses/([^/]+)", "warehouses.get",
+          lambda s, h, m: s.get_warehouse(m.group(1))),
+        r("POST", r"/api/2\.0/sql/warehouses/([^/]+)/start", "warehouses.start",
+          lambda s, h, m: s.start_warehouse(m.group(1))),
+        r("POST", r"/api/2\.0/sql/warehouses/([^/]+)/stop", "warehouses.stop",
+          lambda s, h, m: s.stop_warehouse(m.group(1))),
+        r("POST", r"/api/2\.1/jobs/create", "jobs.create", lambda s, h, m: s.create_job(h.json())),
+        r("GET", r"/api/2\.1/jobs/get", "jobs.get", lambda s, h, m: s.get_job(h.query().get("job_id"))),
+        r("GET", r"/api/2\.1/jobs/list", "jobs.list", lambda s, h, m: s.list_jobs(h.query())),
+        r("POST", r"/api/2\.1/jobs/update", "jobs.update", lambda s, h, m: s.update_job(h.json())),
+        r("POST", r"/api/2\.1/jobs/reset", "jobs.reset", lambda s, h, m: s.update_job(h.json(), reset=True)),
+        r("POST", r"/api/2\.1/jobs/delete", "jobs.delete", lambda s, h, m: s.delete_job(h.json())),
+        r("POST", r"/api/2\.1/jobs/run-now", "jobs.run_now", lambda s, h, m: s.run_now(h.json())),
+        r("GET", r"/api/2\.1/jobs/runs/get", "jobs.get_run", lambda s, h, m: s.get_run(h.query().get("run_id"))),
+        r("GET", r"/api/2\.1/jobs/runs/list", "jobs.list_runs", lambda s, h, m: s.list_runs(h.query())),
+        r("POST", r"/api/2\.1/jobs/runs/cancel", "jobs.cancel_run", lambda s, h, m: s.cancel_run(h.json())),
+        r("POST", r"/api/2\.0/workspace/import", "workspace.import", lambda s, h, m: h.workspace_import()),
+        r("GET", r"/api/2\.0/workspace/export", "workspace.export",
+          lambda s, h, m: s.workspace_export(h.query().get("path", ""))),
+        r("GET", r"/api/2\.0/workspace/get-status", "workspace.get_status",
+          lambda s, h, m: s.workspace_status(h.query().get("path", ""))),
+        r("GET", r"/api/2\.0/workspace/list", "workspace.list",
+          lambda s, h, m: s.workspace_list(h.query().get("path", ""))),
+        r("POST", r"/api/2\.0/workspace/mkdirs", "workspace.mkdirs",
+          lambda s, h, m: s.workspace_mkdirs(h.json().get("path", ""))),
+        r("POST", r"/api/2\.0/workspace/delete", "workspace.delete",
+          lambda s, h, m: s.workspace_delete(h.json().get("path", ""), bool(h.json().get("recursive")))),
+        r("PUT", r"/api/2\.0/fs/files(/.+)", "files.upload",
+          lambda s, h, m: s.file_upload(unquote(m.group(1)), h.body(), h.query().get("overwrite") == "true")),
+        r("GET", r"/api/2\.0/fs/files(/.+)", "files.download",
+          lambda s, h, m: s.file_download(unquote(m.group(1)))),
+        r("DELETE", r"/api/2\.0/fs/files(/.+)", "files.delete",
+          lambda s, h, m: s.file_delete(unquote(m.group(1)))),
+        r("GET", r"/api/2\.0/fs/directories(/.+)", "files.list_directory",
+          lambda s, h, m: s.list_directory(unquote(m.group(1)))),
+        r("GET", r"/api/2\.0/preview/scim/v2/Me", "current_user.me",
+          lambda s, h, m: {"id": "1", "userName": "emulator@example.com"}),
+        r("GET", r"/emulator/results/([^/]+)/(\d+)", "emulator.result",
+          lambda s, h, m: s.chunk_rows_json(m.group(1), int(m.group(2)))),
+        r("GET", r"/emulator/stats", "emulator.stats",
+          lambda s, h, m: {"requests": dict(s.counters), "total": sum(s.counters.values())}),
+        r("POST", r"/emulator/reset", "emulator.reset", lambda s, h, m: s.counters.clear() or {}),
+    ]
+
+
+_ROUTES = _routes()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "EmulatorServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("emulator: " + format, *args)
+
+    # Request helpers used by the route table
+    def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            length = int(self.headers.get("Content-Length") or 0)
+            self._body = self.rfile.read(length) if length else b""
+        return self._body
+
+    def json(self) -> dict:
+        raw = self.body()
+        return json.loads(raw) if raw else {}
+
+    def query(self) -> Dict[str, str]:
+        parsed = parse_qs(urlparse(self.path).query)
+        return {k: v[-1] for k, v in parsed.items()}
+
+    def workspace_import(self) -> dict:
+        ctype = self.headers.get("Content-Type", "")
+        if ctype.startswith("multipart/form-data"):
+            message = BytesParser().parsebytes(
+                f"Content-Type: {ctype}\r\n\r\n".encode("latin-1") + self.body()
+            )
+            fields = {
+                part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+                for part in message.get_payload()
+            }
+            path = fields.get("path", b"").decode("utf-8")
+            content = fields.get("content") or b""
+            overwrite = fields.get("overwrite", b"").decode("utf-8") == "true"
+        else:
+            body = self.json()
+            path = body.get("path", "")
+            content = base64.b64decode(body.get("content") or "")
+            overwrite = bool(body.get("overwrite"))
+        return self.server.state.workspace_import(path, content, overwrite)
+
+    def _dispatch(self, method: str) -> None:
+        # Handler instances are reused across keep-alive requests
+        self.__dict__.pop("_body", None)
+        state = self.server.state
+        path = urlparse(self.path).path
+        for route_method, pattern, label, fn in _ROUTES:
+            m = pattern.match(path) if route_method == method else None
+            if m is None:
+                continue
+            if not label.startswith("emulator."):
+                state.counters[label] += 1
+                if state.latency_ms:
+                    time.sleep(state.latency_ms / 1000)
+            try:
+                self._send(200, fn(state, self, m))
+            except ApiError as e:
+                self._send(e.status, {"error_code": e.error_code, "message": e.message})
+            except Exception as e:
+                logger.exception("Emulator error on %s %s", method, path)
+                self._send(500, {"error_code": "INTERNAL_ERROR", "message": str(e)})
+            return
+        self.body()
+        self._send(404, {"error_code": "ENDPOINT_NOT_FOUND", "message": f"No API found for '{method} {path}'"})
+
+    def _send(self, status: int, payload: Any) -> None:
+        if isinstance(payload, bytes):
+            data, ctype = payload, "application/octet-stream"
+        else:
+            data, ctype = json.dumps(payload).encode("utf-8"), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class EmulatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], state: EmulatorState) -> None:
+        super().__init__(address, _Handler)
+        self.state = state
+        state.base_url = f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+
+class DatabricksEmulator:
+    """Run an emulator in a background thread (``with DatabricksEmulator() as emu:``).
+
+    ``emu.host`` is what to put in ``databricks_host`` / a tenant's
+    credentials; any token and warehouse id are accepted.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **state_kwargs: Any) -> None:
+        self.state = EmulatorState(**state_kwargs)
+        self._server = EmulatorServer((host, port), self.state)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return self.state.base_url
+
+    def start(self) -> "DatabricksEmulator":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="databricks-emulator", daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self.state.close()
+
+    def serve_forever(self) -> None:
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self.state.close()
+
+    def __enter__(self) -> "DatabricksEmulator":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -0,0 +1,180 @@
+"""SQLite-backed stand-in for a Databricks SQL warehouse.
+
+Unity Catalog three-part names (``catalog.schema.table``, backticked or
+not) are stored as single SQLite tables named ``"catalog.schema.table"``.
+A handful of Databricks-only statements (``SHOW TABLES``, ``DESCRIBE``,
+``TRUNCATE``, ``CREATE SCHEMA``) and functions are translated; everything
+else is handed to SQLite as-is, so only the dialect subset the portal
+actually issues is supported.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+from typing import Any, List, Optional, Tuple
+
+_IDENT = r"(?:`[^`]+`|[A-Za-z_][\w$]*)"
+_THREE_PART_RE = re.compile(rf"(?<![\w.`\"'])({_IDENT})\.({_IDENT})\.({_IDENT})(?![\w`])")
+_TWO_PART_RE = rf"({_IDENT})\.({_IDENT})"
+_SHOW_TABLES_RE = re.compile(rf"^\s*SHOW\s+TABLES\s+(?:IN|FROM)\s+{_TWO_PART_RE}\s*;?\s*$", re.I)
+_DESCRIBE_RE = re.compile(r"^\s*(?:DESCRIBE|DESC)\s+(?:TABLE\s+)?(?:EXTENDED\s+)?(\"[^\"]+\"|\S+)\s*;?\s*$", re.I)
+_TRUNCATE_RE = re.compile(r"^\s*TRUNCATE\s+TABLE\s+(\"[^\"]+\"|\S+)\s*;?\s*$", re.I)
+_NOOP_RE = re.compile(
+    r"^\s*(?:CREATE\s+(?:SCHEMA|DATABASE|CATALOG|VOLUME)|USE\s|SET\s|OPTIMIZE\s|ANALYZE\s|ALTER\s+TABLE\s+\S+\s+SET\s+TBLPROPERTIES)",
+    re.I,
+)
+_NOW_INTERVAL_RE = re.compile(
+    r"current_timestamp\(\)\s*([-+])\s*INTERVAL\s+'?(\d+)'?\s+(SECOND|MINUTE|HOUR|DAY)S?", re.I,
+)
+
+
+def _unquote(part: str) -> str:
+    return part[1:-1] if part.startswith("`") else part
+
+
+def schema_key(catalog: str, schema: str) -> str:
+    return f"{_unquote(catalog)}.{_unquote(schema)}".lower()
+
+
+def table_key(catalog: str, schema: str, table: str) -> str:
+    return f"{schema_key(catalog, schema)}.{_unquote(table).lower()}"
+
+
+def translate(sql: str) -> str:
+    """Rewrite Databricks SQL into something SQLite will accept."""
+    sql = _NOW_INTERVAL_RE.sub(
+        lambda m: f"datetime('now', '{m.group(1)}{m.group(2)} {m.group(3).lower()}s')", sql,
+    )
+    sql = re.sub(r"current_timestamp\(\)", "datetime('now')", sql, flags=re.I)
+    sql = _THREE_PART_RE.sub(lambda m: f'"{table_key(*m.groups())}"', sql)
+    return sql.replace("`", '"')
+
+
+class _PercentileApprox:
+    """``percentile_approx(col, p)`` — exact percentile over the group."""
+
+    def __init__(self) -> None:
+        self._values: List[float] = []
+        self._p = 0.5
+
+    def step(self, value: Any, p: Any) -> None:
+        if value is not None:
+            self._values.append(float(value))
+            self._p = float(p)
+
+    def finalize(self) -> Optional[float]:
+        if not self._values:
+            return None
+        values = sorted(self._values)
+        return values[min(len(values) - 1, int(round(self._p * (len(values) - 1))))]
+
+
+class SqliteWarehouse:
+    """Thread-safe SQL executor returning ``(columns, rows)``."""
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.create_aggregate("percentile_approx", 2, _PercentileApprox)
+        self._conn.create_function("date_sub", 2, lambda d, n: _shift(d, -int(n)))
+        self._conn.create_function("date_add", 2, lambda d, n: _shift(d, int(n)))
+        self._conn.create_function("to_date", 1, lambda d: str(d)[:10] if d is not None else None)
+        self._lock = threading.Lock()
+
+    def execute(self, sql: str) -> Tuple[List[Tuple[str, str]], List[List[Any]]]:
+        """Run one statement. Columns are ``(name, type_name)`` pairs.
+
+        Raises ``sqlite3.Error`` (re-worded like the real warehouse for
+        missing tables) on failure.
+        """
+        with self._lock:
+            m = _SHOW_TABLES_RE.match(sql)
+            if m:
+                return self._show_tables(schema_key(m.group(1), m.group(2)))
+            if _NOOP_RE.match(sql):
+                return [], []
+            translated = translate(sql)
+            m = _DESCRIBE_RE.match(translated)
+            if m:
+                return self._describe(m.group(1).strip('"'))
+            m = _TRUNCATE_RE.match(translated)
+            if m:
+                translated = f"DELETE FROM {m.group(1)}"
+            try:
+                cur = self._conn.execute(translated)
+            except sqlite3.OperationalError as e:
+                if "no such table" in str(e):
+                    raise sqlite3.OperationalError(f"[TABLE_OR_VIEW_NOT_FOUND] {e}") from e
+                raise
+            self._conn.commit()
+            if cur.description is None:
+                return [], []
+            columns = [(d[0], "STRING") for d in cur.description]
+            return columns, [list(r) for r in cur.fetchall()]
+
+    def tables(self, prefix: str = "") -> List[str]:
+        rows = self._conn.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'table' AND substr(name, 1, ?) = ? ORDER BY name",
+            (len(prefix), prefix),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def insert_records(self, table: str, records: List[dict]) -> int:
+        """Append JSON records to ``table`` (a ``catalog.schema.table`` key),
+        creating it — or widening it with new TEXT columns — as needed."""
+        columns: List[str] = []
+        for record in records:
+            columns.extend(k for k in record if k not in columns)
+        if not columns:
+            return 0
+        with self._lock:
+            existing = [r[1] for r in self._conn.execute(f'PRAGMA table_info("{table}")')]
+            if not existing:
+                cols = ", ".join(f'"{c}" TEXT' for c in columns)
+                self._conn.execute(f'CREATE TABLE "{table}" ({cols})')
+            for col in columns:
+                if existing and col not in existing:
+                    self._conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{col}" TEXT')
+            col_list = ", ".join(f'"{c}"' for c in columns)
+            placeholders = ", ".join("?" for _ in columns)
+            self._conn.executemany(
+                f'INSERT INTO "{table}" ({col_list}) VALUES ({placeholders})',
+                [[_cell(r.get(c)) for c in columns] for r in records],
+            )
+            self._conn.commit()
+        return len(records)
+
+    def _show_tables(self, key: str) -> Tuple[List[Tuple[str, str]], List[List[Any]]]:
+        database = key.split(".")[-1]
+        rows = [
+            [database, name[len(key) + 1:], "false"]
+            for name in self.tables(key + ".")
+            if name.count(".") == 2
+        ]
+        columns = [("database", "STRING"), ("tableName", "STRING"), ("isTemporary", "BOOLEAN")]
+        return columns, rows
+
+    def _describe(self, name: str) -> Tuple[List[Tuple[str, str]], List[List[Any]]]:
+        info = self._conn.execute(f'PRAGMA table_info("{name}")').fetchall()
+        if not info:
+            raise sqlite3.OperationalError(f"[TABLE_OR_VIEW_NOT_FOUND] The table {name} cannot be found.")
+        columns = [("col_name", "STRING"), ("data_type", "STRING"), ("comment", "STRING")]
+        return columns, [[r[1], (r[2] or "string").lower(), None] for r in info]
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        import json
+
+        return json.dumps(value)
+    return value
+
+
+def _shift(day: Any, days: int) -> Optional[str]:
+    if day is None:
+        return None
+    from datetime import date, timedelta
+
+    return (date.fromisoformat(str(day)[:10]) + timedelta(days=days)).isoformat()
@@ -32,8 +32,45 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("Failed to seed default admin: %s", e)
 
+    # Import the framework config loaders before the first validation request
+    try:
+        from app.dependencies import get_config_service, get_silver_config_service
+        get_config_service().warm_validation()
+        get_silver_config_service().warm_validation()
+    except Exception as e:
+        logger.warning("Failed to warm framework validation: %s", e)
+
+    # Rebuild the job-id registry from Databricks in the background, then on a schedule
+    from app.services.job_registry import JobRegistrySync
+    registry_sync = JobRegistrySync(settings.job_registry_reconcile_seconds)
+    registry_sync.start()
+
+    # Keep the local run-history store in step with the audit logs
+    from app.services.run_history_store import RunHistorySync
+    history_sync = RunHistorySync(settings.run_history_sync_seconds)
+    history_sync.start()
+
+    # Warm SQL warehouses ahead of busy windows and keep them alive while users are active
+    from app.services.warehouse_warmer import warehouse_warmer
+    warehouse_warmer.start()
+
+    # Push run / test progress to open /events streams (one latest-runs poll per tenant)
+    from app.services.run_events import run_event_hub
+    run_event_hub.start()
+
+    # Drain the deploy queue (create/update publishes run here when it is enabled)
+    from app.services.deploy_queue import DeployWorkers, get_deploy_queue
+    deploy_workers = DeployWorkers(get_deploy_queue()) if settings.deploy_queue_enabled else None
+    if deploy_workers is not None:
+        deploy_workers.start()
+
     yield
-    # Shutdown: nothing to clean up
+    if deploy_workers is not None:
+        deploy_workers.stop()
+    run_event_hub.stop()
+    warehouse_warmer.stop()
+    history_sync.stop()
+    registry_sync.stop()
 
 
 app = FastAPI(
@@ -168,3 +168,7 @@ class SourceUpdateRequest(BaseModel):
     extract: Optional[ExtractRequest] = None
     target: Optional[TargetRequest] = None
     schedule: Optional[ScheduleRequest] = None
+
+
+class SourceBulkCreateRequest(BaseModel):
+    sources: List[SourceCreateRequest] = Field(min_length=1, max_length=1000)
@@ -20,6 +20,7 @@ class SourceSummary(BaseModel):
     cdc_mode: CdcMode
     load_type: LoadType
     schedule: Optional[str] = None
+    last_run: Optional["RunRecord"] = None  # only with ?include_last_run=true
 
 
 class SourceDetail(BaseModel):
@@ -38,6 +39,7 @@ class SourceDetail(BaseModel):
 class SourceListResponse(BaseModel):
     sources: List[SourceSummary]
     total: int
+    next_cursor: Optional[str] = None
 
 
 class SourceCreateResponse(BaseModel):
@@ -48,6 +50,49 @@ class SourceCreateResponse(BaseModel):
     message: str
 
 
+class SourceBulkItemResult(BaseModel):
+    name: str
+    status: str  # created | invalid | exists | failed
+    yaml_path: Optional[str] = None
+    job_id: Optional[str] = None
+    errors: List[str] = []
+
+
+class SourceBulkCreateResponse(BaseModel):
+    results: List[SourceBulkItemResult]
+    created: int
+    failed: int
+    git_commit: Optional[str] = None
+    message: str
+
+
+class WorkspaceSyncResponse(BaseModel):
+    remote_dir: str
+    uploaded: List[str]
+    deleted: List[str]
+    unchanged: int
+    failed: Dict[str, str] = {}
+    dry_run: bool = False
+    message: str
+
+
+class OperationResponse(BaseModel):
+    id: str
+    layer: str
+    name: str
+    status: str  # queued | running | succeeded | failed
+    payload: Dict[str, Any] = {}
+    attempts: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: str
+    updated_at: str
+
+
+class OperationListResponse(BaseModel):
+    operations: List[OperationResponse]
+
+
 class SourceDeleteResponse(BaseModel):
     name: str
     message: str
@@ -75,12 +120,24 @@ class RunHistoryResponse(BaseModel):
     source_name: str
     runs: List[RunRecord]
     total: int
+    next_cursor: Optional[str] = None  # pass back as ``cursor`` for older runs
 
 
 class DeadLetterResponse(BaseModel):
     source_name: str
-    total_count: int
+    total_count: int  # every match of the filters; cached, may lag new rejections
     recent_records: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None  # pass back as ``cursor`` for older records
+
+
+class SourceTypeRunStats(BaseModel):
+    runs: int = 0
+    failures: int = 0
+    records_read: int = 0
+    records_written: int = 0
+    records_quarantined: int = 0
+    p50_duration_seconds: Optional[float] = None
+    p95_duration_seconds: Optional[float] = None
 
 
 class DashboardStats(BaseModel):
@@ -88,8 +145,17 @@ class DashboardStats(BaseModel):
     enabled_sources: int
     disabled_sources: int
     sources_by_type: Dict[str, int]
+    # Run figures over the last ``window_hours`` across every catalog in ``catalogs``
+    window_hours: int = 24
+    catalogs: List[str] = []
     recent_runs: int = 0
     recent_failures: int = 0
+    recent_records_read: int = 0
+    recent_records_written: int = 0
+    recent_records_quarantined: int = 0
+    run_stats_by_type: Dict[str, SourceTypeRunStats] = {}
+    skipped_catalogs: List[str] = []  # catalogs whose audit log could not be read
+    failing_sources: List[str] = []  # sources whose latest run failed
 
 
 class EnvironmentInfo(BaseModel):
@@ -76,6 +76,7 @@ class SilverRunHistoryResponse(BaseModel):
     entity_name: str
     runs: List[SilverRunRecord]
     total: int
+    next_cursor: Optional[str] = None  # pass back as ``cursor`` for older runs
 
 
 class SilverDashboardStats(BaseModel):
@@ -92,3 +93,40 @@ class SilverDiagramResponse(BaseModel):
     mermaid: str
     entity_count: int
     domains: List[str]
+
+
+class SilverLineageResponse(BaseModel):
+    bronze_tables: Dict[str, List[str]]
+    business_keys: Dict[str, str]
+
+
+class SilverBronzeConsumersResponse(BaseModel):
+    bronze_table: str
+    entities: List[str]
+
+
+class SilverDagTask(BaseModel):
+    key: str
+    kind: str  # bronze | silver
+    name: str
+    depends_on: List[str] = []
+
+
+class SilverDagPlan(BaseModel):
+    name: str
+    domains: List[str]
+    schedule: Optional[Dict[str, Any]] = None
+    tasks: List[SilverDagTask]
+    waves: List[List[str]]
+    trigger_tables: List[str] = []  # the job starts once all of these are updated
+
+
+class SilverDagListResponse(BaseModel):
+    dags: List[SilverDagPlan]
+    total: int
+
+
+class SilverDagDeployResponse(BaseModel):
+    job_ids: Dict[str, Optional[str]]  # entity name → its DAG or standalone job id
+    dags: int
+    message: str
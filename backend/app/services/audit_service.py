@@ -2,66 +2,419 @@
 
 from __future__ import annotations
 
+import base64
+import json
 import logging
-from typing import Any, Dict, List, Optional
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from app.config import settings
 from app.services.databricks_service import DatabricksService
+from app.services.run_history_store import AUDIT_TABLES, get_run_history_store
 
 logger = logging.getLogger(__name__)
 
 
+def _quote(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
 class AuditService:
     def __init__(self, databricks_service: DatabricksService) -> None:
         self._db = databricks_service
 
     def get_run_history(
-        self, source_name: str, catalog: str, limit: int = 50
+        self,
+        source_name: str,
+        catalog: str,
+        limit: int = 50,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        before: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Newest-first Bronze runs of ``source_name``, filtered by status and time range.
+
+        ``before`` (exclusive) is the ``start_time`` of the last row of the
+        previous page. Served from the local run-history store while it is
+        fresh for ``catalog``.
+        """
+        return self._runs("bronze", source_name, catalog, limit, status, since, before)
+
+    def get_entity_runs(
+        self,
+        entity_name: str,
+        catalog: str,
+        limit: int = 50,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        before: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Like ``get_run_history``, for a Silver entity's transformation runs."""
+        return self._runs("silver", entity_name, catalog, limit, status, since, before)
+
+    def _runs(
+        self,
+        layer: str,
+        name: str,
+        catalog: str,
+        limit: int,
+        status: Optional[str],
+        since: Optional[str],
+        before: Optional[str],
     ) -> List[Dict[str, Any]]:
+        if self._db.available:
+            store = get_run_history_store()
+            if store.covers(self._db.scope, layer, catalog):
+                return store.runs(self._db.scope, layer, catalog, name, limit, status, since, before)
+
+        table, name_col, columns = AUDIT_TABLES[layer]
+        where = [f"{name_col} = {_quote(name)}"]
+        if status:
+            where.append(f"status = {_quote(status)}")
+        if since:
+            where.append(f"start_time >= {_quote(since)}")
+        if before:
+            where.append(f"start_time < {_quote(before)}")
         sql = f"""
-            SELECT source_name, environment, start_time, end_time,
-                   status, records_read, records_written, records_quarantined, error
-            FROM {catalog}.bronze_meta.ingestion_audit_log
-            WHERE source_name = '{source_name}'
+            SELECT {", ".join(columns)}
+            FROM {catalog}.{table}
+            WHERE {" AND ".join(where)}
             ORDER BY start_time DESC
-            LIMIT {limit}
+            LIMIT {int(limit)}
         """
         return self._db.query_sql(sql)
 
+    def get_latest_runs(self, sources: Dict[str, str], limit: int = 1) -> Dict[str, List[Dict[str, Any]]]:
+        """The newest ``limit`` runs of every source in one query.
+
+        ``sources`` maps source name → catalog. Returns name → runs (newest
+        first); sources without runs are missing. Every catalog's audit log
+        is scanned in one ``UNION ALL`` and ranked with ``ROW_NUMBER()``.
+        """
+        names_by_catalog: Dict[str, List[str]] = {}
+        for name, catalog in sorted(sources.items()):
+            if catalog:
+                names_by_catalog.setdefault(catalog, []).append(name)
+        if not names_by_catalog:
+            return {}
+
+        rows = None
+        if self._db.available:
+            store = get_run_history_store()
+            if all(store.covers(self._db.scope, "bronze", c) for c in names_by_catalog):
+                rows = store.latest_runs(self._db.scope, "bronze", names_by_catalog, limit)
+        if rows is None:
+            table, name_col, columns = AUDIT_TABLES["bronze"]
+            cols = ", ".join(columns)
+            scans = "\n                    UNION ALL\n".join(
+                f"""
+                    SELECT {cols} FROM {catalog}.{table}
+                    WHERE {name_col} IN ({", ".join(_quote(n) for n in names)})"""
+                for catalog, names in names_by_catalog.items()
+            )
+            sql = f"""
+                SELECT {cols} FROM (
+                    SELECT {cols},
+                           ROW_NUMBER() OVER (PARTITION BY {name_col} ORDER BY start_time DESC) AS rn
+                    FROM ({scans}
+                    ) runs
+                ) ranked
+                WHERE rn <= {int(limit)}
+                ORDER BY {name_col}, start_time DESC
+            """
+            rows = self._db.query_sql(sql)
+
+        latest: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            latest.setdefault(row.get("source_name"), []).append(row)
+        return latest
+
     def get_dead_letter_count(
-        self, source_name: str, catalog: str, table: str
+        self,
+        source_name: str,
+        catalog: str,
+        table: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        reason: Optional[str] = None,
     ) -> int:
+        """Dead letters matching the filters, cached ``dead_letter_count_ttl_seconds``.
+
+        Counting a quarantine table of tens of millions of rows is a full
+        scan, so the figure may lag the table by up to the TTL.
+        """
+        where = _dead_letter_filters(since, until, reason)
         sql = f"""
             SELECT COUNT(*) as cnt
             FROM {catalog}.bronze_meta.dead_letter_{table}
+            {"WHERE " + " AND ".join(where) if where else ""}
         """
+        key = (self._db.scope if self._db.available else "", " ".join(sql.split()))
+        with _dead_letter_counts_lock:
+            cached = _dead_letter_counts.get(key)
+        if cached is not None and time.monotonic() - cached[1] < settings.dead_letter_count_ttl_seconds:
+            return cached[0]
         result = self._db.query_sql(sql)
+        count = int(result[0].get("cnt") or 0) if result else 0
         if result:
-            return int(result[0].get("cnt", 0))
-        return 0
+            with _dead_letter_counts_lock:
+                _dead_letter_counts[key] = (count, time.monotonic())
+        return count
 
     def get_dead_letter_records(
-        self, source_name: str, catalog: str, table: str, limit: int = 20
+        self,
+        source_name: str,
+        catalog: str,
+        table: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        reason: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        sql = f"""
-            SELECT *
-            FROM {catalog}.bronze_meta.dead_letter_{table}
-            ORDER BY _ingest_timestamp DESC
-            LIMIT {limit}
+        """Newest-first dead letters after ``cursor`` (see ``dead_letter_cursor``).
+
+        Pages by keyset on (``_ingest_timestamp``, ``_dl_row_key``, a hash
+        of the whole row, ``_dl_row_seq``, which numbers identical rows), so
+        a page boundary between duplicates drops none of them. Each page is a
+        top-``limit`` selection over the rows at or before the cursor, and
+        duplicates are numbered within that page only, so no page shuffles
+        the whole table; how much a page scans still depends on how well
+        ``_ingest_timestamp`` prunes files. Raises ValueError for a
+        malformed cursor.
         """
-        return self._db.query_sql(sql)
+        return self._db.query_sql(
+            _dead_letter_page_sql(catalog, table, limit, cursor, since, until, reason)
+        )
 
-    def get_dashboard_stats(self, catalog: str) -> Dict[str, Any]:
-        sql = f"""
-            SELECT
-                COUNT(*) as total_runs,
-                SUM(CASE WHEN status = 'FAILURE' THEN 1 ELSE 0 END) as failures
-            FROM {catalog}.bronze_meta.ingestion_audit_log
-            WHERE start_time >= current_timestamp() - INTERVAL 24 HOURS
+    def iter_dead_letters(
+        self,
+        catalog: str,
+        table: str,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        reason: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Every matching dead letter in page order, streamed chunk by chunk.
+
+        Raises ValueError for a malformed cursor and RuntimeError if the
+        statement fails.
         """
-        result = self._db.query_sql(sql)
-        if result:
-            return {
-                "recent_runs": int(result[0].get("total_runs", 0)),
-                "recent_failures": int(result[0].get("failures", 0)),
+        sql = _dead_letter_page_sql(catalog, table, None, cursor, since, until, reason)
+        return self._db.iter_sql_rows(sql, disposition="EXTERNAL_LINKS")
+
+    def get_dashboard_stats(
+        self,
+        catalogs: List[str],
+        source_types: Dict[str, str],
+        window_hours: int = 24,
+    ) -> Dict[str, Any]:
+        """Bronze run figures over the last ``window_hours`` across ``catalogs``.
+
+        ``source_types`` maps source name → source type; runs of sources no
+        longer configured count as ``other``. Served from the run-history
+        store when every catalog is fresh there, otherwise from one
+        ``UNION ALL`` aggregation over the catalogs' audit logs.
+
+        A catalog whose audit log cannot be read (not created yet, no
+        access) would fail that whole query, so on failure each catalog is
+        probed and the aggregation re-run over the readable ones. The others
+        are listed under ``skipped_catalogs``.
+        """
+        if not catalogs:
+            return _stats_totals({})
+        if self._db.available:
+            store = get_run_history_store()
+            if all(store.covers(self._db.scope, "bronze", c) for c in catalogs):
+                since = datetime.now(timezone.utc) - timedelta(hours=window_hours)
+                rows = store.runs_since(self._db.scope, "bronze", catalogs, since.isoformat())
+                return _stats_totals(_aggregate_runs(rows, source_types))
+
+        table = AUDIT_TABLES["bronze"][0]
+        skipped: List[str] = []
+        [result] = self._db.query_many([_dashboard_stats_sql(catalogs, source_types, window_hours)])
+        if not result.ok:
+            probes = self._db.query_many([f"SELECT 1 FROM {c}.{table} LIMIT 0" for c in catalogs])
+            for catalog, probe in zip(catalogs, probes):
+                if not probe.ok:
+                    logger.warning("Dashboard stats skip %s.%s: %s", catalog, table, probe.error)
+                    skipped.append(catalog)
+            readable = [c for c in catalogs if c not in skipped]
+            if readable:
+                [result] = self._db.query_many([_dashboard_stats_sql(readable, source_types, window_hours)])
+            if not result.ok:
+                logger.warning("Dashboard stats query failed: %s", result.error)
+                skipped = list(catalogs)
+        by_type = {}
+        for row in result.rows if result.ok else []:
+            by_type[row.get("source_type") or "other"] = {
+                "runs": int(row.get("runs") or 0),
+                "failures": int(row.get("failures") or 0),
+                "records_read": int(float(row.get("records_read") or 0)),
+                "records_written": int(float(row.get("records_written") or 0)),
+                "records_quarantined": int(float(row.get("records_quarantined") or 0)),
+                "p50_duration_seconds": _float_or_none(row.get("p50_duration_seconds")),
+                "p95_duration_seconds": _float_or_none(row.get("p95_duration_seconds")),
             }
-        return {"recent_runs": 0, "recent_failures": 0}
+        return _stats_totals(by_type, skipped)
+
+
+def _dashboard_stats_sql(catalogs: List[str], source_types: Dict[str, str], window_hours: int) -> str:
+    """Run figures per source type from one ``UNION ALL`` over ``catalogs``' audit logs."""
+    table = AUDIT_TABLES["bronze"][0]
+    scans = "\n                UNION ALL\n".join(
+        f"""
+                SELECT source_name, status, records_read, records_written, records_quarantined,
+                       unix_timestamp(end_time) - unix_timestamp(start_time) AS duration_seconds
+                FROM {catalog}.{table}
+                WHERE start_time >= current_timestamp() - INTERVAL {int(window_hours)} HOURS"""
+        for catalog in catalogs
+    )
+    cases = " ".join(
+        f"WHEN {_quote(name)} THEN {_quote(kind)}" for name, kind in sorted(source_types.items())
+    )
+    source_type = f"CASE source_name {cases} ELSE 'other' END" if cases else "'other'"
+    return f"""
+            WITH runs AS ({scans}
+            )
+            SELECT
+                {source_type} AS source_type,
+                COUNT(*) AS runs,
+                SUM(CASE WHEN status = 'FAILURE' THEN 1 ELSE 0 END) AS failures,
+                SUM(records_read) AS records_read,
+                SUM(records_written) AS records_written,
+                SUM(records_quarantined) AS records_quarantined,
+                percentile_approx(duration_seconds, 0.5) AS p50_duration_seconds,
+                percentile_approx(duration_seconds, 0.95) AS p95_duration_seconds
+            FROM runs
+            GROUP BY 1
+        """
+
+
+_DEAD_LETTER_KEY = "xxhash64(to_json(struct(*)))"
+_dead_letter_counts: Dict[Tuple[str, str], Tuple[int, float]] = {}
+_dead_letter_counts_lock = threading.Lock()
+
+
+def dead_letter_cursor(record: Dict[str, Any]) -> str:
+    """Opaque cursor resuming after ``record`` (a row of ``get_dead_letter_records``)."""
+    raw = json.dumps({"after": [
+        record.get("_ingest_timestamp"), str(record.get("_dl_row_key")), int(record.get("_dl_row_seq") or 1),
+    ]})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_dead_letter_cursor(cursor: str) -> Tuple[str, int, int]:
+    try:
+        after = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["after"]
+        return str(after[0]), int(after[1]), int(after[2])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _dead_letter_filters(since: Optional[str], until: Optional[str], reason: Optional[str]) -> List[str]:
+    where = []
+    if since:
+        where.append(f"_ingest_timestamp >= {_quote(since)}")
+    if until:
+        where.append(f"_ingest_timestamp < {_quote(until)}")
+    if reason:
+        where.append(f"startswith({settings.dead_letter_reason_column}, {_quote(reason)})")
+    return where
+
+
+def _dead_letter_page_sql(
+    catalog: str,
+    table: str,
+    limit: Optional[int],
+    cursor: Optional[str],
+    since: Optional[str],
+    until: Optional[str],
+    reason: Optional[str],
+) -> str:
+    where = _dead_letter_filters(since, until, reason)
+    keyset, skip, seq = "", "", 0
+    if cursor:
+        ts, key, seq = _decode_dead_letter_cursor(cursor)
+        # The plain bound on the scan lets Delta skip newer files
+        where.append(f"_ingest_timestamp <= {_quote(ts)}")
+        keyset = (
+            f"WHERE _ingest_timestamp < {_quote(ts)} "
+            f"OR (_ingest_timestamp = {_quote(ts)} AND _dl_row_key <= {key})"
+        )
+        skip = f"WHERE NOT (_ingest_timestamp = {_quote(ts)} AND _dl_row_key = {key} AND _dl_row_seq <= {seq})"
+    # Identical rows share a hash; _dl_row_seq numbers them so the keyset stays
+    # total. It is computed over the page only: the top ``limit`` rows, plus
+    # the ``seq`` copies of the cursor's row already returned, which are
+    # numbered again and then dropped.
+    return f"""
+        SELECT * FROM (
+            SELECT *, row_number() OVER (
+                       PARTITION BY _ingest_timestamp, _dl_row_key ORDER BY _ingest_timestamp
+                   ) AS _dl_row_seq
+            FROM (
+                SELECT * FROM (
+                    SELECT *, {_DEAD_LETTER_KEY} AS _dl_row_key
+                    FROM {catalog}.bronze_meta.dead_letter_{table}
+                    {"WHERE " + " AND ".join(where) if where else ""}
+                ) dl
+                {keyset}
+                ORDER BY _ingest_timestamp DESC, _dl_row_key DESC
+                {f"LIMIT {int(limit) + seq}" if limit is not None else ""}
+            ) page
+        ) numbered
+        {skip}
+        ORDER BY _ingest_timestamp DESC, _dl_row_key DESC, _dl_row_seq
+        {f"LIMIT {int(limit)}" if limit is not None else ""}
+    """
+
+
+def _float_or_none(value: Any) -> Optional[float]:
+    return None if value in (None, "") else float(value)
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, like ``percentile_approx`` on a small sample."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct * len(ordered)) - 1)]
+
+
+def _aggregate_runs(rows: List[Dict[str, Any]], source_types: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """Per-source-type figures of raw audit rows (the store's ``runs_since``)."""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(source_types.get(row.get("source_name"), "other"), []).append(row)
+    by_type = {}
+    for kind, runs in groups.items():
+        durations = [r["duration_seconds"] for r in runs if r.get("duration_seconds") is not None]
+        by_type[kind] = {
+            "runs": len(runs),
+            "failures": sum(1 for r in runs if r.get("status") == "FAILURE"),
+            "records_read": sum(int(r.get("records_read") or 0) for r in runs),
+            "records_written": sum(int(r.get("records_written") or 0) for r in runs),
+            "records_quarantined": sum(int(r.get("records_quarantined") or 0) for r in runs),
+            "p50_duration_seconds": _percentile(durations, 0.5),
+            "p95_duration_seconds": _percentile(durations, 0.95),
+        }
+    return by_type
+
+
+def _stats_totals(by_type: Dict[str, Dict[str, Any]], skipped: Iterable[str] = ()) -> Dict[str, Any]:
+    def total(key: str) -> int:
+        return sum(stats[key] for stats in by_type.values())
+
+    return {
+        "recent_runs": total("runs"),
+        "recent_failures": total("failures"),
+        "recent_records_read": total("records_read"),
+        "recent_records_written": total("records_written"),
+        "recent_records_quarantined": total("records_quarantined"),
+        "run_stats_by_type": by_type,
+        "skipped_catalogs": list(skipped),
+    }
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-import sys
+import base64
+import copy
+import json
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 from jinja2 import Environment, FileSystemLoader
@@ -13,6 +16,11 @@ from app.config import settings
 from app.models.enums import CdcMode, LoadType, SourceType
 from app.models.requests import SourceCreateRequest, SourceUpdateRequest
 from app.models.responses import SourceDetail, SourceSummary
+from app.services.config_validator import FrameworkValidator
+from app.services.yaml_catalog import Signature, YamlCatalog
+
+# Fields accepted by query_sources(sort=...); prefix with "-" for descending
+SOURCE_SORT_FIELDS = ("name", "source_type", "target_table", "cdc_mode", "load_type", "schedule")
 
 
 class ConfigService:
@@ -23,6 +31,19 @@ class ConfigService:
             keep_trailing_newline=True,
         )
         self._template = self._jinja_env.get_template("source.yaml.j2")
+        # Parsed sources + name → path index, re-read per file on change
+        self._catalog = YamlCatalog(lambda: self.sources_dir)
+        # path -> (signature, summary); summaries are the filter/sort index
+        self._summaries: Dict[Path, Tuple[Signature, SourceSummary]] = {}
+        self._summaries_lock = threading.Lock()
+        # Warm ConfigLoader + verdict cache for the framework round-trip
+        self._validator = FrameworkValidator(
+            lambda: settings.framework_src_path,
+            "bronze_framework.config.loader",
+            "_parse_source",
+            cache_size=settings.validation_cache_size,
+            process_workers=settings.validation_process_workers,
+        )
 
     @property
     def sources_dir(self) -> Path:
@@ -35,52 +56,144 @@ class ConfigService:
         enabled: Optional[bool] = None,
     ) -> List[SourceSummary]:
         sources: List[SourceSummary] = []
-        if not self.sources_dir.exists():
-            return sources
-
-        for yaml_file in sorted(self.sources_dir.glob("*.yaml")):
-            try:
-                data = self._read_yaml(yaml_file)
-            except Exception:
-                continue
-
-            if source_type and data.get("source_type") != source_type:
+        for s in self._summary_index():
+            if source_type and s.source_type.value != source_type:
                 continue
-            if domain and data.get("tags", {}).get("domain") != domain:
+            if domain and s.tags.get("domain") != domain:
                 continue
-            if enabled is not None and data.get("enabled", True) != enabled:
+            if enabled is not None and s.enabled != enabled:
                 continue
-
-            target = data.get("target", {})
-            cdc = target.get("cdc", {})
-            schedule = data.get("schedule", {})
-
-            sources.append(
-                SourceSummary(
-                    name=data.get("name", yaml_file.stem),
-                    source_type=SourceType(data.get("source_type", "file")),
-                    description=data.get("description", ""),
-                    enabled=data.get("enabled", True),
-                    tags=data.get("tags", {}),
-                    target_table=f"{target.get('catalog', '')}.{target.get('schema', 'bronze')}.{target.get('table', '')}",
-                    cdc_mode=CdcMode(cdc.get("mode", "append")),
-                    load_type=LoadType(data.get("extract", {}).get("load_type", "full")),
-                    schedule=schedule.get("cron_expression"),
-                )
-            )
+            sources.append(s)
         return sources
 
-    def get_source(self, name: str) -> Optional[SourceDetail]:
-        yaml_path = self._source_path(name)
-        if not yaml_path.exists():
-            return None
+    def query_sources(
+        self,
+        source_type: Optional[str] = None,
+        domain: Optional[str] = None,
+        enabled: Optional[bool] = None,
+        tag_key: Optional[str] = None,
+        tag_value: Optional[str] = None,
+        cdc_mode: Optional[str] = None,
+        load_type: Optional[str] = None,
+        has_schedule: Optional[bool] = None,
+        name_prefix: Optional[str] = None,
+        sort: str = "name",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[SourceSummary], int, Optional[str]]:
+        """Filter, sort and keyset-paginate the source index.
+
+        Returns ``(page, total, next_cursor)`` where ``total`` counts every
+        match and ``next_cursor`` is None on the last page. Raises ValueError
+        for an unknown sort field or a cursor issued for a different sort.
+        """
+        descending = sort.startswith("-")
+        field = sort.lstrip("-")
+        if field not in SOURCE_SORT_FIELDS:
+            raise ValueError(
+                f"Invalid sort '{sort}' — expected one of {', '.join(SOURCE_SORT_FIELDS)}"
+            )
 
+        matches: List[SourceSummary] = []
+        for s in self.list_sources(source_type=source_type, domain=domain, enabled=enabled):
+            if tag_key is not None:
+                if tag_key not in s.tags:
+                    continue
+                if tag_value is not None and s.tags[tag_key] != tag_value:
+                    continue
+            elif tag_value is not None and tag_value not in s.tags.values():
+                continue
+            if cdc_mode and s.cdc_mode.value != cdc_mode:
+                continue
+            if load_type and s.load_type.value != load_type:
+                continue
+            if has_schedule is not None and bool(s.schedule) != has_schedule:
+                continue
+            if name_prefix and not s.name.startswith(name_prefix):
+                continue
+            matches.append(s)
+
+        matches.sort(key=lambda s: self._sort_key(s, field), reverse=descending)
+        total = len(matches)
+
+        if cursor:
+            after = self._decode_cursor(cursor, sort)
+            if descending:
+                matches = [s for s in matches if self._sort_key(s, field) < after]
+            else:
+                matches = [s for s in matches if self._sort_key(s, field) > after]
+
+        if limit is None or len(matches) <= limit:
+            return matches, total, None
+        page = matches[:limit]
+        return page, total, self._encode_cursor(self._sort_key(page[-1], field), sort)
+
+    @staticmethod
+    def _sort_key(summary: SourceSummary, field: str) -> Tuple[str, str]:
+        value = getattr(summary, field)
+        if hasattr(value, "value"):
+            value = value.value
+        # Name breaks ties so the keyset is total
+        return (value or "", summary.name)
+
+    @staticmethod
+    def _encode_cursor(key: Tuple[str, str], sort: str) -> str:
+        raw = json.dumps({"sort": sort, "after": list(key)}).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort: str) -> Tuple[str, str]:
         try:
-            data = self._read_yaml(yaml_path)
-            raw_yaml = yaml_path.read_text(encoding="utf-8")
-        except OSError:
-            # File was deleted concurrently between exists() check and read
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            after = payload["after"]
+            key = (str(after[0]), str(after[1]))
+        except Exception:
+            raise ValueError("Invalid cursor")
+        if payload.get("sort") != sort:
+            raise ValueError("Cursor was issued for a different sort order")
+        return key
+
+    def _summary_index(self) -> List[SourceSummary]:
+        """SourceSummary per parseable file (filename order), rebuilt per file on change."""
+        docs = self._catalog.entries()
+        out: List[SourceSummary] = []
+        with self._summaries_lock:
+            live = set()
+            for doc in docs:
+                live.add(doc.path)
+                cached = self._summaries.get(doc.path)
+                if cached is None or cached[0] != doc.signature:
+                    cached = (doc.signature, self._summarise(doc.data, doc.path))
+                    self._summaries[doc.path] = cached
+                out.append(cached[1])
+            for path in [p for p in self._summaries if p not in live]:
+                del self._summaries[path]
+        return out
+
+    @staticmethod
+    def _summarise(data: Dict[str, Any], yaml_file: Path) -> SourceSummary:
+        target = data.get("target", {})
+        cdc = target.get("cdc", {})
+        schedule = data.get("schedule", {})
+        return SourceSummary(
+            name=data.get("name", yaml_file.stem),
+            source_type=SourceType(data.get("source_type", "file")),
+            description=data.get("description", ""),
+            enabled=data.get("enabled", True),
+            tags=data.get("tags", {}),
+            target_table=f"{target.get('catalog', '')}.{target.get('schema', 'bronze')}.{target.get('table', '')}",
+            cdc_mode=CdcMode(cdc.get("mode", "append")),
+            load_type=LoadType(data.get("extract", {}).get("load_type", "full")),
+            schedule=schedule.get("cron_expression"),
+        )
+
+    def get_source(self, name: str) -> Optional[SourceDetail]:
+        doc = self._catalog.get(name)
+        if doc is None:
             return None
+        # Cached dicts are shared — never hand them out for mutation
+        data = copy.deepcopy(doc.data)
+        raw_yaml = doc.raw
 
         return SourceDetail(
             name=data.get("name", name),
@@ -95,6 +208,27 @@ class ConfigService:
             raw_yaml=raw_yaml,
         )
 
+    def sources_version(self, name: Optional[str] = None) -> Optional[str]:
+        """Content digest of one source (None if missing), or of all sources."""
+        return self._catalog.version(name)
+
+    def schedules(self) -> Dict[str, Dict[str, Any]]:
+        """Source name → ``schedule`` block of every scheduled source.
+
+        Served from the parsed-YAML cache without building a SourceDetail
+        per source, so callers that only need schedules stay cheap.
+        """
+        out: Dict[str, Dict[str, Any]] = {}
+        for doc in self._catalog.entries():
+            schedule = doc.data.get("schedule")
+            if isinstance(schedule, dict) and schedule.get("cron_expression"):
+                out.setdefault(doc.data.get("name", doc.path.stem), dict(schedule))
+        return out
+
+    def source_paths(self) -> Dict[str, Path]:
+        """Source name → YAML file holding it (the file name may carry a prefix)."""
+        return self._catalog.paths()
+
     def source_exists(self, name: str) -> bool:
         return self._source_path(name).exists()
 
@@ -103,6 +237,7 @@ class ConfigService:
         yaml_path = self._source_path(req.name)
         yaml_path.parent.mkdir(parents=True, exist_ok=True)
         yaml_path.write_text(yaml_content, encoding="utf-8")
+        self._catalog.invalidate(yaml_path)
         return str(yaml_path)
 
     def update_source(self, name: str, req: SourceUpdateRequest) -> str:
@@ -147,6 +282,7 @@ class ConfigService:
         )
         yaml_content = self.render_yaml(full_req)
         yaml_path.write_text(yaml_content, encoding="utf-8")
+        self._catalog.invalidate(yaml_path)
         return str(yaml_path)
 
     def delete_source(self, name: str) -> bool:
@@ -158,6 +294,8 @@ class ConfigService:
             except OSError:
                 # File was deleted by a concurrent request — treat as not found
                 return False
+            finally:
+                self._catalog.invalidate(yaml_path)
         return False
 
     def render_yaml(self, req: SourceCreateRequest) -> str:
@@ -199,32 +337,26 @@ class ConfigService:
         if errors:
             return False, errors
 
-        # Try round-trip through framework parser
-        try:
-            yaml_content = self.render_yaml(req)
-            data = yaml.safe_load(yaml_content)
-            framework_src = str(settings.framework_src_path)
-            if framework_src not in sys.path:
-                sys.path.insert(0, framework_src)
-            from bronze_framework.config.loader import ConfigLoader
-            loader = ConfigLoader.__new__(ConfigLoader)
-            loader._parse_source(data)
-        except Exception as e:
-            errors.append(f"Framework validation failed: {str(e)}")
+        # Round-trip through the framework parser (cached by rendered YAML)
+        error = self._validator.validate(self.render_yaml(req))
+        if error is not None:
+            errors.append(f"Framework validation failed: {error}")
             return False, errors
 
         return True, []
 
+    def warm_validation(self) -> None:
+        """Load the framework ConfigLoader now rather than on the first validation."""
+        self._validator.warm()
+
+    def validation_stats(self) -> Dict[str, int]:
+        return self._validator.stats()
+
     def _source_path(self, name: str) -> Path:
-        # Try finding existing file with any prefix pattern
-        for yaml_file in self.sources_dir.glob("*.yaml"):
-            try:
-                data = self._read_yaml(yaml_file)
-            except OSError:
-                # File disappeared between glob() and read (concurrent delete)
-                continue
-            if data.get("name") == name:
-                return yaml_file
+        # Existing file with any prefix pattern, via the catalog's name index
+        yaml_path = self._catalog.path_for(name)
+        if yaml_path is not None:
+            return yaml_path
         # Default: use source_type prefix from name pattern or just name
         return self.sources_dir / f"{name}.yaml"
 
@@ -0,0 +1,176 @@
+"""Warm framework validation for portal-rendered YAML configs.
+
+``validate_config`` on the bronze and silver config services round-trips
+every rendered config through the framework's ``ConfigLoader``. Done from
+scratch that means a ``sys.path`` check, an import and a fresh loader per
+call — and AI tool loops re-validate near-identical configs many times per
+conversation.
+
+FrameworkValidator keeps one loader instance warm, memoizes verdicts by a
+SHA-256 of the rendered YAML (LRU, ``settings.validation_cache_size``), and
+can optionally run the parse in a small process pool
+(``settings.validation_process_workers``) so heavy framework imports never
+block request threads. Import failures are never cached, so fixing the
+framework checkout takes effect without a restart.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# (error text or None, cacheable) — import/setup failures are not cacheable
+_Verdict = Tuple[Optional[str], bool]
+
+
+def _load_loader(src_path: str, module: str) -> Any:
+    if src_path not in sys.path:
+        sys.path.insert(0, src_path)
+    loader_cls = importlib.import_module(module).ConfigLoader
+    # The framework's __init__ reads conf/ from disk; the parse methods don't need it
+    return loader_cls.__new__(loader_cls)
+
+
+def _parse(loader: Any, method: str, yaml_content: str) -> _Verdict:
+    try:
+        getattr(loader, method)(yaml.safe_load(yaml_content))
+    except Exception as e:
+        return str(e), True
+    return None, True
+
+
+# ── Process-pool worker side: one warm loader per (src_path, module) ──
+
+_worker_loaders: Dict[Tuple[str, str], Any] = {}
+
+
+def _worker_validate(src_path: str, module: str, method: str, yaml_content: str) -> _Verdict:
+    key = (src_path, module)
+    loader = _worker_loaders.get(key)
+    if loader is None:
+        try:
+            loader = _worker_loaders[key] = _load_loader(src_path, module)
+        except Exception as e:
+            return str(e), False
+    return _parse(loader, method, yaml_content)
+
+
+class FrameworkValidator:
+    """Validate rendered YAML through a framework ConfigLoader parse method.
+
+    ``src_path`` is a callable so the validator follows settings that are
+    resolved lazily (and patched per-test).
+    """
+
+    def __init__(
+        self,
+        src_path: Callable[[], Path],
+        module: str,
+        method: str,
+        cache_size: int = 512,
+        process_workers: int = 0,
+    ) -> None:
+        self._src_path = src_path
+        self._module = module
+        self._method = method
+        self._cache_size = cache_size
+        self._process_workers = process_workers
+        self._results: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loader: Any = None
+        self._loader_src: Optional[str] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._hits = 0
+        self._misses = 0
+
+    def validate(self, yaml_content: str) -> Optional[str]:
+        """Return None if the framework accepts ``yaml_content``, else the error text."""
+        key = hashlib.sha256(yaml_content.encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self._hits += 1
+                return self._results[key]
+            self._misses += 1
+
+        error, cacheable = self._run(yaml_content)
+        if cacheable and self._cache_size > 0:
+            with self._lock:
+                self._results[key] = error
+                self._results.move_to_end(key)
+                while len(self._results) > self._cache_size:
+                    self._results.popitem(last=False)
+        return error
+
+    def warm(self) -> None:
+        """Import the framework loader ahead of the first request (best effort)."""
+        try:
+            if self._process_workers > 0:
+                self._get_pool()
+            else:
+                self._get_loader()
+        except Exception as e:
+            logger.warning("Could not warm %s: %s", self._module, e)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "size": len(self._results)}
+
+    def clear(self) -> None:
+        """Drop cached verdicts and the warm loader (e.g. after a framework upgrade)."""
+        with self._lock:
+            self._results.clear()
+            self._loader = None
+            self._loader_src = None
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # ── Internals ───────────────────────────────────────────────────────────
+
+    def _run(self, yaml_content: str) -> _Verdict:
+        if self._process_workers > 0:
+            src = str(self._src_path())
+            try:
+                return self._get_pool().submit(
+                    _worker_validate, src, self._module, self._method, yaml_content
+                ).result()
+            except BrokenProcessPool:
+                logger.warning("Validation pool crashed; validating in-process")
+                self.shutdown()
+        try:
+            loader = self._get_loader()
+        except Exception as e:
+            return str(e), False
+        return _parse(loader, self._method, yaml_content)
+
+    def _get_loader(self) -> Any:
+        src = str(self._src_path())
+        with self._lock:
+            if self._loader is not None and self._loader_src == src:
+                return self._loader
+        loader = _load_loader(src, self._module)
+        with self._lock:
+            self._loader, self._loader_src = loader, src
+        return loader
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self._process_workers)
+            return self._pool
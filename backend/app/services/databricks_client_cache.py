@@ -0,0 +1,194 @@
+"""Per-tenant cache of DatabricksService instances and their credentials.
+
+Every Databricks-touching request needs the tenant's credentials (a SQLite
+read) and a ``DatabricksService`` whose ``WorkspaceClient`` costs hundreds
+of milliseconds to build (auth + HTTP session setup). This cache keeps both:
+
+- Credentials per tenant for ``settings.databricks_credentials_ttl_seconds``
+  (a tenant without credentials is cached too). Changing credentials
+  through the API calls ``invalidate()``, which also drops the tenant's
+  job-id registry entries, cached SQL results and synced run history, since
+  all of them may belong to the previous workspace; other writers are picked up when the TTL
+  expires.
+- One service per tenant, LRU-bounded by ``settings.databricks_client_cache_size``
+  and expiring after ``settings.databricks_client_cache_ttl_seconds``. The
+  entry is tied to a fingerprint of the credentials, so rotated
+  credentials rebuild the client.
+- A hit in the last ``databricks_client_refresh_ahead_pct`` percent of an
+  entry's lifetime rebuilds it on a background thread. The caller gets the
+  current instance straight away, so busy tenants never pay a cold build.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from app.config import settings
+from app.services.databricks_service import DatabricksService
+from app.services.job_registry import get_job_registry
+from app.services.query_cache import query_cache
+from app.services.run_history_store import get_run_history_store
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def _fingerprint(creds: dict) -> str:
+    # Hash rather than keep the token literal in the key, so it cannot leak via repr
+    raw = "\0".join((creds["host"], creds["token"], creds["warehouse_id"]))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _ServiceEntry:
+    fingerprint: str
+    creds: dict
+    service: DatabricksService
+    created_at: float
+
+
+class DatabricksClientCache:
+    """Thread-safe LRU + TTL cache keyed by tenant id."""
+
+    def __init__(self) -> None:
+        self._services: "OrderedDict[str, _ServiceEntry]" = OrderedDict()
+        self._credentials: Dict[str, Tuple[Optional[dict], float]] = {}
+        self._lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        self._refresher: Optional[ThreadPoolExecutor] = None
+        self._counters = dict.fromkeys(
+            ("hits", "misses", "evictions", "expirations", "refreshes",
+             "credential_hits", "credential_misses"),
+            0,
+        )
+
+    # ── Credentials ─────────────────────────────────────────────────────────
+
+    def credentials(self, tenant_id: str, load: Callable[[str], Optional[dict]]) -> Optional[dict]:
+        """The tenant's credentials, from cache or ``load(tenant_id)``."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._credentials.get(tenant_id, _MISSING)
+            if cached is not _MISSING and now - cached[1] < settings.databricks_credentials_ttl_seconds:
+                self._counters["credential_hits"] += 1
+                return cached[0]
+            self._counters["credential_misses"] += 1
+        creds = load(tenant_id)
+        with self._lock:
+            self._credentials[tenant_id] = (creds, now)
+        return creds
+
+    # ── Services ────────────────────────────────────────────────────────────
+
+    def service(self, tenant_id: str, creds: Optional[dict]) -> DatabricksService:
+        """A cached DatabricksService for ``creds``, building one on a miss."""
+        if creds is None:
+            # Unavailable instance — pass None for everything so available == False.
+            return DatabricksService(host=None, token=None, warehouse_id=None)
+
+        fingerprint = _fingerprint(creds)
+        ttl = settings.databricks_client_cache_ttl_seconds
+        now = time.monotonic()
+        with self._lock:
+            entry = self._services.get(tenant_id)
+            if entry is not None and entry.fingerprint == fingerprint:
+                age = now - entry.created_at
+                if age < ttl:
+                    self._services.move_to_end(tenant_id)
+                    self._counters["hits"] += 1
+                    if age >= ttl * (1 - settings.databricks_client_refresh_ahead_pct / 100):
+                        self._schedule_refresh(tenant_id)
+                    return entry.service
+                self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+
+        service = self._build(tenant_id, creds)
+        self._store(tenant_id, _ServiceEntry(fingerprint, creds, service, time.monotonic()))
+        return service
+
+    def invalidate(self, tenant_id: str) -> None:
+        """Forget a tenant's credentials and service (after they change).
+
+        Job ids, cached SQL results and synced run history are keyed by
+        tenant, not workspace, so they are dropped too — a job id from the old
+        workspace could name an unrelated job in the new one, and the old
+        audit rows and watermarks would hide the new workspace's runs.
+        """
+        with self._lock:
+            self._credentials.pop(tenant_id, None)
+            self._services.pop(tenant_id, None)
+        get_job_registry().clear(tenant_id)
+        query_cache.clear(tenant_id)
+        get_run_history_store().clear(tenant_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._credentials.clear()
+            self._services.clear()
+            for key in self._counters:
+                self._counters[key] = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counters, "size": len(self._services)}
+
+    # ── Internals ───────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _build(tenant_id: str, creds: dict) -> DatabricksService:
+        return DatabricksService(
+            host=creds["host"],
+            token=creds["token"],
+            warehouse_id=creds["warehouse_id"],
+            tenant_id=tenant_id,
+        )
+
+    def _store(self, tenant_id: str, entry: _ServiceEntry) -> None:
+        limit = max(1, settings.databricks_client_cache_size)
+        with self._lock:
+            self._services[tenant_id] = entry
+            self._services.move_to_end(tenant_id)
+            while len(self._services) > limit:
+                self._services.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def _schedule_refresh(self, tenant_id: str) -> None:
+        """Queue a background rebuild (caller holds the lock)."""
+        if tenant_id in self._refreshing:
+            return
+        self._refreshing.add(tenant_id)
+        if self._refresher is None:
+            self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="dbx-client-refresh")
+        self._refresher.submit(self._refresh, tenant_id)
+
+    def _refresh(self, tenant_id: str) -> None:
+        try:
+            with self._lock:
+                entry = self._services.get(tenant_id)
+            if entry is None:
+                return
+            service = self._build(tenant_id, entry.creds)
+            with self._lock:
+                current = self._services.get(tenant_id)
+                # Only swap if credentials didn't change while we were building
+                if current is not None and current.fingerprint == entry.fingerprint:
+                    self._services[tenant_id] = _ServiceEntry(
+                        entry.fingerprint, entry.creds, service, time.monotonic(),
+                    )
+                    self._counters["refreshes"] += 1
+        except Exception as e:
+            logger.warning("Background Databricks client refresh failed for %s: %s", tenant_id, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(tenant_id)
+
+
+databricks_clients = DatabricksClientCache()
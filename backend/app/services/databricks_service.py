@@ -2,13 +2,82 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
 
 from app.config import settings
+from app.services.job_registry import get_job_registry, portal_job_name
+from app.services.query_cache import query_cache, resolve_table_name
+from app.services.run_watcher import get_run_watcher
+from app.services.warehouse_warmer import warehouse_warmer
+from app.services.yaml_catalog import YamlDocCache
 
 logger = logging.getLogger(__name__)
 
+_PENDING_STATES = ("PENDING", "RUNNING")
+_COLD_STATES = ("STOPPED", "STOPPING", "STARTING")  # warehouse states worth waiting out
+
+JOB_TASK_TIMEOUT_SECONDS = 7200  # per ingestion task attempt
+# A triggered run may retry its task once; watch it that long before giving up
+JOB_RUN_WATCH_SECONDS = 2 * JOB_TASK_TIMEOUT_SECONDS
+
+_environment_docs = YamlDocCache()
+
+
+def environment_variables(environment: str) -> Dict[str, Any]:
+    """Variables of ``environments/<environment>.yaml`` ({} when missing or invalid)."""
+    doc = _environment_docs.load(settings.environments_dir / f"{environment}.yaml")
+    return dict(doc.data) if doc is not None and doc.error is None else {}
+
+
+def bronze_run_tables(catalog: str, schema: str, table: str) -> List[str]:
+    """Tables a Bronze ingestion run writes: target, audit log and dead letters."""
+    return [
+        ".".join(filter(None, (catalog, schema, table))),
+        ".".join(filter(None, (catalog, "bronze_meta.ingestion_audit_log"))),
+        ".".join(filter(None, (catalog, f"bronze_meta.dead_letter_{table}"))) if table else "",
+    ]
+
+
+@dataclass
+class SqlChunk:
+    """One result chunk of a SQL statement — column names plus row-major values."""
+    columns: List[str]
+    rows: List[List[Any]]
+
+
+@dataclass
+class StatementResult:
+    """Outcome of one statement run via ``query_many`` — errors are captured, not raised."""
+    sql: str
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# warehouse_id -> slots shared by every DatabricksService instance (and tenant)
+_warehouse_slots: Dict[str, threading.BoundedSemaphore] = {}
+_warehouse_slots_lock = threading.Lock()
+
+
+def _warehouse_slot(warehouse_id: str) -> threading.BoundedSemaphore:
+    with _warehouse_slots_lock:
+        slot = _warehouse_slots.get(warehouse_id)
+        if slot is None:
+            slot = threading.BoundedSemaphore(max(1, settings.databricks_sql_max_concurrency))
+            _warehouse_slots[warehouse_id] = slot
+        return slot
+
 
 class DatabricksService:
     """Per-tenant wrapper over the Databricks SDK.
@@ -20,6 +89,10 @@ class DatabricksService:
     The constructor falls back to env-var settings only when ALL three
     arguments are None. This preserves backward compatibility for tests and
     legacy callers that rely on the singleton-with-env behaviour.
+
+    Read-only statements are served from the shared ``query_cache`` when
+    possible, and portal job ids are resolved through the persistent job
+    registry; ``tenant_id`` scopes both.
     """
 
     def __init__(
@@ -27,6 +100,7 @@ class DatabricksService:
         host: Optional[str] = None,
         token: Optional[str] = None,
         warehouse_id: Optional[str] = None,
+        tenant_id: Optional[str] = None,
     ) -> None:
         # Back-compat: when no arguments at all, use env-var settings.
         if host is None and token is None and warehouse_id is None:
@@ -37,6 +111,7 @@ class DatabricksService:
         self._host = host
         self._token = token
         self._warehouse_id = warehouse_id
+        self._scope = tenant_id or f"{host}|{warehouse_id}"
         self._client = None
         if host and token:
             try:
@@ -49,6 +124,11 @@ class DatabricksService:
     def available(self) -> bool:
         return self._client is not None
 
+    @property
+    def scope(self) -> str:
+        """Key of this tenant / workspace in the portal's local caches and stores."""
+        return self._scope
+
     @property
     def warehouse_id(self) -> Optional[str]:
         """The active warehouse_id — for callers that previously read settings directly."""
@@ -96,165 +176,630 @@ class DatabricksService:
     ) -> Optional[str]:
         if not self.available:
             return None
+        try:
+            job_clusters, task = self._ingestion_task(source_name, environment, "run_source")
+            tags = {"team": "data-engineering", "layer": "bronze", "source": source_name}
+            return self._upsert_job(
+                "bronze", source_name, environment,
+                job_clusters=job_clusters, tasks=[task], schedule=schedule, tags=tags,
+            )
+        except Exception as e:
+            logger.error("Job create/update failed: %s", e)
+            raise RuntimeError(f"Job create/update failed: {e}") from e
 
-        job_name = f"bronze_portal_{source_name}_{environment}"
+    def create_or_update_pack_job(
+        self, pack_name: str, environment: str, source_names: Sequence[str], schedule: Dict,
+    ) -> Optional[str]:
+        """One multi-task job running every source in ``source_names`` concurrently.
 
+        All tasks share a single job cluster (or the configured existing
+        cluster), so a pack of small sources pays for one cluster start
+        instead of one per source. Task keys are the source names.
+        """
+        if not self.available:
+            return None
         try:
-            from databricks.sdk.service.jobs import (
-                CronSchedule,
-                JobCluster,
-                JobSettings,
-                NotebookTask,
-                PauseStatus,
-                Task,
+            job_clusters: List[Any] = []
+            tasks = []
+            for name in sorted(source_names):
+                job_clusters, task = self._ingestion_task(
+                    name, environment, name, max_workers=settings.databricks_pack_max_workers,
+                )
+                tasks.append(task)
+            tags = {"team": "data-engineering", "layer": "bronze", "pack": pack_name}
+            return self._upsert_job(
+                "bronze", pack_name, environment,
+                job_clusters=job_clusters, tasks=tasks, schedule=schedule, tags=tags,
             )
-            from databricks.sdk.service.compute import Library
+        except Exception as e:
+            logger.error("Pack job create/update failed: %s", e)
+            raise RuntimeError(f"Pack job create/update failed: {e}") from e
 
-            existing = self._find_job(job_name)
+    def create_or_update_dag_job(
+        self,
+        dag_name: str,
+        environment: str,
+        tasks: Sequence[Any],
+        schedule: Optional[Dict],
+        trigger_tables: Sequence[str] = (),
+    ) -> Optional[str]:
+        """Multi-task Silver job: Bronze and Silver tasks wired by ``depends_on``.
 
-            notebook_task = NotebookTask(
-                notebook_path=f"{settings.databricks_workspace_path}/notebooks/02_run_single_source.py",
+        ``tasks`` are ``silver_dag.DagTask`` items. Every task runs on one
+        shared job cluster (or the configured existing cluster), and tasks
+        with no path between them run concurrently. With ``trigger_tables``
+        a scheduled job starts once all of them have been updated instead of
+        on its cron (keeping the schedule's pause status).
+        """
+        if not self.available:
+            return None
+        try:
+            from databricks.sdk.service.jobs import TaskDependency
+
+            job_clusters: List[Any] = []
+            sdk_tasks = []
+            for dag_task in tasks:
+                if dag_task.kind == "bronze":
+                    job_clusters, task = self._ingestion_task(
+                        dag_task.name, environment, dag_task.key,
+                        max_workers=settings.databricks_pack_max_workers,
+                    )
+                else:
+                    job_clusters, task = self._silver_entity_task(
+                        dag_task.name, environment, dag_task.key,
+                        max_workers=settings.databricks_pack_max_workers,
+                    )
+                task.depends_on = [TaskDependency(task_key=k) for k in dag_task.depends_on] or None
+                sdk_tasks.append(task)
+            tags = {"team": "data-engineering", "layer": "silver", "dag": dag_name}
+            trigger_tables = [t for t in self._resolve_tables(trigger_tables) if t.count(".") == 2]
+            return self._upsert_job(
+                "silver", dag_name, environment,
+                job_clusters=job_clusters, tasks=sdk_tasks, schedule=schedule, tags=tags,
+                trigger_tables=trigger_tables,
+            )
+        except Exception as e:
+            logger.error("DAG job create/update failed: %s", e)
+            raise RuntimeError(f"DAG job create/update failed: {e}") from e
+
+    def _silver_entity_task(
+        self, entity_name: str, environment: str, task_key: str, max_workers: int = 4,
+    ) -> tuple[List[Any], Any]:
+        """(job_clusters, task) running the single-entity Silver notebook."""
+        from databricks.sdk.service.compute import Library
+        from databricks.sdk.service.jobs import NotebookTask, Task
+
+        root = settings.databricks_silver_workspace_path
+        job_clusters = self._shared_job_clusters(max_workers)
+        task = Task(
+            task_key=task_key,
+            notebook_task=NotebookTask(
+                notebook_path=f"{root}/notebooks/02_run_single_entity",
                 base_parameters={
                     "environment": environment,
-                    "source_file": f"{source_name}.yaml",
-                    "conf_dir": f"{settings.databricks_workspace_path}/conf",
+                    "entity_file": f"{entity_name}.yaml",
+                    "conf_dir": f"{root}/conf",
                 },
-            )
-
-            libraries = [
-                Library(whl=f"{settings.databricks_workspace_path}/dist/bronze_framework-1.0.0-py3-none-any.whl")
-            ]
-
-            # Prefer existing cluster (avoids new-cluster provisioning which requires Azure VM quota).
-            # Set DATABRICKS_CLUSTER_ID in .env to use an existing interactive/all-purpose cluster.
-            if settings.databricks_cluster_id:
-                task = Task(
-                    task_key="run_source",
-                    existing_cluster_id=settings.databricks_cluster_id,
-                    notebook_task=notebook_task,
-                    libraries=libraries,
-                    timeout_seconds=7200,
-                    max_retries=1,
-                )
-                job_clusters = []
-                logger.info("Job will run on existing cluster %s", settings.databricks_cluster_id)
-            else:
-                job_cluster = JobCluster(
-                    job_cluster_key="ingestion_cluster",
-                    new_cluster={
-                        "spark_version": settings.databricks_spark_version,
-                        "node_type_id": settings.databricks_node_type_id,
-                        "num_workers": 2,
-                        "autoscale": {"min_workers": 1, "max_workers": 4},
-                        "spark_conf": {
-                            "spark.databricks.delta.schema.autoMerge.enabled": "true",
-                            "spark.sql.streaming.schemaInference": "true",
-                        },
-                        "data_security_mode": "USER_ISOLATION",
-                    },
-                )
-                if settings.databricks_cluster_policy_id:
-                    job_cluster.new_cluster["policy_id"] = settings.databricks_cluster_policy_id
-                task = Task(
-                    task_key="run_source",
-                    job_cluster_key="ingestion_cluster",
-                    notebook_task=notebook_task,
-                    libraries=libraries,
-                    timeout_seconds=7200,
-                    max_retries=1,
-                )
-                job_clusters = [job_cluster]
-                logger.warning(
-                    "No DATABRICKS_CLUSTER_ID set — job will provision a new cluster on each run"
-                )
+            ),
+            libraries=[Library(whl=f"{root}/dist/silver_framework-1.0.0-py3-none-any.whl")],
+        )
+        if job_clusters:
+            task.job_cluster_key = "ingestion_cluster"
+        else:
+            task.existing_cluster_id = settings.databricks_cluster_id
+        return job_clusters, task
+
+    def _shared_job_clusters(self, max_workers: int) -> List[Any]:
+        """The autoscaling ``ingestion_cluster`` spec, or [] with an existing cluster."""
+        from databricks.sdk.service.compute import ClusterSpec
+        from databricks.sdk.service.jobs import JobCluster
+
+        if settings.databricks_cluster_id:
+            return []
+        new_cluster = {
+            "spark_version": settings.databricks_spark_version,
+            "node_type_id": settings.databricks_node_type_id,
+            "num_workers": 2,
+            "autoscale": {"min_workers": 1, "max_workers": max_workers},
+            "spark_conf": {
+                "spark.databricks.delta.schema.autoMerge.enabled": "true",
+                "spark.sql.streaming.schemaInference": "true",
+            },
+            "data_security_mode": "USER_ISOLATION",
+        }
+        if settings.databricks_cluster_policy_id:
+            new_cluster["policy_id"] = settings.databricks_cluster_policy_id
+        # The SDK serializes new_cluster with as_dict(), so it must be a ClusterSpec
+        return [JobCluster(job_cluster_key="ingestion_cluster", new_cluster=ClusterSpec.from_dict(new_cluster))]
+
+    def _ingestion_task(
+        self, source_name: str, environment: str, task_key: str, max_workers: int = 4,
+    ) -> tuple[List[Any], Any]:
+        """(job_clusters, task) running the single-source notebook for one source."""
+        from databricks.sdk.service.compute import Library
+        from databricks.sdk.service.jobs import NotebookTask, Task
+
+        notebook_task = NotebookTask(
+            notebook_path=f"{settings.databricks_workspace_path}/notebooks/02_run_single_source.py",
+            base_parameters={
+                "environment": environment,
+                "source_file": f"{source_name}.yaml",
+                "conf_dir": f"{settings.databricks_workspace_path}/conf",
+            },
+        )
+
+        libraries = [
+            Library(whl=f"{settings.databricks_workspace_path}/dist/bronze_framework-1.0.0-py3-none-any.whl")
+        ]
 
+        # Prefer existing cluster (avoids new-cluster provisioning which requires Azure VM quota).
+        # Set DATABRICKS_CLUSTER_ID in .env to use an existing interactive/all-purpose cluster.
+        if settings.databricks_cluster_id:
+            task = Task(
+                task_key=task_key,
+                existing_cluster_id=settings.databricks_cluster_id,
+                notebook_task=notebook_task,
+                libraries=libraries,
+                timeout_seconds=JOB_TASK_TIMEOUT_SECONDS,
+                max_retries=1,
+            )
+            logger.info("Job will run on existing cluster %s", settings.databricks_cluster_id)
+            return [], task
+
+        job_clusters = self._shared_job_clusters(max_workers)
+        task = Task(
+            task_key=task_key,
+            job_cluster_key="ingestion_cluster",
+            notebook_task=notebook_task,
+            libraries=libraries,
+            timeout_seconds=JOB_TASK_TIMEOUT_SECONDS,
+            max_retries=1,
+        )
+        logger.warning(
+            "No DATABRICKS_CLUSTER_ID set — job will provision a new cluster on each run"
+        )
+        return job_clusters, task
+
+    def _upsert_job(
+        self,
+        layer: str,
+        name: str,
+        environment: str,
+        job_clusters: List[Any],
+        tasks: List[Any],
+        schedule: Optional[Dict],
+        tags: Dict[str, str],
+        trigger_tables: Sequence[str] = (),
+    ) -> str:
+        """Update the portal job for (layer, name, environment), creating it if missing.
+
+        A scheduled job with ``trigger_tables`` gets a table-update trigger
+        in place of its cron. A registry id that turns out to be stale is
+        dropped and the job is re-resolved by name before a new one is created.
+        """
+        from databricks.sdk.service.jobs import (
+            Condition,
+            CronSchedule,
+            JobSettings,
+            PauseStatus,
+            TableUpdateTriggerConfiguration,
+            TriggerSettings,
+        )
+
+        job_name = portal_job_name(layer, name, environment)
+
+        cron_schedule = None
+        if schedule and schedule.get("cron_expression"):
+            cron_schedule = CronSchedule(
+                quartz_cron_expression=schedule["cron_expression"],
+                timezone_id=schedule.get("timezone", "UTC"),
+                pause_status=PauseStatus(schedule.get("pause_status", "UNPAUSED")),
+            )
+        trigger = None
+        if cron_schedule and trigger_tables:
+            trigger = TriggerSettings(
+                table_update=TableUpdateTriggerConfiguration(
+                    table_names=list(trigger_tables), condition=Condition.ALL_UPDATED,
+                ),
+                pause_status=cron_schedule.pause_status,
+            )
             cron_schedule = None
-            if schedule and schedule.get("cron_expression"):
-                cron_schedule = CronSchedule(
-                    quartz_cron_expression=schedule["cron_expression"],
-                    timezone_id=schedule.get("timezone", "UTC"),
-                    pause_status=PauseStatus(schedule.get("pause_status", "UNPAUSED")),
-                )
 
-            if existing:
+        for _ in range(2):
+            existing = self.find_job_id(layer, name, environment)
+            if not existing:
+                break
+            try:
                 self._client.jobs.update(
                     job_id=existing,
                     new_settings=JobSettings(
                         name=job_name,
                         job_clusters=job_clusters,
-                        tasks=[task],
+                        tasks=tasks,
                         schedule=cron_schedule,
-                        tags={"team": "data-engineering", "layer": "bronze", "source": source_name},
+                        trigger=trigger,
+                        tags=tags,
                     ),
                 )
                 logger.info("Updated job %s (id=%s)", job_name, existing)
                 return str(existing)
-            else:
-                result = self._client.jobs.create(
-                    name=job_name,
-                    job_clusters=job_clusters,
-                    tasks=[task],
-                    schedule=cron_schedule,
-                    tags={"team": "data-engineering", "layer": "bronze", "source": source_name},
-                )
-                logger.info("Created job %s (id=%s)", job_name, result.job_id)
-                return str(result.job_id)
-        except Exception as e:
-            logger.error("Job create/update failed: %s", e)
-            raise RuntimeError(f"Job create/update failed: {e}") from e
+            except Exception as e:
+                if not is_missing_job_error(e):
+                    raise
+                # Deleted in the workspace behind our back — re-resolve by name
+                # first, in case another process has already recreated it
+                logger.warning("Job %s (id=%s) no longer exists; re-resolving", job_name, existing)
+                self.forget_job(layer, name, environment)
+
+        result = self._client.jobs.create(
+            name=job_name,
+            job_clusters=job_clusters,
+            tasks=tasks,
+            schedule=cron_schedule,
+            trigger=trigger,
+            tags=tags,
+        )
+        self.remember_job(layer, name, environment, result.job_id)
+        logger.info("Created job %s (id=%s)", job_name, result.job_id)
+        return str(result.job_id)
 
     def trigger_job(self, source_name: str, environment: str) -> Optional[str]:
+        return self.run_job_now("bronze", source_name, environment)
+
+    def delete_job(self, source_name: str, environment: str) -> bool:
+        return self.delete_job_by_key("bronze", source_name, environment)
+
+    # ── Job id resolution (registry first, name scan as fallback) ───────────
+
+    def find_job_id(self, layer: str, name: str, environment: str) -> Optional[int]:
+        """Job id for a portal job, from the registry or — on a miss — a name scan."""
         if not self.available:
             return None
+        registry = get_job_registry()
+        job_id = registry.get(self._scope, layer, name, environment)
+        if job_id is not None:
+            return job_id
+        job_id = self._find_job(portal_job_name(layer, name, environment))
+        if job_id is not None:
+            registry.put(self._scope, layer, name, environment, job_id)
+        return job_id
+
+    def remember_job(self, layer: str, name: str, environment: str, job_id: Any) -> None:
+        try:
+            get_job_registry().put(self._scope, layer, name, environment, int(job_id))
+        except (TypeError, ValueError):
+            logger.warning("Not recording non-numeric job id %r for %s", job_id, name)
 
-        job_name = f"bronze_portal_{source_name}_{environment}"
-        job_id = self._find_job(job_name)
-        if not job_id:
-            logger.error("Job %s not found", job_name)
-            return None
+    def forget_job(self, layer: str, name: str, environment: str) -> None:
+        get_job_registry().remove(self._scope, layer, name, environment)
 
-        try:
-            run = self._client.jobs.run_now(job_id=job_id)
-            logger.info("Triggered run %s for job %s", run.run_id, job_name)
-            return str(run.run_id)
-        except Exception as e:
-            logger.error("Job trigger failed: %s", e)
+    def run_job_now(
+        self, layer: str, name: str, environment: str, only: Optional[List[str]] = None,
+    ) -> Optional[str]:
+        """Trigger a portal job; returns the run id, or None if missing/failed.
+
+        ``only`` restricts the run to those task keys (one source of a packed
+        job). A registry id that turns out to be stale is dropped and the job
+        is re-resolved by name once before giving up.
+        """
+        if not self.available:
             return None
+        job_name = portal_job_name(layer, name, environment)
+        for attempt in range(2):
+            job_id = self.find_job_id(layer, name, environment)
+            if not job_id:
+                logger.error("Job %s not found", job_name)
+                return None
+            try:
+                if only:
+                    run = self._client.jobs.run_now(job_id=job_id, only=only)
+                else:
+                    run = self._client.jobs.run_now(job_id=job_id)
+                logger.info("Triggered run %s for job %s", run.run_id, job_name)
+                return str(run.run_id)
+            except Exception as e:
+                if attempt == 0 and is_missing_job_error(e):
+                    logger.warning("Stale job id %s for %s; re-resolving", job_id, job_name)
+                    self.forget_job(layer, name, environment)
+                    continue
+                logger.error("Job trigger failed: %s", e)
+                return None
+        return None
 
-    def delete_job(self, source_name: str, environment: str) -> bool:
+    def delete_job_by_key(self, layer: str, name: str, environment: str) -> bool:
         if not self.available:
             return False
-
-        job_name = f"bronze_portal_{source_name}_{environment}"
-        job_id = self._find_job(job_name)
+        job_name = portal_job_name(layer, name, environment)
+        job_id = self.find_job_id(layer, name, environment)
         if not job_id:
             return True  # already gone
 
         try:
             self._client.jobs.delete(job_id=job_id)
             logger.info("Deleted job %s (id=%s)", job_name, job_id)
-            return True
         except Exception as e:
-            logger.error("Job deletion failed: %s", e)
+            if not is_missing_job_error(e):
+                logger.error("Job deletion failed: %s", e)
+                return False
+        self.forget_job(layer, name, environment)
+        return True
+
+    def registered_jobs(self, layer: str) -> List[Dict[str, Any]]:
+        """Registry entries (name, environment, job_id, ...) for this tenant's ``layer`` jobs."""
+        return [e for e in get_job_registry().entries(self._scope) if e["layer"] == layer]
+
+    def reconcile_jobs(self) -> int:
+        """Rebuild this tenant's registry from one bulk ``jobs.list`` pass."""
+        if not self.available:
+            return 0
+        jobs = (
+            (getattr(job.settings, "name", None), job.job_id)
+            for job in self._client.jobs.list()
+        )
+        count = get_job_registry().reconcile(self._scope, jobs)
+        logger.info("Job registry reconciled for %s: %d portal jobs", self._scope, count)
+        return count
+
+    # ── SQL warehouse lifecycle ─────────────────────────────────────────────
+
+    def warehouse_state(self) -> Optional[str]:
+        """RUNNING / STARTING / STOPPED / STOPPING / DELETED, or None if unknown."""
+        if not self.available or not self._warehouse_id:
+            return None
+        try:
+            state = self._client.warehouses.get(id=self._warehouse_id).state
+        except Exception as e:
+            logger.warning("Could not read warehouse %s state: %s", self._warehouse_id, e)
+            return None
+        state = getattr(state, "value", state)
+        warehouse_warmer.observe(self._scope, state)
+        return state
+
+    def start_warehouse(self) -> bool:
+        """Ask the warehouse to start without waiting; False if the call failed."""
+        if not self.available or not self._warehouse_id:
             return False
+        try:
+            self._client.warehouses.start(id=self._warehouse_id)
+        except Exception as e:
+            logger.warning("Could not start warehouse %s: %s", self._warehouse_id, e)
+            return False
+        logger.info("Starting SQL warehouse %s", self._warehouse_id)
+        warehouse_warmer.observe(self._scope, "STARTING")
+        return True
+
+    def wait_for_warehouse(self, timeout: Optional[int] = None) -> Optional[str]:
+        """Start the warehouse if it is stopped and wait up to ``timeout`` s for RUNNING.
+
+        Returns the last observed state (RUNNING on success).
+        """
+        if timeout is None:
+            timeout = settings.warehouse_start_timeout
+        deadline = time.monotonic() + timeout
+        delay = 1.0
+        state = self.warehouse_state()
+        while state != "RUNNING":
+            if state in ("STOPPED", "STOPPING"):
+                self.start_warehouse()
+            elif state in (None, "DELETED", "DELETING"):
+                return state
+            if time.monotonic() >= deadline:
+                return state
+            time.sleep(delay)
+            delay = min(delay * 1.5, 10.0)
+            state = self.warehouse_state()
+        return state
 
     def query_sql(self, sql: str) -> List[Dict[str, Any]]:
+        """Run ``sql`` and return every row as a dict ([] on error or offline).
+
+        Follows all result chunks; for large results prefer ``iter_sql_rows``.
+        Read-only statements are answered from the result cache when fresh.
+        """
         if not self.available or not self._warehouse_id:
             return []
-
+        cached = query_cache.get(self._scope, sql)
+        if cached is not None:
+            return cached
         try:
-            result = self._client.statement_execution.execute_statement(
-                warehouse_id=self._warehouse_id,
-                statement=sql,
-                wait_timeout="30s",
-            )
-            if result.result and result.result.data_array:
-                columns = [c.name for c in result.manifest.schema.columns]
-                return [dict(zip(columns, row)) for row in result.result.data_array]
-            return []
+            rows = list(self.iter_sql_rows(sql))
         except Exception as e:
             logger.error("SQL query failed: %s", e)
             return []
+        query_cache.put(self._scope, sql, rows)
+        return rows
+
+    def invalidate_tables(self, tables: Sequence[str]) -> int:
+        """Drop cached results that read any of ``tables`` (after a job rewrites them)."""
+        tables = self._resolve_tables(tables)
+        dropped = query_cache.invalidate_tables(tables)
+        if dropped:
+            logger.info("Invalidated %d cached SQL results for %s", dropped, ", ".join(tables))
+        return dropped
+
+    def iter_sql_rows(self, sql: str, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """Stream rows as dicts, fetching result chunks lazily.
+
+        Accepts the same keyword arguments as ``iter_sql_chunks``. Unlike
+        ``query_sql`` errors are raised (RuntimeError), not swallowed.
+        """
+        for chunk in self.iter_sql_chunks(sql, **kwargs):
+            for row in chunk.rows:
+                yield dict(zip(chunk.columns, row))
+
+    def iter_sql_chunks(
+        self,
+        sql: str,
+        disposition: str = "INLINE",
+        result_format: str = "JSON_ARRAY",
+        timeout: Optional[int] = None,
+    ) -> Iterator[SqlChunk]:
+        """Execute ``sql`` and yield its result one chunk at a time.
+
+        ``disposition`` is ``INLINE`` (rows in the API response, 25 MiB cap)
+        or ``EXTERNAL_LINKS`` (pre-signed downloads, no size cap).
+        ``result_format`` is ``JSON_ARRAY`` or ``ARROW_STREAM``; the latter
+        requires EXTERNAL_LINKS and the optional ``pyarrow`` package.
+        Statements still running after the 30 s synchronous wait are polled
+        until ``timeout`` seconds (default ``settings.databricks_sql_timeout``),
+        then cancelled.
+        """
+        if not self.available or not self._warehouse_id:
+            return
+        from databricks.sdk.service.sql import Disposition, Format
+
+        if warehouse_warmer.known_state(self._scope) in _COLD_STATES:
+            # Known to be cold — wait for it rather than burn the statement timeout
+            self.wait_for_warehouse()
+
+        api = self._client.statement_execution
+        resp = api.execute_statement(
+            warehouse_id=self._warehouse_id,
+            statement=sql,
+            wait_timeout="30s",
+            disposition=Disposition(disposition),
+            format=Format(result_format),
+        )
+        if timeout is None:
+            timeout = settings.databricks_sql_timeout
+        resp = self._await_statement(resp, timeout)
+        query_cache.invalidate_statement(sql)
+        yield from self._result_chunks(resp, result_format)
+
+    def query_many(
+        self, statements: Sequence[str], timeout: Optional[int] = None
+    ) -> List[StatementResult]:
+        """Run ``statements`` concurrently and return their results in input order.
+
+        Blocking; async callers should await ``query_many_async`` instead.
+        """
+        if not statements:
+            return []
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.query_many_async(statements, timeout))
+        # Called from inside an event loop — run the batch on its own loop
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, self.query_many_async(statements, timeout)).result()
+
+    async def query_many_async(
+        self, statements: Sequence[str], timeout: Optional[int] = None
+    ) -> List[StatementResult]:
+        return list(await asyncio.gather(*(self.execute_async(s, timeout) for s in statements)))
+
+    async def execute_async(self, sql: str, timeout: Optional[int] = None) -> StatementResult:
+        """Submit ``sql`` with ``wait_timeout=0s`` and await completion.
+
+        Holds one of the warehouse's ``settings.databricks_sql_max_concurrency``
+        slots while the statement runs, so parallel batches from concurrent
+        requests cannot flood the warehouse queue.
+        """
+        if not self.available or not self._warehouse_id:
+            return StatementResult(sql=sql)
+        cached = query_cache.get(self._scope, sql)
+        if cached is not None:
+            return StatementResult(sql=sql, rows=cached)
+        if timeout is None:
+            timeout = settings.databricks_sql_timeout
+        if warehouse_warmer.known_state(self._scope) in _COLD_STATES:
+            await asyncio.to_thread(self.wait_for_warehouse)
+        slot = _warehouse_slot(self._warehouse_id)
+        while not slot.acquire(blocking=False):
+            await asyncio.sleep(0.05)
+        try:
+            return await self._run_statement_async(sql, timeout)
+        except Exception as e:
+            logger.warning("SQL statement failed: %s", e)
+            return StatementResult(sql=sql, error=str(e))
+        finally:
+            slot.release()
+
+    async def _run_statement_async(self, sql: str, timeout: int) -> StatementResult:
+        api = self._client.statement_execution
+        resp = await asyncio.to_thread(
+            api.execute_statement,
+            warehouse_id=self._warehouse_id,
+            statement=sql,
+            wait_timeout="0s",
+        )
+        deadline = time.monotonic() + timeout
+        delay = 0.1
+        while _statement_state(resp) in _PENDING_STATES:
+            if time.monotonic() >= deadline:
+                await asyncio.to_thread(self._cancel_statement, resp.statement_id)
+                raise RuntimeError(f"SQL statement timed out after {timeout}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 2.0)
+            resp = await asyncio.to_thread(api.get_statement, resp.statement_id)
+        _raise_for_state(resp)
+        query_cache.invalidate_statement(sql)
+
+        def _rows() -> List[Dict[str, Any]]:
+            return [
+                dict(zip(chunk.columns, row))
+                for chunk in self._result_chunks(resp, "JSON_ARRAY")
+                for row in chunk.rows
+            ]
+
+        rows = await asyncio.to_thread(_rows)
+        query_cache.put(self._scope, sql, rows)
+        return StatementResult(sql=sql, rows=rows)
+
+    def _result_chunks(self, resp: Any, result_format: str) -> Iterator[SqlChunk]:
+        """Yield every chunk of a finished statement, following chunk links."""
+        api = self._client.statement_execution
+        columns: List[str] = []
+        if resp.manifest and resp.manifest.schema and resp.manifest.schema.columns:
+            columns = [c.name for c in resp.manifest.schema.columns]
+
+        data = resp.result
+        while data is not None:
+            rows = self._chunk_rows(data, result_format)
+            if rows:
+                yield SqlChunk(columns=columns, rows=rows)
+            next_index = data.next_chunk_index
+            if next_index is None and data.external_links:
+                next_index = data.external_links[-1].next_chunk_index
+            if next_index is None:
+                break
+            data = api.get_statement_result_chunk_n(resp.statement_id, next_index)
+
+    def _await_statement(self, resp: Any, timeout: int) -> Any:
+        """Poll a statement past the synchronous wait until it finishes."""
+        api = self._client.statement_execution
+        deadline = time.monotonic() + timeout
+        delay = 0.5
+        while _statement_state(resp) in _PENDING_STATES:
+            if time.monotonic() >= deadline:
+                self._cancel_statement(resp.statement_id)
+                raise RuntimeError(f"SQL statement timed out after {timeout}s")
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0)
+            resp = api.get_statement(resp.statement_id)
+        _raise_for_state(resp)
+        return resp
+
+    def _cancel_statement(self, statement_id: str) -> None:
+        try:
+            self._client.statement_execution.cancel_execution(statement_id)
+        except Exception as e:
+            logger.warning("Could not cancel statement %s: %s", statement_id, e)
+
+    @staticmethod
+    def _chunk_rows(data: Any, result_format: str) -> List[List[Any]]:
+        if data.data_array:
+            return data.data_array
+        rows: List[List[Any]] = []
+        for link in data.external_links or []:
+            # Pre-signed cloud storage URL — must be fetched without our token
+            with urllib.request.urlopen(link.external_link, timeout=120) as f:
+                payload = f.read()
+            if result_format == "ARROW_STREAM":
+                rows.extend(_arrow_rows(payload))
+            else:
+                rows.extend(json.loads(payload))
+        return rows
 
     def list_tables(self, catalog: str, schema: str) -> List[Dict[str, Any]]:
         """List tables in a Unity Catalog schema."""
@@ -302,38 +847,55 @@ class DatabricksService:
             logger.error("Volume upload failed: %s", e)
             raise RuntimeError(f"Volume upload failed: {e}") from e
 
-    def wait_for_run_by_id(self, run_id: Optional[str], timeout: int = 600) -> bool:
-        """Poll a specific Databricks job run until it completes.
-
-        Returns True on SUCCESS, False on FAILED/TIMEDOUT/CANCELED or timeout.
-        Uses the Jobs API run-state (not the audit log) so there is no
-        risk of matching a stale audit-log entry from a previous run.
+    def watch_run(
+        self,
+        run_id: Optional[str],
+        timeout: int = 600,
+        tables: Iterable[str] = (),
+        labels: Optional[Mapping[str, str]] = None,
+    ) -> "Future[bool]":
+        """Future resolving to True on SUCCESS, False on any other end state or timeout.
+
+        Polling is shared: every run watched for this tenant is tracked by one
+        ``RunWatcher`` thread with adaptive intervals. Cached reads of
+        ``tables`` (the tables the run writes) are dropped when it ends;
+        ``labels`` go into the run's ``job_run`` events.
+        Offline instances and missing/invalid run ids resolve to True
+        immediately.
         """
+        done: "Future[bool]" = Future()
         if not self.available or not run_id:
-            return True  # Offline / no run id — assume success
-
-        import time
-
+            done.set_result(True)  # Offline / no run id — assume success
+            return done
         try:
             run_id_int = int(run_id)
         except (TypeError, ValueError):
             logger.warning("Invalid run_id %s — skipping wait", run_id)
-            return True
+            done.set_result(True)
+            return done
+        return get_run_watcher(self._client, self._scope).watch(
+            run_id_int, timeout, self._resolve_tables(tables), labels,
+        )
 
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                run = self._client.jobs.runs.get(run_id=run_id_int)
-                lc = str(getattr(run.state, "life_cycle_state", "") or "")
-                if lc in ("TERMINATED", "SKIPPED", "INTERNAL_ERROR"):
-                    result = str(getattr(run.state, "result_state", "") or "")
-                    return result == "SUCCESS"
-            except Exception as e:
-                logger.warning("Error polling run %s: %s", run_id, e)
-            time.sleep(10)
+    def wait_for_run_by_id(
+        self, run_id: Optional[str], timeout: int = 600, tables: Iterable[str] = (),
+    ) -> bool:
+        """Block until a specific Databricks job run completes.
+
+        Returns True on SUCCESS, False on FAILED/TIMEDOUT/CANCELED or timeout.
+        Uses the Jobs API run-state (not the audit log) so there is no
+        risk of matching a stale audit-log entry from a previous run.
+        """
+        return self.watch_run(run_id, timeout, tables).result()
 
-        logger.warning("Timed out waiting for Databricks run %s", run_id)
-        return False
+    @staticmethod
+    def _resolve_tables(tables: Iterable[str]) -> List[str]:
+        """``tables`` with ``${var}`` placeholders resolved for the default environment."""
+        tables = [t for t in tables if t]
+        if not any("$" in t for t in tables):
+            return tables
+        variables = environment_variables(settings.default_environment)
+        return [resolved for t in tables if (resolved := resolve_table_name(t, variables))]
 
     def _find_job(self, job_name: str) -> Optional[int]:
         try:
@@ -342,3 +904,34 @@ class DatabricksService:
         except Exception:
             pass
         return None
+
+
+def is_missing_job_error(exc: Exception) -> bool:
+    """True if a Jobs API error says the job id no longer exists."""
+    if type(exc).__name__ in ("ResourceDoesNotExist", "NotFound"):
+        return True
+    return "does not exist" in str(exc).lower()
+
+
+def _statement_state(resp: Any) -> Optional[str]:
+    state = getattr(getattr(resp, "status", None), "state", None)
+    return getattr(state, "value", state)
+
+
+def _raise_for_state(resp: Any) -> None:
+    state = _statement_state(resp)
+    if state not in (None, "SUCCEEDED"):
+        error = getattr(resp.status, "error", None)
+        message = getattr(error, "message", None) or "no error message"
+        raise RuntimeError(f"SQL statement {state}: {message}")
+
+
+def _arrow_rows(payload: bytes) -> List[List[Any]]:
+    try:
+        import pyarrow.ipc
+    except ImportError as e:
+        raise RuntimeError("ARROW_STREAM results require the 'pyarrow' package") from e
+    rows: List[List[Any]] = []
+    for batch in pyarrow.ipc.open_stream(payload):
+        rows.extend(list(r) for r in zip(*(col.to_pylist() for col in batch.columns)))
+    return rows
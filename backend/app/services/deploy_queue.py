@@ -0,0 +1,390 @@
+"""Persistent queue of deploy operations, run by background workers.
+
+Creating or updating a source / entity used to run the git commit, the
+workspace upload and the job create/update in the request thread. A slow
+Databricks API held a worker for tens of seconds. With
+``settings.deploy_queue_enabled`` the route only validates and writes the
+YAML, enqueues a *publish* operation here, and returns 202 with the
+operation id (``GET /operations/{id}`` reports progress).
+
+- **Persistent** — operations live in the portal SQLite database, so a
+  restart picks up where it left off. A worker holds a lease on the
+  operation it runs; one whose lease ran out (crashed process) is picked up
+  again.
+- **Idempotent** — a publish reads the YAML as it is when it runs, so
+  repeating it is harmless. Queued edits of the same source coalesce into
+  one operation. Requests carrying an ``Idempotency-Key`` header return the
+  operation the first request created.
+- **Retried** — failures, a failed git commit included, are retried with
+  exponential backoff up to ``deploy_queue_max_attempts``. Operations of
+  the same source / entity never run concurrently.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Failures that retrying cannot fix
+_PERMANENT_ERRORS = (FileNotFoundError, ValueError)
+
+
+@dataclass
+class DeployOperation:
+    id: str
+    tenant_id: str
+    layer: str  # bronze | silver
+    name: str
+    status: str  # queued | running | succeeded | failed
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: str = ""
+    updated_at: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        out.pop("tenant_id")
+        return out
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _merge_payloads(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """One publish covering two queued edits of the same source / entity."""
+    return {
+        "commit_messages": old.get("commit_messages", []) + new.get("commit_messages", []),
+        "deploy_job": bool(old.get("deploy_job")) or bool(new.get("deploy_job")),
+        # A create followed by an update is still a create
+        "is_new": bool(old.get("is_new")) or bool(new.get("is_new")),
+        # The pack the source was in before the first queued edit
+        "left_pack": old.get("left_pack") or new.get("left_pack"),
+    }
+
+
+class DeployQueue:
+    """SQLite-backed queue of publish operations."""
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        path = Path(db_path or settings.tenant_db_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db_path = str(path)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._init_db()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self) -> None:
+        with self._get_conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS deploy_operations (
+                    id TEXT PRIMARY KEY,
+                    tenant_id TEXT NOT NULL,
+                    layer TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT,
+                    error TEXT,
+                    not_before TEXT NOT NULL,
+                    lease_until TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_deploy_operations_status "
+                "ON deploy_operations (status, not_before)"
+            )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS deploy_operation_keys (
+                    tenant_id TEXT NOT NULL,
+                    idempotency_key TEXT NOT NULL,
+                    operation_id TEXT NOT NULL,
+                    PRIMARY KEY (tenant_id, idempotency_key)
+                )
+            """)
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> DeployOperation:
+        return DeployOperation(
+            id=row["id"],
+            tenant_id=row["tenant_id"],
+            layer=row["layer"],
+            name=row["name"],
+            status=row["status"],
+            payload=json.loads(row["payload"]),
+            attempts=row["attempts"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+        )
+
+    # ── Producers ───────────────────────────────────────────────────────────
+
+    def enqueue(
+        self,
+        tenant_id: str,
+        layer: str,
+        name: str,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+    ) -> DeployOperation:
+        """Queue a publish of ``name``, merging into one that has not started yet."""
+        now = _now().isoformat()
+        with self._lock, self._get_conn() as conn:
+            pending = conn.execute(
+                "SELECT * FROM deploy_operations "
+                "WHERE tenant_id = ? AND layer = ? AND name = ? AND status = 'queued' "
+                "ORDER BY created_at LIMIT 1",
+                (tenant_id, layer, name),
+            ).fetchone()
+            if pending is not None:
+                merged = _merge_payloads(json.loads(pending["payload"]), payload)
+                conn.execute(
+                    "UPDATE deploy_operations SET payload = ?, updated_at = ? WHERE id = ?",
+                    (json.dumps(merged), now, pending["id"]),
+                )
+                op_id = pending["id"]
+            else:
+                op_id = uuid.uuid4().hex
+                conn.execute(
+                    "INSERT INTO deploy_operations (id, tenant_id, layer, name, status, payload, "
+                    "not_before, created_at, updated_at) VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?)",
+                    (op_id, tenant_id, layer, name, json.dumps(payload), now, now, now),
+                )
+            if idempotency_key:
+                conn.execute(
+                    "INSERT OR IGNORE INTO deploy_operation_keys (tenant_id, idempotency_key, operation_id) "
+                    "VALUES (?, ?, ?)",
+                    (tenant_id, idempotency_key, op_id),
+                )
+        self._wake.set()
+        return self.get(op_id)
+
+    def get(self, operation_id: str, tenant_id: Optional[str] = None) -> Optional[DeployOperation]:
+        with self._get_conn() as conn:
+            row = conn.execute("SELECT * FROM deploy_operations WHERE id = ?", (operation_id,)).fetchone()
+        if row is None or (tenant_id is not None and row["tenant_id"] != tenant_id):
+            return None
+        return self._row(row)
+
+    def find_by_key(self, tenant_id: str, idempotency_key: str) -> Optional[DeployOperation]:
+        """The operation an earlier request with this ``Idempotency-Key`` created."""
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT o.* FROM deploy_operation_keys AS k "
+                "JOIN deploy_operations AS o ON o.id = k.operation_id "
+                "WHERE k.tenant_id = ? AND k.idempotency_key = ?",
+                (tenant_id, idempotency_key),
+            ).fetchone()
+        return self._row(row) if row is not None else None
+
+    def recent(self, tenant_id: str, status: Optional[str] = None, limit: int = 50) -> List[DeployOperation]:
+        sql = "SELECT * FROM deploy_operations WHERE tenant_id = ?"
+        params: List[Any] = [tenant_id]
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._get_conn() as conn:
+            return [self._row(r) for r in conn.execute(sql, params).fetchall()]
+
+    # ── Workers ─────────────────────────────────────────────────────────────
+
+    def claim(self) -> Optional[DeployOperation]:
+        """Lease the oldest due operation whose source / entity is not already running."""
+        now = _now()
+        lease = (now + timedelta(seconds=settings.deploy_queue_lease_seconds)).isoformat()
+        with self._lock, self._get_conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM deploy_operations AS o "
+                "WHERE ((o.status = 'queued' AND o.not_before <= :now) "
+                "       OR (o.status = 'running' AND o.lease_until < :now)) "
+                "  AND NOT EXISTS ("
+                "    SELECT 1 FROM deploy_operations AS r "
+                "    WHERE r.status = 'running' AND r.lease_until >= :now AND r.id != o.id "
+                "      AND r.tenant_id = o.tenant_id AND r.layer = o.layer AND r.name = o.name) "
+                "ORDER BY o.created_at LIMIT 1",
+                {"now": now.isoformat()},
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE deploy_operations SET status = 'running', attempts = attempts + 1, "
+                "lease_until = ?, updated_at = ? WHERE id = ?",
+                (lease, now.isoformat(), row["id"]),
+            )
+        return self.get(row["id"])
+
+    def complete(self, operation_id: str, result: Dict[str, Any]) -> None:
+        self._finish(operation_id, "succeeded", result=result)
+
+    def fail(self, operation_id: str, error: str, retry: bool = True) -> str:
+        """Record a failed attempt → the new status (``queued`` to retry, or ``failed``)."""
+        op = self.get(operation_id)
+        if op is None:
+            return "failed"
+        if retry and op.attempts < settings.deploy_queue_max_attempts:
+            delay = settings.deploy_queue_retry_seconds * 2 ** (op.attempts - 1)
+            not_before = (_now() + timedelta(seconds=delay)).isoformat()
+            self._finish(operation_id, "queued", error=error, not_before=not_before)
+            return "queued"
+        self._finish(operation_id, "failed", error=error)
+        return "failed"
+
+    def _finish(
+        self,
+        operation_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        not_before: Optional[str] = None,
+    ) -> None:
+        now = _now().isoformat()
+        with self._lock, self._get_conn() as conn:
+            conn.execute(
+                "UPDATE deploy_operations SET status = ?, result = ?, error = ?, lease_until = NULL, "
+                "not_before = COALESCE(?, not_before), updated_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, not_before, now, operation_id),
+            )
+
+    def run_next(self, executor: Optional[Callable[[DeployOperation], Dict[str, Any]]] = None) -> Optional[DeployOperation]:
+        """Claim and run one operation → it, finished (None if nothing was due)."""
+        op = self.claim()
+        if op is None:
+            return None
+        executor = executor or execute_operation
+        try:
+            result = executor(op)
+        except _PERMANENT_ERRORS as e:
+            logger.warning("Deploy operation %s (%s %s) failed: %s", op.id, op.layer, op.name, e)
+            self.fail(op.id, str(e), retry=False)
+        except Exception as e:
+            status = self.fail(op.id, str(e))
+            logger.warning(
+                "Deploy operation %s (%s %s) attempt %d failed, %s: %s",
+                op.id, op.layer, op.name, op.attempts, "will retry" if status == "queued" else "giving up", e,
+            )
+        else:
+            self.complete(op.id, result)
+            logger.info("Deploy operation %s (%s %s) succeeded", op.id, op.layer, op.name)
+        return self.get(op.id)
+
+    def wait_for_work(self, timeout: float) -> None:
+        self._wake.wait(timeout)
+        self._wake.clear()
+
+
+def execute_operation(op: DeployOperation) -> Dict[str, Any]:
+    """Publish ``op`` with the tenant's own Databricks credentials."""
+    from app.dependencies import (
+        _get_or_build_databricks_service,
+        get_config_service,
+        get_git_service,
+        get_silver_config_service,
+        get_tenant_service,
+    )
+    from app.services.databricks_client_cache import databricks_clients
+    from app.services.deploy_service import DeployService
+    from app.services.silver_deploy_service import SilverDeployService
+
+    creds = databricks_clients.credentials(op.tenant_id, get_tenant_service().get_databricks_credentials)
+    db = _get_or_build_databricks_service(op.tenant_id, creds)
+    bronze_config, git = get_config_service(), get_git_service()
+    return publish_operation(
+        op,
+        DeployService(bronze_config, git, db),
+        SilverDeployService(get_silver_config_service(), git, db, bronze_config),
+    )
+
+
+def publish_operation(op: DeployOperation, deploy_service, silver_deploy_service) -> Dict[str, Any]:
+    """Run the publish step ``op`` stands for → the deploy result."""
+    message = "; ".join(op.payload.get("commit_messages") or []) or f"portal: publish {op.layer} {op.name}"
+    if op.layer == "bronze":
+        return deploy_service.publish_staged(
+            op.name,
+            message,
+            deploy_job=op.payload.get("deploy_job", True),
+            had_job=not op.payload.get("is_new"),
+            left_pack=op.payload.get("left_pack"),
+        )
+    return silver_deploy_service.publish_staged(
+        op.name,
+        message,
+        deploy_job=op.payload.get("deploy_job", True),
+        is_new=bool(op.payload.get("is_new")),
+    )
+
+
+class DeployWorkers:
+    """``settings.deploy_queue_workers`` threads draining the deploy queue."""
+
+    def __init__(self, queue: "DeployQueue", workers: Optional[int] = None) -> None:
+        self._queue = queue
+        self._workers = settings.deploy_queue_workers if workers is None else workers
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(max(0, self._workers)):
+            thread = threading.Thread(target=self._loop, name=f"deploy-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._queue._wake.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                op = self._queue.run_next()
+            except Exception as e:
+                logger.error("Deploy queue worker error: %s", e)
+                op = None
+            if op is None:
+                self._queue.wait_for_work(settings.deploy_queue_poll_seconds)
+
+
+_queues: Dict[str, DeployQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_deploy_queue() -> DeployQueue:
+    """Queue for the current ``settings.tenant_db_path`` (created on first use)."""
+    path = str(settings.tenant_db_path)
+    with _queues_lock:
+        queue = _queues.get(path)
+        if queue is None:
+            queue = _queues[path] = DeployQueue(path)
+        return queue
@@ -3,18 +3,32 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 from app.config import settings
 from app.models.requests import SourceCreateRequest, SourceUpdateRequest
-from app.models.responses import SourceCreateResponse, SourceDeleteResponse
+from app.models.responses import (
+    SourceBulkCreateResponse,
+    SourceBulkItemResult,
+    SourceCreateResponse,
+    SourceDeleteResponse,
+    WorkspaceSyncResponse,
+)
 from app.services.config_service import ConfigService
-from app.services.databricks_service import DatabricksService
+from app.services.databricks_service import JOB_RUN_WATCH_SECONDS, DatabricksService, bronze_run_tables
+from app.services.deploy_queue import DeployOperation, get_deploy_queue
 from app.services.git_service import GitService
+from app.services.job_packer import JobPacker, pack_name
+from app.services.workspace_publisher import publish_files
 
 logger = logging.getLogger(__name__)
 
 
+def _create_message(req: SourceCreateRequest) -> str:
+    return f"portal: add source {req.name} ({req.source_type.value})"
+
+
 class DeployService:
     def __init__(
         self,
@@ -25,59 +39,208 @@ class DeployService:
         self._config = config_service
         self._git = git_service
         self._db = databricks_service
+        self._packer = JobPacker(config_service, databricks_service)
 
     def create_source(self, req: SourceCreateRequest) -> SourceCreateResponse:
-        # 1. Validate
+        yaml_path = self.stage_create(req)
+        schedule = req.schedule.model_dump() if req.schedule else None
+        git_sha, job_id = self._publish(
+            req.name, yaml_path, _create_message(req), schedule, had_job=False,
+        )
+        return SourceCreateResponse(
+            name=req.name,
+            yaml_path=yaml_path,
+            git_commit=git_sha,
+            job_id=job_id,
+            message=f"Source '{req.name}' created successfully",
+        )
+
+    def queue_create(
+        self, req: SourceCreateRequest, tenant_id: str, idempotency_key: Optional[str] = None,
+    ) -> DeployOperation:
+        """Write the YAML now and queue the rest of ``create_source`` (deploy queue mode)."""
+        self.stage_create(req)
+        return get_deploy_queue().enqueue(tenant_id, "bronze", req.name, {
+            "commit_messages": [_create_message(req)],
+            "deploy_job": True,
+            "is_new": True,
+            "left_pack": None,
+        }, idempotency_key)
+
+    def stage_create(self, req: SourceCreateRequest) -> str:
+        """Validate ``req`` and write its YAML → path. Nothing leaves the portal yet."""
         valid, errors = self._config.validate_config(req)
         if not valid:
             raise ValueError("; ".join(errors))
-
-        # 2. Write YAML
         yaml_path = self._config.write_source(req)
         logger.info("Wrote YAML to %s", yaml_path)
+        return yaml_path
 
-        # 3. Git commit
-        git_sha = self._git.commit_file(
-            yaml_path,
-            f"portal: add source {req.name} ({req.source_type.value})",
-        )
+    def _publish(
+        self,
+        name: str,
+        yaml_path: str,
+        commit_message: str,
+        schedule: Optional[Dict],
+        deploy_job: bool = True,
+        had_job: bool = True,
+        left_pack: Optional[str] = None,
+    ) -> tuple[Optional[str], Optional[str]]:
+        """Git commit, workspace upload and job create/update → (git sha, job id)."""
+        git_sha = self._git.commit_file(yaml_path, commit_message)
+        self._db.upload_yaml(yaml_path, name)
+        job_id = None
+        if deploy_job:
+            # Its own job, or the pack job it joins
+            job_id = self._deploy_job(name, schedule, had_job=had_job, left_pack=left_pack)
+        return git_sha, job_id
 
-        # 4. Upload to Databricks workspace
-        self._db.upload_yaml(yaml_path, req.name)
+    def publish_staged(
+        self,
+        name: str,
+        commit_message: str,
+        deploy_job: bool = True,
+        had_job: bool = True,
+        left_pack: Optional[str] = None,
+    ) -> Dict[str, Optional[str]]:
+        """Publish a source whose YAML was written earlier (deploy queue worker).
 
-        # 5. Create/update Databricks job
-        schedule = req.schedule.model_dump() if req.schedule else None
-        job_id = self._db.create_or_update_job(
-            req.name, settings.default_environment, schedule
+        Reads the YAML as it is now, so running it twice, or after a later
+        edit, deploys the latest config. Raises FileNotFoundError if the
+        source was deleted in the meantime.
+        """
+        source = self._config.get_source(name)
+        if not source:
+            raise FileNotFoundError(f"Source '{name}' not found")
+        yaml_path = str(self._config._source_path(name))
+        git_sha, job_id = self._publish(
+            name, yaml_path, commit_message, source.schedule,
+            deploy_job=deploy_job, had_job=had_job, left_pack=left_pack,
         )
+        return {"yaml_path": yaml_path, "git_commit": git_sha, "job_id": job_id}
 
-        return SourceCreateResponse(
-            name=req.name,
-            yaml_path=yaml_path,
-            git_commit=git_sha,
-            job_id=job_id,
-            message=f"Source '{req.name}' created successfully",
-        )
+    def create_sources_bulk(self, reqs: List[SourceCreateRequest]) -> SourceBulkCreateResponse:
+        """Onboard many sources at once: one git commit, parallel Databricks calls.
 
-    def update_source(self, name: str, req: SourceUpdateRequest) -> SourceCreateResponse:
-        # 1. Update YAML
-        yaml_path = self._config.update_source(name, req)
-        logger.info("Updated YAML at %s", yaml_path)
+        Same steps as ``create_source`` but batched — validation, workspace
+        upload and job create/update each run on a bounded worker pool, and
+        every written YAML goes into a single commit. Failures are reported
+        per item; one bad source never blocks the rest.
+        """
+        results: Dict[str, SourceBulkItemResult] = {}
+        order: List[str] = []
+        candidates: List[SourceCreateRequest] = []
+        for req in reqs:
+            if req.name in results:
+                order.append(req.name)
+                continue  # duplicate in the same batch — first one wins
+            order.append(req.name)
+            if self._config.source_exists(req.name):
+                results[req.name] = SourceBulkItemResult(
+                    name=req.name, status="exists",
+                    errors=[f"Source '{req.name}' already exists"],
+                )
+                continue
+            results[req.name] = SourceBulkItemResult(name=req.name, status="pending")
+            candidates.append(req)
 
-        # 2. Git commit
-        git_sha = self._git.commit_file(
-            yaml_path,
-            f"portal: update source {name}",
+        workers = max(1, settings.deploy_max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # 1. Validate
+            verdicts = list(pool.map(self._config.validate_config, candidates))
+            valid: List[SourceCreateRequest] = []
+            for req, (ok, errors) in zip(candidates, verdicts):
+                if ok:
+                    valid.append(req)
+                else:
+                    results[req.name].status = "invalid"
+                    results[req.name].errors = errors
+
+            # 2. Write YAML (local disk — sequential is fine)
+            written: List[SourceCreateRequest] = []
+            for req in valid:
+                try:
+                    results[req.name].yaml_path = self._config.write_source(req)
+                    written.append(req)
+                except OSError as e:
+                    results[req.name].status = "failed"
+                    results[req.name].errors = [f"Could not write YAML: {e}"]
+
+            # 3. Git commit — one for the whole batch
+            git_sha = self._git.commit_files(
+                [results[r.name].yaml_path for r in written],
+                f"portal: add {len(written)} sources (bulk onboarding)",
+            )
+
+            # 4 + 5. Upload and create/update the job, concurrently per source
+            outcomes = list(pool.map(
+                self._deploy_one, written, [results[r.name].yaml_path for r in written]
+            ))
+
+        # Packed sources share one job per schedule — sync each pack once
+        packs = {
+            req.name: pack_name(req.schedule.model_dump() if req.schedule else None)
+            for req, (_, error) in zip(written, outcomes) if not error
+        }
+        pack_jobs: Dict[str, Optional[str]] = {}
+        pack_error: Optional[str] = None
+        try:
+            pack_jobs = self._packer.sync(packs.values())
+        except Exception as e:
+            logger.error("Bulk pack job sync failed: %s", e)
+            pack_error = str(e)
+
+        for req, (job_id, error) in zip(written, outcomes):
+            item = results[req.name]
+            item.job_id = job_id
+            if not error and packs.get(req.name):
+                item.job_id = pack_jobs.get(req.name)
+                error = pack_error
+            if error:
+                item.status = "failed"
+                item.errors = [error]
+            else:
+                item.status = "created"
+
+        ordered = [results[name] for name in dict.fromkeys(order)]
+        created = sum(1 for r in ordered if r.status == "created")
+        return SourceBulkCreateResponse(
+            results=ordered,
+            created=created,
+            failed=len(ordered) - created,
+            git_commit=git_sha,
+            message=f"{created} of {len(ordered)} sources created",
         )
 
-        # 3. Re-upload to Databricks
-        self._db.upload_yaml(yaml_path, name)
+    def _deploy_one(
+        self, req: SourceCreateRequest, yaml_path: str
+    ) -> tuple[Optional[str], Optional[str]]:
+        """Upload + job create/update for one written source → (job_id, error).
 
-        # 4. Update job if schedule changed
-        if req.schedule:
-            schedule = req.schedule.model_dump()
-            self._db.create_or_update_job(name, settings.default_environment, schedule)
+        Sources that belong to a pack are only uploaded here; the caller
+        syncs their pack jobs once for the whole batch.
+        """
+        try:
+            self._db.upload_yaml(yaml_path, req.name)
+            schedule = req.schedule.model_dump() if req.schedule else None
+            if pack_name(schedule):
+                return None, None
+            job_id = self._db.create_or_update_job(
+                req.name, settings.default_environment, schedule
+            )
+            return job_id, None
+        except Exception as e:
+            logger.error("Bulk deploy failed for '%s': %s", req.name, e)
+            return None, str(e)
 
+    def update_source(self, name: str, req: SourceUpdateRequest) -> SourceCreateResponse:
+        yaml_path, left_pack = self.stage_update(name, req)
+        # Update the job only if the schedule changed
+        schedule = req.schedule.model_dump() if req.schedule else None
+        git_sha, _ = self._publish(
+            name, yaml_path, f"portal: update source {name}", schedule,
+            deploy_job=req.schedule is not None, left_pack=left_pack,
+        )
         return SourceCreateResponse(
             name=name,
             yaml_path=yaml_path,
@@ -85,6 +248,25 @@ class DeployService:
             message=f"Source '{name}' updated successfully",
         )
 
+    def queue_update(
+        self, name: str, req: SourceUpdateRequest, tenant_id: str, idempotency_key: Optional[str] = None,
+    ) -> DeployOperation:
+        """Rewrite the YAML now and queue the rest of ``update_source`` (deploy queue mode)."""
+        _, left_pack = self.stage_update(name, req)
+        return get_deploy_queue().enqueue(tenant_id, "bronze", name, {
+            "commit_messages": [f"portal: update source {name}"],
+            "deploy_job": req.schedule is not None,
+            "is_new": False,
+            "left_pack": left_pack,
+        }, idempotency_key)
+
+    def stage_update(self, name: str, req: SourceUpdateRequest) -> tuple[str, Optional[str]]:
+        """Rewrite the YAML → (path, pack the source is leaving, if packing)."""
+        previous = self._config.get_source(name) if settings.databricks_job_packing else None
+        yaml_path = self._config.update_source(name, req)
+        logger.info("Updated YAML at %s", yaml_path)
+        return yaml_path, pack_name(previous.schedule) if previous else None
+
     def delete_source(self, name: str) -> SourceDeleteResponse:
         # 1. Find and delete YAML
         source = self._config.get_source(name)
@@ -100,8 +282,9 @@ class DeployService:
             f"portal: delete source {name}",
         )
 
-        # 3. Delete Databricks job
+        # 3. Delete Databricks job (and drop it from its pack)
         self._db.delete_job(name, settings.default_environment)
+        self._packer.sync([pack_name(source.schedule)])
 
         return SourceDeleteResponse(
             name=name,
@@ -117,10 +300,7 @@ class DeployService:
 
         self._db.upload_yaml(yaml_path, name)
 
-        schedule = source.schedule
-        job_id = self._db.create_or_update_job(
-            name, settings.default_environment, schedule
-        )
+        job_id = self._deploy_job(name, source.schedule)
 
         return SourceCreateResponse(
             name=name,
@@ -129,10 +309,69 @@ class DeployService:
             message=f"Source '{name}' redeployed successfully",
         )
 
+    def repack_jobs(self) -> Dict[str, List[str]]:
+        """Rebuild every pack job and retire the standalone jobs they replace."""
+        return self._packer.repack_all()
+
+    def _deploy_job(
+        self,
+        name: str,
+        schedule: Optional[Dict],
+        had_job: bool = True,
+        left_pack: Optional[str] = None,
+    ) -> Optional[str]:
+        """Create/update the job that runs ``name`` — its own, or its pack's.
+
+        ``left_pack`` is the pack the source belonged to before a reschedule,
+        re-synced so it loses the task. ``had_job`` False skips looking for a
+        standalone job to retire (a brand-new source has none).
+        """
+        env = settings.default_environment
+        pack = pack_name(schedule)
+        if pack is None:
+            job_id = self._db.create_or_update_job(name, env, schedule)
+            self._packer.sync([left_pack])
+            return job_id
+        job_id = self._packer.sync([pack, left_pack]).get(name)
+        if had_job:
+            self._db.delete_job(name, env)
+        return job_id
+
+    def sync_workspace(self, prune: bool = True, dry_run: bool = False) -> WorkspaceSyncResponse:
+        """Publish every local source YAML to the workspace conf folder in one pass.
+
+        Remote files are named ``{source name}.yaml`` — where ``upload_yaml``
+        puts them and the job reads them — whatever the local file is called.
+        """
+        remote_dir = f"{settings.databricks_workspace_path}/conf/sources"
+        files = {f"{name}.yaml": path for name, path in self._config.source_paths().items()}
+        result = publish_files(self._db, files, remote_dir, prune=prune, dry_run=dry_run)
+        return result.to_response(remote_dir)
+
     def trigger_run(self, name: str) -> Optional[str]:
         source = self._config.get_source(name)
         if not source:
             raise FileNotFoundError(f"Source '{name}' not found")
 
-        run_id = self._db.trigger_job(name, settings.default_environment)
+        pack_job = self._packer.job_for(name, source.schedule)
+        if pack_job:
+            # Run just this source's task of the shared job
+            run_id = self._db.run_job_now(
+                "bronze", pack_job, settings.default_environment, only=[name],
+            )
+        else:
+            run_id = self._db.trigger_job(name, settings.default_environment)
+        if run_id:
+            # The run rewrites the target table and the audit / dead-letter
+            # tables: drop cached reads now and again once the run has ended,
+            # since pages read while it runs would re-cache pre-run rows.
+            tables = bronze_run_tables(
+                source.target.get("catalog", ""),
+                source.target.get("schema", ""),
+                source.target.get("table", ""),
+            )
+            self._db.invalidate_tables(tables)
+            self._db.watch_run(
+                run_id, timeout=JOB_RUN_WATCH_SECONDS, tables=tables, labels={"source_name": name},
+            )
         return run_id
@@ -1,15 +1,31 @@
-"""Git operations via GitPython — auto-commit YAML changes."""
+"""Git operations via GitPython — auto-commit YAML changes.
+
+Every ``GitService`` works on the same repository index, and deploy workers
+commit from several threads, so staging and committing run under one
+process-wide lock. A commit whose files already match HEAD (a retried
+publish) is skipped. Failures raise ``GitCommitError`` instead of returning
+None, so the deploy queue retries the operation rather than recording it as
+succeeded without a commit.
+"""
 
 from __future__ import annotations
 
 import logging
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Serialises index access across threads and GitService instances
+_repo_lock = threading.RLock()
+
+
+class GitCommitError(RuntimeError):
+    """Staging, committing or pushing failed; safe to retry."""
+
 
 class GitService:
     def __init__(self) -> None:
@@ -27,25 +43,45 @@ class GitService:
         return self._repo is not None
 
     def commit_file(self, file_path: str, message: str) -> Optional[str]:
+        return self.commit_files([file_path], message)
+
+    def commit_files(self, file_paths: List[str], message: str) -> Optional[str]:
+        """Stage several files and record them in a single commit.
+
+        Returns the short SHA of the new commit, or of the last commit that
+        touched the files when they already match HEAD. Raises
+        GitCommitError on failure.
+        """
         if not self.available:
             logger.info("Git not available, skipping commit")
             return None
+        if not file_paths:
+            return None
 
         try:
-            rel_path = Path(file_path).relative_to(self._repo.working_dir)
-            self._repo.index.add([str(rel_path)])
-            commit = self._repo.index.commit(message)
-            sha = commit.hexsha[:8]
-            logger.info("Committed %s: %s", sha, message)
+            rel_paths = [
+                str(Path(p).relative_to(self._repo.working_dir)) for p in file_paths
+            ]
+            with _repo_lock:
+                self._repo.index.add(rel_paths)
+                if self._repo.head.is_valid() and not self._repo.index.diff("HEAD", paths=rel_paths):
+                    # Retried after the commit landed: no empty commit, but
+                    # still push in case that is what failed
+                    last = next(self._repo.iter_commits(paths=rel_paths, max_count=1), self._repo.head.commit)
+                    sha = last.hexsha[:8]
+                    logger.info("Nothing to commit, %s already at %s", message, sha)
+                else:
+                    sha = self._repo.index.commit(message).hexsha[:8]
+                    logger.info("Committed %s (%d files): %s", sha, len(rel_paths), message)
 
-            if settings.git_auto_push:
-                self._repo.remote("origin").push()
-                logger.info("Pushed to origin")
+                if settings.git_auto_push:
+                    self._repo.remote("origin").push()
+                    logger.info("Pushed to origin")
 
             return sha
         except Exception as e:
             logger.error("Git commit failed: %s", e)
-            return None
+            raise GitCommitError(f"Git commit failed: {e}") from e
 
     def commit_delete(self, file_path: str, message: str) -> Optional[str]:
         if not self.available:
@@ -53,8 +89,9 @@ class GitService:
 
         try:
             rel_path = Path(file_path).relative_to(self._repo.working_dir)
-            self._repo.index.remove([str(rel_path)], working_tree=True)
-            commit = self._repo.index.commit(message)
+            with _repo_lock:
+                self._repo.index.remove([str(rel_path)], working_tree=True)
+                commit = self._repo.index.commit(message)
             sha = commit.hexsha[:8]
             logger.info("Committed delete %s: %s", sha, message)
             return sha
@@ -8,16 +8,28 @@ Each mart lives under `gold_framework/conf/marts/<mart>/` as:
 
 This service deliberately matches the on-disk schema used by the
 `gold_framework.config.loader` so a write-then-load round trip is lossless.
+
+Reads are cached: each YAML file is parsed once per (path, mtime, size), and
+whole-mart summaries / documents are memoized against a fingerprint of every
+file in the mart directory, so repeated previews don't re-parse unchanged marts.
 """
 
 from __future__ import annotations
 
+import copy
+import os
 import shutil
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+from app.services.yaml_catalog import YamlDocCache, combine_digests
+
+# Sorted ((filename, mtime_ns, size), ...) of every file in a mart directory
+_Fingerprint = Tuple[Tuple[str, int, int], ...]
+
 
 class GoldConfigError(ValueError):
     """Raised when a mart write/read fails for a structural reason."""
@@ -32,6 +44,11 @@ class GoldConfigService:
     def __init__(self, marts_dir: Path) -> None:
         self.marts_dir = Path(marts_dir)
         self.marts_dir.mkdir(parents=True, exist_ok=True)
+        self._docs = YamlDocCache()
+        self._lock = threading.Lock()
+        # mart dir name -> (fingerprint, value)
+        self._summaries: Dict[str, Tuple[_Fingerprint, Dict[str, Any]]] = {}
+        self._marts: Dict[str, Tuple[_Fingerprint, Dict[str, Any]]] = {}
 
     # ── Listing / reading ────────────────────────────────────────────────────
 
@@ -43,56 +60,134 @@ class GoldConfigService:
         for path in sorted(self.marts_dir.iterdir()):
             if not path.is_dir():
                 continue
-            meta_file = path / "_mart.yaml"
-            if not meta_file.exists():
+            fingerprint = self._fingerprint(path)
+            if not any(f[0] == "_mart.yaml" for f in fingerprint):
                 continue
-            meta = yaml.safe_load(meta_file.read_text(encoding="utf-8")) or {}
-            n_dims = len(list(path.glob("dim_*.yaml")))
-            n_facts = len(list(path.glob("fact_*.yaml")))
-            n_metrics = 0
-            metrics_file = path / "metrics.yaml"
-            if metrics_file.exists():
-                m = yaml.safe_load(metrics_file.read_text(encoding="utf-8")) or {}
-                n_metrics = len(m.get("metrics") or [])
-            out.append(
-                {
-                    "name": meta.get("name") or path.name,
-                    "description": meta.get("description", ""),
-                    "schema": meta.get("schema") or f"gld_{path.name}",
-                    "owner": meta.get("owner", ""),
-                    "n_dimensions": n_dims,
-                    "n_facts": n_facts,
-                    "n_metrics": n_metrics,
-                }
-            )
+            with self._lock:
+                cached = self._summaries.get(path.name)
+            if cached is not None and cached[0] == fingerprint:
+                out.append(dict(cached[1]))
+                continue
+            summary = self._summarise(path, fingerprint)
+            with self._lock:
+                self._summaries[path.name] = (fingerprint, summary)
+            out.append(dict(summary))
         return out
 
     def get_mart(self, name: str) -> Dict[str, Any]:
         """Read full mart back into a dict (mart, dimensions, facts, metrics)."""
+        # Callers may mutate the result; the memoized copy must stay pristine.
+        return copy.deepcopy(self._read_mart(name))
+
+    def _read_mart(self, name: str) -> Dict[str, Any]:
         mart_dir = self.marts_dir / name
         meta_file = mart_dir / "_mart.yaml"
-        if not meta_file.exists():
+        fingerprint = self._fingerprint(mart_dir)
+        if not any(f[0] == "_mart.yaml" for f in fingerprint):
             raise FileNotFoundError(f"Mart '{name}' not found at {mart_dir}")
+        with self._lock:
+            cached = self._marts.get(name)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
 
-        mart = yaml.safe_load(meta_file.read_text(encoding="utf-8")) or {}
+        mart = self._load(meta_file)
         dimensions: List[Dict[str, Any]] = []
         for f in sorted(mart_dir.glob("dim_*.yaml")):
-            dimensions.append(yaml.safe_load(f.read_text(encoding="utf-8")) or {})
+            dimensions.append(self._load(f))
         facts: List[Dict[str, Any]] = []
         for f in sorted(mart_dir.glob("fact_*.yaml")):
-            facts.append(yaml.safe_load(f.read_text(encoding="utf-8")) or {})
+            facts.append(self._load(f))
         metrics: List[Dict[str, Any]] = []
         metrics_file = mart_dir / "metrics.yaml"
         if metrics_file.exists():
-            m = yaml.safe_load(metrics_file.read_text(encoding="utf-8")) or {}
+            m = self._load(metrics_file)
             metrics = list(m.get("metrics") or [])
 
-        return {
+        result = {
             "mart": mart,
             "dimensions": dimensions,
             "facts": facts,
             "metrics": metrics,
         }
+        with self._lock:
+            self._marts[name] = (fingerprint, result)
+        return result
+
+    def mart_version(self, name: Optional[str] = None) -> Optional[str]:
+        """Content digest of one mart (None if missing), or of all marts when None."""
+        if name is not None:
+            return self._mart_digest(self.marts_dir / name)
+        parts: List[Tuple[str, str]] = []
+        if self.marts_dir.exists():
+            for path in sorted(self.marts_dir.iterdir()):
+                digest = self._mart_digest(path) if path.is_dir() else None
+                if digest is not None:
+                    parts.append((path.name, digest))
+        return combine_digests(parts)
+
+    def _mart_digest(self, mart_dir: Path) -> Optional[str]:
+        fingerprint = self._fingerprint(mart_dir)
+        if not any(f[0] == "_mart.yaml" for f in fingerprint):
+            return None
+        parts: List[Tuple[str, str]] = []
+        for filename, _, _ in fingerprint:
+            if filename.endswith(".yaml"):
+                doc = self._docs.load(mart_dir / filename)
+                if doc is not None:
+                    parts.append((filename, doc.digest))
+        return combine_digests(parts)
+
+    def _summarise(self, path: Path, fingerprint: _Fingerprint) -> Dict[str, Any]:
+        meta = self._load(path / "_mart.yaml")
+        names = [f[0] for f in fingerprint]
+        n_dims = sum(1 for n in names if n.startswith("dim_") and n.endswith(".yaml"))
+        n_facts = sum(1 for n in names if n.startswith("fact_") and n.endswith(".yaml"))
+        n_metrics = 0
+        if "metrics.yaml" in names:
+            m = self._load(path / "metrics.yaml")
+            n_metrics = len(m.get("metrics") or [])
+        return {
+            "name": meta.get("name") or path.name,
+            "description": meta.get("description", ""),
+            "schema": meta.get("schema") or f"gld_{path.name}",
+            "owner": meta.get("owner", ""),
+            "n_dimensions": n_dims,
+            "n_facts": n_facts,
+            "n_metrics": n_metrics,
+        }
+
+    def _load(self, path: Path) -> Dict[str, Any]:
+        """Parsed YAML for one file, from the (path, mtime, size) cache."""
+        doc = self._docs.load(path)
+        if doc is None:
+            raise FileNotFoundError(f"{path} not found")
+        if doc.error is not None:
+            raise GoldConfigError(f"Invalid YAML in {path}: {doc.error}")
+        return doc.data
+
+    @staticmethod
+    def _fingerprint(mart_dir: Path) -> _Fingerprint:
+        """Cheap change detector for a mart directory — one stat per file."""
+        entries = []
+        try:
+            with os.scandir(mart_dir) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            return ()
+        return tuple(sorted(entries))
+
+    def _invalidate(self, name: str) -> None:
+        with self._lock:
+            self._summaries.pop(name, None)
+            self._marts.pop(name, None)
+        self._docs.invalidate_prefix(self.marts_dir / name)
 
     # ── Writing ──────────────────────────────────────────────────────────────
 
@@ -113,6 +208,7 @@ class GoldConfigService:
 
         if mart_dir.exists() and overwrite:
             shutil.rmtree(mart_dir)
+        self._invalidate(name)
         mart_dir.mkdir(parents=True, exist_ok=False)
 
         # _mart.yaml
@@ -152,6 +248,7 @@ class GoldConfigService:
         if not mart_dir.exists():
             raise FileNotFoundError(f"Mart '{name}' not found")
         shutil.rmtree(mart_dir)
+        self._invalidate(name)
 
     def diff_against_existing(self, ir: Dict[str, Any]) -> Dict[str, Any]:
         """Return a shallow diff comparing the IR to what's currently on disk.
@@ -181,7 +278,8 @@ class GoldConfigService:
             return result
 
         result["exists"] = True
-        existing = self.get_mart(name)
+        # Read-only use, so skip get_mart()'s defensive copy
+        existing = self._read_mart(name)
 
         def _by_name(items: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
             return {it.get("name", ""): it for it in items}
@@ -119,8 +119,10 @@ class GoldReadinessService:
         # 4. Per-source verdict
         source_checks: List[SourceCheck] = []
         for fqn, refs in usage.items():
-            check = self._check_one_source(fqn, refs, bronze_targets, silver_targets, dbx_ok)
+            check = self._check_one_source(fqn, refs, bronze_targets, silver_targets)
             source_checks.append(check)
+        if dbx_ok:
+            self._check_reachability(source_checks)
 
         # 5. Column-level checks (only for sources that resolved + dbx available)
         column_issues = self._check_columns(ir, source_checks, dbx_ok)
@@ -227,7 +229,6 @@ class GoldReadinessService:
         refs: List[str],
         bronze_targets: Dict[str, str],
         silver_targets: Dict[str, str],
-        dbx_ok: bool,
     ) -> SourceCheck:
         layer = self._classify(fqn)
         yaml_present = False
@@ -266,23 +267,27 @@ class GoldReadinessService:
                     f"Source '{fqn}' has an unrecognised schema — could not classify "
                     f"as bronze or silver. Referenced by: {', '.join(refs)}."
                 )
-            return check
-
-        # Databricks reachability
-        if dbx_ok:
-            try:
-                rows = self._dbx.query_sql(f"SELECT 1 FROM {fqn} LIMIT 1")
-                check.table_reachable = True
-            except Exception as e:
-                logger.info("Reachability check failed for %s: %s", fqn, e)
-                check.table_reachable = False
-                check.warning = (
-                    f"YAML for '{fqn}' exists, but the table is not reachable on "
-                    f"Databricks ({e}). Did you deploy + run the pipeline?"
-                )
-
         return check
 
+    def _check_reachability(self, source_checks: List[SourceCheck]) -> None:
+        """``SELECT 1`` against every source whose YAML exists, run concurrently."""
+        pending = [sc for sc in source_checks if sc.yaml_present]
+        if not pending:
+            return
+        results = self._dbx.query_many(
+            [f"SELECT 1 FROM {sc.full_name} LIMIT 1" for sc in pending]
+        )
+        for sc, result in zip(pending, results):
+            if result.ok:
+                sc.table_reachable = True
+                continue
+            logger.info("Reachability check failed for %s: %s", sc.full_name, result.error)
+            sc.table_reachable = False
+            sc.warning = (
+                f"YAML for '{sc.full_name}' exists, but the table is not reachable on "
+                f"Databricks ({result.error}). Did you deploy + run the pipeline?"
+            )
+
     def _check_columns(
         self,
         ir: Dict[str, Any],
@@ -300,22 +305,23 @@ class GoldReadinessService:
         if not describable:
             return []
 
-        # Cache of source -> column set
+        # Cache of source -> column set; every DESCRIBE runs concurrently
         columns_by_source: Dict[str, List[str]] = {}
-        for fqn in describable:
-            try:
-                rows = self._dbx.query_sql(f"DESCRIBE TABLE {fqn}")
-                # `DESCRIBE TABLE` returns col_name / data_type / comment (camelCase varies)
-                cols: List[str] = []
-                for r in rows or []:
-                    name = r.get("col_name") or r.get("colName") or r.get("name") or ""
-                    name = str(name).strip()
-                    if name and not name.startswith("#"):
-                        cols.append(name)
-                columns_by_source[fqn] = cols
-            except Exception as e:
-                logger.warning("DESCRIBE failed for %s: %s", fqn, e)
+        ordered = sorted(describable)
+        results = self._dbx.query_many([f"DESCRIBE TABLE {fqn}" for fqn in ordered])
+        for fqn, result in zip(ordered, results):
+            if not result.ok:
+                logger.warning("DESCRIBE failed for %s: %s", fqn, result.error)
                 columns_by_source[fqn] = []
+                continue
+            # `DESCRIBE TABLE` returns col_name / data_type / comment (camelCase varies)
+            cols: List[str] = []
+            for r in result.rows:
+                name = r.get("col_name") or r.get("colName") or r.get("name") or ""
+                name = str(name).strip()
+                if name and not name.startswith("#"):
+                    cols.append(name)
+            columns_by_source[fqn] = cols
 
         issues: List[ColumnIssue] = []
 
@@ -0,0 +1,161 @@
+"""Pack scheduled Bronze sources into shared multi-task Databricks jobs.
+
+Without ``databricks_cluster_id`` every per-source job provisions its own
+job cluster on each run, so a night of small file sources is mostly spent
+waiting for clusters. With ``settings.databricks_job_packing`` on, sources
+whose schedules are identical (cron expression, timezone and pause status)
+in the same environment run as tasks of one job,
+``bronze_portal_pack-<digest>_<env>``, on a single shared job cluster. The
+tasks have no dependencies, so they run concurrently.
+
+A pack holds at most ``settings.databricks_pack_max_tasks`` sources per job,
+keeping each job under the workspace's per-job task limit and its cluster
+under ``databricks_pack_max_workers``. Larger packs are split, in source-name
+order, into ``pack-<digest>``, ``pack-<digest>-2``, ``pack-<digest>-3``, ...
+
+Membership is never stored separately. It is derived from the source YAMLs
+on every change, so a create, reschedule or delete just re-syncs the packs
+involved. Unscheduled sources keep a standalone job for manual triggers.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from app.config import settings
+from app.services.config_service import ConfigService
+from app.services.databricks_service import DatabricksService
+
+logger = logging.getLogger(__name__)
+
+PACK_PREFIX = "pack-"
+_DIGEST_LENGTH = 10
+
+_pack_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+_pack_locks_guard = threading.Lock()
+
+
+def pack_name(schedule: Optional[Dict]) -> Optional[str]:
+    """The pack a source with ``schedule`` belongs to, or None if it runs standalone."""
+    if not settings.databricks_job_packing or not schedule or not schedule.get("cron_expression"):
+        return None
+    key = "|".join((
+        " ".join(str(schedule["cron_expression"]).split()),
+        schedule.get("timezone") or "UTC",
+        schedule.get("pause_status") or "UNPAUSED",
+    ))
+    return PACK_PREFIX + hashlib.sha1(key.encode("utf-8")).hexdigest()[:_DIGEST_LENGTH]
+
+
+def pack_jobs(pack: str, members: Sequence[str]) -> List[Tuple[str, List[str]]]:
+    """(job name, sources) for each job of ``pack``, in ``members`` order."""
+    size = max(1, settings.databricks_pack_max_tasks)
+    chunks = [list(members[i:i + size]) for i in range(0, len(members), size)]
+    return [(pack if n == 0 else f"{pack}-{n + 1}", chunk) for n, chunk in enumerate(chunks)]
+
+
+def _pack_of_job(job_name: str) -> str:
+    return job_name[:len(PACK_PREFIX) + _DIGEST_LENGTH]
+
+
+def _pack_lock(pack: str) -> threading.Lock:
+    with _pack_locks_guard:
+        return _pack_locks[pack]
+
+
+class JobPacker:
+    """Keeps pack jobs in line with the schedules in the source YAMLs."""
+
+    def __init__(self, config_service: ConfigService, databricks_service: DatabricksService) -> None:
+        self._config = config_service
+        self._db = databricks_service
+
+    def packs(self) -> Dict[str, Tuple[Dict, List[str]]]:
+        """pack name → (shared schedule, sorted member source names)."""
+        grouped: Dict[str, Tuple[Dict, List[str]]] = {}
+        for name, schedule in self._config.schedules().items():
+            pack = pack_name(schedule)
+            if pack is not None:
+                grouped.setdefault(pack, (schedule, []))[1].append(name)
+        return {pack: (schedule, sorted(names)) for pack, (schedule, names) in grouped.items()}
+
+    def job_for(self, name: str, schedule: Optional[Dict]) -> Optional[str]:
+        """The pack job that runs source ``name``, or None if it runs standalone."""
+        pack = pack_name(schedule)
+        if pack is None:
+            return None
+        _, members = self.packs().get(pack, ({}, []))
+        for job, chunk in pack_jobs(pack, members):
+            if name in chunk:
+                return job
+        return pack
+
+    def sync(self, packs: Iterable[Optional[str]]) -> Dict[str, Optional[str]]:
+        """Create, update or delete the jobs of each named pack → member source: job id."""
+        wanted = [p for p in dict.fromkeys(packs) if p]
+        if not wanted:
+            return {}
+        environment = settings.default_environment
+        job_ids: Dict[str, Optional[str]] = {}
+        # Serialise per pack (in a fixed order) so concurrent creates never drop each other's tasks
+        locks = [_pack_lock(p) for p in sorted(wanted)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            current = self.packs()
+            for pack in wanted:
+                schedule, members = current.get(pack, ({}, []))
+                jobs = pack_jobs(pack, members)
+                for job, chunk in jobs:
+                    job_id = self._db.create_or_update_pack_job(job, environment, chunk, schedule)
+                    job_ids.update(dict.fromkeys(chunk, job_id))
+                if jobs:
+                    logger.info("Pack %s: %d sources in %d jobs", pack, len(members), len(jobs))
+                # Jobs of chunks the pack no longer fills (all of them once it is empty)
+                for job in sorted(self._registered_jobs(pack, environment) - {job for job, _ in jobs}):
+                    self._db.delete_job_by_key("bronze", job, environment)
+                    logger.info("Pack job %s has no sources left; deleted", job)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        return job_ids
+
+    def repack_all(self) -> Dict[str, List[str]]:
+        """Bring every Bronze job in line with the current packing mode.
+
+        Syncs all packs and deletes pack jobs that no longer have members.
+        With packing on, standalone jobs of packed sources are removed; with
+        it off, scheduled sources get their standalone jobs back. Used once
+        after flipping ``databricks_job_packing``.
+        """
+        environment = settings.default_environment
+        current = self.packs()
+        stale = {
+            _pack_of_job(entry["name"])
+            for entry in self._db.registered_jobs("bronze")
+            if entry["name"].startswith(PACK_PREFIX) and entry["environment"] == environment
+        }
+        if not settings.databricks_job_packing:
+            for name, schedule in self._config.schedules().items():
+                self._db.create_or_update_job(name, environment, schedule)
+        self.sync(list(current) + sorted(stale - set(current)))
+        for _, members in current.values():
+            for name in members:
+                self._db.delete_job(name, environment)
+        return {
+            job: chunk
+            for pack, (_, members) in current.items()
+            for job, chunk in pack_jobs(pack, members)
+        }
+
+    def _registered_jobs(self, pack: str, environment: str) -> Set[str]:
+        """Job names of ``pack`` this tenant's registry knows, plus the first job's name."""
+        names = {pack}
+        for entry in self._db.registered_jobs("bronze"):
+            if entry["environment"] == environment and entry["name"].startswith(f"{pack}-"):
+                names.add(entry["name"])
+        return names
@@ -0,0 +1,203 @@
+"""Persistent job-name → job-id registry for portal-managed Databricks jobs.
+
+Every deploy, trigger and delete used to resolve the job id with a
+``jobs.list(name=...)`` round-trip. The registry keeps the mapping in the
+portal SQLite database instead, keyed per tenant by (layer, source/entity,
+environment):
+
+- ``DatabricksService`` records ids when it creates a job and looks them up
+  before falling back to a name scan (whose hit is recorded too).
+- ``reconcile()`` replaces a tenant's entries with the result of one bulk
+  ``jobs.list`` pass — run at startup and every
+  ``settings.job_registry_reconcile_seconds``.
+- A stale id (job deleted in the workspace) is dropped by the caller on the
+  first "does not exist" error, which then re-resolves by name.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# ``{layer}_portal_{name}_{environment}`` — environments never contain "_"
+_JOB_NAME_RE = re.compile(r"^(bronze|silver)_portal_(.+)_([^_]+)$")
+
+
+def portal_job_name(layer: str, name: str, environment: str) -> str:
+    """Databricks job name the portal uses for a source/entity deployment."""
+    return f"{layer}_portal_{name}_{environment}"
+
+
+def parse_job_name(job_name: str) -> Optional[Tuple[str, str, str]]:
+    """(layer, name, environment) for a portal job name, None for anything else."""
+    m = _JOB_NAME_RE.match(job_name or "")
+    return (m.group(1), m.group(2), m.group(3)) if m else None
+
+
+class JobRegistry:
+    """SQLite-backed (tenant scope, layer, name, environment) → job_id map."""
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        path = Path(db_path or settings.tenant_db_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db_path = str(path)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self) -> None:
+        with self._get_conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_registry (
+                    scope TEXT NOT NULL,
+                    layer TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    environment TEXT NOT NULL,
+                    job_id INTEGER NOT NULL,
+                    updated_at TEXT DEFAULT (datetime('now')),
+                    PRIMARY KEY (scope, layer, name, environment)
+                )
+            """)
+
+    def get(self, scope: str, layer: str, name: str, environment: str) -> Optional[int]:
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT job_id FROM job_registry "
+                "WHERE scope = ? AND layer = ? AND name = ? AND environment = ?",
+                (scope, layer, name, environment),
+            ).fetchone()
+        return int(row["job_id"]) if row else None
+
+    def put(self, scope: str, layer: str, name: str, environment: str, job_id: int) -> None:
+        with self._lock, self._get_conn() as conn:
+            conn.execute(
+                "INSERT INTO job_registry (scope, layer, name, environment, job_id, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, datetime('now')) "
+                "ON CONFLICT (scope, layer, name, environment) "
+                "DO UPDATE SET job_id = excluded.job_id, updated_at = excluded.updated_at",
+                (scope, layer, name, environment, int(job_id)),
+            )
+
+    def remove(self, scope: str, layer: str, name: str, environment: str) -> None:
+        with self._lock, self._get_conn() as conn:
+            conn.execute(
+                "DELETE FROM job_registry "
+                "WHERE scope = ? AND layer = ? AND name = ? AND environment = ?",
+                (scope, layer, name, environment),
+            )
+
+    def clear(self, scope: str) -> None:
+        """Forget every job id of ``scope`` (its workspace changed)."""
+        with self._lock, self._get_conn() as conn:
+            conn.execute("DELETE FROM job_registry WHERE scope = ?", (scope,))
+
+    def reconcile(self, scope: str, jobs: Iterable[Tuple[str, int]]) -> int:
+        """Replace ``scope``'s entries with the portal jobs in ``jobs``.
+
+        ``jobs`` is ``(job_name, job_id)`` pairs from a full ``jobs.list``;
+        non-portal names are ignored. When a name appears more than once the
+        lowest id (the oldest job) wins, matching what a name scan returns.
+        Returns the number of entries written.
+        """
+        found: Dict[Tuple[str, str, str], int] = {}
+        for job_name, job_id in jobs:
+            key = parse_job_name(job_name)
+            if key is None or job_id is None:
+                continue
+            found[key] = min(int(job_id), found.get(key, int(job_id)))
+        with self._lock, self._get_conn() as conn:
+            conn.execute("DELETE FROM job_registry WHERE scope = ?", (scope,))
+            conn.executemany(
+                "INSERT INTO job_registry (scope, layer, name, environment, job_id) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(scope, *key, job_id) for key, job_id in found.items()],
+            )
+        return len(found)
+
+    def entries(self, scope: str) -> List[dict]:
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                "SELECT layer, name, environment, job_id, updated_at FROM job_registry "
+                "WHERE scope = ? ORDER BY layer, name, environment",
+                (scope,),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+
+_registries: Dict[str, JobRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_job_registry() -> JobRegistry:
+    """Registry for the current ``settings.tenant_db_path`` (created on first use)."""
+    path = str(settings.tenant_db_path)
+    with _registries_lock:
+        registry = _registries.get(path)
+        if registry is None:
+            registry = _registries[path] = JobRegistry(path)
+        return registry
+
+
+class JobRegistrySync:
+    """Background thread that reconciles every tenant's registry on a schedule.
+
+    ``interval_seconds`` > 0 repeats, 0 runs a single startup pass, < 0 disables.
+    """
+
+    def __init__(self, interval_seconds: int) -> None:
+        self._interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._interval < 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="job-registry-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            reconcile_all_tenants()
+            if self._interval == 0:
+                return
+            self._stop.wait(self._interval)
+
+
+def reconcile_all_tenants() -> int:
+    """One reconcile pass for every enabled tenant with Databricks credentials."""
+    from app.dependencies import _get_or_build_databricks_service, get_tenant_service
+
+    total = 0
+    try:
+        tenant_svc = get_tenant_service()
+        tenants = [t for t in tenant_svc.list_tenants() if t.get("enabled")]
+    except Exception as e:
+        logger.warning("Job registry reconcile skipped: %s", e)
+        return 0
+    for tenant in tenants:
+        try:
+            creds = tenant_svc.get_databricks_credentials(tenant["id"])
+            db = _get_or_build_databricks_service(tenant["id"], creds)
+            if db is not None and db.available:
+                total += db.reconcile_jobs()
+        except Exception as e:
+            logger.warning("Job registry reconcile failed for tenant %s: %s", tenant["id"], e)
+    return total
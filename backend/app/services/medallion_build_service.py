@@ -0,0 +1,258 @@
+"""End-to-end refresh of a gold mart's upstream: Bronze → Silver in waves.
+
+``GoldReadinessService`` reports which Bronze sources and Silver entities a
+mart reads, but refreshing them was left to the user. ``MedallionBuildService``
+plans and runs that refresh:
+
+1. **Plan** — resolve every ``source_entity`` of the mart IR to a Bronze
+   source or Silver entity (by target table). Then walk upstream through the
+   Silver dependency graph (``silver_dag``: the Bronze and Silver tables
+   named by each entity's ``bronze_table`` lineage) and sort the result into
+   waves. Every node in a wave has all of its dependencies in earlier waves.
+2. **Run** — on a background thread, trigger every job in a wave through
+   the normal trigger paths (``DeployService`` / ``SilverDeployService``,
+   so packed and DAG jobs are honoured). Wait for the wave on the shared
+   run watcher, then start the next wave. A node whose upstream failed is
+   skipped, while unaffected branches keep going.
+
+Builds are kept in memory (the last ``medallion_build_history`` per process)
+and polled through ``GET /gold/builds/{build_id}``, which only returns the
+starting tenant's builds. The gold build itself has
+no Databricks job yet; a succeeded build means every input is fresh.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from graphlib import TopologicalSorter
+from typing import Any, Dict, List, Optional, Set
+
+from app.config import settings
+from app.services.silver_dag import bronze_table_owners, bronze_task_key, dependency_graph, silver_task_key
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BuildNode:
+    key: str
+    layer: str  # bronze | silver
+    name: str
+    depends_on: List[str] = field(default_factory=list)
+    wave: int = 0
+    state: str = "pending"  # pending | running | succeeded | failed | skipped
+    run_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BuildPlan:
+    mart: str
+    waves: List[List[str]]
+    nodes: Dict[str, BuildNode]
+    unresolved: List[str] = field(default_factory=list)
+
+
+@dataclass
+class BuildStatus:
+    build_id: str
+    mart: str
+    state: str  # running | succeeded | failed
+    waves: List[List[str]]
+    nodes: Dict[str, BuildNode]
+    unresolved: List[str]
+    tenant_id: str = ""
+    current_wave: int = 0
+    started_at: str = ""
+    finished_at: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        out.pop("tenant_id")
+        out["progress"] = {
+            state: sum(1 for n in self.nodes.values() if n.state == state)
+            for state in ("pending", "running", "succeeded", "failed", "skipped")
+        }
+        return out
+
+
+_builds: "OrderedDict[str, BuildStatus]" = OrderedDict()
+_builds_lock = threading.Lock()
+
+
+def get_build(build_id: str, tenant_id: Optional[str] = None) -> Optional[BuildStatus]:
+    """The build, or None when unknown or started by another tenant."""
+    with _builds_lock:
+        status = _builds.get(build_id)
+    if status is None or (tenant_id is not None and status.tenant_id != tenant_id):
+        return None
+    return status
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class MedallionBuildService:
+    def __init__(
+        self,
+        bronze_config_service,
+        silver_config_service,
+        deploy_service,
+        silver_deploy_service,
+        databricks_service,
+    ) -> None:
+        self._bronze = bronze_config_service
+        self._silver = silver_config_service
+        self._deploy = deploy_service
+        self._silver_deploy = silver_deploy_service
+        self._db = databricks_service
+
+    # ── Planning ────────────────────────────────────────────────────────────
+
+    def plan(self, ir: Dict[str, Any]) -> BuildPlan:
+        """Upstream Bronze/Silver nodes of the mart, sorted into waves.
+
+        Raises ValueError on a dependency cycle.
+        """
+        bronze_summaries = self._bronze.list_sources()
+        bronze_targets = {s.target_table: s.name for s in bronze_summaries}
+        silver_targets = {e.target_table: e.name for e in self._silver.list_entities()}
+
+        # Full Bronze+Silver graph, then the part reachable upstream of the mart
+        entities = [
+            entity for name in silver_targets.values()
+            if (entity := self._silver.get_entity(name)) is not None
+        ]
+        owners = bronze_table_owners((s.name, s.target_table) for s in bronze_summaries)
+        graph: Dict[str, BuildNode] = {}
+        for task in dependency_graph(entities, owners).values():
+            graph[task.key] = BuildNode(
+                key=task.key, layer=task.kind, name=task.name, depends_on=list(task.depends_on),
+            )
+
+        roots: List[str] = []
+        unresolved: List[str] = []
+        for fqn in self._mart_sources(ir):
+            if fqn in silver_targets:
+                roots.append(silver_task_key(silver_targets[fqn]))
+            elif fqn in bronze_targets:
+                key = bronze_task_key(bronze_targets[fqn])
+                graph.setdefault(key, BuildNode(key=key, layer="bronze", name=bronze_targets[fqn]))
+                roots.append(key)
+            else:
+                unresolved.append(fqn)
+
+        needed: Set[str] = set()
+        stack = list(roots)
+        while stack:
+            key = stack.pop()
+            if key in needed:
+                continue
+            needed.add(key)
+            stack.extend(graph[key].depends_on)
+
+        nodes = {key: graph[key] for key in sorted(needed)}
+        sorter = TopologicalSorter({k: n.depends_on for k, n in nodes.items()})
+        sorter.prepare()
+        waves: List[List[str]] = []
+        while sorter.is_active():
+            ready = sorted(sorter.get_ready())
+            for key in ready:
+                nodes[key].wave = len(waves)
+            waves.append(ready)
+            sorter.done(*ready)
+        mart = (ir.get("mart") or {}).get("name") or ir.get("name", "")
+        return BuildPlan(mart=mart, waves=waves, nodes=nodes, unresolved=unresolved)
+
+    @staticmethod
+    def _mart_sources(ir: Dict[str, Any]) -> List[str]:
+        sources = [
+            (item.get("source_entity") or "").strip()
+            for kind in ("dimensions", "facts")
+            for item in ir.get(kind, []) or []
+        ]
+        return list(dict.fromkeys(s for s in sources if s))
+
+    # ── Running ─────────────────────────────────────────────────────────────
+
+    def start(self, ir: Dict[str, Any], tenant_id: str = "") -> BuildStatus:
+        """Plan the build for ``tenant_id`` and run it on a background thread."""
+        plan = self.plan(ir)
+        status = BuildStatus(
+            build_id=uuid.uuid4().hex,
+            tenant_id=tenant_id,
+            mart=plan.mart,
+            state="running",
+            waves=plan.waves,
+            nodes=plan.nodes,
+            unresolved=plan.unresolved,
+            started_at=_now(),
+        )
+        with _builds_lock:
+            _builds[status.build_id] = status
+            while len(_builds) > max(1, settings.medallion_build_history):
+                _builds.popitem(last=False)
+        threading.Thread(
+            target=self.run, args=(status,), name=f"medallion-build-{status.build_id[:8]}", daemon=True,
+        ).start()
+        return status
+
+    def run(self, status: BuildStatus) -> BuildStatus:
+        """Run ``status`` wave by wave (blocking) and return it."""
+        try:
+            for index, wave in enumerate(status.waves):
+                status.current_wave = index
+                self._run_wave([status.nodes[k] for k in wave], status.nodes)
+        except Exception as e:
+            logger.exception("Medallion build %s aborted", status.build_id)
+            for node in status.nodes.values():
+                if node.state in ("pending", "running"):
+                    node.state, node.error = "failed", f"Build aborted: {e}"
+        status.state = (
+            "succeeded" if all(n.state == "succeeded" for n in status.nodes.values()) else "failed"
+        )
+        status.finished_at = _now()
+        logger.info("Medallion build %s for %s %s", status.build_id, status.mart, status.state)
+        return status
+
+    def _run_wave(self, wave: List[BuildNode], nodes: Dict[str, BuildNode]) -> None:
+        watches = {}
+        for node in wave:
+            failed_upstream = [d for d in node.depends_on if nodes[d].state != "succeeded"]
+            if failed_upstream:
+                node.state = "skipped"
+                node.error = f"Upstream did not succeed: {', '.join(failed_upstream)}"
+                continue
+            try:
+                node.run_id = self._trigger(node)
+            except Exception as e:
+                node.state, node.error = "failed", str(e)
+                continue
+            if not node.run_id:
+                node.state = "failed"
+                node.error = f"Could not trigger the {node.layer} job for '{node.name}' — deploy it first"
+                continue
+            node.state = "running"
+            label = "source_name" if node.layer == "bronze" else "entity_name"
+            watches[node.key] = self._db.watch_run(
+                node.run_id, settings.medallion_build_run_timeout, labels={label: node.name},
+            )
+
+        for key, future in watches.items():
+            node = nodes[key]
+            if future.result():
+                node.state = "succeeded"
+            else:
+                node.state = "failed"
+                node.error = f"Run {node.run_id} did not succeed"
+
+    def _trigger(self, node: BuildNode) -> Optional[str]:
+        if node.layer == "bronze":
+            return self._deploy.trigger_run(node.name)
+        return self._silver_deploy.trigger_run(node.name)
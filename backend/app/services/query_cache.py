@@ -0,0 +1,194 @@
+"""TTL + LRU cache for read-only Databricks SQL results.
+
+Metadata and monitoring queries (``DESCRIBE TABLE``, ``SHOW TABLES``, audit
+log history, dashboard stats) are repeated on every page load and chat turn.
+``DatabricksService`` consults this cache before sending a read-only
+statement to the warehouse.
+
+Entries are keyed by ``(scope, normalized SQL)``, where scope is the tenant,
+and expire after a per-statement-class TTL (``settings.sql_cache_ttl_*``).
+Each entry remembers the tables its statement references. That lets
+``invalidate_tables()`` drop everything touching a table when a job run
+rewrites it. Write statements that go through ``DatabricksService`` trigger
+the same invalidation for the tables they name.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from app.config import settings
+
+_WS_RE = re.compile(r"\s+")
+_STATEMENT_CLASS_RE = re.compile(r"^\s*(\w+)", re.IGNORECASE)
+# Identifiers following a table-introducing keyword: FROM x, JOIN x, TABLE x, IN x, INTO x ...
+_TABLE_REF_RE = re.compile(
+    r"\b(?:FROM|JOIN|TABLE|TABLES\s+IN|IN|INTO|UPDATE|EXISTS)\s+((?:`[^`]+`|[\w$]+)(?:\.(?:`[^`]+`|[\w$]+)){0,2})",
+    re.IGNORECASE,
+)
+_VARIABLE_RE = re.compile(r"\$\{(\w+)\}")
+_READ_CLASSES = {"describe": "describe", "desc": "describe", "show": "show", "select": "select", "with": "select"}
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and drop a trailing semicolon (literals are kept as-is)."""
+    return _WS_RE.sub(" ", sql).strip().rstrip(";").strip()
+
+
+def statement_class(sql: str) -> Optional[str]:
+    """``describe`` / ``show`` / ``select`` for cacheable reads, None otherwise."""
+    m = _STATEMENT_CLASS_RE.match(sql)
+    return _READ_CLASSES.get(m.group(1).lower()) if m else None
+
+
+def referenced_tables(sql: str) -> FrozenSet[str]:
+    """Lower-cased, backtick-free object names the statement mentions."""
+    out = set()
+    for m in _TABLE_REF_RE.finditer(sql):
+        name = m.group(1).replace("`", "").lower()
+        if name and name not in ("select", "values"):
+            out.add(name)
+    return frozenset(out)
+
+
+def resolve_table_name(name: str, variables: Dict[str, Any]) -> str:
+    """Substitute ``${var}`` placeholders; parts that stay templated are dropped.
+
+    ``${catalog}.bronze.orders`` becomes ``dev.bronze.orders`` when
+    ``variables`` define ``catalog`` and ``bronze.orders`` otherwise, which
+    still matches cached statements by suffix.
+    """
+    name = _VARIABLE_RE.sub(lambda m: str(variables.get(m.group(1), m.group(0))), name)
+    return ".".join(p for p in name.split(".") if "$" not in p)
+
+
+def _related(a: str, b: str) -> bool:
+    """Same object, or one is a catalog/schema prefix or a shorter suffix of the other."""
+    if a == b:
+        return True
+    return (
+        a.startswith(b + ".") or b.startswith(a + ".")
+        or a.endswith("." + b) or b.endswith("." + a)
+    )
+
+
+@dataclass
+class _Entry:
+    rows: List[Dict[str, Any]]
+    expires_at: float
+    tables: FrozenSet[str]
+
+
+class QueryResultCache:
+    """Process-wide, thread-safe result cache shared by every DatabricksService."""
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    # ── Lookup / store ──────────────────────────────────────────────────────
+
+    def get(self, scope: str, sql: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached rows (copied) for a read statement, or None on a miss."""
+        if not settings.sql_cache_enabled or statement_class(sql) is None:
+            return None
+        key = (scope, normalize_sql(sql))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return [dict(r) for r in entry.rows]
+
+    def put(self, scope: str, sql: str, rows: List[Dict[str, Any]]) -> None:
+        cls = statement_class(sql)
+        if not settings.sql_cache_enabled or cls is None:
+            return
+        ttl = self._ttl(cls)
+        if ttl <= 0:
+            return
+        key = (scope, normalize_sql(sql))
+        entry = _Entry(
+            rows=[dict(r) for r in rows],
+            expires_at=time.monotonic() + ttl,
+            tables=referenced_tables(sql),
+        )
+        limit = self._max_entries or settings.sql_cache_max_entries
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > limit:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    # ── Invalidation ────────────────────────────────────────────────────────
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """Drop every entry (any scope) that references one of ``tables``.
+
+        Names may be ``catalog.schema.table``, ``schema.table`` or a bare
+        ``catalog.schema`` prefix. Returns the number of entries dropped.
+        """
+        targets = [t.replace("`", "").lower() for t in tables if t]
+        if not targets:
+            return 0
+        with self._lock:
+            doomed = [
+                key for key, entry in self._entries.items()
+                if any(_related(t, x) for t in entry.tables for x in targets)
+            ]
+            for key in doomed:
+                del self._entries[key]
+            self._invalidations += len(doomed)
+        return len(doomed)
+
+    def invalidate_statement(self, sql: str) -> int:
+        """Invalidate whatever a write statement touches; no-op for reads."""
+        if statement_class(sql) is not None:
+            return 0
+        return self.invalidate_tables(referenced_tables(sql))
+
+    def clear(self, scope: Optional[str] = None) -> None:
+        with self._lock:
+            if scope is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == scope]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "size": len(self._entries),
+            }
+
+    @staticmethod
+    def _ttl(cls: str) -> int:
+        return {
+            "describe": settings.sql_cache_ttl_describe,
+            "show": settings.sql_cache_ttl_show,
+            "select": settings.sql_cache_ttl_select,
+        }[cls]
+
+
+# Shared by all DatabricksService instances — they are rebuilt per tenant/request
+query_cache = QueryResultCache()
@@ -12,6 +12,7 @@ from app.services.audit_service import AuditService
 from app.services.config_service import ConfigService
 from app.services.deploy_service import DeployService
 from app.services.embedding_service import EmbeddingService
+from app.services.run_history_store import catalog_of
 from app.services.audit_tools import AUDIT_TOOLS, execute_audit_tool
 from app.services.pipeline_tools import PIPELINE_TOOLS, execute_tool
 from app.services.silver_config_service import SilverConfigService
@@ -24,6 +25,9 @@ from app.services.tenant_service import TenantService
 
 logger = logging.getLogger(__name__)
 
+# Latest runs per source quoted in the live operational context
+_OPERATIONAL_RUNS_PER_SOURCE = 3
+
 
 class QueryType:
     CONFIG = "config"
@@ -229,7 +233,7 @@ class RAGService:
     # ── Context Retrieval ──
 
     def _get_operational_context(self, tenant_id: str) -> str:
-        """Fetch live operational data from AuditService."""
+        """Fetch live operational data from AuditService (every source, one query)."""
         context_parts = []
 
         sources = self._config.list_sources()
@@ -241,19 +245,15 @@ class RAGService:
             + ", ".join(s.name for s in sources)
         )
 
-        for source in sources[:5]:
-            detail = self._config.get_source(source.name)
-            if not detail:
-                continue
-            catalog = detail.target.get("catalog", "")
-            if not catalog:
-                continue
-
-            try:
-                runs = self._audit.get_run_history(source.name, catalog, limit=5)
-            except Exception:
-                runs = []
+        try:
+            latest = self._audit.get_latest_runs(
+                {s.name: catalog_of(s) for s in sources}, limit=_OPERATIONAL_RUNS_PER_SOURCE,
+            )
+        except Exception:
+            latest = {}
 
+        for source in sources:
+            runs = latest.get(source.name)
             if runs:
                 context_parts.append(f"\nRecent runs for '{source.name}':")
                 for run in runs:
@@ -0,0 +1,248 @@
+"""Per-tenant push stream of run state transitions and test-case progress.
+
+Monitoring pages used to re-poll ``/bronze/sources/{name}/runs`` and
+``/testing/suites/{name}/results/latest``, so every open tab cost a warehouse
+query or a results-directory scan per refresh. ``RunEventHub`` pushes the
+same information over server-sent events instead (``GET /events``):
+
+- **job_run** — published by the shared ``RunWatcher`` when it starts
+  watching a run and when the run terminates. Runs triggered for a source
+  or entity carry its ``source_name`` / ``entity_name``.
+- **test_progress** — published by ``TestingService`` every time a suite
+  result is saved (placeholder, each finished test case, final status).
+- **run** — the hub's own watcher thread polls the latest run of every
+  Bronze source once per ``run_events_poll_seconds``, for each tenant that
+  has at least one open stream. That is one ``get_latest_runs`` query per
+  tenant no matter how many tabs are open, and it is answered from the
+  run-history store when that is fresh. Only changes are published.
+
+Each tenant keeps the last ``run_events_history`` events, so a reconnecting
+``EventSource`` resumes from its ``Last-Event-ID``. A new stream first gets a
+``snapshot`` event with the latest run status per source; so does one whose
+``Last-Event-ID`` is older than the retained events (or from before a
+restart), since replaying would silently skip what was dropped. The first
+stream of a tenant polls the latest runs itself, so its snapshot is not
+empty. A ``source`` stream only gets events carrying that ``source_name``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_QUEUE_SIZE = 1000  # events buffered per stream before the oldest are dropped
+
+
+@dataclass
+class RunEvent:
+    type: str
+    data: Dict[str, Any]
+    id: Optional[int] = None  # None for per-stream events (snapshot) that are not replayed
+
+    def encode(self) -> str:
+        """The event in ``text/event-stream`` framing."""
+        head = f"id: {self.id}\n" if self.id is not None else ""
+        return f"{head}event: {self.type}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+
+@dataclass
+class _Subscriber:
+    loop: asyncio.AbstractEventLoop
+    queue: "asyncio.Queue[RunEvent]"
+    source: Optional[str] = None
+
+    def wants(self, event: RunEvent) -> bool:
+        return self.source is None or event.data.get("source_name") == self.source
+
+
+@dataclass
+class _Tenant:
+    service: Any = None
+    subscribers: List[_Subscriber] = field(default_factory=list)
+    history: Deque[RunEvent] = field(default_factory=deque)
+    evicted_through: int = 0  # id of the newest event dropped from ``history``
+    # source name → (start_time, status) of its latest run; None until the first poll
+    latest: Optional[Dict[str, Tuple[Any, Any]]] = None
+
+
+def _offer(queue: "asyncio.Queue[RunEvent]", event: RunEvent) -> None:
+    if queue.full():
+        queue.get_nowait()  # a stalled client loses its oldest events, never blocks publishers
+    queue.put_nowait(event)
+
+
+class RunEventHub:
+    """Fan-out of run / test events to every open stream of a tenant."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._tenants: Dict[str, _Tenant] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    # ── Publishing ──────────────────────────────────────────────────────────
+
+    def publish(self, scope: str, event_type: str, data: Dict[str, Any]) -> RunEvent:
+        """Record an event for ``scope`` and hand it to the tenant's open streams."""
+        with self._lock:
+            event = RunEvent(type=event_type, data=data, id=next(self._ids))
+            self._last_id = event.id
+            tenant = self._tenants.setdefault(scope, _Tenant())
+            tenant.history.append(event)
+            while len(tenant.history) > max(0, settings.run_events_history):
+                tenant.evicted_through = tenant.history.popleft().id
+            subscribers = [s for s in tenant.subscribers if s.wants(event)]
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(_offer, sub.queue, event)
+            except RuntimeError:
+                pass  # the stream's loop has closed; it unsubscribes on its way out
+        return event
+
+    # ── Streaming ───────────────────────────────────────────────────────────
+
+    async def stream(
+        self,
+        service: Any,
+        last_event_id: Optional[int] = None,
+        source: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """SSE frames for ``service``'s tenant until ``run_events_max_stream_seconds``.
+
+        Replays the events after ``last_event_id`` while they are all still
+        retained, otherwise starts with a snapshot of the latest run per
+        source. Idle streams get a comment line every
+        ``run_events_keepalive_seconds``.
+        """
+        scope = service.scope
+        sub = _Subscriber(loop=asyncio.get_running_loop(), queue=asyncio.Queue(_QUEUE_SIZE), source=source)
+        with self._lock:
+            tenant = self._tenants.setdefault(scope, _Tenant())
+            seed = tenant.latest is None and not self._can_resume(tenant, last_event_id)
+        if seed:
+            try:
+                await asyncio.to_thread(self._poll_runs, scope, service)
+            except Exception as e:
+                logger.warning("Run event snapshot poll failed for %s: %s", scope, e)
+        with self._lock:
+            tenant = self._tenants.setdefault(scope, _Tenant())
+            tenant.service = service
+            tenant.subscribers.append(sub)
+            if self._can_resume(tenant, last_event_id):
+                backlog = [e for e in tenant.history if e.id > last_event_id and sub.wants(e)]
+            else:
+                latest = dict(tenant.latest or {})
+                if source is not None:
+                    latest = {k: v for k, v in latest.items() if k == source}
+                backlog = [RunEvent(type="snapshot", data={"runs": {
+                    name: {"start_time": start, "status": status} for name, (start, status) in latest.items()
+                }})]
+        deadline = time.monotonic() + settings.run_events_max_stream_seconds
+        try:
+            yield f"retry: {settings.run_events_retry_ms}\n\n"
+            for event in backlog:
+                yield event.encode()
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    event = await asyncio.wait_for(
+                        sub.queue.get(), min(remaining, settings.run_events_keepalive_seconds),
+                    )
+                except asyncio.TimeoutError:
+                    if deadline - time.monotonic() > 0:
+                        yield ": keepalive\n\n"
+                    continue
+                yield event.encode()
+        finally:
+            with self._lock:
+                if sub in tenant.subscribers:
+                    tenant.subscribers.remove(sub)
+                if not tenant.subscribers:
+                    tenant.service = None
+
+    def _can_resume(self, tenant: _Tenant, last_event_id: Optional[int]) -> bool:
+        """True if every event after ``last_event_id`` is still in ``tenant.history``."""
+        return last_event_id is not None and tenant.evicted_through <= last_event_id <= self._last_id
+
+    def subscribers(self, scope: str) -> int:
+        with self._lock:
+            tenant = self._tenants.get(scope)
+            return len(tenant.subscribers) if tenant else 0
+
+    # ── Audit-log watcher ───────────────────────────────────────────────────
+
+    def tick(self) -> int:
+        """Poll the latest runs of every tenant with open streams → events published."""
+        with self._lock:
+            watched = [(scope, t.service) for scope, t in self._tenants.items() if t.subscribers and t.service]
+        published = 0
+        for scope, service in watched:
+            try:
+                published += self._poll_runs(scope, service)
+            except Exception as e:
+                logger.warning("Run event poll failed for %s: %s", scope, e)
+        return published
+
+    def _poll_runs(self, scope: str, service: Any) -> int:
+        if not getattr(service, "available", False):
+            return 0
+        from app.dependencies import get_config_service
+        from app.services.audit_service import AuditService
+        from app.services.run_history_store import catalog_of
+
+        sources = get_config_service().list_sources()
+        latest = AuditService(service).get_latest_runs({s.name: catalog_of(s) for s in sources}, limit=1)
+        current = {name: (runs[0].get("start_time"), runs[0].get("status")) for name, runs in latest.items() if runs}
+        with self._lock:
+            tenant = self._tenants.setdefault(scope, _Tenant())
+            previous, tenant.latest = tenant.latest, current
+        if previous is None:
+            return 0  # first look only seeds the snapshot
+        changed = [name for name, key in sorted(current.items()) if previous.get(name) != key]
+        for name in changed:
+            self.publish(scope, "run", {"source_name": name, **latest[name][0]})
+        return len(changed)
+
+    # ── Background loop ─────────────────────────────────────────────────────
+
+    def start(self, interval_seconds: Optional[int] = None) -> None:
+        """Run ``tick`` every ``interval_seconds`` on a daemon thread (<= 0 disables)."""
+        interval = settings.run_events_poll_seconds if interval_seconds is None else interval_seconds
+        with self._thread_lock:
+            if interval <= 0 or self._thread is not None:
+                return
+            self._stop.clear()
+            thread = threading.Thread(target=self._loop, args=(interval,), name="run-events", daemon=True)
+            thread.start()
+            self._thread = thread
+
+    def stop(self) -> None:
+        with self._thread_lock:
+            self._stop.set()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _loop(self, interval: int) -> None:
+        while not self._stop.wait(interval):
+            self.tick()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tenants.clear()
+
+
+run_event_hub = RunEventHub()
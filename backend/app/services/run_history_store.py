@@ -0,0 +1,422 @@
+"""Local copy of the Bronze / Silver audit logs, synced incrementally.
+
+Every run-history page view used to query
+``{catalog}.bronze_meta.ingestion_audit_log`` or
+``{catalog}.slv_meta.transformation_audit_log`` on the warehouse.
+``RunHistoryStore`` keeps those rows in a SQLite file in the portal data
+dir (``settings.run_history_db_path``), keyed per tenant scope and catalog:
+
+- ``sync`` pulls only rows with ``start_time`` at or after the stored
+  watermark, minus ``run_history_lookback_minutes`` so that runs whose
+  audit row is rewritten when they finish are picked up again. Runs stored
+  as RUNNING reach further back, up to the longest a job run may last, so
+  a run longer than the lookback is still seen finishing. Rows are
+  upserted, so the overlap never duplicates anything. A catalog seen for
+  the first time is backfilled ``run_history_backfill_days``.
+- ``RunHistorySync`` runs one pass per tenant every
+  ``run_history_sync_seconds`` for every catalog a source / entity targets.
+- ``AuditService`` answers from the store (indexed, paginated by time range
+  and status) while the catalog's last sync is fresh, and falls back to
+  the live query otherwise.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.services.databricks_service import JOB_RUN_WATCH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# layer → (audit table under the catalog, name column, columns copied)
+AUDIT_TABLES: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "bronze": (
+        "bronze_meta.ingestion_audit_log",
+        "source_name",
+        (
+            "source_name", "environment", "start_time", "end_time", "status",
+            "records_read", "records_written", "records_quarantined", "error",
+        ),
+    ),
+    "silver": (
+        "slv_meta.transformation_audit_log",
+        "entity_name",
+        (
+            "entity_name", "domain", "target_table", "status", "start_time", "end_time",
+            "records_read", "records_written", "records_skipped", "error_message",
+            "scd_type", "bronze_sources",
+        ),
+    ),
+}
+
+# Audit statuses of runs still in flight; their rows are re-read until they finish
+_OPEN_STATUSES = ("RUNNING",)
+_INT_COLUMNS = {"records_read", "records_written", "records_quarantined", "records_skipped"}
+_SYNC_BATCH = 5000
+
+
+def normalize_timestamp(value: Any) -> Optional[str]:
+    """``YYYY-MM-DD HH:MM:SS[.ffffff]`` in UTC, which sorts as text; None if unparseable."""
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat(sep=" ")
+
+
+class RunHistoryStore:
+    """SQLite-backed audit rows per (tenant scope, layer, catalog)."""
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        path = Path(db_path or settings.run_history_db_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db_path = str(path)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self) -> None:
+        with self._get_conn() as conn:
+            for layer, (_, name_col, columns) in AUDIT_TABLES.items():
+                cols = ", ".join(
+                    f"{c} INTEGER NOT NULL DEFAULT 0" if c in _INT_COLUMNS else f"{c} TEXT"
+                    for c in columns if c not in (name_col, "start_time")
+                )
+                conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {layer}_runs (
+                        scope TEXT NOT NULL,
+                        catalog TEXT NOT NULL,
+                        {name_col} TEXT NOT NULL,
+                        start_time TEXT NOT NULL,
+                        {cols},
+                        PRIMARY KEY (scope, catalog, {name_col}, start_time)
+                    )
+                """)
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{layer}_runs_status "
+                    f"ON {layer}_runs (scope, catalog, {name_col}, status, start_time)"
+                )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS run_history_sync (
+                    scope TEXT NOT NULL,
+                    layer TEXT NOT NULL,
+                    catalog TEXT NOT NULL,
+                    watermark TEXT,
+                    synced_at TEXT NOT NULL,
+                    PRIMARY KEY (scope, layer, catalog)
+                )
+            """)
+
+    # ── Sync state ──────────────────────────────────────────────────────────
+
+    def sync_state(self, scope: str, layer: str, catalog: str) -> Tuple[Optional[str], Optional[str]]:
+        """(watermark, synced_at) of the last successful sync, or (None, None)."""
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT watermark, synced_at FROM run_history_sync "
+                "WHERE scope = ? AND layer = ? AND catalog = ?",
+                (scope, layer, catalog),
+            ).fetchone()
+        return (row["watermark"], row["synced_at"]) if row else (None, None)
+
+    def covers(self, scope: str, layer: str, catalog: str) -> bool:
+        """True if the catalog was synced recently enough to answer reads."""
+        if settings.run_history_sync_seconds <= 0:
+            return False
+        _, synced_at = self.sync_state(scope, layer, catalog)
+        if synced_at is None:
+            return False
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(synced_at)
+        return age <= timedelta(seconds=max(3 * settings.run_history_sync_seconds, 180))
+
+    # ── Writes ──────────────────────────────────────────────────────────────
+
+    def upsert(self, scope: str, layer: str, catalog: str, rows: Iterable[Dict[str, Any]]) -> int:
+        _, name_col, columns = AUDIT_TABLES[layer]
+        records = []
+        for row in rows:
+            start = normalize_timestamp(row.get("start_time"))
+            if start is None or not row.get(name_col):
+                continue
+            values = []
+            for col in columns:
+                value = row.get(col)
+                if col == "start_time":
+                    value = start
+                elif col == "end_time":
+                    value = normalize_timestamp(value)
+                elif col in _INT_COLUMNS:
+                    value = int(value or 0)
+                values.append(value)
+            records.append((scope, catalog, *values))
+        if not records:
+            return 0
+        placeholders = ", ".join("?" for _ in range(len(columns) + 2))
+        with self._lock, self._get_conn() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {layer}_runs (scope, catalog, {', '.join(columns)}) "
+                f"VALUES ({placeholders})",
+                records,
+            )
+        return len(records)
+
+    def _mark_synced(self, scope: str, layer: str, catalog: str, watermark: Optional[str]) -> None:
+        with self._lock, self._get_conn() as conn:
+            conn.execute(
+                "INSERT INTO run_history_sync (scope, layer, catalog, watermark, synced_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (scope, layer, catalog) DO UPDATE SET "
+                "watermark = COALESCE(excluded.watermark, run_history_sync.watermark), "
+                "synced_at = excluded.synced_at",
+                (scope, layer, catalog, watermark, datetime.now(timezone.utc).isoformat()),
+            )
+
+    def clear(self, scope: str) -> None:
+        """Forget every stored run and watermark of ``scope`` (its workspace changed)."""
+        with self._lock, self._get_conn() as conn:
+            for layer in AUDIT_TABLES:
+                conn.execute(f"DELETE FROM {layer}_runs WHERE scope = ?", (scope,))
+            conn.execute("DELETE FROM run_history_sync WHERE scope = ?", (scope,))
+
+    # ── Reads ───────────────────────────────────────────────────────────────
+
+    def runs(
+        self,
+        scope: str,
+        layer: str,
+        catalog: str,
+        name: str,
+        limit: int = 50,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        before: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Newest-first runs of ``name``; ``before`` (exclusive) pages backwards."""
+        _, name_col, columns = AUDIT_TABLES[layer]
+        sql = f"SELECT {', '.join(columns)} FROM {layer}_runs WHERE scope = ? AND catalog = ? AND {name_col} = ?"
+        params: List[Any] = [scope, catalog, name]
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        if since and (since := normalize_timestamp(since)):
+            sql += " AND start_time >= ?"
+            params.append(since)
+        if before and (before := normalize_timestamp(before)):
+            sql += " AND start_time < ?"
+            params.append(before)
+        sql += " ORDER BY start_time DESC LIMIT ?"
+        params.append(limit)
+        with self._get_conn() as conn:
+            return [dict(r) for r in conn.execute(sql, params).fetchall()]
+
+    def latest_runs(
+        self, scope: str, layer: str, names_by_catalog: Dict[str, List[str]], limit: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """The newest ``limit`` runs of every name, newest first within each name."""
+        _, name_col, columns = AUDIT_TABLES[layer]
+        clauses, params = [], [scope]
+        for catalog, names in names_by_catalog.items():
+            clauses.append(f"(catalog = ? AND {name_col} IN ({', '.join('?' for _ in names)}))")
+            params.extend([catalog, *names])
+        if not clauses:
+            return []
+        cols = ", ".join(columns)
+        sql = (
+            f"SELECT {cols} FROM ("
+            f"SELECT {cols}, ROW_NUMBER() OVER "
+            f"(PARTITION BY catalog, {name_col} ORDER BY start_time DESC) AS rn "
+            f"FROM {layer}_runs WHERE scope = ? AND ({' OR '.join(clauses)})"
+            f") WHERE rn <= ? ORDER BY {name_col}, start_time DESC"
+        )
+        with self._get_conn() as conn:
+            return [dict(r) for r in conn.execute(sql, [*params, limit]).fetchall()]
+
+    def runs_since(self, scope: str, layer: str, catalogs: List[str], since: str) -> List[Dict[str, Any]]:
+        """Every run in ``catalogs`` started at or after ``since``, with ``duration_seconds``."""
+        _, _, columns = AUDIT_TABLES[layer]
+        placeholders = ", ".join("?" for _ in catalogs)
+        sql = (
+            f"SELECT catalog, {', '.join(columns)}, "
+            f"(julianday(end_time) - julianday(start_time)) * 86400.0 AS duration_seconds "
+            f"FROM {layer}_runs WHERE scope = ? AND catalog IN ({placeholders}) AND start_time >= ?"
+        )
+        with self._get_conn() as conn:
+            rows = conn.execute(sql, [scope, *catalogs, normalize_timestamp(since) or since]).fetchall()
+        return [dict(r) for r in rows]
+
+    def _oldest_open_start(self, scope: str, layer: str, catalog: str, not_before: str) -> Optional[str]:
+        """Start of the oldest stored run still in an open status, from ``not_before`` on."""
+        with self._get_conn() as conn:
+            row = conn.execute(
+                f"SELECT MIN(start_time) AS start_time FROM {layer}_runs "
+                f"WHERE scope = ? AND catalog = ? AND start_time >= ? "
+                f"AND status IN ({', '.join('?' for _ in _OPEN_STATUSES)})",
+                (scope, catalog, not_before, *_OPEN_STATUSES),
+            ).fetchone()
+        return row["start_time"] if row else None
+
+    # ── Sync ────────────────────────────────────────────────────────────────
+
+    def sync(self, db, layer: str, catalog: str) -> int:
+        """Pull new audit rows of one catalog from the warehouse → rows upserted.
+
+        Raises RuntimeError when the warehouse query fails; the catalog then
+        keeps its previous watermark and reads fall back to live queries once
+        the last sync goes stale.
+        """
+        table, _, columns = AUDIT_TABLES[layer]
+        scope = db.scope
+        watermark, _ = self.sync_state(scope, layer, catalog)
+        if watermark:
+            newest = datetime.fromisoformat(watermark)
+            since = newest - timedelta(minutes=settings.run_history_lookback_minutes)
+            # A run can outlast the lookback; keep re-reading open rows for as
+            # long as a job run may last, so they do not stay RUNNING for good
+            oldest_open = self._oldest_open_start(
+                scope, layer, catalog,
+                (newest - timedelta(seconds=JOB_RUN_WATCH_SECONDS)).isoformat(sep=" ", timespec="seconds"),
+            )
+            if oldest_open:
+                since = min(since, datetime.fromisoformat(oldest_open))
+        else:
+            since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=settings.run_history_backfill_days)
+        cursor = since.isoformat(sep=" ", timespec="seconds")
+
+        total = 0
+        newest = watermark
+        while True:
+            sql = (
+                f"SELECT {', '.join(columns)} FROM {catalog}.{table} "
+                f"WHERE start_time >= '{cursor}' ORDER BY start_time LIMIT {_SYNC_BATCH}"
+            )
+            rows = list(db.iter_sql_rows(sql))
+            total += self.upsert(scope, layer, catalog, rows)
+            starts = [s for s in (normalize_timestamp(r.get("start_time")) for r in rows) if s]
+            if starts:
+                newest = max(filter(None, (newest, max(starts))))
+            if len(rows) < _SYNC_BATCH or not starts:
+                break
+            last = max(starts)[:19]
+            if last == cursor:
+                break  # a whole batch shares one second; the next sync moves on
+            cursor = last
+        self._mark_synced(scope, layer, catalog, newest)
+        return total
+
+
+_stores: Dict[str, RunHistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_run_history_store() -> RunHistoryStore:
+    """Store for the current ``settings.run_history_db_path`` (created on first use)."""
+    path = str(settings.run_history_db_path)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = RunHistoryStore(path)
+        return store
+
+
+def catalog_of(summary: Any) -> Optional[str]:
+    """Catalog of a summary's ``target_table``; None when empty or templated."""
+    catalog = (summary.target_table or "").split(".")[0]
+    return catalog if catalog and "$" not in catalog else None
+
+
+def catalogs_of(summaries: Iterable[Any]) -> List[str]:
+    """Distinct catalogs of the summaries' ``target_table`` (templated ones skipped)."""
+    return sorted({c for c in map(catalog_of, summaries) if c})
+
+
+def audit_catalogs() -> Dict[str, List[str]]:
+    """layer → catalogs targeted by the configured sources / entities."""
+    from app.dependencies import get_config_service, get_silver_config_service
+
+    return {
+        "bronze": catalogs_of(get_config_service().list_sources()),
+        "silver": catalogs_of(get_silver_config_service().list_entities()),
+    }
+
+
+def sync_tenant(db) -> int:
+    """One incremental pass over every audited catalog for ``db``'s tenant."""
+    store = get_run_history_store()
+    total = 0
+    for layer, catalogs in audit_catalogs().items():
+        for catalog in catalogs:
+            try:
+                total += store.sync(db, layer, catalog)
+            except Exception as e:
+                logger.warning("Run history sync of %s %s for %s failed: %s", layer, catalog, db.scope, e)
+    return total
+
+
+def sync_all_tenants() -> int:
+    """One sync pass for every enabled tenant with Databricks credentials."""
+    from app.dependencies import _get_or_build_databricks_service, get_tenant_service
+
+    total = 0
+    try:
+        tenant_svc = get_tenant_service()
+        tenants = [t for t in tenant_svc.list_tenants() if t.get("enabled")]
+    except Exception as e:
+        logger.warning("Run history sync skipped: %s", e)
+        return 0
+    for tenant in tenants:
+        try:
+            creds = tenant_svc.get_databricks_credentials(tenant["id"])
+            db = _get_or_build_databricks_service(tenant["id"], creds)
+            if db is not None and db.available:
+                total += sync_tenant(db)
+        except Exception as e:
+            logger.warning("Run history sync failed for tenant %s: %s", tenant["id"], e)
+    return total
+
+
+class RunHistorySync:
+    """Background thread that syncs every tenant's run history on a schedule.
+
+    ``interval_seconds`` > 0 repeats, 0 runs a single startup pass, < 0 disables.
+    """
+
+    def __init__(self, interval_seconds: int) -> None:
+        self._interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._interval < 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="run-history-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            sync_all_tenants()
+            if self._interval == 0:
+                return
+            self._stop.wait(self._interval)
@@ -0,0 +1,246 @@
+"""Shared run-completion poller for Databricks job runs.
+
+Waiting on a job run used to park one thread per run in a fixed 10-second
+``sleep`` loop. A RunWatcher instead tracks every in-flight run id for a
+tenant from a single background thread and hands out
+``concurrent.futures.Future`` objects that resolve to True (SUCCESS) or
+False (any other terminal state, or the caller's timeout):
+
+- Each run is polled on its own adaptive schedule: ``run_watch_initial_interval``
+  after it is registered, then backing off by ``run_watch_backoff`` up to
+  ``run_watch_max_interval``. Short runs are noticed within seconds; long
+  runs stop burning API calls.
+- When at least ``run_watch_batch_threshold`` runs are due together, their
+  states come from a ``jobs.list_runs(completed_only=True)`` listing rather
+  than one ``get_run`` per run. The listing stops after
+  ``run_watch_batch_max_pages`` pages, so a busy workspace cannot make it
+  dearer than polling; runs it did not reach are polled individually.
+- The thread exits when nothing is being watched and is restarted by the
+  next ``watch()``.
+- Tables registered with a watch are invalidated in the SQL result cache
+  once the run reaches a terminal state (or the watch times out), so reads
+  made while the run was writing do not outlive it.
+
+Callers block with ``future.result()``, await with ``asyncio.wrap_future``,
+or attach ``future.add_done_callback``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+from app.config import settings
+from app.services.query_cache import query_cache
+from app.services.run_events import run_event_hub
+
+logger = logging.getLogger(__name__)
+
+_TERMINAL_STATES = ("TERMINATED", "SKIPPED", "INTERNAL_ERROR")
+# list_runs start_time_from slack — run_now starts the clock slightly before we watch
+_BATCH_SLACK_MS = 60_000
+_BATCH_PAGE_SIZE = 25
+
+
+def _enum_value(value: Any) -> str:
+    return str(getattr(value, "value", value) or "")
+
+
+def run_outcome(state: Any) -> Optional[bool]:
+    """True/False for a terminal run state (SUCCESS or not), None while running."""
+    if state is None:
+        return None
+    if _enum_value(getattr(state, "life_cycle_state", None)) not in _TERMINAL_STATES:
+        return None
+    return _enum_value(getattr(state, "result_state", None)) == "SUCCESS"
+
+
+@dataclass
+class _Watch:
+    run_id: int
+    future: "Future[bool]"
+    deadline: float
+    interval: float
+    next_check: float
+    registered_ms: int
+    tables: Set[str]
+    labels: Dict[str, str]
+
+
+class RunWatcher:
+    """Poll a set of run ids for one workspace client from a single thread."""
+
+    def __init__(self, client: Any, scope: str) -> None:
+        self._client = client
+        self._scope = scope
+        self._watches: Dict[int, _Watch] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def set_client(self, client: Any) -> None:
+        """Switch to a freshly built client (DatabricksService instances are rebuilt)."""
+        self._client = client
+
+    def watch(
+        self,
+        run_id: int,
+        timeout: float,
+        tables: Iterable[str] = (),
+        labels: Optional[Mapping[str, str]] = None,
+    ) -> "Future[bool]":
+        """Future resolving when ``run_id`` terminates or ``timeout`` seconds pass.
+
+        ``tables`` are invalidated in the query cache when the run ends.
+        ``labels`` (e.g. ``source_name``) are added to the run's ``job_run``
+        events, so filtered event streams can tell whose run it is.
+        Watching a run that is already tracked returns the same future (the
+        later deadline wins, the tables and labels are merged).
+        """
+        now = time.monotonic()
+        with self._lock:
+            watch = self._watches.get(run_id)
+            if watch is not None:
+                watch.deadline = max(watch.deadline, now + timeout)
+                watch.tables.update(t for t in tables if t)
+                watch.labels.update(labels or {})
+                return watch.future
+            interval = settings.run_watch_initial_interval
+            watch = self._watches[run_id] = _Watch(
+                run_id=run_id,
+                future=Future(),
+                deadline=now + timeout,
+                interval=interval,
+                next_check=now + interval,
+                registered_ms=int(time.time() * 1000),
+                tables={t for t in tables if t},
+                labels=dict(labels or {}),
+            )
+            run_event_hub.publish(
+                self._scope, "job_run", {"run_id": str(run_id), "state": "RUNNING", **watch.labels},
+            )
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name=f"run-watcher-{self._scope}", daemon=True,
+                )
+                self._thread.start()
+        self._wake.set()
+        return watch.future
+
+    def pending(self) -> List[int]:
+        with self._lock:
+            return sorted(self._watches)
+
+    # ── Poll loop ───────────────────────────────────────────────────────────
+
+    def _loop(self) -> None:
+        while True:
+            with self._lock:
+                if not self._watches:
+                    self._thread = None
+                    return
+                now = time.monotonic()
+                # Pull nearly-due runs into this tick so they can share a batch lookup
+                horizon = now + settings.run_watch_initial_interval
+                if any(w.next_check <= now for w in self._watches.values()):
+                    due = [w for w in self._watches.values() if w.next_check <= horizon]
+                else:
+                    due = []
+                wake_at = min(w.next_check for w in self._watches.values())
+            if due:
+                try:
+                    self._poll(due)
+                except Exception as e:  # never let the loop die with futures outstanding
+                    logger.warning("Run watcher poll failed: %s", e)
+                continue
+            self._wake.wait(max(0.0, wake_at - now))
+            self._wake.clear()
+
+    def _poll(self, due: List[_Watch]) -> None:
+        outcomes: Dict[int, Optional[bool]] = {}
+        if len(due) >= settings.run_watch_batch_threshold:
+            outcomes = self._batch_outcomes(due)
+        for watch in due:
+            if watch.run_id not in outcomes:
+                outcomes[watch.run_id] = self._get_outcome(watch.run_id)
+
+        now = time.monotonic()
+        for watch in due:
+            outcome = outcomes.get(watch.run_id)
+            if outcome is None and now < watch.deadline:
+                watch.interval = min(
+                    watch.interval * settings.run_watch_backoff,
+                    settings.run_watch_max_interval,
+                )
+                watch.next_check = min(now + watch.interval, watch.deadline)
+                continue
+            if outcome is None:
+                logger.warning("Timed out waiting for Databricks run %s", watch.run_id)
+            with self._lock:
+                self._watches.pop(watch.run_id, None)
+            if watch.tables and query_cache.invalidate_tables(watch.tables):
+                logger.info(
+                    "Run %s ended; invalidated cached SQL for %s",
+                    watch.run_id, ", ".join(sorted(watch.tables)),
+                )
+            state = "TIMED_OUT" if outcome is None else ("SUCCEEDED" if outcome else "FAILED")
+            run_event_hub.publish(
+                self._scope, "job_run", {"run_id": str(watch.run_id), "state": state, **watch.labels},
+            )
+            if not watch.future.done():
+                watch.future.set_result(bool(outcome))
+
+    def _get_outcome(self, run_id: int) -> Optional[bool]:
+        try:
+            return run_outcome(self._client.jobs.get_run(run_id=run_id).state)
+        except Exception as e:
+            logger.warning("Error polling run %s: %s", run_id, e)
+            return None
+
+    def _batch_outcomes(self, due: List[_Watch]) -> Dict[int, Optional[bool]]:
+        """Outcomes for ``due`` from a capped completed-runs listing; {} on error.
+
+        Runs absent from a listing that was read to the end are still in
+        flight (reported as None). If the page cap cut the listing short,
+        only the runs it found are returned and the caller polls the rest.
+        """
+        wanted = {w.run_id for w in due}
+        since = min(w.registered_ms for w in due) - _BATCH_SLACK_MS
+        budget = settings.run_watch_batch_max_pages * _BATCH_PAGE_SIZE
+        found: Dict[int, Optional[bool]] = {}
+        seen = 0
+        try:
+            for run in self._client.jobs.list_runs(
+                completed_only=True, start_time_from=since, limit=_BATCH_PAGE_SIZE,
+            ):
+                if run.run_id in wanted:
+                    found[run.run_id] = run_outcome(run.state)
+                    if len(found) == len(wanted):
+                        break
+                seen += 1
+                if seen >= budget:
+                    logger.debug("Run listing capped after %d runs; polling the rest", seen)
+                    return found
+        except Exception as e:
+            logger.warning("Batched run listing failed, polling individually: %s", e)
+            return {}
+        return {run_id: found.get(run_id) for run_id in wanted}
+
+
+_watchers: Dict[str, RunWatcher] = {}
+_watchers_lock = threading.Lock()
+
+
+def get_run_watcher(client: Any, scope: str) -> RunWatcher:
+    """The shared watcher for a tenant scope, pointed at ``client``."""
+    with _watchers_lock:
+        watcher = _watchers.get(scope)
+        if watcher is None:
+            watcher = _watchers[scope] = RunWatcher(client, scope)
+        else:
+            watcher.set_client(client)
+        return watcher
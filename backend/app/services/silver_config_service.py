@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-import sys
+import copy
+import re
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import yaml
 from jinja2 import Environment, FileSystemLoader
@@ -12,6 +14,115 @@ from jinja2 import Environment, FileSystemLoader
 from app.config import settings
 from app.models.silver_requests import SilverEntityCreateRequest, SilverEntityUpdateRequest
 from app.models.silver_responses import SilverEntityDetail, SilverEntitySummary
+from app.services.config_validator import FrameworkValidator
+from app.services.yaml_catalog import CachedDoc, Signature, YamlCatalog
+
+_PLACEHOLDER_RE = re.compile(r"\$\{[^}]+\}\.")
+
+
+def lineage_key(bronze_table: str) -> str:
+    """Normalise a bronze table reference for lineage lookups.
+
+    Entity configs usually reference ``${catalog}.bronze.orders``; the
+    placeholder is stripped so the key is ``bronze.orders``.
+    """
+    return _PLACEHOLDER_RE.sub("", bronze_table.strip()).lower()
+
+
+class SilverLineageIndex:
+    """Reverse lineage maintained alongside the entity YAMLs.
+
+        bronze table  → silver entities that read it
+        business key  → entity that owns it (first entity by filename)
+
+    Entries are keyed by file signature, so ``sync()`` only re-indexes
+    entities whose YAML changed since the last call.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # path -> (signature, entity name, bronze keys, business keys)
+        self._entries: Dict[Path, Tuple[Signature, str, List[str], List[str]]] = {}
+        self._consumers: Dict[str, Set[str]] = {}
+        self._bk_owners: Dict[str, Set[Tuple[Path, str]]] = {}
+
+    def sync(self, docs: List[CachedDoc]) -> None:
+        """Bring the index in line with ``docs`` (the full, current entity set)."""
+        with self._lock:
+            seen: Set[Path] = set()
+            for doc in docs:
+                seen.add(doc.path)
+                entry = self._entries.get(doc.path)
+                if entry is None or entry[0] != doc.signature:
+                    self._put(doc)
+            for path in [p for p in self._entries if p not in seen]:
+                self._drop(path)
+
+    def update(self, doc: Optional[CachedDoc], path: Path) -> None:
+        """Re-index one entity file after a write (``doc`` None = deleted)."""
+        with self._lock:
+            if doc is None:
+                self._drop(Path(path))
+            else:
+                self._put(doc)
+
+    def consumers_of(self, bronze_table: str) -> List[str]:
+        """Silver entities reading ``bronze_table`` (catalog-qualified or not)."""
+        key = lineage_key(bronze_table)
+        keys = {key}
+        parts = key.split(".")
+        if len(parts) == 3:
+            # ``dev.bronze.orders`` also matches ``${catalog}.bronze.orders``
+            keys.add(".".join(parts[1:]))
+        with self._lock:
+            out: Set[str] = set()
+            for k in keys:
+                out |= self._consumers.get(k, set())
+        return sorted(out)
+
+    def bronze_consumers(self) -> Dict[str, List[str]]:
+        with self._lock:
+            return {k: sorted(v) for k, v in sorted(self._consumers.items()) if v}
+
+    def business_key_owners(self) -> Dict[str, str]:
+        with self._lock:
+            return {bk: min(owners)[1] for bk, owners in sorted(self._bk_owners.items()) if owners}
+
+    # Caller holds the lock for the helpers below.
+
+    def _put(self, doc: CachedDoc) -> None:
+        self._drop(doc.path)
+        data = doc.data
+        name = data.get("name", doc.path.stem)
+        bronze = sorted({
+            lineage_key(s.get("bronze_table", ""))
+            for s in data.get("sources", []) or []
+            if s.get("bronze_table")
+        })
+        bks = [k for k in (data.get("target", {}) or {}).get("business_keys", []) or [] if k]
+        self._entries[doc.path] = (doc.signature, name, bronze, bks)
+        for key in bronze:
+            self._consumers.setdefault(key, set()).add(name)
+        for bk in bks:
+            self._bk_owners.setdefault(bk, set()).add((doc.path, name))
+
+    def _drop(self, path: Path) -> None:
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return
+        _, name, bronze, bks = entry
+        for key in bronze:
+            names = self._consumers.get(key)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._consumers[key]
+        for bk in bks:
+            owners = self._bk_owners.get(bk)
+            if owners is not None:
+                owners.discard((path, name))
+                if not owners:
+                    del self._bk_owners[bk]
 
 
 class SilverConfigService:
@@ -22,6 +133,15 @@ class SilverConfigService:
             keep_trailing_newline=True,
         )
         self._template = self._jinja_env.get_template("silver_entity.yaml.j2")
+        self._catalog = YamlCatalog(lambda: self.entities_dir)
+        self._lineage = SilverLineageIndex()
+        self._validator = FrameworkValidator(
+            lambda: settings.silver_framework_src_path,
+            "silver_framework.config.loader",
+            "_parse_entity",
+            cache_size=settings.validation_cache_size,
+            process_workers=settings.validation_process_workers,
+        )
 
     @property
     def entities_dir(self) -> Path:
@@ -34,15 +154,8 @@ class SilverConfigService:
         scd_type: Optional[str] = None,
     ) -> List[SilverEntitySummary]:
         entities: List[SilverEntitySummary] = []
-        if not self.entities_dir.exists():
-            return entities
-
-        for yaml_file in sorted(self.entities_dir.glob("*.yaml")):
-            try:
-                data = self._read_yaml(yaml_file)
-            except Exception:
-                continue
-
+        for doc in self._catalog.entries():
+            data, yaml_file = doc.data, doc.path
             if domain and data.get("domain") != domain:
                 continue
             if enabled is not None and data.get("enabled", True) != enabled:
@@ -75,24 +188,27 @@ class SilverConfigService:
         return entities
 
     def get_entity(self, name: str) -> Optional[SilverEntityDetail]:
-        yaml_path = self._entity_path(name)
-        if not yaml_path.exists():
+        doc = self._catalog.get(name)
+        if doc is None:
             return None
+        return self._detail(copy.deepcopy(doc.data), name, doc.raw)
 
-        data = self._read_yaml(yaml_path)
-        raw_yaml = yaml_path.read_text(encoding="utf-8")
+    def preview_entity(self, req: SilverEntityCreateRequest) -> SilverEntityDetail:
+        """The entity ``req`` would write, without writing anything."""
+        raw_yaml = self.render_yaml(req)
+        return self._detail(yaml.safe_load(raw_yaml) or {}, req.name, raw_yaml)
 
-        return SilverEntityDetail(
-            name=data.get("name", name),
-            domain=data.get("domain", ""),
-            description=data.get("description", ""),
-            enabled=data.get("enabled", True),
-            tags=data.get("tags", {}),
-            sources=data.get("sources", []),
-            target=data.get("target", {}),
-            schedule=data.get("schedule"),
-            raw_yaml=raw_yaml,
-        )
+    def preview_update(self, name: str, req: SilverEntityUpdateRequest) -> SilverEntityDetail:
+        """The entity ``update_entity(name, req)`` would write, without writing anything."""
+        return self.preview_entity(self._merged_update(name, req))
+
+    def entities_version(self, name: Optional[str] = None) -> Optional[str]:
+        """Content digest of one entity (None if missing), or of all entities."""
+        return self._catalog.version(name)
+
+    def entity_paths(self) -> Dict[str, Path]:
+        """Entity name → YAML file holding it (the file name may carry a prefix)."""
+        return self._catalog.paths()
 
     def entity_exists(self, name: str) -> bool:
         return self._entity_path(name).exists()
@@ -102,11 +218,19 @@ class SilverConfigService:
         yaml_path = self.entities_dir / f"{req.name}.yaml"
         yaml_path.parent.mkdir(parents=True, exist_ok=True)
         yaml_path.write_text(yaml_content, encoding="utf-8")
+        self._reindex(yaml_path)
         return str(yaml_path)
 
     def update_entity(self, name: str, req: SilverEntityUpdateRequest) -> str:
         yaml_path = self._entity_path(name)
-        data = self._read_yaml(yaml_path)
+        yaml_content = self.render_yaml(self._merged_update(name, req))
+        yaml_path.write_text(yaml_content, encoding="utf-8")
+        self._reindex(yaml_path)
+        return str(yaml_path)
+
+    def _merged_update(self, name: str, req: SilverEntityUpdateRequest) -> SilverEntityCreateRequest:
+        """The stored entity with ``req`` applied, as a full request."""
+        data = self._read_yaml(self._entity_path(name))
 
         if req.description is not None:
             data["description"] = req.description
@@ -122,8 +246,8 @@ class SilverConfigService:
         if req.schedule is not None:
             data["schedule"] = req.schedule.model_dump(exclude_none=True)
 
-        # Rebuild full request from merged data and re-render
-        full_req = SilverEntityCreateRequest(
+        # Rebuild full request from merged data
+        return SilverEntityCreateRequest(
             name=data["name"],
             domain=data["domain"],
             description=data.get("description", ""),
@@ -131,17 +255,32 @@ class SilverConfigService:
             tags=data.get("tags", {}),
             **self._extract_nested(data),
         )
-        yaml_content = self.render_yaml(full_req)
-        yaml_path.write_text(yaml_content, encoding="utf-8")
-        return str(yaml_path)
 
     def delete_entity(self, name: str) -> bool:
         yaml_path = self._entity_path(name)
         if yaml_path.exists():
             yaml_path.unlink()
+            self._reindex(yaml_path)
             return True
         return False
 
+    # ── Lineage ──────────────────────────────────────────────────────────────
+
+    def consumers_of(self, bronze_table: str) -> List[str]:
+        """Names of Silver entities that read ``bronze_table``."""
+        self._sync_lineage()
+        return self._lineage.consumers_of(bronze_table)
+
+    def bronze_consumers(self) -> Dict[str, List[str]]:
+        """Full reverse index: normalised bronze table → consuming entities."""
+        self._sync_lineage()
+        return self._lineage.bronze_consumers()
+
+    def business_key_owners(self) -> Dict[str, str]:
+        """Business key → owning entity (first entity by filename that declares it)."""
+        self._sync_lineage()
+        return self._lineage.business_key_owners()
+
     def render_yaml(self, req: SilverEntityCreateRequest) -> str:
         ctx = req.model_dump(mode="json")
         return self._template.render(**ctx)
@@ -196,29 +335,51 @@ class SilverConfigService:
         if errors:
             return False, errors
 
-        # Round-trip through framework parser
-        try:
-            yaml_content = self.render_yaml(req)
-            data = yaml.safe_load(yaml_content)
-            silver_src = str(settings.silver_framework_src_path)
-            if silver_src not in sys.path:
-                sys.path.insert(0, silver_src)
-            from silver_framework.config.loader import ConfigLoader
-            loader = ConfigLoader.__new__(ConfigLoader)
-            loader._parse_entity(data)
-        except Exception as e:
-            errors.append(f"Framework validation failed: {str(e)}")
+        # Round-trip through the framework parser (cached by rendered YAML)
+        error = self._validator.validate(self.render_yaml(req))
+        if error is not None:
+            errors.append(f"Framework validation failed: {error}")
             return False, errors
 
         return True, []
 
+    def warm_validation(self) -> None:
+        """Load the framework ConfigLoader now rather than on the first validation."""
+        self._validator.warm()
+
+    def validation_stats(self) -> Dict[str, int]:
+        return self._validator.stats()
+
+    @staticmethod
+    def _detail(data: Dict[str, Any], name: str, raw_yaml: str) -> SilverEntityDetail:
+        return SilverEntityDetail(
+            name=data.get("name", name),
+            domain=data.get("domain", ""),
+            description=data.get("description", ""),
+            enabled=data.get("enabled", True),
+            tags=data.get("tags", {}),
+            sources=data.get("sources", []),
+            target=data.get("target", {}),
+            schedule=data.get("schedule"),
+            raw_yaml=raw_yaml,
+        )
+
     def _entity_path(self, name: str) -> Path:
-        for yaml_file in self.entities_dir.glob("*.yaml"):
-            data = self._read_yaml(yaml_file)
-            if data.get("name") == name:
-                return yaml_file
+        yaml_path = self._catalog.path_for(name)
+        if yaml_path is not None:
+            return yaml_path
         return self.entities_dir / f"{name}.yaml"
 
+    def _reindex(self, yaml_path: Path) -> None:
+        """Invalidate the catalog entry for a written/deleted file and update lineage."""
+        self._catalog.invalidate(yaml_path)
+        doc = self._catalog.load(yaml_path)
+        self._lineage.update(doc if doc is not None and doc.error is None else None, yaml_path)
+
+    def _sync_lineage(self) -> None:
+        # Stat-only when nothing changed; picks up edits made outside the portal
+        self._lineage.sync(self._catalog.entries())
+
     def _read_yaml(self, path: Path) -> Dict[str, Any]:
         with open(path, "r", encoding="utf-8") as f:
             return yaml.safe_load(f) or {}
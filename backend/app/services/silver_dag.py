@@ -0,0 +1,264 @@
+"""Dependency graph of Silver entities, deployed as multi-task DAG jobs.
+
+Each Silver entity normally gets its own single-task job, scheduled with
+enough slack that its Bronze inputs are probably fresh. ``build_dags``
+derives the real dependencies from the entity configs instead. Edges come
+only from explicit lineage, the tables named in ``sources[].bronze_table``:
+
+- **Bronze edges** — an entity depends on the portal Bronze source whose
+  target table it reads.
+- **Silver edges** — an entity depends on the Silver entity whose target
+  table it reads.
+
+Column names are never matched, so two entities that both carry a
+``customer_id`` are not linked unless one reads the other's table.
+
+A DAG job holds the entities connected by those edges that share one
+schedule: the same cron expression, timezone and pause status, or no
+schedule at all. The job keeps exactly that schedule, so manual-only
+entities stay manual and paused ones stay paused. An entity without edges
+keeps its standalone job. Each DAG job is
+``silver_portal_dag-<first entity>_<env>``; tasks without edges between
+them run concurrently on the job's shared cluster.
+
+Upstream work outside a DAG's own entities is wired in one of two ways:
+
+- Unscheduled Bronze sources, which only run on demand, become upstream
+  tasks of every DAG that reads them (``settings.silver_dag_bronze_tasks``).
+- Tables refreshed by their own schedule — unpaused scheduled Bronze
+  sources and entities of other unpaused scheduled jobs — are not run
+  again. A scheduled DAG that reads them is started by a table-update
+  trigger once all of them have been updated, in place of its cron, so it
+  runs right after its inputs land. Unscheduled and paused DAGs get no
+  trigger, and paused upstreams are not waited for.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from graphlib import CycleError, TopologicalSorter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.services.silver_config_service import lineage_key
+
+DAG_PREFIX = "dag-"
+BRONZE_TASK_PREFIX = "bronze__"
+
+# (cron expression, timezone, pause status), or None for an unscheduled entity
+ScheduleKey = Optional[Tuple[str, str, str]]
+
+
+@dataclass
+class DagTask:
+    key: str
+    kind: str  # "bronze" | "silver"
+    name: str  # source or entity name
+    depends_on: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SilverDag:
+    name: str
+    domains: List[str]
+    tasks: List[DagTask]
+    schedule: Optional[Dict[str, Any]] = None
+    trigger_tables: List[str] = field(default_factory=list)  # start on their update, not the cron
+
+    def waves(self) -> List[List[str]]:
+        """Task keys grouped into levels that can run concurrently, in order."""
+        return _waves({t.key: t.depends_on for t in self.tasks})
+
+
+def silver_task_key(entity: str) -> str:
+    return entity
+
+
+def bronze_task_key(source: str) -> str:
+    return f"{BRONZE_TASK_PREFIX}{source}"
+
+
+def bronze_table_owners(sources: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+    """Lineage key of each producer's target table → producer name.
+
+    ``sources`` are ``(name, "catalog.schema.table")`` pairs. Both the full
+    name and ``schema.table`` are keyed, since entity configs usually
+    reference ``${catalog}.schema.table``.
+    """
+    owners: Dict[str, str] = {}
+    for name, target_table in sorted(sources):
+        full = lineage_key(target_table)
+        parts = full.split(".")
+        for key in (full, ".".join(parts[-2:])):
+            if all(parts[-2:]):
+                owners.setdefault(key, name)
+    return owners
+
+
+def schedule_key(schedule: Optional[Dict[str, Any]]) -> ScheduleKey:
+    """What a DAG job's members must agree on; None when there is no cron."""
+    if not schedule or not schedule.get("cron_expression"):
+        return None
+    return (
+        " ".join(str(schedule["cron_expression"]).split()),
+        schedule.get("timezone") or "UTC",
+        schedule.get("pause_status") or "UNPAUSED",
+    )
+
+
+def dependency_graph(entities: Iterable[Any], bronze_owners: Dict[str, str]) -> Dict[str, DagTask]:
+    """Every entity and each portal Bronze source it reads, with all lineage edges.
+
+    ``bronze_owners`` comes from ``bronze_table_owners``. Keys are task keys.
+    Raises ValueError on a dependency cycle.
+    """
+    entities = sorted(entities, key=lambda e: e.name)
+    silver_owners = bronze_table_owners((e.name, _target_table(e)) for e in entities)
+    graph: Dict[str, DagTask] = {}
+    for e in entities:
+        bronze_deps, silver_deps = set(), set()
+        for s in e.sources or []:
+            table = s.get("bronze_table")
+            if not table:
+                continue
+            if key := _table_key(table, bronze_owners):
+                bronze_deps.add(bronze_owners[key])
+            elif (key := _table_key(table, silver_owners)) and silver_owners[key] != e.name:
+                silver_deps.add(silver_owners[key])
+        for source in bronze_deps:
+            graph.setdefault(bronze_task_key(source), DagTask(key=bronze_task_key(source), kind="bronze", name=source))
+        graph[silver_task_key(e.name)] = DagTask(
+            key=silver_task_key(e.name), kind="silver", name=e.name,
+            depends_on=[bronze_task_key(b) for b in sorted(bronze_deps)]
+            + [silver_task_key(d) for d in sorted(silver_deps)],
+        )
+    _waves({key: task.depends_on for key, task in graph.items()})
+    return graph
+
+
+def build_dags(
+    entities: Iterable[Any],
+    bronze_owners: Dict[str, str],
+    include_bronze: bool = True,
+    scheduled_sources: Optional[Mapping[str, Optional[str]]] = None,
+) -> List[SilverDag]:
+    """Group ``entities`` (SilverEntityDetail) into DAG jobs.
+
+    ``bronze_owners`` comes from ``bronze_table_owners``. ``scheduled_sources``
+    maps each Bronze source with its own schedule to the target table a DAG
+    reading it is triggered on (None if the source is paused). With
+    ``include_bronze`` the other Bronze sources run as upstream tasks.
+    Entities that end up without edges are left out (standalone jobs).
+    Raises ValueError on a dependency cycle.
+    """
+    entities = sorted(entities, key=lambda e: e.name)
+    by_name = {e.name: e for e in entities}
+    scheduled_sources = scheduled_sources or {}
+    graph = dependency_graph(entities, bronze_owners)
+    keys = {e.name: schedule_key(e.schedule) for e in entities}
+
+    # Union entities that must share a job: an in-schedule Silver edge, or a
+    # Bronze task both wait on
+    parent = {name: name for name in by_name}
+
+    def find(x: str) -> str:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(a: str, b: str) -> None:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    first_reader: Dict[Tuple[ScheduleKey, str], str] = {}
+    for e in entities:
+        for dep in graph[silver_task_key(e.name)].depends_on:
+            upstream = graph[dep]
+            if upstream.kind == "silver":
+                if keys[upstream.name] == keys[e.name]:
+                    union(e.name, upstream.name)
+            elif include_bronze and upstream.name not in scheduled_sources:
+                union(e.name, first_reader.setdefault((keys[e.name], upstream.name), e.name))
+
+    groups: Dict[str, List[str]] = {}
+    for name in by_name:
+        groups.setdefault(find(name), []).append(name)
+
+    dags: List[SilverDag] = []
+    for members in groups.values():
+        key = keys[members[0]]
+        member_set = set(members)
+        bronze_tasks, triggers = set(), set()
+        silver_tasks: List[DagTask] = []
+        for m in members:
+            depends = []
+            for dep in graph[silver_task_key(m)].depends_on:
+                upstream = graph[dep]
+                if upstream.kind == "silver":
+                    if upstream.name in member_set:
+                        depends.append(dep)
+                    elif _runs_on_schedule(keys[upstream.name]):
+                        triggers.add(_target_table(by_name[upstream.name]))
+                elif upstream.name in scheduled_sources:
+                    if scheduled_sources[upstream.name]:
+                        triggers.add(scheduled_sources[upstream.name])
+                elif include_bronze:
+                    bronze_tasks.add(upstream.name)
+                    depends.append(dep)
+            silver_tasks.append(DagTask(key=silver_task_key(m), kind="silver", name=m, depends_on=depends))
+        if not _runs_on_schedule(key):
+            triggers = set()  # run by hand only, or paused
+        if not triggers and not any(t.depends_on for t in silver_tasks):
+            continue
+        dags.append(SilverDag(
+            name=DAG_PREFIX + members[0],
+            domains=sorted({by_name[m].domain or "default" for m in members}),
+            tasks=[
+                DagTask(key=bronze_task_key(s), kind="bronze", name=s) for s in sorted(bronze_tasks)
+            ] + silver_tasks,
+            schedule=_schedule(key),
+            trigger_tables=sorted(triggers),
+        ))
+    return sorted(dags, key=lambda d: d.name)
+
+
+def _waves(deps: Dict[str, List[str]]) -> List[List[str]]:
+    sorter = TopologicalSorter(deps)
+    try:
+        sorter.prepare()
+    except CycleError as e:
+        raise ValueError(f"Dependency cycle between Silver entities: {' -> '.join(e.args[1])}") from e
+    waves: List[List[str]] = []
+    while sorter.is_active():
+        ready = sorted(sorter.get_ready())
+        waves.append(ready)
+        sorter.done(*ready)
+    return waves
+
+
+def _target_table(entity: Any) -> str:
+    target = entity.target or {}
+    return ".".join(str(target.get(part) or "") for part in ("catalog", "schema", "table"))
+
+
+def _table_key(table: str, owners: Dict[str, str]) -> Optional[str]:
+    key = lineage_key(table)
+    if key in owners:
+        return key
+    parts = key.split(".")
+    # ``dev.bronze.orders`` also matches a producer keyed as ``bronze.orders``
+    if len(parts) == 3 and ".".join(parts[1:]) in owners:
+        return ".".join(parts[1:])
+    return None
+
+
+def _runs_on_schedule(key: ScheduleKey) -> bool:
+    return key is not None and key[2] == "UNPAUSED"
+
+
+def _schedule(key: ScheduleKey) -> Optional[Dict[str, Any]]:
+    if key is None:
+        return None
+    cron, timezone, pause_status = key
+    return {"cron_expression": cron, "timezone": timezone, "pause_status": pause_status}
@@ -3,52 +3,44 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 
 from app.config import settings
 from app.models.silver_requests import SilverEntityCreateRequest, SilverEntityUpdateRequest
-from app.models.silver_responses import SilverEntityCreateResponse, SilverEntityDeleteResponse
-from app.services.databricks_service import DatabricksService
+from app.models.responses import WorkspaceSyncResponse
+from app.models.silver_responses import SilverEntityCreateResponse, SilverEntityDeleteResponse, SilverEntityDetail
+from app.services.config_service import ConfigService
+from app.services.databricks_service import JOB_RUN_WATCH_SECONDS, DatabricksService, is_missing_job_error
+from app.services.deploy_queue import DeployOperation, get_deploy_queue
 from app.services.git_service import GitService
 from app.services.silver_config_service import SilverConfigService
+from app.services.silver_dag import DAG_PREFIX, SilverDag, bronze_table_owners, build_dags, schedule_key
+from app.services.workspace_publisher import publish_files
 
 logger = logging.getLogger(__name__)
 
 
+def _create_message(req: SilverEntityCreateRequest) -> str:
+    return f"portal: add silver entity {req.name} ({req.domain})"
+
+
 class SilverDeployService:
     def __init__(
         self,
         config_service: SilverConfigService,
         git_service: GitService,
         databricks_service: DatabricksService,
+        bronze_config_service: Optional[ConfigService] = None,
     ) -> None:
         self._config = config_service
         self._git = git_service
         self._db = databricks_service
+        self._bronze_config = bronze_config_service
 
     def create_entity(self, req: SilverEntityCreateRequest) -> SilverEntityCreateResponse:
-        # 1. Validate
-        valid, errors = self._config.validate_config(req)
-        if not valid:
-            raise ValueError("; ".join(errors))
-
-        # 2. Write YAML
-        yaml_path = self._config.write_entity(req)
-        logger.info("Wrote Silver YAML to %s", yaml_path)
-
-        # 3. Git commit
-        git_sha = self._git.commit_file(
-            yaml_path,
-            f"portal: add silver entity {req.name} ({req.domain})",
-        )
-
-        # 4. Upload to Databricks workspace
-        self._upload_yaml(yaml_path, req.name)
-
-        # 5. Create/update Databricks job
+        yaml_path = self.stage_create(req)
         schedule = req.schedule.model_dump() if req.schedule else None
-        job_id = self._create_silver_job(req.name, schedule)
-
+        git_sha, job_id = self._publish(req.name, yaml_path, _create_message(req), schedule, is_new=True)
         return SilverEntityCreateResponse(
             name=req.name,
             yaml_path=yaml_path,
@@ -58,24 +50,12 @@ class SilverDeployService:
         )
 
     def update_entity(self, name: str, req: SilverEntityUpdateRequest) -> SilverEntityCreateResponse:
-        # 1. Update YAML
-        yaml_path = self._config.update_entity(name, req)
-        logger.info("Updated Silver YAML at %s", yaml_path)
-
-        # 2. Git commit
-        git_sha = self._git.commit_file(
-            yaml_path,
-            f"portal: update silver entity {name}",
+        yaml_path = self.stage_update(name, req)
+        schedule = req.schedule.model_dump() if req.schedule else None
+        git_sha, _ = self._publish(
+            name, yaml_path, f"portal: update silver entity {name}", schedule,
+            deploy_job=req.schedule is not None,
         )
-
-        # 3. Re-upload to Databricks
-        self._upload_yaml(yaml_path, name)
-
-        # 4. Update job if schedule changed
-        if req.schedule:
-            schedule = req.schedule.model_dump()
-            self._create_silver_job(name, schedule)
-
         return SilverEntityCreateResponse(
             name=name,
             yaml_path=yaml_path,
@@ -83,6 +63,98 @@ class SilverDeployService:
             message=f"Silver entity '{name}' updated successfully",
         )
 
+    def queue_create(
+        self, req: SilverEntityCreateRequest, tenant_id: str, idempotency_key: Optional[str] = None,
+    ) -> DeployOperation:
+        """Write the YAML now and queue the rest of ``create_entity`` (deploy queue mode)."""
+        self.stage_create(req)
+        return get_deploy_queue().enqueue(tenant_id, "silver", req.name, {
+            "commit_messages": [_create_message(req)],
+            "deploy_job": True,
+            "is_new": True,
+        }, idempotency_key)
+
+    def queue_update(
+        self, name: str, req: SilverEntityUpdateRequest, tenant_id: str, idempotency_key: Optional[str] = None,
+    ) -> DeployOperation:
+        """Rewrite the YAML now and queue the rest of ``update_entity`` (deploy queue mode)."""
+        self.stage_update(name, req)
+        return get_deploy_queue().enqueue(tenant_id, "silver", name, {
+            "commit_messages": [f"portal: update silver entity {name}"],
+            "deploy_job": req.schedule is not None,
+            "is_new": False,
+        }, idempotency_key)
+
+    def stage_create(self, req: SilverEntityCreateRequest) -> str:
+        """Validate ``req`` and write its YAML → path. Nothing leaves the portal yet.
+
+        Raises ValueError for an invalid config or one that would close a
+        dependency cycle, before anything is written.
+        """
+        valid, errors = self._config.validate_config(req)
+        if not valid:
+            raise ValueError("; ".join(errors))
+        self.plan_dags(self._config.preview_entity(req))
+        yaml_path = self._config.write_entity(req)
+        logger.info("Wrote Silver YAML to %s", yaml_path)
+        return yaml_path
+
+    def stage_update(self, name: str, req: SilverEntityUpdateRequest) -> str:
+        """Rewrite the YAML → path; ValueError (nothing written) if it closes a cycle."""
+        self.plan_dags(self._config.preview_update(name, req))
+        yaml_path = self._config.update_entity(name, req)
+        logger.info("Updated Silver YAML at %s", yaml_path)
+        return yaml_path
+
+    def _publish(
+        self,
+        name: str,
+        yaml_path: str,
+        commit_message: str,
+        schedule: Optional[dict],
+        deploy_job: bool = True,
+        is_new: bool = False,
+    ) -> tuple[Optional[str], Optional[str]]:
+        """Git commit, workspace upload and job create/update → (git sha, job id).
+
+        ``deploy_job`` False skips the standalone job (an update that left
+        the schedule alone). DAG jobs are always re-synced, since any
+        change may move edges.
+        """
+        git_sha = self._git.commit_file(yaml_path, commit_message)
+        self._upload_yaml(yaml_path, name)
+        job_id = None
+        if settings.silver_dag_jobs:
+            job_ids = self.sync_dags()
+            job_id = job_ids.get(name)
+            if job_id is None and name not in job_ids and deploy_job:
+                job_id = self._create_silver_job(name, schedule)
+        elif deploy_job:
+            job_id = self._create_silver_job(name, schedule)
+        return git_sha, job_id
+
+    def publish_staged(
+        self,
+        name: str,
+        commit_message: str,
+        deploy_job: bool = True,
+        is_new: bool = False,
+    ) -> Dict[str, Optional[str]]:
+        """Publish an entity whose YAML was written earlier (deploy queue worker).
+
+        Reads the YAML as it is now, so running it twice, or after a later
+        edit, deploys the latest config. Raises FileNotFoundError if the
+        entity was deleted in the meantime.
+        """
+        entity = self._config.get_entity(name)
+        if not entity:
+            raise FileNotFoundError(f"Silver entity '{name}' not found")
+        yaml_path = str(self._config._entity_path(name))
+        git_sha, job_id = self._publish(
+            name, yaml_path, commit_message, entity.schedule, deploy_job=deploy_job, is_new=is_new,
+        )
+        return {"yaml_path": yaml_path, "git_commit": git_sha, "job_id": job_id}
+
     def delete_entity(self, name: str) -> SilverEntityDeleteResponse:
         entity = self._config.get_entity(name)
         if not entity:
@@ -97,6 +169,8 @@ class SilverDeployService:
         )
 
         self._delete_silver_job(name)
+        if settings.silver_dag_jobs:
+            self.sync_dags()
 
         return SilverEntityDeleteResponse(
             name=name,
@@ -116,7 +190,11 @@ class SilverDeployService:
         if isinstance(entity, dict) and entity.get("schedule"):
             schedule = entity["schedule"]
 
-        job_id = self._create_silver_job(name, schedule)
+        if settings.silver_dag_jobs:
+            job_ids = self.sync_dags()
+            job_id = job_ids[name] if name in job_ids else self._create_silver_job(name, schedule)
+        else:
+            job_id = self._create_silver_job(name, schedule)
 
         return SilverEntityCreateResponse(
             name=name,
@@ -126,24 +204,120 @@ class SilverDeployService:
             message=f"Silver entity '{name}' redeployed successfully",
         )
 
+    def sync_workspace(self, prune: bool = True, dry_run: bool = False) -> WorkspaceSyncResponse:
+        """Publish every local Silver entity YAML to the workspace conf folder in one pass.
+
+        Remote files are named ``{entity name}.yaml``, matching ``_upload_yaml``
+        and the job's ``entity_file`` parameter.
+        """
+        remote_dir = f"{settings.databricks_silver_workspace_path}/conf/entities"
+        files = {f"{name}.yaml": path for name, path in self._config.entity_paths().items()}
+        result = publish_files(self._db, files, remote_dir, prune=prune, dry_run=dry_run)
+        return result.to_response(remote_dir)
+
+    # ── DAG jobs ─────────────────────────────────────────────────────────────
+
+    def plan_dags(self, candidate: Optional[SilverEntityDetail] = None) -> List[SilverDag]:
+        """Group the entities into dependency-ordered DAG jobs (nothing deployed).
+
+        ``candidate`` stands in for the stored entity of the same name, so a
+        change can be checked before it is written. Raises ValueError on a
+        dependency cycle.
+        """
+        entities = {
+            entity.name: entity for summary in self._config.list_entities()
+            if (entity := self._config.get_entity(summary.name)) is not None
+        }
+        if candidate is not None:
+            entities[candidate.name] = candidate
+        sources = self._bronze_config.list_sources() if self._bronze_config is not None else []
+        schedules = self._bronze_config.schedules() if self._bronze_config is not None else {}
+        # Sources on their own schedule are not run again inside a DAG; a
+        # DAG reading them waits for their tables instead (none if paused)
+        scheduled = {
+            s.name: s.target_table if schedule_key(schedules[s.name])[2] == "UNPAUSED" else None
+            for s in sources if s.name in schedules
+        }
+        return build_dags(
+            entities.values(),
+            bronze_table_owners((s.name, s.target_table) for s in sources),
+            include_bronze=settings.silver_dag_bronze_tasks,
+            scheduled_sources=scheduled,
+        )
+
+    def sync_dags(self) -> Dict[str, Optional[str]]:
+        """Deploy every DAG job and bring the standalone jobs in line with them.
+
+        DAG jobs that no longer have tasks are deleted. Entities a DAG job
+        runs lose their standalone job; entities outside every DAG get theirs
+        back if they have none. Returns entity name → id of the job created
+        or updated for it here.
+        """
+        env = settings.default_environment
+        dags = self.plan_dags()
+        job_ids: Dict[str, Optional[str]] = {}
+        for dag in dags:
+            job_id = self._db.create_or_update_dag_job(
+                dag.name, env, dag.tasks, dag.schedule, trigger_tables=dag.trigger_tables,
+            )
+            for task in dag.tasks:
+                if task.kind == "silver":
+                    job_ids[task.name] = job_id
+            logger.info("Silver DAG %s: %d tasks in %d waves", dag.name, len(dag.tasks), len(dag.waves()))
+
+        live = {dag.name for dag in dags}
+        registered = {e["name"] for e in self._db.registered_jobs("silver") if e["environment"] == env}
+        for name in sorted(registered):
+            if name.startswith(DAG_PREFIX) and name not in live:
+                self._db.delete_job_by_key("silver", name, env)
+            elif name in job_ids:
+                self._delete_silver_job(name)
+        for summary in self._config.list_entities():
+            if summary.name not in job_ids and summary.name not in registered:
+                entity = self._config.get_entity(summary.name)
+                job_ids[summary.name] = self._create_silver_job(summary.name, entity.schedule if entity else None)
+        return job_ids
+
+    def _dag_of(self, name: str) -> Optional[SilverDag]:
+        for dag in self.plan_dags():
+            if any(t.kind == "silver" and t.name == name for t in dag.tasks):
+                return dag
+        return None
+
     def trigger_run(self, name: str) -> Optional[str]:
         """Trigger an immediate Databricks job run for a Silver entity."""
         if not self._db.available:
             return None
 
-        job_name = f"silver_portal_{name}_{settings.default_environment}"
-        job_id = self._db._find_job(job_name)
-        if not job_id:
-            logger.error("Silver job '%s' not found on Databricks", job_name)
-            return None
+        dag = self._dag_of(name) if settings.silver_dag_jobs else None
+        if dag is not None:
+            # Run just this entity's task of its DAG job
+            run_id = self._db.run_job_now(
+                "silver", dag.name, settings.default_environment, only=[name],
+            )
+        else:
+            run_id = self._db.run_job_now("silver", name, settings.default_environment)
+        if run_id is not None:
+            # Drop cached reads now and again once the run has ended — pages
+            # read while it runs would otherwise re-cache pre-run rows.
+            tables = self._entity_tables(name)
+            self._db.invalidate_tables(tables)
+            self._db.watch_run(
+                run_id, timeout=JOB_RUN_WATCH_SECONDS, tables=tables, labels={"entity_name": name},
+            )
+        return run_id
 
-        try:
-            run = self._db._client.jobs.run_now(job_id=job_id)
-            logger.info("Triggered Silver run %s for job %s", run.run_id, job_name)
-            return str(run.run_id)
-        except Exception as e:
-            logger.error("Silver job trigger failed: %s", e)
-            return None
+    def _entity_tables(self, name: str) -> List[str]:
+        """The entity's target table plus its catalog's audit tables."""
+        entity = self._config.get_entity(name)
+        if not entity:
+            return []
+        catalog = entity.target.get("catalog", "")
+        return [
+            ".".join(filter(None, (catalog, entity.target.get("schema"), entity.target.get("table")))),
+            ".".join(filter(None, (catalog, "slv_meta.transformation_audit_log"))),
+            f"{catalog}.slv_meta" if catalog and "$" not in catalog else "",
+        ]
 
     def _upload_yaml(self, local_path: str, entity_name: str) -> Optional[str]:
         """Upload Silver entity YAML to Databricks workspace."""
@@ -221,24 +395,31 @@ class SilverDeployService:
                     timezone_id=schedule.get("timezone", "UTC"),
                 )
 
-            # Find existing job — _find_job returns the job_id int directly
-            existing_id = self._db._find_job(job_name)
+            env = settings.default_environment
+            existing_id = self._db.find_job_id("silver", entity_name, env)
             if existing_id:
-                self._db._client.jobs.update(
-                    job_id=existing_id,
-                    new_settings=job_settings,
-                )
-                logger.info("Updated Silver job: %s (id=%s)", job_name, existing_id)
-                return str(existing_id)
-            else:
-                result = self._db._client.jobs.create(
-                    name=job_name,
-                    tasks=[task],
-                    schedule=job_settings.schedule,
-                    tags={"team": "data-engineering", "layer": "silver", "entity": entity_name},
-                )
-                logger.info("Created Silver job: %s (id=%s)", job_name, result.job_id)
-                return str(result.job_id)
+                try:
+                    self._db._client.jobs.update(
+                        job_id=existing_id,
+                        new_settings=job_settings,
+                    )
+                    logger.info("Updated Silver job: %s (id=%s)", job_name, existing_id)
+                    return str(existing_id)
+                except Exception as e:
+                    if not is_missing_job_error(e):
+                        raise
+                    logger.warning("Silver job %s (id=%s) no longer exists; recreating", job_name, existing_id)
+                    self._db.forget_job("silver", entity_name, env)
+
+            result = self._db._client.jobs.create(
+                name=job_name,
+                tasks=[task],
+                schedule=job_settings.schedule,
+                tags={"team": "data-engineering", "layer": "silver", "entity": entity_name},
+            )
+            self._db.remember_job("silver", entity_name, env, result.job_id)
+            logger.info("Created Silver job: %s (id=%s)", job_name, result.job_id)
+            return str(result.job_id)
 
         except Exception as e:
             logger.error("Silver job creation failed: %s", e)
@@ -248,11 +429,5 @@ class SilverDeployService:
         """Delete the Databricks job for a Silver entity."""
         if not self._db.available:
             return
-        try:
-            job_name = f"silver_portal_{entity_name}_{settings.default_environment}"
-            existing = self._db._find_job(job_name)
-            if existing:
-                self._db._client.jobs.delete(job_id=existing)
-                logger.info("Deleted Silver job: %s", job_name)
-        except Exception as e:
-            logger.error("Silver job deletion failed: %s", e)
+        if not self._db.delete_job_by_key("silver", entity_name, settings.default_environment):
+            logger.error("Silver job deletion failed for %s", entity_name)
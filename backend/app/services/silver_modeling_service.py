@@ -510,19 +510,15 @@ class SilverModelingService:
                         comment=row.get("comment"),
                     ))
 
-            # Row count
-            count_rows = self._databricks.query_sql(f"SELECT COUNT(*) as cnt FROM {full_name}")
-            row_count = int(count_rows[0]["cnt"]) if count_rows else 0
-
-            # Sample data (prefer current records for SCD2)
+            # Row count, sample data (prefer current records for SCD2) and basic
+            # profiling of non-system columns are independent — run them together
             has_is_current = any(c.name == "_is_current" for c in columns)
-            sample_sql = f"SELECT * FROM {full_name}"
-            if has_is_current:
-                sample_sql += " WHERE _is_current = true"
-            sample_sql += " LIMIT 100"
-            sample_data = self._databricks.query_sql(sample_sql)
+            current_filter = " WHERE _is_current = true" if has_is_current else ""
+            statements = [
+                f"SELECT COUNT(*) as cnt FROM {full_name}",
+                f"SELECT * FROM {full_name}{current_filter} LIMIT 100",
+            ]
 
-            # Basic profiling for non-system columns
             data_columns = [c.name for c in columns if not c.name.startswith("_")]
             profiling: List[ColumnProfileStats] = []
             if data_columns:
@@ -534,11 +530,16 @@ class SilverModelingService:
                     profile_exprs.append(
                         f"SUM(CASE WHEN `{col_name}` IS NULL THEN 1 ELSE 0 END) as `{col_name}_nulls`"
                     )
-                profile_sql = f"SELECT {', '.join(profile_exprs)} FROM {full_name}"
-                if has_is_current:
-                    profile_sql += " WHERE _is_current = true"
-                profile_rows = self._databricks.query_sql(profile_sql)
+                statements.append(
+                    f"SELECT {', '.join(profile_exprs)} FROM {full_name}{current_filter}"
+                )
 
+            results = self._databricks.query_many(statements)
+            count_rows, sample_data = results[0].rows, results[1].rows
+            row_count = int(count_rows[0]["cnt"]) if count_rows else 0
+
+            if data_columns:
+                profile_rows = results[2].rows
                 if profile_rows:
                     stats = profile_rows[0]
                     for col_name in data_columns[:10]:
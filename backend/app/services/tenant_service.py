@@ -94,7 +94,10 @@ class TenantService:
             ).fetchone()
         if row:
             return "default"
-        self.create_tenant("default", "Default Local Tenant")
+        try:
+            self.create_tenant("default", "Default Local Tenant")
+        except sqlite3.IntegrityError:
+            pass  # created by a concurrent first request
         return "default"
 
     def validate_api_key(self, api_key: str) -> Optional[str]:
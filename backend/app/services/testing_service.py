@@ -30,7 +30,8 @@ from app.models.testing import (
     TestSuiteSummary,
 )
 from app.services.config_service import ConfigService
-from app.services.databricks_service import DatabricksService
+from app.services.databricks_service import DatabricksService, bronze_run_tables
+from app.services.run_events import run_event_hub
 
 logger = logging.getLogger(__name__)
 
@@ -383,17 +384,20 @@ class TestingService:
                     f".dead_letter_{suite.target_table}"
                 )
 
+        # Cached reads of the tables the test job writes are dropped once each run ends
+        tables = bronze_run_tables(suite.test_catalog, suite.test_schema, suite.target_table)
+
         # TC004 pattern: upload baseline data + run job first
         if tc.setup_data_file:
             self._upload_test_data(suite.source_name, tc.setup_data_file)
             run_id = self._db_svc.trigger_job(f"{suite.source_name}_test", environment)
-            self._db_svc.wait_for_run_by_id(run_id, timeout=1800)
+            self._db_svc.wait_for_run_by_id(run_id, timeout=1800, tables=tables)
 
         # Upload and run main test data
         if tc.data_file:
             self._upload_test_data(suite.source_name, tc.data_file)
         run_id = self._db_svc.trigger_job(f"{suite.source_name}_test", environment)
-        success = self._db_svc.wait_for_run_by_id(run_id, timeout=1800)
+        success = self._db_svc.wait_for_run_by_id(run_id, timeout=1800, tables=tables)
         if not success:
             logger.warning(
                 "TC %s: job run %s did not report SUCCESS — assertions will determine TC status",
@@ -438,7 +442,9 @@ class TestingService:
 
     def _run_assertion(self, assertion: AssertionSpec) -> AssertionResult:
         try:
-            rows = self._db_svc.query_sql(assertion.sql)
+            # Straight to the warehouse: a cached count from before the run would
+            # decide the test case (iter_sql_rows bypasses the result cache).
+            rows = list(self._db_svc.iter_sql_rows(assertion.sql))
             if rows:
                 raw = list(rows[0].values())[0]
                 try:
@@ -550,41 +556,21 @@ class TestingService:
         except Exception as e:
             logger.warning("Could not upload test data %s: %s", data_file, e)
 
-    def _wait_for_run(
-        self,
-        source_name: str,
-        run_start: datetime,
-        timeout: int = 600,
-    ) -> bool:
-        """Poll audit log every 10 s until the test run completes or times out."""
-        if not self._db_svc.available:
-            return True  # Offline mode: assume success
-
-        test_source_name = f"{source_name}_test"
-        start_iso = run_start.strftime("%Y-%m-%d %H:%M:%S")
-        deadline = time.time() + timeout
-
-        while time.time() < deadline:
-            rows = self._db_svc.query_sql(
-                f"SELECT status FROM dev.bronze_meta.ingestion_audit_log "
-                f"WHERE source_name = '{test_source_name}' "
-                f"AND start_time >= '{start_iso}' "
-                f"ORDER BY end_time DESC LIMIT 1"
-            )
-            if rows:
-                status = rows[0].get("status", "")
-                if status in ("SUCCESS", "FAILED", "FAILURE", "ERROR"):
-                    return status == "SUCCESS"
-            time.sleep(10)
-
-        logger.warning("Timed out waiting for test run of %s", source_name)
-        return False
-
     def _save_result(self, source_name: str, result: TestRunResult) -> None:
         results_dir = TESTING_ROOT / "results" / source_name
         results_dir.mkdir(parents=True, exist_ok=True)
         result_path = results_dir / f"{result.run_id}.json"
-        result_path.write_text(result.model_dump_json(indent=2), encoding="utf-8")
+        # Written aside and renamed, so get_latest_result never reads half a file
+        tmp_path = result_path.with_suffix(".json.tmp")
+        tmp_path.write_text(result.model_dump_json(indent=2), encoding="utf-8")
+        os.replace(tmp_path, result_path)
+        run_event_hub.publish(self._db_svc.scope, "test_progress", {
+            "source_name": source_name,
+            "run_id": result.run_id,
+            "overall_status": result.overall_status,
+            "summary": result.summary.model_dump(),
+            "test_cases": [{"id": tc.id, "status": tc.status} for tc in result.test_cases],
+        })
 
     def _save_html_report(self, source_name: str, result: TestRunResult) -> None:
         try:
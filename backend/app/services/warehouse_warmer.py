@@ -0,0 +1,307 @@
+"""Keep each tenant's SQL warehouse warm when it is about to be needed.
+
+A serverless / pro warehouse that has auto-stopped takes a while to come
+back. The first statement after a quiet period burns the 30 s synchronous
+wait, and ``query_sql`` then returns ``[]``. ``WarehouseWarmer`` tracks
+every tenant that used the portal recently and, once per tick
+(``settings.warehouse_warmup_tick_seconds``):
+
+- **warms up ahead of busy windows** — the warehouse is started when a
+  Bronze source or Silver entity cron fires within the next
+  ``warehouse_warmup_lead_minutes``, or when the next hour of the week has
+  had portal activity on at least ``warehouse_warmup_min_active_days`` of
+  the last four weeks;
+- **keeps it alive while users are active** — while the tenant made a
+  request within ``warehouse_keepalive_idle_minutes``, a ``SELECT 1`` is
+  sent every ``warehouse_keepalive_seconds`` (a stopped warehouse is
+  started instead).
+
+Every state ``DatabricksService`` reads goes through ``observe``, so
+``iter_sql_chunks`` can see from ``known_state`` that a warehouse is cold
+and wait for it instead of timing out.
+
+Cron expressions are Quartz (``sec min hour day-of-month month day-of-week
+[year]``). Only the subset the portal writes is understood; ``L``, ``W``
+and ``#`` are treated as wildcards, which can only warm up too often.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.services.databricks_service import DatabricksService
+
+logger = logging.getLogger(__name__)
+
+_MONTHS = {m: i for i, m in enumerate(
+    ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"), start=1,
+)}
+_DAYS = {d: i for i, d in enumerate(("SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"), start=1)}
+
+# Idle tenants are forgotten after a week; schedule warm-ups only cover tenants seen since
+_FORGET_AFTER = timedelta(days=7)
+_HISTORY = timedelta(days=28)
+_SCHEDULE_TTL = 300.0
+
+
+# ── Quartz cron matching ─────────────────────────────────────────────────────
+
+
+def _field_matches(expr: str, value: int, low: int, high: int, names: Optional[Dict[str, int]] = None) -> bool:
+    for part in expr.upper().split(","):
+        if names:
+            for name, number in names.items():
+                part = part.replace(name, str(number))
+        if part in ("*", "?") or any(c in part for c in "LW#"):
+            return True
+        base, _, step = part.partition("/")
+        if base in ("*", "?"):
+            start, end = low, high
+        elif "-" in base:
+            start, end = (int(x) for x in base.split("-", 1))
+        else:
+            start = int(base)
+            end = high if step else start
+        if start <= value <= end and (value - start) % int(step or 1) == 0:
+            return True
+    return False
+
+
+def cron_matches(cron: str, moment: datetime) -> bool:
+    """True if Quartz ``cron`` fires during the minute of ``moment`` (its local time).
+
+    Raises ValueError on an expression that cannot be parsed.
+    """
+    fields = cron.split()
+    if len(fields) not in (6, 7):
+        raise ValueError(f"Expected 6 or 7 cron fields, got {len(fields)}: {cron!r}")
+    _, minute, hour, dom, month, dow = fields[:6]
+    quartz_dow = (moment.weekday() + 1) % 7 + 1  # Quartz: 1 = Sunday
+    checks = [
+        _field_matches(minute, moment.minute, 0, 59),
+        _field_matches(hour, moment.hour, 0, 23),
+        _field_matches(dom, moment.day, 1, 31),
+        _field_matches(month, moment.month, 1, 12, _MONTHS),
+        _field_matches(dow, quartz_dow, 1, 7, _DAYS),
+    ]
+    if len(fields) == 7:
+        checks.append(_field_matches(fields[6], moment.year, 1970, 2199))
+    return all(checks)
+
+
+def cron_fires_within(schedule: Dict[str, Any], start: datetime, minutes: int) -> bool:
+    """True if ``schedule`` fires in the ``minutes`` after ``start`` (an aware datetime)."""
+    cron = schedule.get("cron_expression")
+    if not cron or schedule.get("pause_status") == "PAUSED":
+        return False
+    try:
+        tz = ZoneInfo(schedule.get("timezone") or "UTC")
+    except Exception:
+        tz = timezone.utc
+    local = start.astimezone(tz).replace(second=0, microsecond=0)
+    try:
+        return any(cron_matches(cron, local + timedelta(minutes=i)) for i in range(1, minutes + 1))
+    except ValueError as e:
+        logger.debug("Unparseable cron %r: %s", cron, e)
+        return False
+
+
+# ── Warmer ───────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class _Tenant:
+    service: Any
+    last_activity: datetime
+    last_keepalive: Optional[datetime] = None
+    last_action: Optional[str] = None
+    # (weekday, hour) in UTC → dates with portal activity in that hour
+    activity: Dict[Tuple[int, int], Set[str]] = field(default_factory=dict)
+
+
+class WarehouseWarmer:
+    """Per-tenant warehouse state cache plus the warm-up / keep-alive loop."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tenants: Dict[str, _Tenant] = {}
+        self._states: Dict[str, Tuple[str, float]] = {}
+        self._schedules: Optional[List[Dict[str, Any]]] = None
+        self._schedules_at = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    # ── State cache ─────────────────────────────────────────────────────────
+
+    def observe(self, scope: str, state: Optional[str]) -> None:
+        if state:
+            with self._lock:
+                self._states[scope] = (state, time.monotonic())
+
+    def known_state(self, scope: str) -> Optional[str]:
+        """Last observed state, or None when it is older than ``warehouse_state_ttl_seconds``."""
+        with self._lock:
+            entry = self._states.get(scope)
+        if entry is None or time.monotonic() - entry[1] > settings.warehouse_state_ttl_seconds:
+            return None
+        return entry[0]
+
+    # ── Activity ────────────────────────────────────────────────────────────
+
+    def touch(self, service: "DatabricksService", now: Optional[datetime] = None) -> None:
+        """Record a portal request for the service's tenant."""
+        if not getattr(service, "available", False):
+            return
+        now = now or datetime.now(timezone.utc)
+        scope = service._scope
+        with self._lock:
+            tenant = self._tenants.get(scope)
+            if tenant is None:
+                tenant = self._tenants[scope] = _Tenant(service=service, last_activity=now)
+            tenant.service = service
+            tenant.last_activity = max(tenant.last_activity, now)
+            tenant.activity.setdefault((now.weekday(), now.hour), set()).add(now.date().isoformat())
+
+    def status(self, scope: str) -> Dict[str, Any]:
+        with self._lock:
+            tenant = self._tenants.get(scope)
+            if tenant is None:
+                return {"tracked": False}
+            return {
+                "tracked": True,
+                "last_activity": tenant.last_activity.isoformat(),
+                "last_keepalive": tenant.last_keepalive.isoformat() if tenant.last_keepalive else None,
+                "last_action": tenant.last_action,
+                "busy_hours": sorted(
+                    [day, hour] for (day, hour), days in tenant.activity.items()
+                    if len(days) >= settings.warehouse_warmup_min_active_days
+                ),
+            }
+
+    # ── Tick ────────────────────────────────────────────────────────────────
+
+    def tick(self, now: Optional[datetime] = None) -> Dict[str, str]:
+        """One pass over every tracked tenant → scope: action taken."""
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            for scope in [s for s, t in self._tenants.items() if now - t.last_activity > _FORGET_AFTER]:
+                del self._tenants[scope]
+            tenants = list(self._tenants.items())
+        if not tenants:
+            return {}
+        scheduled = self._schedule_due(now)
+        actions: Dict[str, str] = {}
+        for scope, tenant in tenants:
+            try:
+                action = self._tick_tenant(tenant, now, scheduled)
+            except Exception as e:
+                logger.warning("Warehouse warm-up failed for %s: %s", scope, e)
+                continue
+            if action:
+                tenant.last_action = f"{action} at {now.isoformat()}"
+                actions[scope] = action
+        return actions
+
+    def _tick_tenant(self, tenant: _Tenant, now: datetime, scheduled: bool) -> Optional[str]:
+        db = tenant.service
+        active = now - tenant.last_activity <= timedelta(minutes=settings.warehouse_keepalive_idle_minutes)
+        warm_ahead = scheduled or self._busy_hour_ahead(tenant, now)
+        if not (active or warm_ahead):
+            return None
+
+        state = db.warehouse_state()
+        if state in ("STOPPED", "STOPPING"):
+            return "start" if db.start_warehouse() else None
+        if state != "RUNNING" or not active:
+            return None
+        due = tenant.last_keepalive is None or (
+            now - tenant.last_keepalive >= timedelta(seconds=settings.warehouse_keepalive_seconds)
+        )
+        if not due:
+            return None
+        list(db.iter_sql_rows("SELECT 1"))  # iter_sql_rows bypasses the result cache
+        tenant.last_keepalive = now
+        return "keepalive"
+
+    def _busy_hour_ahead(self, tenant: _Tenant, now: datetime) -> bool:
+        """True if a usually-busy hour starts within the lead time."""
+        ahead = now + timedelta(minutes=settings.warehouse_warmup_lead_minutes)
+        if ahead.hour == now.hour:
+            return False
+        cutoff = (now - _HISTORY).date().isoformat()
+        with self._lock:
+            days = tenant.activity.get((ahead.weekday(), ahead.hour), set())
+            days -= {d for d in days if d < cutoff}
+            return len(days) >= settings.warehouse_warmup_min_active_days
+
+    def _schedule_due(self, now: datetime) -> bool:
+        lead = settings.warehouse_warmup_lead_minutes
+        return any(cron_fires_within(s, now, lead) for s in self._load_schedules())
+
+    def _load_schedules(self) -> List[Dict[str, Any]]:
+        """Schedules of all Bronze sources and Silver entities, re-read every few minutes."""
+        if self._schedules is not None and time.monotonic() - self._schedules_at < _SCHEDULE_TTL:
+            return self._schedules
+        from app.dependencies import get_config_service, get_silver_config_service
+
+        schedules: List[Dict[str, Any]] = []
+        try:
+            bronze = get_config_service()
+            for summary in bronze.list_sources():
+                source = bronze.get_source(summary.name) if summary.schedule else None
+                if source and source.schedule:
+                    schedules.append(source.schedule)
+            silver = get_silver_config_service()
+            for summary in silver.list_entities():
+                entity = silver.get_entity(summary.name) if summary.schedule else None
+                if entity and entity.schedule:
+                    schedules.append(entity.schedule)
+        except Exception as e:
+            logger.warning("Could not read schedules for warehouse warm-up: %s", e)
+        self._schedules, self._schedules_at = schedules, time.monotonic()
+        return schedules
+
+    # ── Background loop ─────────────────────────────────────────────────────
+
+    def start(self, interval_seconds: Optional[int] = None) -> None:
+        """Run ``tick`` every ``interval_seconds`` on a daemon thread (<= 0 disables)."""
+        interval = settings.warehouse_warmup_tick_seconds if interval_seconds is None else interval_seconds
+        with self._thread_lock:
+            if interval <= 0 or self._thread is not None:
+                return
+            self._stop.clear()
+            thread = threading.Thread(
+                target=self._loop, args=(interval,), name="warehouse-warmer", daemon=True,
+            )
+            thread.start()
+            self._thread = thread
+
+    def stop(self) -> None:
+        with self._thread_lock:
+            self._stop.set()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _loop(self, interval: int) -> None:
+        while not self._stop.wait(interval):
+            self.tick()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tenants.clear()
+            self._states.clear()
+        self._schedules = None
+
+
+warehouse_warmer = WarehouseWarmer()
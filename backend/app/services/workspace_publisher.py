@@ -0,0 +1,199 @@
+"""Publish a local config directory to a Databricks workspace folder in bulk.
+
+``upload_yaml`` costs a delete plus an import per file. Re-syncing a whole
+environment that way is thousands of sequential calls, most of them
+re-uploading files that have not changed. ``publish_files`` instead:
+
+1. lists the remote folder once and reads the portal's manifest there
+   (``_portal_manifest.json``: file name → SHA-256 of what was uploaded);
+2. uploads only files that are new, changed, or missing remotely, on a
+   bounded worker pool (``settings.deploy_max_workers``);
+3. deletes orphans — files a previous sync published that no longer exist
+   locally. Files the manifest never recorded (e.g. the testing service's
+   ``*_test.yaml`` variants) are left alone;
+4. writes the updated manifest.
+
+Remote files are named by the caller. The sync endpoints pass the config
+catalog's ``{name}.yaml`` → local file map, the same path that ``upload_yaml``
+writes and the jobs' ``source_file`` / ``entity_file`` parameter reads, so a
+prefixed local file such as ``jdbc_orders.yaml`` lands on ``orders.yaml``.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Set
+
+from app.config import settings
+from app.models.responses import WorkspaceSyncResponse
+from app.services.databricks_service import DatabricksService
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "_portal_manifest.json"
+
+
+@dataclass
+class PublishResult:
+    uploaded: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    dry_run: bool = False
+
+    def to_response(self, remote_dir: str) -> WorkspaceSyncResponse:
+        """The sync endpoints' response for this result."""
+        return WorkspaceSyncResponse(
+            remote_dir=remote_dir,
+            uploaded=self.uploaded,
+            deleted=self.deleted,
+            unchanged=len(self.unchanged),
+            failed=self.failed,
+            dry_run=self.dry_run,
+            message=(
+                f"{'Would sync' if self.dry_run else 'Synced'} {remote_dir}: "
+                f"{len(self.uploaded)} uploaded, {len(self.deleted)} deleted, "
+                f"{len(self.unchanged)} unchanged, {len(self.failed)} failed"
+            ),
+        )
+
+
+def _digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def publish_directory(
+    db: DatabricksService,
+    local_dir: Path,
+    remote_dir: str,
+    pattern: str = "*.yaml",
+    prune: bool = True,
+    dry_run: bool = False,
+) -> PublishResult:
+    """Make ``remote_dir`` match the ``pattern`` files in ``local_dir``, by file name."""
+    files = {p.name: p for p in sorted(Path(local_dir).glob(pattern))}
+    return publish_files(db, files, remote_dir, prune=prune, dry_run=dry_run)
+
+
+def publish_files(
+    db: DatabricksService,
+    files: Mapping[str, Path],
+    remote_dir: str,
+    prune: bool = True,
+    dry_run: bool = False,
+) -> PublishResult:
+    """Make ``remote_dir`` hold exactly ``files`` (remote file name → local file).
+
+    Raises RuntimeError when Databricks is not configured. Per-file failures
+    are reported in ``PublishResult.failed`` and retried by the next sync.
+    """
+    if not db.available:
+        raise RuntimeError("Databricks client not initialised — check DATABRICKS_HOST and DATABRICKS_TOKEN")
+    client = db._client
+    remote_dir = remote_dir.rstrip("/")
+
+    local = {name: Path(path).read_bytes() for name, path in sorted(files.items())}
+    remote = _list_remote(client, remote_dir)
+    manifest = _read_manifest(client, remote_dir) if MANIFEST_NAME in remote else {}
+
+    result = PublishResult(dry_run=dry_run)
+    for name, content in local.items():
+        if name in remote and manifest.get(name) == _digest(content):
+            result.unchanged.append(name)
+        else:
+            result.uploaded.append(name)
+    orphans = sorted(n for n in manifest if n not in local and n in remote) if prune else []
+    result.deleted = orphans
+    if dry_run:
+        return result
+
+    from databricks.sdk.service.workspace import ImportFormat
+
+    def _upload(name: str) -> Optional[str]:
+        path = f"{remote_dir}/{name}"
+        try:
+            # Delete first — overwrite=True is incompatible with ImportFormat.AUTO
+            if name in remote:
+                client.workspace.delete(path)
+            client.workspace.upload(path, local[name], format=ImportFormat.AUTO)
+            return None
+        except Exception as e:
+            return str(e)
+
+    def _delete(name: str) -> Optional[str]:
+        try:
+            client.workspace.delete(f"{remote_dir}/{name}")
+            return None
+        except Exception as e:
+            return str(e)
+
+    if result.uploaded and not remote:
+        client.workspace.mkdirs(remote_dir)
+    with ThreadPoolExecutor(max_workers=max(1, settings.deploy_max_workers)) as pool:
+        upload_errors = list(pool.map(_upload, result.uploaded))
+        delete_errors = list(pool.map(_delete, orphans))
+
+    new_manifest = {n: manifest[n] for n in result.unchanged}
+    for name, error in zip(list(result.uploaded), upload_errors):
+        if error:
+            result.failed[name] = error
+            result.uploaded.remove(name)
+        else:
+            new_manifest[name] = _digest(local[name])
+    for name, error in zip(orphans, delete_errors):
+        if error:
+            result.failed[name] = error
+            result.deleted.remove(name)
+            new_manifest[name] = manifest[name]  # keep it so the next sync retries
+
+    if new_manifest != manifest or MANIFEST_NAME not in remote:
+        _write_manifest(client, remote_dir, new_manifest, exists=MANIFEST_NAME in remote)
+    logger.info(
+        "Published %s: %d uploaded, %d deleted, %d unchanged, %d failed",
+        remote_dir, len(result.uploaded), len(result.deleted), len(result.unchanged), len(result.failed),
+    )
+    return result
+
+
+def _list_remote(client, remote_dir: str) -> Set[str]:
+    try:
+        return {
+            obj.path.rsplit("/", 1)[-1]
+            for obj in client.workspace.list(remote_dir)
+            if obj.path
+        }
+    except Exception as e:
+        logger.debug("Could not list %s (may not exist): %s", remote_dir, e)
+        return set()
+
+
+def _read_manifest(client, remote_dir: str) -> Dict[str, str]:
+    from databricks.sdk.service.workspace import ExportFormat
+
+    try:
+        resp = client.workspace.export(f"{remote_dir}/{MANIFEST_NAME}", format=ExportFormat.SOURCE)
+        data = json.loads(base64.b64decode(resp.content or ""))
+        return dict(data.get("files") or {})
+    except Exception as e:
+        logger.warning("Unreadable workspace manifest in %s, re-uploading everything: %s", remote_dir, e)
+        return {}
+
+
+def _write_manifest(client, remote_dir: str, files: Dict[str, str], exists: bool) -> None:
+    from databricks.sdk.service.workspace import ImportFormat
+
+    path = f"{remote_dir}/{MANIFEST_NAME}"
+    payload = json.dumps({"version": 1, "files": dict(sorted(files.items()))}, indent=2).encode("utf-8")
+    try:
+        if exists:
+            client.workspace.delete(path)
+        client.workspace.upload(path, payload, format=ImportFormat.AUTO)
+    except Exception as e:
+        # Not fatal: the next sync just re-uploads what it cannot prove is unchanged
+        logger.warning("Could not write workspace manifest %s: %s", path, e)
@@ -0,0 +1,264 @@
+"""In-memory caches for YAML config files on disk.
+
+Two building blocks shared by the config services:
+
+    YamlDocCache  — path → parsed document, re-parsed only when the file's
+                    (mtime_ns, size) signature changes.
+    YamlCatalog   — a directory of named YAML documents (one per file) with a
+                    name → path index, so lookups by name do not need to open
+                    every file in the directory.
+
+Invalidation is stat-based rather than event-based: the catalog re-lists the
+directory only when the directory's own mtime changes (a file was added,
+removed or renamed) and re-parses a file only when its signature changes.
+Writers inside the portal also call ``invalidate()`` explicitly so their own
+changes are visible immediately, regardless of filesystem timestamp
+granularity.
+
+Every cached document carries a SHA-1 ``digest`` of its raw text; the read
+endpoints use it (and ``YamlCatalog.version()``) as their ETag.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+# (mtime_ns, size) — cheap to obtain via stat(), changes on every rewrite
+Signature = Tuple[int, int]
+
+
+def file_signature(path: Path) -> Optional[Signature]:
+    """Return the (mtime_ns, size) signature of ``path``, or None if it is gone."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def combine_digests(parts: Iterable[Tuple[str, str]]) -> str:
+    """Collection-level digest from ``(name, digest)`` pairs, order-sensitive."""
+    h = hashlib.sha1()
+    for name, digest in parts:
+        h.update(f"{name}\0{digest}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+@dataclass
+class CachedDoc:
+    path: Path
+    signature: Signature
+    raw: str
+    data: Dict[str, Any]
+    error: Optional[str] = None   # YAML parse error text, if the file is invalid
+    digest: str = ""              # SHA-1 of ``raw``
+
+
+class YamlDocCache:
+    """Per-file parsed-YAML cache keyed by (path, mtime_ns, size).
+
+    Returned ``data`` dicts are shared between callers — copy before mutating.
+    """
+
+    def __init__(self) -> None:
+        self._docs: Dict[Path, CachedDoc] = {}
+        self._lock = threading.Lock()
+
+    def load(self, path: Path) -> Optional[CachedDoc]:
+        """Return the parsed document at ``path`` (None if it does not exist)."""
+        path = Path(path)
+        sig = file_signature(path)
+        if sig is None:
+            self.invalidate(path)
+            return None
+        with self._lock:
+            cached = self._docs.get(path)
+        if cached is not None and cached.signature == sig:
+            return cached
+
+        try:
+            raw = path.read_text(encoding="utf-8")
+        except OSError:
+            # Deleted between stat() and read (concurrent delete)
+            self.invalidate(path)
+            return None
+        try:
+            data = yaml.safe_load(raw) or {}
+            error = None
+            if not isinstance(data, dict):
+                data, error = {}, "YAML document is not a mapping"
+        except yaml.YAMLError as e:
+            data, error = {}, str(e)
+
+        doc = CachedDoc(
+            path=path, signature=sig, raw=raw, data=data, error=error,
+            digest=hashlib.sha1(raw.encode("utf-8")).hexdigest(),
+        )
+        # Only cache when the file did not change while we were reading it —
+        # otherwise a half-written file could be pinned to the newer signature.
+        if file_signature(path) == sig:
+            with self._lock:
+                self._docs[path] = doc
+        return doc
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Drop one path (or everything when ``path`` is None)."""
+        with self._lock:
+            if path is None:
+                self._docs.clear()
+            else:
+                self._docs.pop(Path(path), None)
+
+    def invalidate_prefix(self, directory: Path) -> None:
+        """Drop every cached file under ``directory``."""
+        directory = Path(directory)
+        with self._lock:
+            for p in [p for p in self._docs if directory in p.parents]:
+                del self._docs[p]
+
+
+class YamlCatalog:
+    """A directory of ``*.yaml`` configs indexed by their ``name`` field.
+
+    ``directory`` is a callable so the catalog follows settings that are
+    resolved lazily (and patched per-test).
+    """
+
+    def __init__(
+        self,
+        directory: Callable[[], Path],
+        pattern: str = "*.yaml",
+        key: str = "name",
+    ) -> None:
+        self._directory = directory
+        self._pattern = pattern
+        self._key = key
+        self._docs = YamlDocCache()
+        self._lock = threading.RLock()
+        self._dir_path: Optional[Path] = None
+        self._dir_signature: Optional[Signature] = None
+        self._files: List[Path] = []
+        self._by_name: Dict[str, Path] = {}
+        self._name_of: Dict[Path, str] = {}
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def entries(self) -> List[CachedDoc]:
+        """All parseable documents, ordered by filename.
+
+        Files that fail to parse are skipped, matching the previous
+        glob-and-parse behaviour of the config services.
+        """
+        self._refresh_listing()
+        with self._lock:
+            files = list(self._files)
+        out: List[CachedDoc] = []
+        for path in files:
+            doc = self._load(path)
+            if doc is not None and doc.error is None:
+                out.append(doc)
+        return out
+
+    def get(self, name: str) -> Optional[CachedDoc]:
+        """Return the document whose ``name`` field equals ``name``, or None."""
+        path = self.path_for(name)
+        if path is None:
+            return None
+        doc = self._load(path)
+        if doc is None or doc.data.get(self._key) != name:
+            # Renamed in place or deleted — fall back to a full re-index once.
+            self.invalidate()
+            path = self.path_for(name)
+            doc = self._load(path) if path is not None else None
+            if doc is None or doc.data.get(self._key) != name:
+                return None
+        return doc
+
+    def path_for(self, name: str) -> Optional[Path]:
+        """Return the file currently holding ``name``, or None."""
+        self._refresh_listing()
+        with self._lock:
+            return self._by_name.get(name)
+
+    def load(self, path: Path) -> Optional[CachedDoc]:
+        """Read one file directly (e.g. right after writing it) and index it."""
+        return self._load(Path(path))
+
+    def paths(self) -> Dict[str, Path]:
+        """Name → the file currently holding it, for every indexed document."""
+        self._refresh_listing()
+        with self._lock:
+            return dict(sorted(self._by_name.items()))
+
+    def names(self) -> List[str]:
+        self._refresh_listing()
+        with self._lock:
+            return sorted(self._by_name)
+
+    def version(self, name: Optional[str] = None) -> Optional[str]:
+        """Content digest of one document, or of the whole collection when None.
+
+        Returns None when ``name`` does not exist. Only unchanged files are
+        served from cache, so this costs one stat() per file.
+        """
+        if name is not None:
+            doc = self.get(name)
+            return doc.digest if doc is not None else None
+        return combine_digests((d.path.name, d.digest) for d in self.entries())
+
+    # ── Invalidation ────────────────────────────────────────────────────────
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Force a re-read of ``path`` (or a full re-list when None)."""
+        with self._lock:
+            if path is None:
+                self._dir_signature = None
+                self._docs.invalidate()
+                return
+            path = Path(path)
+            self._docs.invalidate(path)
+            # The directory listing may have changed too (create/delete)
+            self._dir_signature = None
+
+    # ── Internals ───────────────────────────────────────────────────────────
+
+    def _load(self, path: Path) -> Optional[CachedDoc]:
+        doc = self._docs.load(path)
+        with self._lock:
+            old = self._name_of.pop(path, None)
+            if old is not None and self._by_name.get(old) == path:
+                del self._by_name[old]
+            if doc is not None and doc.error is None:
+                name = doc.data.get(self._key)
+                if name:
+                    self._name_of[path] = name
+                    # First file (by filename) wins on duplicate names
+                    current = self._by_name.get(name)
+                    if current is None or current == path or path < current:
+                        self._by_name[name] = path
+        return doc
+
+    def _refresh_listing(self) -> None:
+        directory = Path(self._directory())
+        sig = file_signature(directory)
+        with self._lock:
+            if directory == self._dir_path and sig is not None and sig == self._dir_signature:
+                return
+            # Rebuilt while holding the lock so concurrent readers never see a
+            # half-populated index (e.g. source_exists() briefly returning False).
+            if directory != self._dir_path:
+                self._docs.invalidate()
+            self._dir_path = directory
+            self._dir_signature = sig
+            self._files = sorted(directory.glob(self._pattern)) if sig is not None else []
+            self._by_name = {}
+            self._name_of = {}
+            for path in self._files:
+                self._load(path)
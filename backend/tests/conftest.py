@@ -76,12 +76,16 @@ from app.services.databricks_service import DatabricksService
 from app.services.deploy_service import DeployService
 from app.services.embedding_service import EmbeddingService
 from app.services.git_service import GitService
+from app.services.databricks_client_cache import databricks_clients
+from app.services.query_cache import query_cache
 from app.services.rag_service import RAGService
 from app.services.silver_config_service import SilverConfigService
 from app.services.silver_deploy_service import SilverDeployService
 from app.services.silver_modeling_service import SilverModelingService
 from app.services.tenant_service import TenantService
 from app.services.testing_service import TestingService
+from app.services.run_events import run_event_hub
+from app.services.warehouse_warmer import warehouse_warmer
 
 
 # ── Settings isolation ─────────────────────────────────────────────────
@@ -98,8 +102,15 @@ def isolate_settings(tmp_path, monkeypatch):
     monkeypatch.setattr(settings, "silver_conf_dir", str(silver_conf))
     monkeypatch.setattr(settings, "chromadb_persist_dir", str(tmp_path / "chromadb"))
     monkeypatch.setattr(settings, "tenant_db_path", str(tmp_path / "tenants.db"))
+    monkeypatch.setattr(settings, "run_history_db_path", str(tmp_path / "run_history.db"))
     monkeypatch.setattr(settings, "git_enabled", False)
     monkeypatch.setattr(settings, "rag_require_auth", False)
+    # Process-wide caches must not leak results between tests
+    query_cache.clear()
+    databricks_clients.clear()
+    warehouse_warmer.clear()
+    run_event_hub.clear()
+    monkeypatch.setattr("app.services.audit_service._dead_letter_counts", {})
 
 
 # ── Mock external services ─────────────────────────────────────────────
@@ -109,6 +120,7 @@ def mock_git():
     mock = MagicMock(spec=GitService)
     mock.available = False
     mock.commit_file.return_value = "deadbeef"
+    mock.commit_files.return_value = "deadbeef"
     mock.commit_delete.return_value = None
     return mock
 
@@ -129,9 +141,11 @@ def mock_db():
 def mock_audit():
     mock = MagicMock(spec=AuditService)
     mock.get_run_history.return_value = []
+    mock.get_entity_runs.return_value = []
     mock.get_dead_letter_count.return_value = 0
     mock.get_dead_letter_records.return_value = []
     mock.get_dashboard_stats.return_value = {"recent_runs": 0, "recent_failures": 0}
+    mock.get_latest_runs.return_value = {}
     return mock
 
 
@@ -230,8 +244,8 @@ def deploy_svc(config_svc, mock_git, mock_db):
 
 
 @pytest.fixture
-def silver_deploy_svc(silver_config_svc, mock_git, mock_db):
-    return SilverDeployService(silver_config_svc, mock_git, mock_db)
+def silver_deploy_svc(silver_config_svc, mock_git, mock_db, config_svc):
+    return SilverDeployService(silver_config_svc, mock_git, mock_db, config_svc)
 
 
 # ── Main TestClient fixture ────────────────────────────────────────────
@@ -49,3 +49,163 @@ class TestTriggerRun:
     def test_trigger_nonexistent_source(self, client):
         resp = client.post(f"{BASE}/sources/no_such/trigger")
         assert resp.status_code == 404
+
+    def test_trigger_invalidates_cached_results(self, client, mock_db):
+        mock_db.available = True
+        mock_db.trigger_job.return_value = "123"
+        client.post(f"{BASE}/sources", json=make_file_source("cache_src"))
+        resp = client.post(f"{BASE}/sources/cache_src/trigger")
+        assert resp.status_code == 200
+        tables = mock_db.invalidate_tables.call_args[0][0]
+        assert tables == [
+            "dev.bronze.cache_src",
+            "dev.bronze_meta.ingestion_audit_log",
+            "dev.bronze_meta.dead_letter_cache_src",
+        ]
+        # ... and once more when the run ends
+        assert mock_db.watch_run.call_args.args == ("123",)
+        assert mock_db.watch_run.call_args.kwargs["tables"] == tables
+
+
+class TestSyncWorkspace:
+    def test_sync_reports_publish_result(self, client, mock_db):
+        from unittest.mock import patch
+
+        from app.services.workspace_publisher import PublishResult
+
+        mock_db.available = True
+        result = PublishResult(uploaded=["a.yaml"], unchanged=["b.yaml", "c.yaml"], failed={"d.yaml": "boom"})
+        with patch("app.services.deploy_service.publish_files", return_value=result) as publish:
+            resp = client.post(f"{BASE}/sources/sync", params={"prune": "false"})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["uploaded"] == ["a.yaml"]
+        assert data["unchanged"] == 2
+        assert data["failed"] == {"d.yaml": "boom"}
+        assert data["remote_dir"].endswith("/conf/sources")
+        assert publish.call_args.kwargs["prune"] is False
+
+    def test_sync_names_remote_files_after_the_source(self, client, mock_db):
+        from unittest.mock import patch
+
+        from app.config import settings
+        from app.services.workspace_publisher import PublishResult
+
+        (settings.sources_dir / "jdbc_prefixed.yaml").write_text(
+            "name: prefixed\nsource_type: jdbc\ntarget: {catalog: dev, schema: bronze, table: p}\n"
+        )
+        mock_db.available = True
+        with patch("app.services.deploy_service.publish_files", return_value=PublishResult()) as publish:
+            client.post(f"{BASE}/sources/sync")
+        files = publish.call_args.args[1]
+        assert list(files) == ["prefixed.yaml"]
+        assert files["prefixed.yaml"].name == "jdbc_prefixed.yaml"
+
+    def test_sync_databricks_unavailable(self, client, mock_db):
+        mock_db.available = False
+        resp = client.post(f"{BASE}/sources/sync")
+        assert resp.status_code == 502
+
+
+class TestJobPacking:
+    NIGHTLY = {"cron_expression": "0 0 2 * * ?", "timezone": "UTC"}
+    HOURLY = {"cron_expression": "0 0 * * * ?", "timezone": "UTC"}
+
+    @staticmethod
+    def _members(mock_db):
+        return {c.args[0]: c.args[2] for c in mock_db.create_or_update_pack_job.call_args_list}
+
+    def test_same_schedule_shares_one_job(self, client, mock_db, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "databricks_job_packing", True)
+        mock_db.create_or_update_pack_job.return_value = "77"
+        client.post(f"{BASE}/sources", json=make_file_source("p_a", schedule=self.NIGHTLY))
+        resp = client.post(f"{BASE}/sources", json=make_file_source("p_b", schedule=self.NIGHTLY))
+        assert resp.json()["job_id"] == "77"
+        client.post(f"{BASE}/sources", json=make_file_source("p_manual"))
+
+        mock_db.create_or_update_job.assert_called_once()  # only the unscheduled source
+        [(pack, members)] = self._members(mock_db).items()
+        assert pack.startswith("pack-")
+        assert members == ["p_a", "p_b"]
+
+    def test_reschedule_and_delete_update_membership(self, client, mock_db, monkeypatch):
+        from app.config import settings
+        from app.services.job_packer import pack_name
+
+        monkeypatch.setattr(settings, "databricks_job_packing", True)
+        nightly, hourly = pack_name(self.NIGHTLY), pack_name(self.HOURLY)
+        for name in ("r_a", "r_b"):
+            client.post(f"{BASE}/sources", json=make_file_source(name, schedule=self.NIGHTLY))
+
+        mock_db.create_or_update_pack_job.reset_mock()
+        client.put(f"{BASE}/sources/r_b", json={"schedule": self.HOURLY})
+        assert self._members(mock_db) == {nightly: ["r_a"], hourly: ["r_b"]}
+
+        client.delete(f"{BASE}/sources/r_a")
+        mock_db.delete_job_by_key.assert_called_with("bronze", nightly, settings.default_environment)
+
+    def test_large_pack_splits_into_capped_jobs(self, client, mock_db, monkeypatch):
+        from app.config import settings
+        from app.services.job_packer import pack_name
+
+        monkeypatch.setattr(settings, "databricks_job_packing", True)
+        monkeypatch.setattr(settings, "databricks_pack_max_tasks", 2)
+        nightly = pack_name(self.NIGHTLY)
+        mock_db.create_or_update_pack_job.side_effect = lambda job, *args: f"id-{job}"
+        sources = [make_file_source(f"chunk_{i}", schedule=self.NIGHTLY) for i in range(5)]
+        resp = client.post(f"{BASE}/sources/bulk", json={"sources": sources})
+        assert self._members(mock_db) == {
+            nightly: ["chunk_0", "chunk_1"],
+            f"{nightly}-2": ["chunk_2", "chunk_3"],
+            f"{nightly}-3": ["chunk_4"],
+        }
+        assert resp.json()["results"][4]["job_id"] == f"id-{nightly}-3"
+
+        client.post(f"{BASE}/sources/chunk_3/trigger")
+        assert mock_db.run_job_now.call_args.args[1] == f"{nightly}-2"
+
+        # Shrinking the pack deletes the job of the chunk it no longer fills
+        mock_db.registered_jobs.return_value = [
+            {"name": f"{nightly}-{n}", "environment": settings.default_environment} for n in (2, 3)
+        ]
+        client.delete(f"{BASE}/sources/chunk_4")
+        mock_db.delete_job_by_key.assert_called_with("bronze", f"{nightly}-3", settings.default_environment)
+
+    def test_packs_read_schedules_without_loading_sources(self, config_svc, mock_db, monkeypatch):
+        from unittest.mock import MagicMock
+
+        from app.config import settings
+        from app.services.job_packer import JobPacker, pack_name
+
+        monkeypatch.setattr(settings, "databricks_job_packing", True)
+        (settings.sources_dir / "jdbc_sched.yaml").write_text(
+            "name: sched\nsource_type: jdbc\nschedule: {cron_expression: '0 0 2 * * ?', timezone: UTC}\n"
+        )
+        (settings.sources_dir / "manual.yaml").write_text("name: manual\nsource_type: file\n")
+        monkeypatch.setattr(config_svc, "get_source", MagicMock(side_effect=AssertionError))
+        assert JobPacker(config_svc, mock_db).packs() == {pack_name(self.NIGHTLY): (self.NIGHTLY, ["sched"])}
+
+    def test_trigger_runs_only_the_source_task(self, client, mock_db, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "databricks_job_packing", True)
+        mock_db.run_job_now.return_value = "555"
+        client.post(f"{BASE}/sources", json=make_file_source("t_a", schedule=self.NIGHTLY))
+        resp = client.post(f"{BASE}/sources/t_a/trigger")
+        assert resp.json()["run_id"] == "555"
+        assert mock_db.run_job_now.call_args.kwargs["only"] == ["t_a"]
+        mock_db.trigger_job.assert_not_called()
+
+    def test_bulk_syncs_each_pack_once(self, client, mock_db, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "databricks_job_packing", True)
+        mock_db.create_or_update_pack_job.return_value = "88"
+        sources = [make_file_source(f"bulk_p{i}", schedule=self.NIGHTLY) for i in range(5)]
+        resp = client.post(f"{BASE}/sources/bulk", json={"sources": sources})
+        assert resp.json()["created"] == 5
+        assert {r["job_id"] for r in resp.json()["results"]} == {"88"}
+        assert mock_db.create_or_update_pack_job.call_count == 1
+        mock_db.create_or_update_job.assert_not_called()
@@ -1,5 +1,7 @@
 """Tests for Bronze monitoring endpoints: run history, dead letters, stats."""
 
+import json
+
 from tests.conftest import make_file_source
 
 BASE = "/api/v1/bronze"
@@ -64,6 +66,24 @@ class TestRunHistory:
         resp = client.get(f"{BASE}/sources/overflow_src/runs?limit=99999")
         assert resp.status_code == 422
 
+    def test_run_history_filters_and_cursor(self, client, mock_audit):
+        mock_audit.get_run_history.return_value = [
+            {"source_name": "page_src", "status": "FAILURE", "start_time": f"2026-01-0{d} 08:00:00"}
+            for d in (3, 2)
+        ]
+        client.post(f"{BASE}/sources", json=make_file_source("page_src"))
+        resp = client.get(
+            f"{BASE}/sources/page_src/runs",
+            params={"limit": 2, "status": "FAILURE", "since": "2026-01-01", "cursor": "2026-01-04 00:00:00"},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["next_cursor"] == "2026-01-02 08:00:00"
+        args = mock_audit.get_run_history.call_args
+        assert args.kwargs == {"status": "FAILURE", "since": "2026-01-01", "before": "2026-01-04 00:00:00"}
+
+        mock_audit.get_run_history.return_value = mock_audit.get_run_history.return_value[:1]
+        assert client.get(f"{BASE}/sources/page_src/runs?limit=2").json()["next_cursor"] is None
+
 
 class TestDeadLetters:
     def test_dead_letters_404_for_nonexistent(self, client):
@@ -104,6 +124,54 @@ class TestDeadLetters:
         resp = client.get(f"{BASE}/sources/dl_bad/dead-letters?limit=101")
         assert resp.status_code == 422
 
+    def test_dead_letters_keyset_page_and_filters(self, client, mock_audit):
+        from app.services.audit_service import dead_letter_cursor
+
+        rows = [{"_ingest_timestamp": f"2026-01-01 08:00:0{i}", "_dl_row_key": str(100 - i)} for i in range(3)]
+        mock_audit.get_dead_letter_records.return_value = rows
+        mock_audit.get_dead_letter_count.return_value = 1234
+        client.post(f"{BASE}/sources", json=make_file_source("dl_page"))
+
+        resp = client.get(f"{BASE}/sources/dl_page/dead-letters", params={
+            "limit": 2, "since": "2026-01-01", "reason": "null_primary_key", "cursor": "abc",
+        })
+        data = resp.json()
+        assert data["total_count"] == 1234
+        assert data["recent_records"] == rows[:2]
+        assert data["next_cursor"] == dead_letter_cursor(rows[1])
+        args = mock_audit.get_dead_letter_records.call_args
+        assert args.args == ("dl_page", "dev", "dl_page", 3)
+        assert args.kwargs == {"cursor": "abc", "since": "2026-01-01", "until": None, "reason": "null_primary_key"}
+
+    def test_dead_letters_bad_cursor_is_422(self, client, mock_audit):
+        mock_audit.get_dead_letter_records.side_effect = ValueError("Invalid cursor")
+        client.post(f"{BASE}/sources", json=make_file_source("dl_cur"))
+        assert client.get(f"{BASE}/sources/dl_cur/dead-letters?cursor=x").status_code == 422
+
+    def test_dead_letters_export_streams_ndjson(self, client, mock_audit):
+        mock_audit.iter_dead_letters.return_value = iter([{"id": 1}, {"id": 2, "_rejection_reason": "rescued_data"}])
+        client.post(f"{BASE}/sources", json=make_file_source("dl_exp"))
+        resp = client.get(f"{BASE}/sources/dl_exp/dead-letters/export?reason=rescued")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        assert [json.loads(line) for line in resp.text.splitlines()] == [
+            {"id": 1}, {"id": 2, "_rejection_reason": "rescued_data"},
+        ]
+        assert mock_audit.iter_dead_letters.call_args.kwargs["reason"] == "rescued"
+        assert client.get(f"{BASE}/sources/ghost/dead-letters/export").status_code == 404
+
+    def test_dead_letters_export_marks_a_failed_stream(self, client, mock_audit):
+        def rows():
+            yield {"id": 1}
+            raise RuntimeError("chunk 2 download failed")
+
+        mock_audit.iter_dead_letters.return_value = rows()
+        client.post(f"{BASE}/sources", json=make_file_source("dl_fail"))
+        resp = client.get(f"{BASE}/sources/dl_fail/dead-letters/export")
+        assert [json.loads(line) for line in resp.text.splitlines()] == [
+            {"id": 1}, {"error": "chunk 2 download failed"},
+        ]
+
 
 class TestDashboardStats:
     def test_stats_no_sources(self, client):
@@ -137,6 +205,40 @@ class TestDashboardStats:
         assert by_type.get("file", 0) == 2
         assert by_type.get("jdbc", 0) == 1
 
+    def test_stats_span_every_catalog(self, client, mock_audit):
+        mock_audit.get_dashboard_stats.return_value = {
+            "recent_runs": 3,
+            "recent_failures": 1,
+            "run_stats_by_type": {"jdbc": {"runs": 3, "failures": 1, "p95_duration_seconds": 42.0}},
+        }
+        client.post(f"{BASE}/sources", json=make_file_source("f1"))
+        client.post(f"{BASE}/sources", json=make_jdbc_source(
+            "j1", target={"catalog": "prod", "schema": "bronze", "table": "j1"},
+        ))
+
+        data = client.get(f"{BASE}/stats?window_hours=6").json()
+        assert data["catalogs"] == ["dev", "prod"]
+        assert data["window_hours"] == 6
+        assert data["recent_runs"] == 3
+        assert data["run_stats_by_type"]["jdbc"]["p95_duration_seconds"] == 42.0
+        mock_audit.get_dashboard_stats.assert_called_once_with(
+            ["dev", "prod"], {"f1": "file", "j1": "jdbc"}, 6,
+        )
+
+    def test_stats_list_sources_whose_latest_run_failed(self, client, mock_audit):
+        mock_audit.get_latest_runs.return_value = {
+            "ok": [{"status": "SUCCESS"}],
+            "bad": [{"status": "FAILURE"}],
+        }
+        client.post(f"{BASE}/sources", json=make_file_source("ok"))
+        client.post(f"{BASE}/sources", json=make_file_source("bad"))
+        assert client.get(f"{BASE}/stats").json()["failing_sources"] == ["bad"]
+        mock_audit.get_latest_runs.assert_called_once_with({"ok": "dev", "bad": "dev"}, limit=1)
+
+    def test_stats_window_bounds(self, client):
+        assert client.get(f"{BASE}/stats").json()["window_hours"] == 24
+        assert client.get(f"{BASE}/stats?window_hours=0").status_code == 422
+
     def test_stats_required_fields(self, client):
         resp = client.get(f"{BASE}/stats")
         data = resp.json()
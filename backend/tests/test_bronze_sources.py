@@ -53,6 +53,47 @@ class TestListSources:
         assert len(sources) == 1
         assert sources[0]["name"] == "d1"
 
+    def test_list_filter_by_tag_and_prefix(self, client):
+        client.post(f"{BASE}/sources", json=make_file_source("crm_a", tags={"team": "crm"}))
+        client.post(f"{BASE}/sources", json=make_file_source("crm_b", tags={"team": "ops"}))
+        client.post(f"{BASE}/sources", json=make_file_source("erp_a", tags={"team": "crm"}))
+        resp = client.get(f"{BASE}/sources?tag_key=team&tag_value=crm&name_prefix=crm_")
+        assert [s["name"] for s in resp.json()["sources"]] == ["crm_a"]
+
+    def test_list_filter_by_schedule_and_load_type(self, client):
+        scheduled = make_file_source("sched_src")
+        scheduled["schedule"] = {"cron_expression": "0 8 * * *"}
+        client.post(f"{BASE}/sources", json=scheduled)
+        client.post(f"{BASE}/sources", json=make_file_source("adhoc_src"))
+        resp = client.get(f"{BASE}/sources?has_schedule=true&load_type=full")
+        assert [s["name"] for s in resp.json()["sources"]] == ["sched_src"]
+        resp = client.get(f"{BASE}/sources?has_schedule=false&cdc_mode=append")
+        assert [s["name"] for s in resp.json()["sources"]] == ["adhoc_src"]
+
+    def test_list_paginates_with_cursor(self, client):
+        for i in range(5):
+            client.post(f"{BASE}/sources", json=make_file_source(f"page_{i}"))
+        seen, cursor = [], None
+        while True:
+            url = f"{BASE}/sources?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            data = client.get(url).json()
+            assert data["total"] == 5
+            seen += [s["name"] for s in data["sources"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        assert seen == [f"page_{i}" for i in range(5)]
+
+    def test_list_sort_descending(self, client):
+        for name in ("b_src", "a_src", "c_src"):
+            client.post(f"{BASE}/sources", json=make_file_source(name))
+        resp = client.get(f"{BASE}/sources?sort=-name&limit=2")
+        assert [s["name"] for s in resp.json()["sources"]] == ["c_src", "b_src"]
+
+    def test_list_invalid_sort_and_cursor_422(self, client):
+        assert client.get(f"{BASE}/sources?sort=bogus").status_code == 422
+        assert client.get(f"{BASE}/sources?cursor=not-a-cursor").status_code == 422
+
 
 # ──────────────────────────────────────────────────────────────────────
 # Create source — happy paths
@@ -167,6 +208,55 @@ class TestCreateSource:
         assert resp.status_code == 201
 
 
+class TestBulkCreateSources:
+    def test_bulk_create_single_commit(self, client, mock_git, mock_db):
+        payload = {"sources": [make_file_source(f"bulk_{i}") for i in range(4)]}
+        resp = client.post(f"{BASE}/sources/bulk", json=payload)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["created"] == 4
+        assert data["failed"] == 0
+        assert data["git_commit"] == "deadbeef"
+        assert [r["name"] for r in data["results"]] == [f"bulk_{i}" for i in range(4)]
+        mock_git.commit_files.assert_called_once()
+        assert len(mock_git.commit_files.call_args[0][0]) == 4
+        mock_git.commit_file.assert_not_called()
+        assert mock_db.upload_yaml.call_count == 4
+        assert mock_db.create_or_update_job.call_count == 4
+        assert client.get(f"{BASE}/sources").json()["total"] == 4
+
+    def test_bulk_create_reports_per_item_outcome(self, client, mock_db):
+        client.post(f"{BASE}/sources", json=make_file_source("bulk_existing"))
+        bad = make_file_source("bulk_bad")
+        bad["extract"] = {}
+        payload = {"sources": [
+            make_file_source("bulk_ok"),
+            make_file_source("bulk_existing"),
+            bad,
+        ]}
+        data = client.post(f"{BASE}/sources/bulk", json=payload).json()
+        status = {r["name"]: r["status"] for r in data["results"]}
+        assert status == {"bulk_ok": "created", "bulk_existing": "exists", "bulk_bad": "invalid"}
+        assert data["created"] == 1
+        assert data["failed"] == 2
+        assert client.get(f"{BASE}/sources/bulk_bad").status_code == 404
+
+    def test_bulk_create_deploy_failure_is_isolated(self, client, mock_db):
+        def _upload(path, name):
+            if name == "bulk_boom":
+                raise RuntimeError("Workspace upload failed: boom")
+        mock_db.upload_yaml.side_effect = _upload
+        payload = {"sources": [make_file_source("bulk_fine"), make_file_source("bulk_boom")]}
+        data = client.post(f"{BASE}/sources/bulk", json=payload).json()
+        by_name = {r["name"]: r for r in data["results"]}
+        assert by_name["bulk_fine"]["status"] == "created"
+        assert by_name["bulk_boom"]["status"] == "failed"
+        assert "boom" in by_name["bulk_boom"]["errors"][0]
+
+    def test_bulk_create_empty_list_422(self, client):
+        assert client.post(f"{BASE}/sources/bulk", json={"sources": []}).status_code == 422
+
+
 # ──────────────────────────────────────────────────────────────────────
 # Create source — validation errors (422)
 # ──────────────────────────────────────────────────────────────────────
@@ -314,6 +404,64 @@ class TestGetSource:
         assert "not found" in resp.json()["detail"].lower()
 
 
+class TestConditionalGet:
+    def test_detail_304_until_changed(self, client):
+        client.post(f"{BASE}/sources", json=make_file_source("etag_src"))
+        first = client.get(f"{BASE}/sources/etag_src")
+        etag = first.headers["etag"]
+        resp = client.get(f"{BASE}/sources/etag_src", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+        client.put(f"{BASE}/sources/etag_src", json={"description": "changed"})
+        resp = client.get(f"{BASE}/sources/etag_src", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+        assert resp.json()["description"] == "changed"
+
+    def test_list_etag_tracks_collection(self, client):
+        client.post(f"{BASE}/sources", json=make_file_source("etag_a"))
+        etag = client.get(f"{BASE}/sources").headers["etag"]
+        assert client.get(f"{BASE}/sources", headers={"If-None-Match": etag}).status_code == 304
+        client.post(f"{BASE}/sources", json=make_file_source("etag_b"))
+        resp = client.get(f"{BASE}/sources", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.json()["total"] == 2
+
+    def test_missing_source_still_404(self, client):
+        resp = client.get(f"{BASE}/sources/ghost", headers={"If-None-Match": "*"})
+        assert resp.status_code == 404
+
+
+class TestListLastRun:
+    def test_last_run_column_in_one_audit_call(self, client, mock_audit):
+        mock_audit.get_latest_runs.return_value = {
+            "lr_a": [{"source_name": "lr_a", "status": "FAILURE", "start_time": "2026-01-02 08:00:00"}],
+        }
+        client.post(f"{BASE}/sources", json=make_file_source("lr_a"))
+        client.post(f"{BASE}/sources", json=make_jdbc_source("lr_b"))
+
+        resp = client.get(f"{BASE}/sources", params={"include_last_run": True})
+        assert resp.status_code == 200
+        assert "etag" not in resp.headers
+        by_name = {s["name"]: s for s in resp.json()["sources"]}
+        assert by_name["lr_a"]["last_run"]["status"] == "FAILURE"
+        assert by_name["lr_b"]["last_run"] is None
+        mock_audit.get_latest_runs.assert_called_once_with({"lr_a": "dev", "lr_b": "dev"}, limit=1)
+
+    def test_plain_list_skips_the_audit_log(self, client, mock_audit):
+        client.post(f"{BASE}/sources", json=make_file_source("lr_c"))
+        assert client.get(f"{BASE}/sources").json()["sources"][0]["last_run"] is None
+        mock_audit.get_latest_runs.assert_not_called()
+
+    def test_audit_failure_keeps_the_list(self, client, mock_audit):
+        mock_audit.get_latest_runs.side_effect = RuntimeError("warehouse down")
+        client.post(f"{BASE}/sources", json=make_file_source("lr_d"))
+        resp = client.get(f"{BASE}/sources?include_last_run=true")
+        assert resp.status_code == 200 and resp.json()["total"] == 1
+
+
 # ──────────────────────────────────────────────────────────────────────
 # Update source
 # ──────────────────────────────────────────────────────────────────────
@@ -0,0 +1,385 @@
+"""End-to-end tests of DatabricksService against the local emulator."""
+
+from __future__ import annotations
+
+import json
+import time
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.config import settings
+from app.emulator import DatabricksEmulator
+from app.services import testing_service
+from app.services.databricks_service import DatabricksService
+from app.services.config_service import ConfigService
+from app.services.gold_readiness_service import GoldReadinessService
+from app.services.warehouse_warmer import warehouse_warmer
+from app.services.workspace_publisher import MANIFEST_NAME, publish_directory
+
+
+@pytest.fixture
+def emulator(monkeypatch):
+    monkeypatch.setattr(settings, "run_watch_initial_interval", 0.05)
+    monkeypatch.setattr(settings, "run_watch_max_interval", 0.2)
+    with DatabricksEmulator(chunk_rows=2, run_seconds=0.2) as emu:
+        yield emu
+
+
+@pytest.fixture
+def emu_db(emulator):
+    return DatabricksService(host=emulator.host, token="t", warehouse_id="wh", tenant_id="emu")
+
+
+def _stats(emulator) -> dict:
+    with urllib.request.urlopen(f"{emulator.host}/emulator/stats") as f:
+        return json.load(f)["requests"]
+
+
+def _seed(emulator, *statements):
+    for sql in statements:
+        emulator.state.warehouse.execute(sql)
+
+
+def _seed_audit(emulator, *runs):
+    """Append (source_name, start_time, status) rows to dev's ingestion audit log."""
+    emulator.state.warehouse.insert_records("dev.bronze_meta.ingestion_audit_log", [
+        {
+            "source_name": name, "environment": "dev", "start_time": start, "end_time": None,
+            "status": status, "records_read": 1, "records_written": 1,
+            "records_quarantined": 0, "error": None,
+        }
+        for name, start, status in runs
+    ])
+
+
+class TestEmulatorSql:
+    def test_chunked_results_are_followed(self, emulator, emu_db):
+        _seed(
+            emulator,
+            "CREATE TABLE dev.silver.customers (id INT, name TEXT)",
+            "INSERT INTO dev.silver.customers VALUES (1, 'a'), (2, 'b'), (3, 'c')",
+        )
+        rows = emu_db.query_sql("SELECT * FROM `dev`.`silver`.customers ORDER BY id")
+        assert rows == [{"id": "1", "name": "a"}, {"id": "2", "name": "b"}, {"id": "3", "name": "c"}]
+        assert _stats(emulator) == {"sql.execute": 1, "sql.chunk": 1}
+
+        chunks = list(emu_db.iter_sql_chunks("SELECT id FROM dev.silver.customers", disposition="EXTERNAL_LINKS"))
+        assert [c.rows for c in chunks] == [[["1"], ["2"]], [["3"]]]
+
+    def test_metadata_statements_and_errors(self, emulator, emu_db):
+        _seed(emulator, "CREATE TABLE dev.bronze.orders (order_id INT, amount REAL)")
+        assert emu_db.list_tables("dev", "bronze") == [
+            {"table": "orders", "full_name": "dev.bronze.orders"}
+        ]
+        assert [r["col_name"] for r in emu_db.query_sql("DESCRIBE TABLE dev.bronze.orders")] == [
+            "order_id", "amount",
+        ]
+        [ok, missing] = emu_db.query_many(["SELECT COUNT(*) AS n FROM dev.bronze.orders", "SELECT * FROM dev.bronze.nope"])
+        assert ok.rows == [{"n": "0"}]
+        assert "TABLE_OR_VIEW_NOT_FOUND" in missing.error
+
+
+class TestEmulatorJobs:
+    def _deploy_source(self, emu_db, tmp_path):
+        yaml_path = tmp_path / "orders.yaml"
+        yaml_path.write_text(
+            "name: orders\n"
+            "target: {catalog: dev, schema: bronze, table: orders}\n"
+            "extract: {path: /Volumes/dev/bronze/landing_data/orders/}\n"
+        )
+        emu_db.upload_yaml(str(yaml_path), "orders")
+        return emu_db.create_or_update_job("orders", "dev")
+
+    def test_trigger_wait_ingests_landing_files(self, emulator, emu_db, tmp_path):
+        job_id = self._deploy_source(emu_db, tmp_path)
+        emu_db.upload_bytes_to_volume(
+            b'{"order_id": 1}\n{"order_id": 2, "amount": 9.5}\n',
+            "/Volumes/dev/bronze/landing_data/orders/test_batch.json",
+        )
+        run_id = emu_db.trigger_job("orders", "dev")
+        assert emu_db.wait_for_run_by_id(run_id, timeout=10) is True
+
+        assert emu_db.query_sql("SELECT COUNT(*) AS n FROM dev.bronze.orders") == [{"n": "2"}]
+        [audit] = emu_db.query_sql(
+            "SELECT status, records_written FROM dev.bronze_meta.ingestion_audit_log "
+            "WHERE start_time >= current_timestamp() - INTERVAL 24 HOURS"
+        )
+        assert audit == {"status": "SUCCESS", "records_written": "2"}
+        assert emu_db.find_job_id("bronze", "orders", "dev") == int(job_id)
+
+    def test_reads_during_a_run_do_not_outlive_it(self, emulator, emu_db, tmp_path):
+        self._deploy_source(emu_db, tmp_path)
+        _seed(emulator, "CREATE TABLE dev.bronze.orders (order_id INT, amount REAL)")
+        count = "SELECT COUNT(*) AS n FROM dev.bronze.orders"
+        emu_db.upload_bytes_to_volume(
+            b'{"order_id": 1}\n{"order_id": 2}\n',
+            "/Volumes/dev/bronze/landing_data/orders/test_batch.json",
+        )
+        run_id = emu_db.trigger_job("orders", "dev")
+        assert emu_db.query_sql(count) == [{"n": "0"}]  # cached while the run is in flight
+        assert emu_db.wait_for_run_by_id(run_id, timeout=10, tables=["dev.bronze.orders"]) is True
+        assert emu_db.query_sql(count) == [{"n": "2"}]
+
+    def test_registry_avoids_repeat_list_calls(self, emulator, emu_db, tmp_path):
+        self._deploy_source(emu_db, tmp_path)
+        for _ in range(3):
+            emu_db.trigger_job("orders", "dev")
+        stats = _stats(emulator)
+        assert stats["jobs.list"] == 1        # the miss before create only
+        assert stats["jobs.run_now"] == 3
+
+    def test_stale_registry_entry_recovers(self, emulator, emu_db, tmp_path):
+        self._deploy_source(emu_db, tmp_path)
+        emu_db._client.jobs.delete(job_id=emu_db.find_job_id("bronze", "orders", "dev"))
+        new_id = emu_db.create_or_update_job("orders", "dev")
+        assert emu_db.find_job_id("bronze", "orders", "dev") == int(new_id)
+
+    def test_packed_job_runs_tasks_on_one_cluster(self, emulator, emu_db, tmp_path):
+        for name in ("p_orders", "p_refunds"):
+            (tmp_path / f"{name}.yaml").write_text(
+                f"name: {name}\n"
+                f"target: {{catalog: dev, schema: bronze, table: {name}}}\n"
+                f"extract: {{path: /Volumes/dev/bronze/landing_data/{name}/}}\n"
+            )
+            emu_db.upload_yaml(str(tmp_path / f"{name}.yaml"), name)
+            emu_db.upload_bytes_to_volume(b'{"id": 1}\n', f"/Volumes/dev/bronze/landing_data/{name}/a.json")
+        job_id = emu_db.create_or_update_pack_job(
+            "pack-test", "dev", ["p_refunds", "p_orders"], {"cron_expression": "0 0 2 * * ?"},
+        )
+        job = emu_db._client.jobs.get(job_id=int(job_id))
+        assert [t.task_key for t in job.settings.tasks] == ["p_orders", "p_refunds"]
+        assert len(job.settings.job_clusters) == 1
+
+        run_id = emu_db.run_job_now("bronze", "pack-test", "dev", only=["p_refunds"])
+        assert emu_db.wait_for_run_by_id(int(run_id), timeout=10)
+        assert emu_db.list_tables("dev", "bronze") == [
+            {"table": "p_refunds", "full_name": "dev.bronze.p_refunds"}
+        ]
+
+    def test_silver_dag_job_wires_dependencies(self, emu_db):
+        from app.services.silver_dag import DagTask
+
+        tasks = [
+            DagTask(key="bronze__orders", kind="bronze", name="orders"),
+            DagTask(key="order", kind="silver", name="order", depends_on=["bronze__orders"]),
+        ]
+        job_id = emu_db.create_or_update_dag_job("dag-sales", "dev", tasks, None)
+        job = emu_db._client.jobs.get(job_id=int(job_id))
+        assert job.settings.name == "silver_portal_dag-sales_dev"
+        by_key = {t.task_key: t for t in job.settings.tasks}
+        assert [d.task_key for d in by_key["order"].depends_on] == ["bronze__orders"]
+        assert by_key["order"].job_cluster_key == by_key["bronze__orders"].job_cluster_key
+
+    def test_volume_directory_clear(self, emu_db):
+        base = "/Volumes/dev/bronze/landing_data/x"
+        emu_db.upload_bytes_to_volume(b"{}", f"{base}/a.json")
+        emu_db.upload_bytes_to_volume(b"{}", f"{base}/b.json")
+        emu_db.clear_volume_directory(base)
+        assert list(emu_db._client.files.list_directory_contents(base)) == []
+
+
+class TestEmulatorWarehouse:
+    def test_waits_for_a_stopped_warehouse(self, emulator, emu_db, monkeypatch):
+        monkeypatch.setattr("app.services.databricks_service.time.sleep", lambda s: None)
+        emulator.state.stop_warehouse("wh")
+        assert emu_db.warehouse_state() == "STOPPED"
+        assert warehouse_warmer.known_state(emu_db._scope) == "STOPPED"
+
+        assert emu_db.wait_for_warehouse(timeout=5) == "RUNNING"
+        assert _stats(emulator)["warehouses.start"] == 1
+
+    def test_query_on_known_cold_warehouse_starts_it_first(self, emulator, emu_db, monkeypatch):
+        monkeypatch.setattr("app.services.databricks_service.time.sleep", lambda s: None)
+        _seed(emulator, "CREATE TABLE t (id INTEGER)", "INSERT INTO t VALUES (1)")
+        emulator.state.stop_warehouse("wh")
+        emu_db.warehouse_state()
+        assert emu_db.query_sql("SELECT id FROM t") == [{"id": "1"}]
+        assert emulator.state.warehouse_state == "RUNNING"
+
+
+class TestWorkspacePublisher:
+    REMOTE = "/Workspace/portal/conf/sources"
+
+    def _write(self, tmp_path, **files):
+        for name, body in files.items():
+            (tmp_path / f"{name}.yaml").write_text(body)
+
+    def test_resync_uploads_only_changes(self, emulator, emu_db, tmp_path):
+        self._write(tmp_path, a="name: a\n", b="name: b\n")
+        first = publish_directory(emu_db, tmp_path, self.REMOTE)
+        assert first.uploaded == ["a.yaml", "b.yaml"] and not first.failed
+
+        imports = _stats(emulator)["workspace.import"]
+        assert publish_directory(emu_db, tmp_path, self.REMOTE).unchanged == ["a.yaml", "b.yaml"]
+        assert _stats(emulator)["workspace.import"] == imports
+
+        self._write(tmp_path, b="name: b\nenabled: false\n")
+        again = publish_directory(emu_db, tmp_path, self.REMOTE)
+        assert again.uploaded == ["b.yaml"] and again.unchanged == ["a.yaml"]
+        assert emulator.state._workspace[f"{self.REMOTE}/b.yaml"] == b"name: b\nenabled: false\n"
+
+    def test_prunes_only_files_it_published(self, emulator, emu_db, tmp_path):
+        self._write(tmp_path, a="name: a\n", b="name: b\n")
+        publish_directory(emu_db, tmp_path, self.REMOTE)
+        emu_db._client.workspace.upload(f"{self.REMOTE}/a_test.yaml", b"name: a_test\n")
+        (tmp_path / "b.yaml").unlink()
+
+        preview = publish_directory(emu_db, tmp_path, self.REMOTE, dry_run=True)
+        assert preview.deleted == ["b.yaml"] and preview.dry_run
+        assert f"{self.REMOTE}/b.yaml" in emulator.state._workspace
+
+        result = publish_directory(emu_db, tmp_path, self.REMOTE)
+        assert result.deleted == ["b.yaml"]
+        remote = {p.rsplit("/", 1)[-1] for p in emulator.state._workspace if p.startswith(self.REMOTE)}
+        assert remote == {"a.yaml", "a_test.yaml", MANIFEST_NAME}
+
+
+class TestEmulatorTestingSuite:
+    """run_suite end to end: test job, setup, trigger, wait, teardown, assertions."""
+
+    COUNT = "SELECT COUNT(*) AS n FROM dev.bronze_test.orders"
+
+    @staticmethod
+    def _tc(tc_id, data_file, expected):
+        return {
+            "id": tc_id, "name": f"Load {data_file}", "category": "insert", "positive": True,
+            "data_file": data_file, "teardown": ["truncate_dead_letter_table"],
+            "assertions": [{
+                "type": "row_count", "description": f"{expected} rows loaded",
+                "expected": expected, "sql": TestEmulatorTestingSuite.COUNT,
+            }],
+        }
+
+    def test_suite_runs_against_the_emulator(self, emulator, emu_db, isolate_settings, tmp_path, monkeypatch):
+        root = tmp_path / "testing"
+        monkeypatch.setattr("app.services.testing_service.TESTING_ROOT", root)
+        (root / "suites").mkdir(parents=True)
+        (root / "data" / "orders").mkdir(parents=True)
+        (root / "data" / "orders" / "two.json").write_text('{"order_id": 1}\n{"order_id": 2}\n')
+        (root / "data" / "orders" / "three.json").write_text('{"order_id": 3}\n{"order_id": 4}\n{"order_id": 5}\n')
+        (root / "suites" / "orders.yaml").write_text(json.dumps({
+            "source_name": "orders", "source_type": "file", "primary_keys": ["order_id"],
+            "target_table": "orders", "test_catalog": "dev", "test_schema": "bronze_test",
+            "test_cases": [self._tc("TC001", "two.json", 2), self._tc("TC002", "three.json", 5)],
+        }))
+        (settings.sources_dir / "orders.yaml").write_text(
+            "name: orders\nsource_type: file\n"
+            "target: {catalog: dev, schema: bronze, table: orders}\n"
+            "extract: {format: json, path: /Volumes/dev/bronze/landing_data/orders/}\n"
+        )
+        # A page read before the suite has cached an empty test table
+        _seed(emulator, "CREATE TABLE dev.bronze_test.orders (order_id INT)")
+        assert emu_db.query_sql(self.COUNT) == [{"n": "0"}]
+
+        svc = testing_service.TestingService(ConfigService(), emu_db)
+        run_id = svc.run_suite("orders").run_id
+        deadline = time.monotonic() + 20
+        while (result := svc.get_latest_result("orders")).overall_status == "RUNNING":
+            assert time.monotonic() < deadline, "suite did not finish"
+            time.sleep(0.05)
+
+        assert result.run_id == run_id
+        assert result.overall_status == "PASSED", [tc.assertions for tc in result.test_cases]
+        assert [(tc.id, tc.assertions[0].actual) for tc in result.test_cases] == [("TC001", 2), ("TC002", 5)]
+        assert _stats(emulator)["jobs.run_now"] == 2
+        # The test job wrote through the portal's cache: later reads see its rows
+        assert emu_db.query_sql(self.COUNT) == [{"n": "5"}]
+
+
+class TestEmulatorGoldReadiness:
+    def test_readiness_flow_against_emulator(self, emulator, emu_db):
+        _seed(
+            emulator,
+            "CREATE TABLE dev.slv_customer.customer (customer_id TEXT, customer_name TEXT)",
+        )
+        silver = MagicMock()
+        silver.list_entities.return_value = [SimpleNamespace(name="customer", target_table="dev.slv_customer.customer")]
+        bronze = MagicMock()
+        bronze.list_sources.return_value = []
+        ir = {
+            "mart": {"name": "crm"},
+            "dimensions": [{
+                "name": "dim_customer",
+                "source_entity": "dev.slv_customer.customer",
+                "business_key": ["customer_id"],
+                "attributes": [{"name": "customer_name"}, {"name": "country_code"}],
+            }],
+            "facts": [],
+        }
+        report = GoldReadinessService(bronze, silver, emu_db).check(ir)
+        assert report.databricks_available is True
+        assert [c.missing_column for c in report.column_issues] == ["country_code"]
+
+
+class TestRunHistorySync:
+    def test_incremental_sync_from_watermark(self, emulator, emu_db, monkeypatch):
+        from app.services.run_history_store import get_run_history_store
+
+        monkeypatch.setattr(settings, "run_history_lookback_minutes", 60)
+        store = get_run_history_store()
+        now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        t1, t2, t3 = (str(now - timedelta(hours=h)) for h in (4, 2, 1))
+        _seed_audit(
+            emulator,
+            ("orders", "2000-01-01 00:00:00", "SUCCESS"),  # outside the backfill window
+            ("orders", t1, "SUCCESS"),
+            ("orders", t2, "RUNNING"),
+        )
+        assert store.sync(emu_db, "bronze", "dev") == 2
+        assert store.sync_state("emu", "bronze", "dev")[0] == t2
+
+        # The running row is rewritten in place and one new run arrives
+        emulator.state.warehouse.execute(
+            "UPDATE \"dev.bronze_meta.ingestion_audit_log\" SET status = 'SUCCESS' "
+            f"WHERE start_time = '{t2}'"
+        )
+        _seed_audit(emulator, ("orders", t3, "FAILURE"))
+        assert store.sync(emu_db, "bronze", "dev") == 2  # only rows inside the lookback
+        runs = store.runs("emu", "bronze", "dev", "orders")
+        assert [(r["start_time"], r["status"]) for r in runs] == [
+            (t3, "FAILURE"), (t2, "SUCCESS"), (t1, "SUCCESS"),
+        ]
+
+
+    def test_runs_longer_than_the_lookback_are_refreshed(self, emulator, emu_db, monkeypatch):
+        from app.services.run_history_store import get_run_history_store
+
+        monkeypatch.setattr(settings, "run_history_lookback_minutes", 60)
+        store = get_run_history_store()
+        now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        long_run, later = str(now - timedelta(hours=3)), str(now - timedelta(minutes=5))
+        _seed_audit(emulator, ("orders", long_run, "RUNNING"), ("refunds", later, "SUCCESS"))
+        store.sync(emu_db, "bronze", "dev")
+
+        # Finishes three hours in — well outside the 60-minute lookback
+        emulator.state.warehouse.execute(
+            "UPDATE \"dev.bronze_meta.ingestion_audit_log\" SET status = 'SUCCESS' "
+            f"WHERE start_time = '{long_run}'"
+        )
+        store.sync(emu_db, "bronze", "dev")
+        [run] = store.runs("emu", "bronze", "dev", "orders")
+        assert run["status"] == "SUCCESS"
+
+
+class TestLatestRuns:
+    def test_latest_runs_of_many_sources_in_one_statement(self, emulator, emu_db):
+        from app.services.audit_service import AuditService
+
+        _seed_audit(emulator, *[
+            (name, f"2026-01-0{day} 08:00:00", "FAILURE" if day == 3 else "SUCCESS")
+            for name in ("orders", "customers") for day in (1, 2, 3)
+        ], ("ignored", "2026-01-04 08:00:00", "SUCCESS"))
+        before = _stats(emulator).get("sql.execute", 0)
+
+        latest = AuditService(emu_db).get_latest_runs(
+            {"orders": "dev", "customers": "dev", "never_ran": "dev"}, limit=2,
+        )
+        assert _stats(emulator)["sql.execute"] == before + 1
+        assert sorted(latest) == ["customers", "orders"]
+        assert [(r["start_time"], r["status"]) for r in latest["orders"]] == [
+            ("2026-01-03 08:00:00", "FAILURE"), ("2026-01-02 08:00:00", "SUCCESS"),
+        ]
@@ -0,0 +1,212 @@
+"""Tests for the deploy queue — 202 create/update routes and the worker side."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.services.deploy_queue import DeployQueue, get_deploy_queue, publish_operation
+from tests.conftest import make_file_source, make_silver_entity
+
+
+def _payload(message="portal: add source s", **overrides):
+    return {"commit_messages": [message], "deploy_job": True, "is_new": True, "left_pack": None, **overrides}
+
+
+@pytest.fixture
+def queue(isolate_settings):
+    return DeployQueue(settings.tenant_db_path)
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    """Deploy queue on, no background workers — tests drain it themselves."""
+    monkeypatch.setattr(settings, "deploy_queue_enabled", True)
+    monkeypatch.setattr(settings, "deploy_queue_workers", 0)
+
+
+def _drain(deploy_svc, silver_deploy_svc):
+    ran = []
+    while (op := get_deploy_queue().run_next(
+        lambda op: publish_operation(op, deploy_svc, silver_deploy_svc)
+    )) is not None:
+        ran.append(op)
+    return ran
+
+
+class TestDeployQueue:
+    def test_claim_complete(self, queue):
+        op = queue.enqueue("t1", "bronze", "s", _payload())
+        assert op.status == "queued"
+        claimed = queue.claim()
+        assert claimed.id == op.id and claimed.status == "running" and claimed.attempts == 1
+        assert queue.claim() is None
+        queue.complete(op.id, {"job_id": "42"})
+        assert queue.get(op.id).result == {"job_id": "42"}
+
+    def test_queued_edits_coalesce(self, queue):
+        first = queue.enqueue("t1", "bronze", "s", _payload(left_pack="pack-old"))
+        second = queue.enqueue("t1", "bronze", "s", _payload(
+            "portal: update source s", deploy_job=False, is_new=False, left_pack="pack-new",
+        ))
+        assert second.id == first.id
+        assert second.payload == {
+            "commit_messages": ["portal: add source s", "portal: update source s"],
+            "deploy_job": True,
+            "is_new": True,
+            "left_pack": "pack-old",
+        }
+        # Other tenants and other names get their own operation
+        assert queue.enqueue("t2", "bronze", "s", _payload()).id != first.id
+        assert queue.enqueue("t1", "silver", "s", _payload()).id != first.id
+
+    def test_same_name_never_runs_concurrently(self, queue):
+        queue.enqueue("t1", "bronze", "s", _payload())
+        running = queue.claim()
+        # Edited while running → a second operation, held back until the first finishes
+        later = queue.enqueue("t1", "bronze", "s", _payload("portal: update source s"))
+        assert later.id != running.id
+        assert queue.claim() is None
+        queue.complete(running.id, {})
+        assert queue.claim().id == later.id
+
+    def test_retries_with_backoff_then_fails(self, queue, monkeypatch):
+        monkeypatch.setattr(settings, "deploy_queue_max_attempts", 2)
+        monkeypatch.setattr(settings, "deploy_queue_retry_seconds", 0)
+        op = queue.enqueue("t1", "bronze", "s", _payload())
+
+        def boom(op):
+            raise RuntimeError("Databricks is slow")
+
+        assert queue.run_next(boom).status == "queued"
+        done = queue.run_next(boom)
+        assert done.status == "failed" and done.attempts == 2
+        assert done.error == "Databricks is slow"
+        assert queue.claim() is None and done.id == op.id
+
+    def test_backoff_delays_the_retry(self, queue, monkeypatch):
+        monkeypatch.setattr(settings, "deploy_queue_retry_seconds", 60)
+        queue.enqueue("t1", "bronze", "s", _payload())
+        queue.run_next(lambda op: 1 / 0)
+        assert queue.claim() is None
+
+    def test_missing_config_is_not_retried(self, queue):
+        queue.enqueue("t1", "bronze", "s", _payload())
+
+        def gone(op):
+            raise FileNotFoundError("Source 's' not found")
+
+        done = queue.run_next(gone)
+        assert done.status == "failed" and done.attempts == 1
+
+    def test_expired_lease_is_reclaimed(self, queue, monkeypatch):
+        op = queue.enqueue("t1", "bronze", "s", _payload())
+        queue.claim()
+        monkeypatch.setattr(
+            "app.services.deploy_queue._now",
+            lambda: datetime.now(timezone.utc) + timedelta(seconds=settings.deploy_queue_lease_seconds + 1),
+        )
+        reclaimed = queue.claim()
+        assert reclaimed.id == op.id and reclaimed.attempts == 2
+
+    def test_idempotency_key_resolves_to_the_operation(self, queue):
+        op = queue.enqueue("t1", "bronze", "s", _payload(), idempotency_key="k1")
+        queue.enqueue("t1", "bronze", "s", _payload(), idempotency_key="k2")
+        assert queue.find_by_key("t1", "k1").id == op.id
+        assert queue.find_by_key("t1", "k2").id == op.id  # coalesced
+        assert queue.find_by_key("t2", "k1") is None
+
+
+class TestQueuedRoutes:
+    def test_create_source_returns_202_and_publishes_later(
+        self, queued, client, mock_db, mock_git, deploy_svc, silver_deploy_svc,
+    ):
+        resp = client.post("/api/v1/bronze/sources", json=make_file_source("orders"))
+        assert resp.status_code == 202
+        op = resp.json()
+        assert op["status"] == "queued" and op["name"] == "orders"
+        assert resp.headers["location"] == f"/api/v1/operations/{op['id']}"
+        # YAML is written, nothing has left the portal yet
+        assert client.get("/api/v1/bronze/sources/orders").status_code == 200
+        mock_git.commit_file.assert_not_called()
+        mock_db.upload_yaml.assert_not_called()
+
+        [done] = _drain(deploy_svc, silver_deploy_svc)
+        assert done.status == "succeeded"
+        mock_git.commit_file.assert_called_once()
+        assert mock_git.commit_file.call_args.args[1] == "portal: add source orders (file)"
+        mock_db.upload_yaml.assert_called_once()
+        mock_db.create_or_update_job.assert_called_once()
+
+        status = client.get(f"/api/v1/operations/{op['id']}").json()
+        assert status["status"] == "succeeded"
+        assert status["result"]["yaml_path"].endswith("orders.yaml")
+
+    def test_idempotency_key_replays_the_first_response(self, queued, client):
+        headers = {"Idempotency-Key": "abc"}
+        first = client.post("/api/v1/bronze/sources", json=make_file_source("orders"), headers=headers)
+        again = client.post("/api/v1/bronze/sources", json=make_file_source("orders"), headers=headers)
+        assert again.status_code == 202
+        assert again.json()["id"] == first.json()["id"]
+        # Without the key the duplicate is still a conflict
+        assert client.post("/api/v1/bronze/sources", json=make_file_source("orders")).status_code == 409
+
+    def test_invalid_source_is_rejected_before_queueing(self, queued, client):
+        resp = client.post("/api/v1/bronze/sources", json=make_file_source("bad", extract={}))
+        assert resp.status_code == 422
+        assert client.get("/api/v1/operations").json()["operations"] == []
+
+    def test_update_without_schedule_skips_the_job(
+        self, queued, client, mock_db, deploy_svc, silver_deploy_svc,
+    ):
+        client.post("/api/v1/bronze/sources", json=make_file_source("orders"))
+        _drain(deploy_svc, silver_deploy_svc)
+        mock_db.reset_mock()
+
+        resp = client.put("/api/v1/bronze/sources/orders", json={"description": "Orders feed"})
+        assert resp.status_code == 202
+        [done] = _drain(deploy_svc, silver_deploy_svc)
+        assert done.status == "succeeded"
+        mock_db.upload_yaml.assert_called_once()
+        mock_db.create_or_update_job.assert_not_called()
+
+    def test_silver_create_and_update_coalesce(
+        self, queued, client, mock_git, deploy_svc, silver_deploy_svc,
+    ):
+        created = client.post("/api/v1/silver/entities", json=make_silver_entity("customer"))
+        updated = client.put("/api/v1/silver/entities/customer", json={"description": "Customers"})
+        assert created.status_code == updated.status_code == 202
+        assert created.json()["id"] == updated.json()["id"]
+
+        [done] = _drain(deploy_svc, silver_deploy_svc)
+        assert done.status == "succeeded"
+        mock_git.commit_file.assert_called_once()
+        assert mock_git.commit_file.call_args.args[1] == (
+            "portal: add silver entity customer (customer); portal: update silver entity customer"
+        )
+
+    def test_publish_of_deleted_source_fails_cleanly(self, queued, client, deploy_svc, silver_deploy_svc):
+        op = client.post("/api/v1/bronze/sources", json=make_file_source("orders")).json()
+        (settings.sources_dir / "orders.yaml").unlink()
+        [done] = _drain(deploy_svc, silver_deploy_svc)
+        assert done.id == op["id"] and done.status == "failed"
+        assert "not found" in done.error
+
+    def test_failed_git_commit_is_retried(self, queued, client, mock_git, deploy_svc, silver_deploy_svc):
+        from app.services.git_service import GitCommitError
+
+        mock_git.commit_file.side_effect = GitCommitError("Git commit failed: index.lock exists")
+        op = client.post("/api/v1/bronze/sources", json=make_file_source("orders")).json()
+        [done] = _drain(deploy_svc, silver_deploy_svc)
+        assert done.id == op["id"] and done.status == "queued"
+        assert "index.lock" in done.error
+
+    def test_operations_are_tenant_scoped(self, queued, client):
+        other = get_deploy_queue().enqueue("someone-else", "bronze", "x", _payload())
+        assert client.get(f"/api/v1/operations/{other.id}").status_code == 404
+        assert client.get("/api/v1/operations/nope").status_code == 404
+
+    def test_queue_off_keeps_synchronous_201(self, client):
+        assert client.post("/api/v1/bronze/sources", json=make_file_source("orders")).status_code == 201
@@ -14,6 +14,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from app.services.databricks_service import StatementResult
 from app.services.gold_readiness_service import (
     ColumnIssue,
     GoldReadinessService,
@@ -93,6 +94,9 @@ def _service(
         return []
 
     dbx.query_sql.side_effect = query_sql
+    dbx.query_many.side_effect = lambda stmts, **kw: [
+        StatementResult(sql=s, rows=query_sql(s)) for s in stmts
+    ]
     return GoldReadinessService(bronze, silver, dbx)
 
 
@@ -210,8 +214,10 @@ def test_databricks_unreachable_warns_but_yaml_still_ok():
     ]
     dbx = MagicMock()
     dbx.available = True
-    # Reachability check raises -> table_reachable=False -> warning, not error
-    dbx.query_sql.side_effect = Exception("workspace down")
+    # Reachability check fails -> table_reachable=False -> warning, not error
+    dbx.query_many.side_effect = lambda stmts, **kw: [
+        StatementResult(sql=s, error="workspace down") for s in stmts
+    ]
 
     svc = GoldReadinessService(bronze, silver, dbx)
     report = svc.check(_ir_simple_sales())
@@ -257,3 +263,21 @@ def test_ai_enrichment_populates_suggestions(monkeypatch):
 
     enriched = svc.enrich_with_ai_suggestions(report)
     assert enriched.column_issues[0].suggestions == ["country", "cust_country"]
+
+
+def test_reachability_and_describe_are_batched():
+    """One query_many call per phase, regardless of how many sources the mart uses."""
+    svc = _service(
+        silver_targets=["dev.slv_customer.customer", "dev.slv_sales.order_line"],
+        dbx_available=True,
+        describe_columns={
+            "dev.slv_customer.customer": ["customer_id", "customer_name", "country_code"],
+            "dev.slv_sales.order_line": [
+                "order_id", "order_line_id", "customer_id", "qty", "price", "order_updated_at",
+            ],
+        },
+    )
+    report = svc.check(_ir_simple_sales())
+    assert report.ready is True
+    assert svc._dbx.query_many.call_count == 2
+    svc._dbx.query_sql.assert_not_called()
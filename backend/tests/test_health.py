@@ -37,6 +37,16 @@ class TestHealth:
         assert data["databricks_configured"] is True
 
 
+class TestCacheStats:
+    def test_cache_stats_shape(self, client):
+        resp = client.get("/api/v1/health/caches")
+        assert resp.status_code == 200
+        assert set(resp.json()["sql_results"]) >= {"hits", "misses", "size"}
+        assert set(resp.json()["databricks_clients"]) >= {
+            "hits", "misses", "evictions", "refreshes", "credential_hits", "size",
+        }
+
+
 class TestEnvironments:
     def test_environments_empty(self, client):
         resp = client.get("/api/v1/environments")
@@ -73,3 +83,47 @@ class TestEnvironments:
         assert env["name"] == "staging"
         assert env["variables"]["catalog"] == "staging"
         assert env["variables"]["region"] == "us-east-1"
+
+    def test_environments_conditional_get(self, client):
+        from app.config import settings
+
+        env_dir = settings.environments_dir
+        env_dir.mkdir(parents=True, exist_ok=True)
+        (env_dir / "dev.yaml").write_text("catalog: dev\n")
+        etag = client.get("/api/v1/environments").headers["etag"]
+        resp = client.get("/api/v1/environments", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        (env_dir / "dev.yaml").write_text("catalog: dev2\n")
+        resp = client.get("/api/v1/environments", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.json()[0]["variables"]["catalog"] == "dev2"
+
+
+class TestWarehouseEndpoints:
+    def test_reports_state_and_warmer_status(self, client, mock_db):
+        mock_db._warehouse_id, mock_db._scope = "wh-1", "tenant-1"
+        mock_db.warehouse_state.return_value = "STOPPED"
+        data = client.get("/api/v1/warehouse").json()
+        assert data["state"] == "STOPPED" and data["ready"] is False
+        assert data["warmer"] == {"tracked": False}
+
+    def test_unreadable_state_is_502(self, client, mock_db):
+        mock_db._warehouse_id, mock_db._scope = "wh-1", "tenant-1"
+        mock_db.warehouse_state.return_value = None
+        assert client.get("/api/v1/warehouse").status_code == 502
+
+    def test_start_without_wait(self, client, mock_db):
+        mock_db._warehouse_id, mock_db._scope = "wh-1", "tenant-1"
+        mock_db.warehouse_state.return_value = "STOPPED"
+        mock_db.start_warehouse.return_value = True
+        data = client.post("/api/v1/warehouse/start").json()
+        assert data["state"] == "STARTING"
+        mock_db.start_warehouse.assert_called_once()
+        mock_db.wait_for_warehouse.assert_not_called()
+
+    def test_start_and_wait(self, client, mock_db):
+        mock_db._warehouse_id, mock_db._scope = "wh-1", "tenant-1"
+        mock_db.wait_for_warehouse.return_value = "RUNNING"
+        data = client.post("/api/v1/warehouse/start?wait=true&timeout=30").json()
+        assert data["ready"] is True
+        mock_db.wait_for_warehouse.assert_called_once_with(30)
@@ -0,0 +1,129 @@
+"""Tests for MedallionBuildService — upstream planning and wave execution."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.services.medallion_build_service import MedallionBuildService, get_build
+from tests.conftest import make_file_source, make_silver_entity
+
+
+def _bronze(name, table):
+    return SimpleNamespace(name=name, target_table=f"dev.bronze.{table}")
+
+
+def _entity(name, *reads):
+    return SimpleNamespace(
+        name=name, domain="sales", schedule=None, target_table=f"dev.slv_sales.{name}",
+        target={"catalog": "dev", "schema": "slv_sales", "table": name},
+        sources=[{"bronze_table": table, "columns": []} for table in reads],
+    )
+
+
+def _ir(*tables):
+    return {
+        "mart": {"name": "sales"},
+        "dimensions": [{"name": "dim_x", "source_entity": tables[0]}],
+        "facts": [{"name": f"fact_{i}", "source_entity": t} for i, t in enumerate(tables[1:])],
+    }
+
+
+def _done(value: bool) -> Future:
+    f: Future = Future()
+    f.set_result(value)
+    return f
+
+
+def _service(outcomes=None):
+    bronze = MagicMock()
+    bronze.list_sources.return_value = [
+        _bronze("cust_src", "customers"), _bronze("order_src", "orders"), _bronze("fx_src", "fx_rates"),
+    ]
+    entities = {
+        "customer": _entity("customer", "dev.bronze.customers"),
+        "order_line": _entity("order_line", "${catalog}.bronze.orders", "${catalog}.slv_sales.customer"),
+        "unused": _entity("unused", "dev.bronze.other"),
+    }
+    silver = MagicMock()
+    silver.list_entities.return_value = list(entities.values())
+    silver.get_entity.side_effect = entities.get
+
+    deploy, silver_deploy, db = MagicMock(), MagicMock(), MagicMock()
+    deploy.trigger_run.side_effect = lambda name: f"run-{name}"
+    silver_deploy.trigger_run.side_effect = lambda name: f"run-{name}"
+    outcomes = outcomes or {}
+    db.watch_run.side_effect = lambda run_id, timeout, **kwargs: _done(outcomes.get(run_id, True))
+    return MedallionBuildService(bronze, silver, deploy, silver_deploy, db), deploy, silver_deploy
+
+
+def test_plan_walks_upstream_into_waves():
+    svc, _, _ = _service()
+    plan = svc.plan(_ir("dev.slv_sales.order_line", "dev.bronze.fx_rates", "dev.gold.elsewhere"))
+    assert plan.mart == "sales"
+    assert plan.waves == [
+        ["bronze__cust_src", "bronze__fx_src", "bronze__order_src"],
+        ["customer"],
+        ["order_line"],
+    ]
+    assert plan.unresolved == ["dev.gold.elsewhere"]
+    assert "unused" not in plan.nodes
+
+
+def test_run_triggers_waves_and_skips_downstream_of_failures():
+    svc, deploy, silver_deploy = _service({"run-cust_src": False})
+    plan = svc.plan(_ir("dev.slv_sales.order_line", "dev.bronze.fx_rates"))
+    from app.services.medallion_build_service import BuildStatus
+
+    status = svc.run(BuildStatus(
+        build_id="b1", mart=plan.mart, state="running", waves=plan.waves,
+        nodes=plan.nodes, unresolved=[],
+    ))
+    states = {k: n.state for k, n in status.nodes.items()}
+    assert states == {
+        "bronze__cust_src": "failed",
+        "bronze__fx_src": "succeeded",
+        "bronze__order_src": "succeeded",
+        "customer": "skipped",
+        "order_line": "skipped",
+    }
+    assert status.state == "failed"
+    assert sorted(c.args[0] for c in deploy.trigger_run.call_args_list) == ["cust_src", "fx_src", "order_src"]
+    silver_deploy.trigger_run.assert_not_called()
+
+
+def test_build_endpoints(client, mock_db):
+    client.post(
+        "/api/v1/bronze/sources",
+        json=make_file_source("customers_src", target={"catalog": "dev", "schema": "bronze", "table": "customers"}),
+    )
+    client.post("/api/v1/silver/entities", json=make_silver_entity("customer"))
+    ir = _ir("dev.slv_customer.customer")
+
+    plan = client.post("/api/v1/gold/build/plan", json={"ir": ir}).json()
+    assert plan["waves"] == [["bronze__customers_src"], ["customer"]]
+
+    mock_db.watch_run.side_effect = lambda run_id, timeout, **kwargs: _done(True)
+    mock_db.trigger_job.return_value = "11"
+    mock_db.run_job_now.return_value = "12"
+    mock_db.available = True
+    resp = client.post("/api/v1/gold/build", json={"ir": ir})
+    assert resp.status_code == 202
+    build_id = resp.json()["build_id"]
+
+    import time
+
+    for _ in range(100):
+        status = client.get(f"/api/v1/gold/builds/{build_id}").json()
+        if status["state"] != "running":
+            break
+        time.sleep(0.02)
+    assert status["state"] == "succeeded"
+    assert status["progress"]["succeeded"] == 2
+    assert get_build(build_id) is not None
+    assert client.get("/api/v1/gold/builds/nope").status_code == 404
+    # Another tenant's build is not visible
+    get_build(build_id).tenant_id = "someone-else"
+    assert client.get(f"/api/v1/gold/builds/{build_id}").status_code == 404
+    assert get_build(build_id, tenant_id="someone-else") is not None
@@ -0,0 +1,188 @@
+"""Tests for the run-event SSE stream — hub fan-out, resume, watcher and publishers."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.config import settings
+from app.models import testing as testing_models
+from app.services.run_events import run_event_hub
+
+
+@pytest.fixture(autouse=True)
+def short_streams(monkeypatch):
+    monkeypatch.setattr(settings, "run_events_max_stream_seconds", 0.3)
+    monkeypatch.setattr(settings, "run_events_keepalive_seconds", 0.1)
+
+
+def _service(scope="t1", available=True):
+    return SimpleNamespace(scope=scope, available=available)
+
+
+def _events(text: str):
+    """(event, data) pairs of an SSE body, comments and retry lines skipped."""
+    out = []
+    for frame in text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            out.append((fields["event"], json.loads(fields["data"])))
+    return out
+
+
+def _collect(service, during=None, **kwargs):
+    async def run():
+        frames = []
+        async for frame in run_event_hub.stream(service, **kwargs):
+            frames.append(frame)
+            if during is not None and len(frames) == 2:  # retry + snapshot sent → subscribed
+                threading.Thread(target=during).start()
+        return "".join(frames)
+
+    return asyncio.run(run())
+
+
+class TestRunEventHub:
+    def test_live_events_reach_the_tenants_streams_only(self):
+        def publish():
+            run_event_hub.publish("t2", "run", {"source_name": "other"})
+            run_event_hub.publish("t1", "run", {"source_name": "orders", "status": "SUCCESS"})
+
+        body = _collect(_service(), during=publish)
+        assert body.startswith("retry: ")
+        assert ": keepalive" in body
+        assert _events(body) == [
+            ("snapshot", {"runs": {}}),
+            ("run", {"source_name": "orders", "status": "SUCCESS"}),
+        ]
+        assert run_event_hub.subscribers("t1") == 0
+
+    def test_resume_from_last_event_id(self):
+        first = run_event_hub.publish("t1", "job_run", {"run_id": "1", "state": "RUNNING"})
+        run_event_hub.publish("t1", "job_run", {"run_id": "1", "state": "SUCCEEDED"})
+        body = _collect(_service(), last_event_id=first.id)
+        assert _events(body) == [("job_run", {"run_id": "1", "state": "SUCCEEDED"})]
+        assert f"id: {first.id + 1}\n" in body
+
+    def test_history_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(settings, "run_events_history", 2)
+        events = [run_event_hub.publish("t1", "job_run", {"run_id": str(i)}) for i in range(5)]
+        body = _collect(_service(available=False), last_event_id=events[2].id)
+        assert [data["run_id"] for _, data in _events(body)] == ["3", "4"]
+
+        # Events 1 and 2 are gone; a stale id (or one from before a restart)
+        # gets a snapshot instead of a replay with a silent gap
+        for stale in (events[1].id, events[-1].id + 100):
+            body = _collect(_service(available=False), last_event_id=stale)
+            assert [event for event, _ in _events(body)] == ["snapshot"]
+
+    def test_source_filter(self):
+        run_event_hub.publish("t1", "run", {"source_name": "orders"})
+        run_event_hub.publish("t1", "run", {"source_name": "customers"})
+        run_event_hub.publish("t1", "job_run", {"run_id": "7", "source_name": "orders"})
+        run_event_hub.publish("t1", "job_run", {"run_id": "8", "entity_name": "customer"})
+        body = _collect(_service(), last_event_id=0, source="orders")
+        assert _events(body) == [
+            ("run", {"source_name": "orders"}), ("job_run", {"run_id": "7", "source_name": "orders"}),
+        ]
+
+
+class TestLatestRunWatcher:
+    @pytest.fixture
+    def latest(self, monkeypatch):
+        runs = {"orders": [{"source_name": "orders", "status": "RUNNING", "start_time": "2026-01-01 08:00:00"}]}
+        sources = [SimpleNamespace(name="orders", target_table="dev.bronze.orders")]
+        config = MagicMock(list_sources=MagicMock(return_value=sources))
+        monkeypatch.setattr("app.dependencies.get_config_service", lambda: config)
+        audit = MagicMock(side_effect=lambda svc: MagicMock(get_latest_runs=MagicMock(return_value=runs)))
+        monkeypatch.setattr("app.services.audit_service.AuditService", audit)
+        return runs, audit
+
+    def test_one_poll_per_tenant_publishes_changes(self, latest, monkeypatch):
+        runs, audit = latest
+        monkeypatch.setattr(settings, "run_events_max_stream_seconds", 1.5)
+        service = _service()
+
+        def poll():
+            assert run_event_hub.tick() == 0  # the first stream already seeded it
+            runs["orders"][0]["status"] = "SUCCESS"
+            assert run_event_hub.tick() == 1
+            assert run_event_hub.tick() == 0
+
+        async def two_tabs():
+            first = run_event_hub.stream(service)
+            second = run_event_hub.stream(service, source="orders")
+            await first.__anext__(), await second.__anext__()
+            snapshots = [await first.__anext__(), await second.__anext__()]  # both subscribed
+            await asyncio.to_thread(poll)
+
+            async def drain(stream, snapshot):
+                return snapshot + "".join([f async for f in stream])
+
+            return await asyncio.gather(drain(first, snapshots[0]), drain(second, snapshots[1]))
+
+        first, second = asyncio.run(two_tabs())
+        assert audit.call_count == 4  # the seeding poll, then one per tick, not per tab
+        for body in (first, second):
+            (_, snapshot), (_, run) = _events(body)
+            assert snapshot["runs"]["orders"]["status"] == "RUNNING"
+            assert run["status"] == "SUCCESS"
+
+        # A new tab starts from the watcher's snapshot
+        monkeypatch.setattr(settings, "run_events_max_stream_seconds", 0.1)
+        snapshot = _events(_collect(service))[0]
+        assert snapshot == ("snapshot", {"runs": {"orders": {"start_time": "2026-01-01 08:00:00", "status": "SUCCESS"}}})
+
+    def test_tenants_without_streams_are_not_polled(self, latest):
+        _, audit = latest
+        run_event_hub.publish("t1", "run", {})
+        assert run_event_hub.tick() == 0
+        audit.assert_not_called()
+
+
+class TestPublishers:
+    def test_run_watcher_publishes_transitions(self, monkeypatch):
+        from app.services.run_watcher import RunWatcher
+
+        monkeypatch.setattr(settings, "run_watch_initial_interval", 0.01)
+        client = MagicMock()
+        client.jobs.get_run.return_value = MagicMock(
+            state=SimpleNamespace(life_cycle_state="TERMINATED", result_state="SUCCESS"),
+        )
+        watcher = RunWatcher(client, "t1")
+        assert watcher.watch(42, timeout=5, labels={"source_name": "orders"}).result(timeout=5) is True
+        body = _collect(_service(), last_event_id=0, source="orders")
+        assert [(data["state"], data["source_name"]) for _, data in _events(body)] == [
+            ("RUNNING", "orders"), ("SUCCEEDED", "orders"),
+        ]
+
+    def test_testing_service_publishes_progress(self, tmp_path, monkeypatch):
+        from app.services.testing_service import TestingService
+
+        monkeypatch.setattr("app.services.testing_service.TESTING_ROOT", tmp_path)
+        svc = TestingService(MagicMock(), MagicMock(scope="t1"))
+        svc._save_result("orders", testing_models.TestRunResult(
+            run_id="r1", source_name="orders", overall_status="RUNNING", environment="dev",
+            started_at=datetime.now(timezone.utc),
+            summary=testing_models.TestRunSummary(total=3, passed=1, failed=0, skipped=0),
+        ))
+        [(event, data)] = _events(_collect(_service(), last_event_id=0))
+        assert event == "test_progress"
+        assert data["source_name"] == "orders" and data["overall_status"] == "RUNNING"
+        assert data["summary"]["passed"] == 1
+
+
+class TestEventsEndpoint:
+    def test_stream_over_http(self, client, mock_db):
+        mock_db.scope = "default"
+        run_event_hub.publish("default", "job_run", {"run_id": "9", "state": "RUNNING"})
+        resp = client.get("/api/v1/events", headers={"Last-Event-ID": "0"})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        assert _events(resp.text) == [("job_run", {"run_id": "9", "state": "RUNNING"})]
@@ -7,6 +7,8 @@ tests can miss (e.g., wrong field extraction, partial update logic).
 
 import yaml
 import pytest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from unittest.mock import MagicMock
 
 from app.models.enums import CdcMode, LoadType, SourceType
@@ -24,8 +26,11 @@ from app.models.silver_requests import (
     SilverTargetRequest,
 )
 from app.services.config_service import ConfigService
+from app.services.config_validator import FrameworkValidator
+from app.services.databricks_service import DatabricksService
 from app.services.silver_config_service import SilverConfigService
 from app.services.deploy_service import DeployService
+from app.services.warehouse_warmer import WarehouseWarmer, cron_fires_within, cron_matches
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -210,6 +215,53 @@ class TestConfigServiceUpdateSource:
         assert detail.tags.get("key") == "val"
 
 
+class TestConfigServiceCatalog:
+    def test_unchanged_files_are_not_reparsed(self, config_svc, monkeypatch):
+        for i in range(3):
+            config_svc.write_source(_file_req(f"cat_src_{i}"))
+        config_svc.list_sources()
+
+        calls = []
+        real_load = yaml.safe_load
+        monkeypatch.setattr(yaml, "safe_load", lambda *a, **kw: calls.append(1) or real_load(*a, **kw))
+        config_svc.list_sources()
+        config_svc.get_source("cat_src_1")
+        assert config_svc.source_exists("cat_src_2") is True
+        assert calls == []
+
+    def test_external_edit_is_picked_up(self, config_svc):
+        path = config_svc.write_source(_file_req("cat_edit"))
+        config_svc.list_sources()
+        data = yaml.safe_load(open(path, encoding="utf-8"))
+        data["description"] = "Edited outside the portal"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(yaml.safe_dump(data) + "\n# padding so the size changes\n")
+        assert config_svc.get_source("cat_edit").description == "Edited outside the portal"
+
+    def test_external_add_and_remove_are_picked_up(self, config_svc):
+        config_svc.write_source(_file_req("cat_keep"))
+        assert [s.name for s in config_svc.list_sources()] == ["cat_keep"]
+
+        extra = config_svc.sources_dir / "file_cat_extra.yaml"
+        extra.write_text(config_svc.render_yaml(_file_req("cat_extra")), encoding="utf-8")
+        assert config_svc.source_exists("cat_extra")
+        assert {s.name for s in config_svc.list_sources()} == {"cat_keep", "cat_extra"}
+
+        extra.unlink()
+        assert config_svc.get_source("cat_extra") is None
+        assert [s.name for s in config_svc.list_sources()] == ["cat_keep"]
+
+    def test_name_index_resolves_prefixed_filename(self, config_svc):
+        path = config_svc.sources_dir / "jdbc_prefixed.yaml"
+        path.write_text(config_svc.render_yaml(_file_req("prefixed")), encoding="utf-8")
+        assert config_svc._source_path("prefixed") == path
+
+    def test_get_source_returns_independent_copy(self, config_svc):
+        config_svc.write_source(_file_req("cat_copy", tags={"domain": "a"}))
+        config_svc.get_source("cat_copy").target["table"] = "mutated"
+        assert config_svc.get_source("cat_copy").target["table"] == "cat_copy"
+
+
 class TestConfigServiceValidation:
     def test_valid_file_source(self, config_svc):
         req = _file_req("valid_src")
@@ -271,6 +323,61 @@ class TestConfigServiceValidation:
         assert "preview_src" in yaml_text
 
 
+class TestFrameworkValidator:
+    @staticmethod
+    def _write_framework(root, body="        if 'bad' in data:\n            raise ValueError('bad key')\n"):
+        pkg = root / "fakefw"
+        pkg.mkdir(parents=True, exist_ok=True)
+        (pkg / "__init__.py").write_text("", encoding="utf-8")
+        (pkg / "loader.py").write_text(
+            "class ConfigLoader:\n"
+            "    def __init__(self):\n"
+            "        raise RuntimeError('must not be constructed')\n"
+            "    def _parse_source(self, data):\n" + body,
+            encoding="utf-8",
+        )
+
+    def test_repeat_validation_is_cached(self, config_svc):
+        req = _file_req("cached_src")
+        assert config_svc.validate_config(req) == (True, [])
+        assert config_svc.validate_config(req) == (True, [])
+        stats = config_svc.validation_stats()
+        assert stats["hits"] >= 1
+        assert stats["size"] >= 1
+
+    def test_parse_errors_are_cached(self, tmp_path):
+        self._write_framework(tmp_path)
+        v = FrameworkValidator(lambda: tmp_path, "fakefw.loader", "_parse_source")
+        assert v.validate("bad: 1\n") == "bad key"
+        assert v.validate("bad: 1\n") == "bad key"
+        assert v.validate("good: 1\n") is None
+        assert v.stats() == {"hits": 1, "misses": 2, "size": 2}
+
+    def test_import_failure_not_cached(self, tmp_path):
+        v = FrameworkValidator(lambda: tmp_path, "missingfw_xyz.loader", "_parse_source")
+        assert "missingfw_xyz" in v.validate("a: 1\n")
+        v.validate("a: 1\n")
+        assert v.stats()["size"] == 0
+
+    def test_lru_eviction(self, tmp_path):
+        self._write_framework(tmp_path)
+        v = FrameworkValidator(lambda: tmp_path, "fakefw.loader", "_parse_source", cache_size=2)
+        for i in range(3):
+            v.validate(f"k: {i}\n")
+        assert v.stats()["size"] == 2
+
+    def test_process_pool(self, tmp_path):
+        self._write_framework(tmp_path / "poolfw")
+        v = FrameworkValidator(
+            lambda: tmp_path / "poolfw", "fakefw.loader", "_parse_source", process_workers=1,
+        )
+        try:
+            assert v.validate("bad: 1\n") == "bad key"
+            assert v.validate("good: 1\n") is None
+        finally:
+            v.shutdown()
+
+
 # ──────────────────────────────────────────────────────────────────────
 # SilverConfigService unit tests
 # ──────────────────────────────────────────────────────────────────────
@@ -490,3 +597,1150 @@ class TestDeployServiceUpdate:
         mock_git.commit_file.reset_mock()
         deploy_svc.update_source("update_git_test", SourceUpdateRequest(description="x"))
         assert mock_git.commit_file.call_count == 1
+
+
+class TestGitService:
+    @pytest.fixture
+    def repo(self, tmp_path, monkeypatch):
+        import git
+
+        repo = git.Repo.init(tmp_path / "fw")
+        repo.config_writer().set_value("user", "name", "t").set_value("user", "email", "t@t").release()
+        monkeypatch.setattr("app.services.git_service.settings.git_enabled", True)
+        monkeypatch.setattr("app.services.git_service.settings.framework_root", repo.working_dir)
+        return repo
+
+    def test_commit_file_records_one_commit(self, repo):
+        from app.services.git_service import GitService
+
+        path = Path(repo.working_dir) / "a.yaml"
+        path.write_text("name: a\n")
+        sha = GitService().commit_file(str(path), "add a")
+        assert sha == repo.head.commit.hexsha[:8]
+        assert list(repo.head.commit.stats.files) == ["a.yaml"]
+
+    def test_retry_of_landed_commit_is_not_recommitted(self, repo):
+        from app.services.git_service import GitService
+
+        a, b = Path(repo.working_dir) / "a.yaml", Path(repo.working_dir) / "b.yaml"
+        a.write_text("name: a\n")
+        first = GitService().commit_file(str(a), "add a")
+        b.write_text("name: b\n")
+        GitService().commit_file(str(b), "add b")
+        assert GitService().commit_file(str(a), "add a") == first
+        assert len(list(repo.iter_commits())) == 2
+
+    def test_failed_commit_raises(self, repo, tmp_path):
+        from app.services.git_service import GitCommitError, GitService
+
+        with pytest.raises(GitCommitError):
+            GitService().commit_file(str(tmp_path / "outside.yaml"), "add outside")
+
+    def test_concurrent_commits_all_land(self, repo):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from app.services.git_service import GitService
+
+        paths = []
+        for i in range(8):
+            paths.append(Path(repo.working_dir) / f"s{i}.yaml")
+            paths[-1].write_text(f"name: s{i}\n")
+        with ThreadPoolExecutor(4) as pool:
+            shas = list(pool.map(lambda p: GitService().commit_file(str(p), f"add {p.stem}"), paths))
+        assert len(set(shas)) == 8
+        assert {f for c in repo.iter_commits() for f in c.stats.files} == {p.name for p in paths}
+
+
+# ──────────────────────────────────────────────────────────────────────
+# GoldConfigService unit tests
+# ──────────────────────────────────────────────────────────────────────
+
+def _mart_ir(name="sales", dims=("dim_customer", "dim_product")):
+    return {
+        "mart": {"name": name, "description": "Sales mart", "owner": "data-team"},
+        "dimensions": [{"name": d, "source_entity": f"dev.slv_sales.{d[4:]}"} for d in dims],
+        "facts": [{"name": "fact_orders", "source_entity": "dev.slv_sales.orders"}],
+        "metrics": [{"name": "revenue", "expression": "SUM(amount)"}],
+    }
+
+
+@pytest.fixture
+def gold_svc(tmp_path):
+    from app.services.gold_config_service import GoldConfigService
+    return GoldConfigService(tmp_path / "marts")
+
+
+class TestGoldConfigServiceCache:
+    def test_repeated_reads_do_not_reparse(self, gold_svc, monkeypatch):
+        gold_svc.write_mart(_mart_ir())
+        gold_svc.list_marts()
+        gold_svc.get_mart("sales")
+
+        calls = []
+        real_load = yaml.safe_load
+        monkeypatch.setattr(yaml, "safe_load", lambda *a, **kw: calls.append(1) or real_load(*a, **kw))
+        assert gold_svc.list_marts()[0]["n_dimensions"] == 2
+        gold_svc.get_mart("sales")
+        gold_svc.diff_against_existing(_mart_ir())
+        assert calls == []
+
+    def test_file_change_invalidates_mart(self, gold_svc):
+        mart_dir = gold_svc.write_mart(_mart_ir())
+        assert gold_svc.list_marts()[0]["n_dimensions"] == 2
+
+        (mart_dir / "dim_region.yaml").write_text("name: dim_region\n", encoding="utf-8")
+        assert gold_svc.list_marts()[0]["n_dimensions"] == 3
+        names = [d["name"] for d in gold_svc.get_mart("sales")["dimensions"]]
+        assert names == ["dim_customer", "dim_product", "dim_region"]
+
+    def test_overwrite_is_reflected_in_diff(self, gold_svc):
+        gold_svc.write_mart(_mart_ir())
+        gold_svc.write_mart(_mart_ir(dims=("dim_customer",)), overwrite=True)
+        diff = gold_svc.diff_against_existing(_mart_ir())
+        assert diff["added"]["dimensions"] == ["dim_product"]
+
+    def test_get_mart_returns_independent_copy(self, gold_svc):
+        gold_svc.write_mart(_mart_ir())
+        gold_svc.get_mart("sales")["dimensions"].clear()
+        assert len(gold_svc.get_mart("sales")["dimensions"]) == 2
+
+    def test_deleted_mart_not_found(self, gold_svc):
+        gold_svc.write_mart(_mart_ir())
+        gold_svc.get_mart("sales")
+        gold_svc.delete_mart("sales")
+        assert gold_svc.list_marts() == []
+        with pytest.raises(FileNotFoundError):
+            gold_svc.get_mart("sales")
+
+    def test_mart_version_tracks_content(self, gold_svc):
+        gold_svc.write_mart(_mart_ir())
+        one, everything = gold_svc.mart_version("sales"), gold_svc.mart_version()
+        assert gold_svc.mart_version("sales") == one
+        assert gold_svc.mart_version("missing") is None
+        gold_svc.write_mart(_mart_ir(dims=("dim_customer",)), overwrite=True)
+        assert gold_svc.mart_version("sales") != one
+        assert gold_svc.mart_version() != everything
+
+
+# ──────────────────────────────────────────────────────────────────────
+# DatabricksService SQL result fetching
+# ──────────────────────────────────────────────────────────────────────
+
+def _statement(state="SUCCEEDED", data=None, columns=("id", "name"), statement_id="stmt-1"):
+    resp = MagicMock()
+    resp.statement_id = statement_id
+    resp.status.state.value = state
+    resp.manifest.schema.columns = [MagicMock() for _ in columns]
+    for col, name in zip(resp.manifest.schema.columns, columns):
+        col.name = name
+    resp.result = data
+    return resp
+
+
+def _chunk(rows, next_index=None):
+    data = MagicMock()
+    data.data_array = rows
+    data.external_links = None
+    data.next_chunk_index = next_index
+    return data
+
+
+@pytest.fixture
+def sql_db():
+    svc = DatabricksService(host="https://example", token=None, warehouse_id="wh-1")
+    svc._client = MagicMock()
+    return svc
+
+
+class TestDatabricksSqlFetching:
+    def test_follows_next_chunk_index(self, sql_db):
+        api = sql_db._client.statement_execution
+        api.execute_statement.return_value = _statement(data=_chunk([["1", "a"]], next_index=1))
+        api.get_statement_result_chunk_n.side_effect = [
+            _chunk([["2", "b"]], next_index=2),
+            _chunk([["3", "c"]]),
+        ]
+        rows = sql_db.query_sql("SELECT * FROM t")
+        assert [r["id"] for r in rows] == ["1", "2", "3"]
+        assert api.get_statement_result_chunk_n.call_args_list[0].args == ("stmt-1", 1)
+
+    def test_iter_rows_fetches_lazily(self, sql_db):
+        api = sql_db._client.statement_execution
+        api.execute_statement.return_value = _statement(data=_chunk([["1", "a"]], next_index=1))
+        it = sql_db.iter_sql_rows("SELECT * FROM t")
+        assert next(it) == {"id": "1", "name": "a"}
+        api.get_statement_result_chunk_n.assert_not_called()
+
+    def test_polls_pending_statement(self, sql_db, monkeypatch):
+        monkeypatch.setattr("app.services.databricks_service.time.sleep", lambda s: None)
+        api = sql_db._client.statement_execution
+        api.execute_statement.return_value = _statement(state="PENDING")
+        api.get_statement.side_effect = [
+            _statement(state="RUNNING"),
+            _statement(data=_chunk([["7", "x"]])),
+        ]
+        assert sql_db.query_sql("SELECT 1") == [{"id": "7", "name": "x"}]
+        assert api.get_statement.call_count == 2
+
+    def test_timeout_cancels_and_raises(self, sql_db, monkeypatch):
+        monkeypatch.setattr("app.services.databricks_service.time.sleep", lambda s: None)
+        api = sql_db._client.statement_execution
+        api.execute_statement.return_value = _statement(state="PENDING")
+        api.get_statement.return_value = _statement(state="RUNNING")
+        with pytest.raises(RuntimeError, match="timed out"):
+            list(sql_db.iter_sql_rows("SELECT 1", timeout=0))
+        api.cancel_execution.assert_called_once_with("stmt-1")
+
+    def test_failed_statement_raises(self, sql_db):
+        api = sql_db._client.statement_execution
+        failed = _statement(state="FAILED")
+        failed.status.error.message = "TABLE_OR_VIEW_NOT_FOUND"
+        api.execute_statement.return_value = failed
+        with pytest.raises(RuntimeError, match="TABLE_OR_VIEW_NOT_FOUND"):
+            list(sql_db.iter_sql_rows("SELECT * FROM missing"))
+        assert sql_db.query_sql("SELECT * FROM missing") == []
+
+    def test_external_links_json(self, sql_db, monkeypatch):
+        payloads = {"https://s3/one": b'[["1","a"]]', "https://s3/two": b'[["2","b"]]'}
+
+        class _Resp:
+            def __init__(self, url):
+                self._body = payloads[url]
+            def read(self):
+                return self._body
+            def __enter__(self):
+                return self
+            def __exit__(self, *exc):
+                return False
+
+        monkeypatch.setattr(
+            "app.services.databricks_service.urllib.request.urlopen",
+            lambda url, timeout=None: _Resp(url),
+        )
+        first = MagicMock(data_array=None, next_chunk_index=None)
+        first.external_links = [MagicMock(external_link="https://s3/one", next_chunk_index=1)]
+        second = MagicMock(data_array=None, next_chunk_index=None)
+        second.external_links = [MagicMock(external_link="https://s3/two", next_chunk_index=None)]
+        api = sql_db._client.statement_execution
+        api.execute_statement.return_value = _statement(data=first)
+        api.get_statement_result_chunk_n.return_value = second
+
+        chunks = list(sql_db.iter_sql_chunks("SELECT * FROM big", disposition="EXTERNAL_LINKS"))
+        assert [c.rows for c in chunks] == [[["1", "a"]], [["2", "b"]]]
+        assert api.execute_statement.call_args.kwargs["disposition"].value == "EXTERNAL_LINKS"
+
+    def test_offline_yields_nothing(self):
+        svc = DatabricksService(host=None, token=None, warehouse_id="wh")
+        assert list(svc.iter_sql_rows("SELECT 1")) == []
+        assert svc.query_sql("SELECT 1") == []
+
+
+class TestDatabricksQueryMany:
+    def test_results_in_input_order_with_errors_captured(self, sql_db):
+        api = sql_db._client.statement_execution
+
+        def execute(warehouse_id, statement, wait_timeout, **kw):
+            assert wait_timeout == "0s"
+            if "missing" in statement:
+                failed = _statement(state="FAILED", statement_id=statement)
+                failed.status.error.message = "TABLE_OR_VIEW_NOT_FOUND"
+                return failed
+            return _statement(data=_chunk([[statement, "x"]]), statement_id=statement)
+
+        api.execute_statement.side_effect = execute
+        results = sql_db.query_many(["SELECT a", "SELECT missing", "SELECT c"])
+        assert [r.sql for r in results] == ["SELECT a", "SELECT missing", "SELECT c"]
+        assert results[0].rows == [{"id": "SELECT a", "name": "x"}]
+        assert results[1].ok is False
+        assert "TABLE_OR_VIEW_NOT_FOUND" in results[1].error
+        assert results[2].ok
+
+    def test_polls_until_done(self, sql_db):
+        api = sql_db._client.statement_execution
+        api.execute_statement.return_value = _statement(state="PENDING")
+        api.get_statement.side_effect = [
+            _statement(state="RUNNING"),
+            _statement(data=_chunk([["1", "a"]])),
+        ]
+        [result] = sql_db.query_many(["SELECT 1"])
+        assert result.rows == [{"id": "1", "name": "a"}]
+
+    def test_concurrency_bounded_per_warehouse(self, sql_db, monkeypatch):
+        import threading
+        import time as _time
+        from app.config import settings
+        from app.services import databricks_service
+
+        monkeypatch.setattr(settings, "databricks_sql_max_concurrency", 2)
+        monkeypatch.setattr(databricks_service, "_warehouse_slots", {})
+        in_flight, peak, lock = [0], [0], threading.Lock()
+
+        def execute(**kw):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            _time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            return _statement(data=_chunk([["1", "a"]]))
+
+        sql_db._client.statement_execution.execute_statement.side_effect = execute
+        results = sql_db.query_many([f"SELECT {i}" for i in range(6)])
+        assert all(r.ok for r in results)
+        assert peak[0] == 2
+
+    def test_offline_returns_empty_results(self):
+        svc = DatabricksService(host=None, token=None, warehouse_id="wh")
+        assert [r.rows for r in svc.query_many(["SELECT 1"])] == [[]]
+        assert svc.query_many([]) == []
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Read-only SQL result cache
+# ──────────────────────────────────────────────────────────────────────
+
+class TestQueryResultCache:
+    def test_statement_helpers(self):
+        from app.services.query_cache import normalize_sql, referenced_tables, statement_class
+
+        assert normalize_sql("  SELECT *\n  FROM t ;") == "SELECT * FROM t"
+        assert statement_class("describe table x") == "describe"
+        assert statement_class("WITH a AS (SELECT 1) SELECT * FROM a") == "select"
+        assert statement_class("TRUNCATE TABLE x") is None
+        assert referenced_tables(
+            "SELECT * FROM `dev`.`bronze`.orders o JOIN dev.silver.c ON 1=1 WHERE id IN (1)"
+        ) == {"dev.bronze.orders", "dev.silver.c"}
+        assert referenced_tables("SHOW TABLES IN `dev`.`bronze`") == {"dev.bronze"}
+
+    def test_repeat_read_served_from_cache(self, sql_db):
+        from app.services.query_cache import query_cache
+
+        api = sql_db._client.statement_execution
+        api.execute_statement.return_value = _statement(data=_chunk([["1", "a"]]))
+        first = sql_db.query_sql("DESCRIBE TABLE dev.bronze.orders")
+        first[0]["id"] = "mutated"
+        again = sql_db.query_sql("DESCRIBE  TABLE dev.bronze.orders;")
+        assert again == [{"id": "1", "name": "a"}]
+        assert api.execute_statement.call_count == 1
+        assert query_cache.stats()["hits"] >= 1
+
+    def test_invalidate_tables_and_write_statements(self, sql_db):
+        api = sql_db._client.statement_execution
+        api.execute_statement.return_value = _statement(data=_chunk([["1", "a"]]))
+        sql_db.query_sql("SELECT * FROM dev.bronze_meta.ingestion_audit_log")
+        sql_db.query_sql("SHOW TABLES IN dev.bronze")
+
+        # Schema-level invalidation drops everything underneath it
+        assert sql_db.invalidate_tables(["dev.bronze_meta"]) == 1
+        # A write through the service invalidates the listing of its schema
+        api.execute_statement.return_value = _statement(data=None)
+        sql_db.query_sql("TRUNCATE TABLE dev.bronze.orders")
+        api.execute_statement.return_value = _statement(data=_chunk([["2", "b"]]))
+        assert sql_db.query_sql("SHOW TABLES IN dev.bronze") == [{"id": "2", "name": "b"}]
+
+    def test_ttl_and_scope(self, sql_db, monkeypatch):
+        from app.config import settings
+
+        api = sql_db._client.statement_execution
+        api.execute_statement.return_value = _statement(data=_chunk([["1", "a"]]))
+        other = DatabricksService(host="https://example", token=None, warehouse_id="wh-1", tenant_id="t2")
+        other._client = sql_db._client
+        sql_db.query_sql("SELECT 1")
+        other.query_sql("SELECT 1")
+        assert api.execute_statement.call_count == 2   # different tenant scope
+
+        monkeypatch.setattr(settings, "sql_cache_ttl_select", 0)
+        sql_db.query_sql("SELECT 2")
+        sql_db.query_sql("SELECT 2")
+        assert api.execute_statement.call_count == 4
+
+    def test_errors_are_not_cached(self, sql_db):
+        api = sql_db._client.statement_execution
+        api.execute_statement.side_effect = [
+            RuntimeError("warehouse asleep"),
+            _statement(data=_chunk([["1", "a"]])),
+        ]
+        assert sql_db.query_sql("SELECT * FROM t") == []
+        assert sql_db.query_sql("SELECT * FROM t") == [{"id": "1", "name": "a"}]
+
+    def test_templated_names_resolve_per_environment(self, sql_db):
+        from app.config import settings
+
+        sql_db._client.statement_execution.execute_statement.return_value = _statement(data=_chunk([["1", "a"]]))
+        sql_db.query_sql("SELECT * FROM dev.bronze.orders")
+        sql_db.query_sql("SELECT * FROM dev.bronze_meta.ingestion_audit_log")
+        # No environment file: the unresolved catalog is dropped, the suffix still matches
+        assert sql_db.invalidate_tables(["${catalog}.bronze.orders"]) == 1
+
+        settings.environments_dir.mkdir(parents=True, exist_ok=True)
+        (settings.environments_dir / "dev.yaml").write_text("catalog: dev\n")
+        assert sql_db._resolve_tables(["${catalog}.bronze_meta", ""]) == ["dev.bronze_meta"]
+        assert sql_db.invalidate_tables(["${catalog}.bronze_meta"]) == 1
+
+    def test_lru_bound(self):
+        from app.services.query_cache import QueryResultCache
+
+        cache = QueryResultCache(max_entries=2)
+        for i in range(3):
+            cache.put("s", f"SELECT {i}", [{"v": i}])
+        assert cache.get("s", "SELECT 0") is None
+        assert cache.get("s", "SELECT 2") == [{"v": 2}]
+        assert cache.stats()["evictions"] == 1
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Job-id registry
+# ──────────────────────────────────────────────────────────────────────
+
+def _job(name, job_id):
+    job = MagicMock()
+    job.job_id = job_id
+    job.settings.name = name
+    return job
+
+
+class TestJobRegistry:
+    def test_parse_job_name(self):
+        from app.services.job_registry import parse_job_name, portal_job_name
+
+        assert parse_job_name(portal_job_name("bronze", "erp_orders", "dev")) == ("bronze", "erp_orders", "dev")
+        assert parse_job_name("silver_portal_customer_prod") == ("silver", "customer", "prod")
+        assert parse_job_name("nightly_vacuum") is None
+
+    def test_reconcile_replaces_scope(self):
+        from app.services.job_registry import get_job_registry
+
+        reg = get_job_registry()
+        reg.put("t1", "bronze", "gone", "dev", 1)
+        reg.put("t2", "bronze", "other", "dev", 2)
+        count = reg.reconcile("t1", [
+            ("bronze_portal_orders_dev", 11),
+            ("bronze_portal_orders_dev", 10),
+            ("silver_portal_customer_dev", 20),
+            ("ad_hoc_job", 30),
+        ])
+        assert count == 2
+        assert reg.get("t1", "bronze", "orders", "dev") == 10
+        assert reg.get("t1", "bronze", "gone", "dev") is None
+        assert reg.get("t2", "bronze", "other", "dev") == 2
+
+    def test_lookup_scans_once_then_uses_registry(self, sql_db):
+        jobs = sql_db._client.jobs
+        jobs.list.return_value = [_job("bronze_portal_orders_dev", 42)]
+        jobs.run_now.return_value.run_id = 7
+
+        assert sql_db.trigger_job("orders", "dev") == "7"
+        assert sql_db.trigger_job("orders", "dev") == "7"
+        assert jobs.list.call_count == 1
+        jobs.run_now.assert_called_with(job_id=42)
+
+    def test_create_records_id(self, sql_db):
+        jobs = sql_db._client.jobs
+        jobs.list.return_value = []
+        jobs.create.return_value.job_id = 55
+
+        assert sql_db.create_or_update_job("orders", "dev") == "55"
+        assert sql_db.find_job_id("bronze", "orders", "dev") == 55
+        assert jobs.list.call_count == 1
+
+    def test_stale_id_self_heals(self, sql_db):
+        from app.services.job_registry import get_job_registry
+
+        get_job_registry().put(sql_db._scope, "bronze", "orders", "dev", 99)
+        jobs = sql_db._client.jobs
+        jobs.list.return_value = [_job("bronze_portal_orders_dev", 42)]
+        jobs.run_now.side_effect = [
+            Exception("Job 99 does not exist."),
+            MagicMock(run_id=8),
+        ]
+
+        assert sql_db.trigger_job("orders", "dev") == "8"
+        assert jobs.run_now.call_args_list[-1].kwargs == {"job_id": 42}
+        assert get_job_registry().get(sql_db._scope, "bronze", "orders", "dev") == 42
+
+    def test_stale_id_on_update_reuses_job_recreated_elsewhere(self, sql_db):
+        from app.services.job_registry import get_job_registry
+
+        get_job_registry().put(sql_db._scope, "bronze", "orders", "dev", 99)
+        jobs = sql_db._client.jobs
+        jobs.list.return_value = [_job("bronze_portal_orders_dev", 42)]
+        jobs.update.side_effect = [Exception("Job 99 does not exist."), None]
+
+        assert sql_db.create_or_update_job("orders", "dev") == "42"
+        assert jobs.update.call_args.kwargs["job_id"] == 42
+        jobs.create.assert_not_called()
+
+        get_job_registry().put(sql_db._scope, "bronze", "orders", "dev", 99)
+        jobs.list.return_value = []
+        jobs.update.side_effect = Exception("Job 99 does not exist.")
+        jobs.create.return_value.job_id = 55
+        assert sql_db.create_or_update_job("orders", "dev") == "55"
+
+    def test_delete_forgets_entry(self, sql_db):
+        sql_db.remember_job("bronze", "orders", "dev", 42)
+        assert sql_db.delete_job("orders", "dev") is True
+        sql_db._client.jobs.delete.assert_called_once_with(job_id=42)
+        sql_db._client.jobs.list.return_value = []
+        assert sql_db.find_job_id("bronze", "orders", "dev") is None
+
+    def test_reconcile_jobs_bulk_list(self, sql_db):
+        sql_db._client.jobs.list.return_value = [
+            _job("bronze_portal_orders_dev", 1),
+            _job("silver_portal_customer_dev", 2),
+        ]
+        assert sql_db.reconcile_jobs() == 2
+        sql_db._client.jobs.list.assert_called_once_with()
+        assert sql_db.find_job_id("silver", "customer", "dev") == 2
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Shared run watcher
+# ──────────────────────────────────────────────────────────────────────
+
+def _run_state(life_cycle, result=None):
+    from databricks.sdk.service.jobs import RunLifeCycleState, RunResultState, RunState
+
+    return RunState(
+        life_cycle_state=RunLifeCycleState(life_cycle),
+        result_state=RunResultState(result) if result else None,
+    )
+
+
+@pytest.fixture
+def fast_watch(monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "run_watch_initial_interval", 0.01)
+    monkeypatch.setattr(settings, "run_watch_max_interval", 0.05)
+
+
+class TestRunWatcher:
+    def test_run_outcome(self):
+        from app.services.run_watcher import run_outcome
+
+        assert run_outcome(_run_state("RUNNING")) is None
+        assert run_outcome(_run_state("TERMINATED", "SUCCESS")) is True
+        assert run_outcome(_run_state("TERMINATED", "FAILED")) is False
+        assert run_outcome(_run_state("INTERNAL_ERROR")) is False
+
+    def test_wait_polls_until_terminal(self, sql_db, fast_watch):
+        sql_db._client.jobs.get_run.side_effect = [
+            MagicMock(state=_run_state("PENDING")),
+            MagicMock(state=_run_state("RUNNING")),
+            MagicMock(state=_run_state("TERMINATED", "SUCCESS")),
+        ]
+        assert sql_db.wait_for_run_by_id("101", timeout=5) is True
+        assert sql_db._client.jobs.get_run.call_count == 3
+
+    def test_same_run_shares_future(self, sql_db, fast_watch):
+        sql_db._client.jobs.get_run.return_value = MagicMock(state=_run_state("RUNNING"))
+        first = sql_db.watch_run("102", timeout=0.2)
+        assert sql_db.watch_run("102", timeout=0.2) is first
+        assert first.result(timeout=5) is False   # timed out
+
+    def test_many_due_runs_use_one_listing(self, sql_db, fast_watch, monkeypatch):
+        from app.config import settings
+        from app.services.run_watcher import RunWatcher
+
+        monkeypatch.setattr(settings, "run_watch_batch_threshold", 2)
+        sql_db._client.jobs.list_runs.return_value = [
+            MagicMock(run_id=1, state=_run_state("TERMINATED", "SUCCESS")),
+            MagicMock(run_id=2, state=_run_state("TERMINATED", "FAILED")),
+            MagicMock(run_id=99, state=_run_state("TERMINATED", "SUCCESS")),
+        ]
+        watcher = RunWatcher(sql_db._client, "batch-test")
+        futures = [watcher.watch(1, 5), watcher.watch(2, 5)]
+        assert [f.result(timeout=5) for f in futures] == [True, False]
+        sql_db._client.jobs.get_run.assert_not_called()
+        assert watcher.pending() == []
+
+    def test_busy_workspace_listing_is_capped(self, sql_db, fast_watch, monkeypatch):
+        from app.config import settings
+        from app.services.run_watcher import RunWatcher
+
+        monkeypatch.setattr(settings, "run_watch_batch_threshold", 2)
+        monkeypatch.setattr(settings, "run_watch_batch_max_pages", 1)
+        listed = []
+
+        def list_runs(**kwargs):
+            for i in range(1000, 2000):   # other jobs' runs, newest first
+                listed.append(i)
+                yield MagicMock(run_id=i, state=_run_state("TERMINATED", "SUCCESS"))
+
+        sql_db._client.jobs.list_runs.side_effect = list_runs
+        sql_db._client.jobs.get_run.return_value = MagicMock(state=_run_state("TERMINATED", "FAILED"))
+        watcher = RunWatcher(sql_db._client, "busy-test")
+        futures = [watcher.watch(1, 5), watcher.watch(2, 5)]
+        assert [f.result(timeout=5) for f in futures] == [False, False]
+        assert len(listed) == 25
+        assert sql_db._client.jobs.get_run.call_count == 2
+
+    def test_run_end_invalidates_its_tables(self, sql_db, fast_watch):
+        from app.services.query_cache import query_cache
+
+        query_cache.put("default", "SELECT COUNT(*) FROM dev.bronze.orders", [{"n": "0"}])
+        query_cache.put("default", "SELECT * FROM dev.bronze.refunds", [{"n": "1"}])
+        sql_db._client.jobs.get_run.side_effect = [
+            MagicMock(state=_run_state("RUNNING")),
+            MagicMock(state=_run_state("TERMINATED", "SUCCESS")),
+        ]
+        future = sql_db.watch_run("103", timeout=5, tables=["dev.bronze.orders"])
+        # A read while the run is in flight re-caches pre-run rows
+        query_cache.put("default", "SELECT COUNT(*) FROM dev.bronze.orders", [{"n": "0"}])
+        assert future.result(timeout=5) is True
+        assert query_cache.get("default", "SELECT COUNT(*) FROM dev.bronze.orders") is None
+        assert query_cache.get("default", "SELECT * FROM dev.bronze.refunds") == [{"n": "1"}]
+
+    def test_offline_and_invalid_ids_resolve_immediately(self, sql_db):
+        offline = DatabricksService(host=None, token=None, warehouse_id=None)
+        assert offline.wait_for_run_by_id("5") is True
+        assert sql_db.wait_for_run_by_id(None) is True
+        assert sql_db.wait_for_run_by_id("not-a-number") is True
+        sql_db._client.jobs.get_run.assert_not_called()
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Per-tenant DatabricksService cache
+# ──────────────────────────────────────────────────────────────────────
+
+def _creds(token="tok-1"):
+    return {"host": "https://h", "token": token, "warehouse_id": "wh"}
+
+
+@pytest.fixture
+def client_cache(monkeypatch):
+    from app.services.databricks_client_cache import DatabricksClientCache
+
+    builds = []
+
+    def build(tenant_id, creds):
+        svc = MagicMock(name=f"svc-{tenant_id}-{len(builds)}")
+        builds.append((tenant_id, creds["token"]))
+        return svc
+
+    monkeypatch.setattr(DatabricksClientCache, "_build", staticmethod(build))
+    cache = DatabricksClientCache()
+    cache.builds = builds
+    return cache
+
+
+class TestDatabricksClientCache:
+    def test_hit_reuses_instance(self, client_cache):
+        first = client_cache.service("t1", _creds())
+        assert client_cache.service("t1", _creds()) is first
+        assert client_cache.stats()["hits"] == 1
+        assert len(client_cache.builds) == 1
+
+    def test_rotated_credentials_rebuild(self, client_cache):
+        first = client_cache.service("t1", _creds("old"))
+        assert client_cache.service("t1", _creds("new")) is not first
+        assert client_cache.stats()["size"] == 1
+
+    def test_no_credentials_gives_unavailable_instance(self, client_cache):
+        assert client_cache.service("t1", None).available is False
+        assert client_cache.builds == []
+
+    def test_lru_eviction(self, client_cache, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "databricks_client_cache_size", 2)
+        a = client_cache.service("a", _creds())
+        client_cache.service("b", _creds())
+        client_cache.service("a", _creds())          # a is now most recent
+        client_cache.service("c", _creds())          # evicts b
+        assert client_cache.service("a", _creds()) is a
+        assert client_cache.stats()["evictions"] == 1
+        client_cache.service("b", _creds())
+        assert len(client_cache.builds) == 4
+
+    def test_ttl_expiry(self, client_cache, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "databricks_client_cache_ttl_seconds", 0)
+        client_cache.service("t1", _creds())
+        client_cache.service("t1", _creds())
+        assert client_cache.stats()["expirations"] == 1
+        assert len(client_cache.builds) == 2
+
+    def test_refresh_ahead_rebuilds_in_background(self, client_cache, monkeypatch):
+        import time as _time
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "databricks_client_refresh_ahead_pct", 100)
+        first = client_cache.service("t1", _creds())
+        assert client_cache.service("t1", _creds()) is first   # served immediately
+        deadline = _time.monotonic() + 5
+        while client_cache.stats()["refreshes"] == 0 and _time.monotonic() < deadline:
+            _time.sleep(0.01)
+        assert client_cache.service("t1", _creds()) is not first
+        assert client_cache.stats()["misses"] == 1
+
+    def test_credentials_cached_until_invalidated(self, client_cache):
+        loader = MagicMock(return_value=_creds())
+        client_cache.credentials("t1", loader)
+        client_cache.credentials("t1", loader)
+        assert loader.call_count == 1
+
+        loader.return_value = None
+        client_cache.invalidate("t1")
+        assert client_cache.credentials("t1", loader) is None
+        assert client_cache.credentials("t1", loader) is None   # "no credentials" is cached too
+        assert loader.call_count == 2
+
+    def test_invalidate_forgets_workspace_state(self, client_cache):
+        from app.services.job_registry import get_job_registry
+        from app.services.query_cache import query_cache
+        from app.services.run_history_store import get_run_history_store
+
+        store = get_run_history_store()
+        get_job_registry().put("t1", "bronze", "orders", "dev", 42)
+        get_job_registry().put("t2", "bronze", "orders", "dev", 7)
+        query_cache.put("t1", "SELECT 1", [{"n": 1}])
+        query_cache.put("t2", "SELECT 1", [{"n": 2}])
+        for scope in ("t1", "t2"):
+            store.upsert(scope, "bronze", "dev", [{"source_name": "orders", "start_time": "2026-01-01 08:00:00"}])
+            store._mark_synced(scope, "bronze", "dev", "2026-01-01 08:00:00")
+
+        client_cache.invalidate("t1")
+        assert get_job_registry().get("t1", "bronze", "orders", "dev") is None
+        assert query_cache.get("t1", "SELECT 1") is None
+        assert store.runs("t1", "bronze", "dev", "orders") == []
+        assert store.sync_state("t1", "bronze", "dev") == (None, None)
+        # Other tenants keep theirs
+        assert get_job_registry().get("t2", "bronze", "orders", "dev") == 7
+        assert query_cache.get("t2", "SELECT 1") == [{"n": 2}]
+        assert len(store.runs("t2", "bronze", "dev", "orders")) == 1
+
+
+# ── Silver DAG builder ────────────────────────────────────────────────────
+
+
+class TestSilverDag:
+    NIGHTLY = {"cron_expression": "0 0 2 * * ?", "timezone": "UTC"}
+
+    @staticmethod
+    def _entity(name, reads, domain="sales", schedule=None, columns=()):
+        from types import SimpleNamespace
+
+        return SimpleNamespace(
+            name=name, domain=domain, schedule=schedule,
+            target={"catalog": "dev", "schema": "silver", "table": name},
+            sources=[
+                {"bronze_table": table, "columns": [{"source": c, "target": c} for c in columns]}
+                for table in reads
+            ],
+        )
+
+    def test_lineage_edges(self):
+        from app.services.silver_dag import bronze_table_owners, build_dags
+
+        owners = bronze_table_owners([("orders_src", "dev.bronze.orders"), ("cust_src", "dev.bronze.customers")])
+        entities = [
+            self._entity("customer", ["${catalog}.bronze.customers"]),
+            self._entity("order", ["dev.bronze.orders", "${catalog}.silver.customer"]),
+            self._entity("product", ["dev.bronze.unmanaged"]),
+        ]
+        [dag] = build_dags(entities, owners)
+        assert dag.name == "dag-customer"
+        deps = {t.key: t.depends_on for t in dag.tasks}
+        assert deps["order"] == ["bronze__orders_src", "customer"]
+        assert deps["customer"] == ["bronze__cust_src"]
+        assert "product" not in deps  # no edges, keeps its own job
+        assert dag.waves() == [["bronze__cust_src", "bronze__orders_src"], ["customer"], ["order"]]
+
+    def test_shared_columns_are_not_edges(self):
+        from app.services.silver_dag import build_dags
+
+        entities = [
+            self._entity("a", ["b.a"], columns=["a_id", "b_id"]),
+            self._entity("b", ["b.b"], columns=["b_id", "a_id"]),
+        ]
+        assert build_dags(entities, {}) == []
+
+    def test_lineage_cycle_is_rejected(self):
+        from app.services.silver_dag import build_dags
+
+        entities = [self._entity("a", ["dev.silver.b"]), self._entity("b", ["dev.silver.a"])]
+        with pytest.raises(ValueError, match="cycle"):
+            build_dags(entities, {})
+
+    def test_only_same_schedule_entities_share_a_dag(self):
+        from app.services.silver_dag import build_dags
+
+        paused = {**self.NIGHTLY, "pause_status": "PAUSED"}
+        hourly = {"cron_expression": "0 0 * * * ?", "timezone": "UTC"}
+        entities = [
+            self._entity("a", ["b.a"], schedule=self.NIGHTLY),
+            self._entity("b", ["dev.silver.a"], schedule=self.NIGHTLY),
+            self._entity("c", ["dev.silver.a"], schedule=hourly),
+            self._entity("d", ["dev.silver.a"], schedule=paused),
+            self._entity("e", ["dev.silver.a"]),
+        ]
+        dags = {d.name: d for d in build_dags(entities, {})}
+        # The hourly entity is started by a's table instead of joining a's job
+        assert sorted(dags) == ["dag-a", "dag-c"]
+        assert [t.name for t in dags["dag-a"].tasks] == ["a", "b"]
+        assert dags["dag-a"].schedule == {**self.NIGHTLY, "pause_status": "UNPAUSED"}
+        assert dags["dag-c"].schedule["cron_expression"] == hourly["cron_expression"]
+        assert dags["dag-c"].trigger_tables == ["dev.silver.a"]
+
+    def test_scheduled_bronze_source_becomes_a_trigger(self):
+        from app.services.silver_dag import bronze_table_owners, build_dags
+
+        owners = bronze_table_owners([("orders_src", "dev.bronze.orders"), ("old_src", "dev.bronze.old")])
+        scheduled = {"orders_src": "dev.bronze.orders", "old_src": None}
+        entities = [
+            self._entity("order", ["dev.bronze.orders"], schedule=self.NIGHTLY),
+            self._entity("legacy", ["dev.bronze.old"], schedule=self.NIGHTLY),
+            self._entity("manual", ["dev.bronze.orders"]),
+        ]
+        [dag] = build_dags(entities, owners, scheduled_sources=scheduled)
+        assert dag.name == "dag-order"
+        assert [t.key for t in dag.tasks] == ["order"]
+        assert dag.trigger_tables == ["dev.bronze.orders"]
+
+
+# ── Warehouse warm-up ────────────────────────────────────────────────────
+
+class TestCronMatching:
+    def test_daily_and_weekday_expressions(self):
+        monday_2am = datetime(2026, 10, 12, 2, 0)
+        assert cron_matches("0 0 2 * * ?", monday_2am)
+        assert not cron_matches("0 0 2 * * ?", monday_2am.replace(minute=1))
+        assert cron_matches("0 0 2 ? * MON-FRI", monday_2am)
+        assert not cron_matches("0 0 2 ? * 1", monday_2am)  # Quartz 1 = Sunday
+        assert cron_matches("0 */15 * * * ?", monday_2am.replace(minute=45))
+        assert cron_matches("0 30 9,17 ? JAN-DEC *", monday_2am.replace(hour=17, minute=30))
+
+    def test_rejects_wrong_field_count(self):
+        with pytest.raises(ValueError):
+            cron_matches("0 2 * * *", datetime(2026, 1, 1))
+
+    def test_fires_within_honours_timezone_and_pause(self):
+        schedule = {"cron_expression": "0 0 6 * * ?", "timezone": "Europe/Berlin"}
+        # 03:57 UTC == 05:57 Berlin (CEST) — fires three minutes later
+        start = datetime(2026, 7, 1, 3, 57, tzinfo=timezone.utc)
+        assert cron_fires_within(schedule, start, 5)
+        assert not cron_fires_within(schedule, start, 2)
+        assert not cron_fires_within({**schedule, "pause_status": "PAUSED"}, start, 5)
+        assert not cron_fires_within({"cron_expression": "garbage"}, start, 5)
+
+
+def _warm_db(state="STOPPED"):
+    db = MagicMock(spec=DatabricksService)
+    db.available = True
+    db._scope = "tenant-1"
+    db.warehouse_state.return_value = state
+    db.start_warehouse.return_value = True
+    db.iter_sql_rows.return_value = iter([{"1": "1"}])
+    return db
+
+
+class TestWarehouseWarmer:
+    NOW = datetime(2026, 10, 12, 8, 57, tzinfo=timezone.utc)  # a Monday
+
+    @pytest.fixture
+    def warmer(self, monkeypatch):
+        w = WarehouseWarmer()
+        monkeypatch.setattr(w, "_load_schedules", lambda: [])
+        return w
+
+    def test_keeps_alive_while_active(self, warmer):
+        db = _warm_db("RUNNING")
+        warmer.touch(db, now=self.NOW)
+        assert warmer.tick(self.NOW) == {"tenant-1": "keepalive"}
+        db.iter_sql_rows.assert_called_once_with("SELECT 1")
+        # Not due again until the keep-alive interval has passed
+        assert warmer.tick(self.NOW + timedelta(seconds=60)) == {}
+
+    def test_starts_stopped_warehouse_for_active_tenant(self, warmer):
+        db = _warm_db("STOPPED")
+        warmer.touch(db, now=self.NOW)
+        assert warmer.tick(self.NOW) == {"tenant-1": "start"}
+        db.start_warehouse.assert_called_once()
+
+    def test_idle_tenant_is_left_alone(self, warmer):
+        db = _warm_db("STOPPED")
+        warmer.touch(db, now=self.NOW - timedelta(hours=3))
+        assert warmer.tick(self.NOW) == {}
+        db.warehouse_state.assert_not_called()
+
+    def test_warms_ahead_of_a_scheduled_job(self, warmer, monkeypatch):
+        monkeypatch.setattr(warmer, "_load_schedules", lambda: [{"cron_expression": "0 0 9 * * ?"}])
+        db = _warm_db("STOPPED")
+        warmer.touch(db, now=self.NOW - timedelta(hours=3))
+        assert warmer.tick(self.NOW) == {"tenant-1": "start"}
+
+    def test_warms_ahead_of_a_usually_busy_hour(self, warmer):
+        db = _warm_db("STOPPED")
+        # Active at 09:xx on the two previous Mondays
+        for weeks in (2, 1):
+            warmer.touch(db, now=self.NOW.replace(minute=10) + timedelta(hours=1) - timedelta(weeks=weeks))
+        assert warmer.tick(self.NOW) == {"tenant-1": "start"}
+        assert warmer.status("tenant-1")["busy_hours"] == [[0, 9]]
+
+    def test_known_state_expires(self, warmer, monkeypatch):
+        warmer.observe("tenant-1", "STOPPED")
+        assert warmer.known_state("tenant-1") == "STOPPED"
+        monkeypatch.setattr("app.services.warehouse_warmer.settings.warehouse_state_ttl_seconds", -1)
+        assert warmer.known_state("tenant-1") is None
+
+
+class TestRunHistoryStore:
+    def _run(self, name, start, status="SUCCESS", **extra):
+        return {"source_name": name, "start_time": start, "status": status, "records_read": 10, **extra}
+
+    @pytest.fixture
+    def store(self):
+        from app.services.run_history_store import get_run_history_store
+
+        return get_run_history_store()
+
+    def test_upsert_is_idempotent(self, store):
+        running = self._run("orders", "2026-01-01T08:00:00Z", status="RUNNING")
+        assert store.upsert("t1", "bronze", "dev", [running, {"source_name": "x"}]) == 1
+        store.upsert("t1", "bronze", "dev", [{**running, "status": "SUCCESS", "records_read": "12"}])
+        [row] = store.runs("t1", "bronze", "dev", "orders")
+        assert row["status"] == "SUCCESS" and row["records_read"] == 12
+        assert row["start_time"] == "2026-01-01 08:00:00"
+
+    def test_runs_filter_and_page(self, store):
+        store.upsert("t1", "bronze", "dev", [
+            self._run("orders", f"2026-01-0{day} 08:00:00", status="FAILURE" if day % 2 else "SUCCESS")
+            for day in range(1, 8)
+        ])
+        store.upsert("t2", "bronze", "dev", [self._run("orders", "2026-01-09 08:00:00")])
+
+        first = store.runs("t1", "bronze", "dev", "orders", limit=3)
+        assert [r["start_time"][:10] for r in first] == ["2026-01-07", "2026-01-06", "2026-01-05"]
+        older = store.runs("t1", "bronze", "dev", "orders", limit=3, before=first[-1]["start_time"])
+        assert [r["start_time"][:10] for r in older] == ["2026-01-04", "2026-01-03", "2026-01-02"]
+        failures = store.runs("t1", "bronze", "dev", "orders", status="FAILURE", since="2026-01-03")
+        assert [r["start_time"][:10] for r in failures] == ["2026-01-07", "2026-01-05", "2026-01-03"]
+
+    def test_covers_only_fresh_syncs(self, store, monkeypatch):
+        assert not store.covers("t1", "bronze", "dev")
+        store._mark_synced("t1", "bronze", "dev", "2026-01-01 08:00:00")
+        assert store.covers("t1", "bronze", "dev")
+        assert not store.covers("t1", "silver", "dev")
+        monkeypatch.setattr("app.services.run_history_store.settings.run_history_sync_seconds", 0)
+        assert not store.covers("t1", "bronze", "dev")
+
+    def test_failed_sync_is_logged_as_warning(self, store, monkeypatch, caplog):
+        from app.services.run_history_store import sync_tenant
+
+        monkeypatch.setattr("app.services.run_history_store.audit_catalogs", lambda: {"bronze": ["dev"]})
+        db = MagicMock(spec=DatabricksService)
+        db.scope = "t1"
+        db.iter_sql_rows.side_effect = RuntimeError("TABLE_OR_VIEW_NOT_FOUND")
+        with caplog.at_level("WARNING", logger="app.services.run_history_store"):
+            assert sync_tenant(db) == 0
+        assert "TABLE_OR_VIEW_NOT_FOUND" in caplog.text
+
+    def test_audit_service_reads_from_a_fresh_store(self, store):
+        from app.services.audit_service import AuditService
+
+        db = MagicMock(spec=DatabricksService)
+        db.available, db.scope = True, "t1"
+        audit = AuditService(db)
+        audit.get_run_history("orders", "dev", limit=5)
+        db.query_sql.assert_called_once()
+        assert "status" not in db.query_sql.call_args.args[0].split("WHERE")[1]
+
+        store.upsert("t1", "bronze", "dev", [self._run("orders", "2026-01-01 08:00:00")])
+        store._mark_synced("t1", "bronze", "dev", "2026-01-01 08:00:00")
+        db.query_sql.reset_mock()
+        assert [r["source_name"] for r in audit.get_run_history("orders", "dev")] == ["orders"]
+        db.query_sql.assert_not_called()
+
+
+class TestDashboardStatsQuery:
+    def test_one_union_all_query_across_catalogs(self):
+        from app.services.audit_service import AuditService
+        from app.services.databricks_service import StatementResult
+
+        db = MagicMock(spec=DatabricksService)
+        db.available = False
+        db.query_many.side_effect = lambda statements: [StatementResult(sql=s, rows=[
+            {"source_type": "file", "runs": "4", "failures": "1", "records_read": "40",
+             "records_written": "38", "records_quarantined": "2",
+             "p50_duration_seconds": "12.0", "p95_duration_seconds": "30.5"},
+            {"source_type": "other", "runs": "1", "failures": "0", "records_read": None,
+             "records_written": None, "records_quarantined": None,
+             "p50_duration_seconds": None, "p95_duration_seconds": None},
+        ]) for s in statements]
+        stats = AuditService(db).get_dashboard_stats(["dev", "prod"], {"orders": "file", "o'brien": "file"}, 6)
+
+        [[sql]] = db.query_many.call_args.args
+        assert stats["skipped_catalogs"] == []
+        assert sql.count("UNION ALL") == 1
+        assert "dev.bronze_meta.ingestion_audit_log" in sql and "prod.bronze_meta.ingestion_audit_log" in sql
+        assert "INTERVAL 6 HOURS" in sql and "WHEN 'o''brien' THEN 'file'" in sql
+        assert stats["recent_runs"] == 5 and stats["recent_failures"] == 1
+        assert stats["recent_records_quarantined"] == 2
+        assert stats["run_stats_by_type"]["file"]["p95_duration_seconds"] == 30.5
+        assert stats["run_stats_by_type"]["other"]["p50_duration_seconds"] is None
+
+    def test_unreadable_catalog_is_skipped_not_zeroed(self):
+        from app.services.audit_service import AuditService
+        from app.services.databricks_service import StatementResult
+
+        def run(statements):
+            return [
+                StatementResult(sql=s, error="TABLE_OR_VIEW_NOT_FOUND") if "prod." in s
+                else StatementResult(sql=s, rows=[{"source_type": "file", "runs": "3", "failures": "1"}])
+                for s in statements
+            ]
+
+        db = MagicMock(spec=DatabricksService)
+        db.available = False
+        db.query_many.side_effect = run
+        stats = AuditService(db).get_dashboard_stats(["dev", "prod"], {"orders": "file"}, 24)
+
+        assert stats["skipped_catalogs"] == ["prod"]
+        assert stats["recent_runs"] == 3 and stats["recent_failures"] == 1
+        [[rerun]] = db.query_many.call_args.args
+        assert "UNION ALL" not in rerun and "dev.bronze_meta.ingestion_audit_log" in rerun
+
+    def test_fresh_run_history_store_answers_without_the_warehouse(self):
+        from app.services.audit_service import AuditService
+        from app.services.run_history_store import get_run_history_store
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        store = get_run_history_store()
+        store.upsert("t1", "bronze", "dev", [
+            {"source_name": "orders", "status": "SUCCESS", "records_read": 5,
+             "start_time": now - timedelta(minutes=m), "end_time": now - timedelta(minutes=m) + timedelta(seconds=m)}
+            for m in (10, 20, 30, 40)
+        ] + [{"source_name": "old", "status": "FAILURE", "start_time": now - timedelta(days=3)}])
+        store.upsert("t1", "bronze", "prod", [
+            {"source_name": "gone", "status": "FAILURE", "start_time": now - timedelta(minutes=5)},
+        ])
+        for catalog in ("dev", "prod"):
+            store._mark_synced("t1", "bronze", catalog, str(now))
+
+        db = MagicMock(spec=DatabricksService)
+        db.available, db.scope = True, "t1"
+        stats = AuditService(db).get_dashboard_stats(["dev", "prod"], {"orders": "file"}, 24)
+        db.query_many.assert_not_called()
+        assert stats["recent_runs"] == 5 and stats["recent_failures"] == 1
+        file_stats = stats["run_stats_by_type"]["file"]
+        assert file_stats["records_read"] == 20
+        assert round(file_stats["p50_duration_seconds"]) == 20
+        assert round(file_stats["p95_duration_seconds"]) == 40
+        assert stats["run_stats_by_type"]["other"]["p50_duration_seconds"] is None
+
+
+class TestLatestRuns:
+    def test_store_ranks_per_source(self):
+        from app.services.audit_service import AuditService
+        from app.services.run_history_store import get_run_history_store
+
+        store = get_run_history_store()
+        store.upsert("t1", "bronze", "dev", [
+            {"source_name": name, "status": "SUCCESS", "start_time": f"2026-01-0{day} 08:00:00"}
+            for name in ("a", "b", "c") for day in (1, 2, 3)
+        ])
+        store._mark_synced("t1", "bronze", "dev", "2026-01-03 08:00:00")
+        db = MagicMock(spec=DatabricksService)
+        db.available, db.scope = True, "t1"
+
+        latest = AuditService(db).get_latest_runs({"a": "dev", "b": "dev", "x": "prod"}, limit=2)
+        # prod is not synced → one live query instead
+        db.query_sql.assert_called_once()
+        sql = db.query_sql.call_args.args[0]
+        assert "ROW_NUMBER() OVER (PARTITION BY source_name" in sql and sql.count("UNION ALL") == 1
+
+        latest = AuditService(db).get_latest_runs({"a": "dev", "b": "dev"}, limit=2)
+        assert {k: [r["start_time"][8:10] for r in v] for k, v in latest.items()} == {
+            "a": ["03", "02"], "b": ["03", "02"],
+        }
+
+    def test_rag_operational_context_covers_every_source(self):
+        from app.services.audit_service import AuditService
+        from app.services.rag_service import RAGService
+
+        config = MagicMock(spec=ConfigService)
+        config.list_sources.return_value = [
+            MagicMock(target_table=f"dev.bronze.s{i}") for i in range(8)
+        ]
+        for i, summary in enumerate(config.list_sources.return_value):
+            summary.name = f"s{i}"
+        audit = MagicMock(spec=AuditService)
+        audit.get_latest_runs.return_value = {
+            "s7": [{"status": "FAILURE", "start_time": "2026-01-01", "error": "boom"}],
+        }
+        rag = RAGService(MagicMock(), config, audit, MagicMock(), MagicMock(), MagicMock(), MagicMock())
+
+        context = rag._get_operational_context("default")
+        audit.get_latest_runs.assert_called_once()
+        assert len(audit.get_latest_runs.call_args.args[0]) == 8
+        assert "Recent runs for 's7'" in context and "error=boom" in context
+        config.get_source.assert_not_called()
+        audit.get_run_history.assert_not_called()
+
+
+class TestDeadLetterBrowser:
+    def _audit(self):
+        from app.services.audit_service import AuditService
+
+        db = MagicMock(spec=DatabricksService)
+        db.available, db.scope = True, "t1"
+        return AuditService(db), db
+
+    def test_keyset_page_sql(self):
+        from app.services.audit_service import dead_letter_cursor
+
+        audit, db = self._audit()
+        cursor = dead_letter_cursor(
+            {"_ingest_timestamp": "2026-01-01T08:00:00Z", "_dl_row_key": "-42", "_dl_row_seq": "2"}
+        )
+        audit.get_dead_letter_records(
+            "orders", "dev", "orders", 21, cursor=cursor, since="2025-12-01", reason="null_primary_key",
+        )
+        sql = " ".join(db.query_sql.call_args.args[0].split())
+        assert "FROM dev.bronze_meta.dead_letter_orders WHERE _ingest_timestamp >= '2025-12-01'" in sql
+        assert "startswith(_rejection_reason, 'null_primary_key')" in sql
+        assert "_ingest_timestamp <= '2026-01-01T08:00:00Z'" in sql
+        assert ("WHERE _ingest_timestamp < '2026-01-01T08:00:00Z' OR "
+                "(_ingest_timestamp = '2026-01-01T08:00:00Z' AND _dl_row_key <= -42)") in sql
+        # The two copies of the cursor row already returned are fetched again and dropped
+        assert "ORDER BY _ingest_timestamp DESC, _dl_row_key DESC LIMIT 23" in sql
+        assert ("WHERE NOT (_ingest_timestamp = '2026-01-01T08:00:00Z' AND _dl_row_key = -42 "
+                "AND _dl_row_seq <= 2)") in sql
+        assert sql.endswith("ORDER BY _ingest_timestamp DESC, _dl_row_key DESC, _dl_row_seq LIMIT 21")
+        assert "COUNT" not in sql
+
+        with pytest.raises(ValueError):
+            audit.get_dead_letter_records("orders", "dev", "orders", cursor="not-a-cursor")
+
+    def test_duplicates_are_numbered_within_the_page_only(self):
+        audit, db = self._audit()
+        audit.get_dead_letter_records("orders", "dev", "orders", 20)
+        sql = " ".join(db.query_sql.call_args.args[0].split())
+        # The window reads the top-20 subquery, never the table scan itself
+        window, page = sql.split("OVER", 1)[1].split("FROM (", 1)
+        assert "PARTITION BY _ingest_timestamp, _dl_row_key" in window
+        scan, rest = page.split("LIMIT 20", 1)
+        assert "FROM dev.bronze_meta.dead_letter_orders" in scan and "OVER" not in scan
+        assert "OVER" not in rest
+
+    def test_count_is_cached_per_filter(self, monkeypatch):
+        audit, db = self._audit()
+        db.query_sql.return_value = [{"cnt": "12000000"}]
+        assert audit.get_dead_letter_count("orders", "dev", "orders") == 12_000_000
+        assert audit.get_dead_letter_count("orders", "dev", "orders") == 12_000_000
+        assert db.query_sql.call_count == 1
+        audit.get_dead_letter_count("orders", "dev", "orders", reason="rescued_data")
+        assert db.query_sql.call_count == 2
+        monkeypatch.setattr("app.services.audit_service.settings.dead_letter_count_ttl_seconds", 0)
+        audit.get_dead_letter_count("orders", "dev", "orders")
+        assert db.query_sql.call_count == 3
+
+    def test_export_streams_external_links(self):
+        audit, db = self._audit()
+        db.iter_sql_rows.return_value = iter([{"id": "1"}])
+        assert list(audit.iter_dead_letters("dev", "orders", until="2026-01-01")) == [{"id": "1"}]
+        sql = db.iter_sql_rows.call_args.args[0]
+        assert "_ingest_timestamp < '2026-01-01'" in sql and "LIMIT" not in sql
+        assert db.iter_sql_rows.call_args.kwargs == {"disposition": "EXTERNAL_LINKS"}
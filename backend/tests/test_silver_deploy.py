@@ -84,21 +84,16 @@ class TestSilverTriggerRun:
         # Simulate Databricks available with a job
         mock_db.available = True
 
-        from unittest.mock import MagicMock, patch
+        from unittest.mock import MagicMock
 
-        run_mock = MagicMock()
-        run_mock.run_id = 999
-
-        # Patch at silver deploy service level
-        mock_db._find_job = MagicMock(return_value=42)
         mock_db._client = MagicMock()
-        mock_db._client.jobs.run_now.return_value = run_mock
+        mock_db.run_job_now.return_value = "999"
 
         client.post(f"{BASE}/entities", json=make_silver_entity("runnable_entity"))
-        # trigger will attempt to call _find_job and run_now
         resp = client.post(f"{BASE}/entities/runnable_entity/trigger")
-        # Either 200 with run_id or 503 if Databricks path fails
-        assert resp.status_code in (200, 503)
+        assert resp.status_code == 200
+        assert resp.json()["run_id"] == "999"
+        mock_db.run_job_now.assert_called_once_with("silver", "runnable_entity", "dev")
 
     def test_trigger_error_includes_deploy_hint(self, client, mock_db):
         """503 error message should hint to deploy first."""
@@ -108,3 +103,112 @@ class TestSilverTriggerRun:
         assert resp.status_code == 503
         detail = resp.json()["detail"]
         assert "deploy" in detail.lower() or "unavailable" in detail.lower()
+
+
+class TestSilverSyncWorkspace:
+    def test_sync_dry_run(self, client, mock_db):
+        from unittest.mock import patch
+
+        from app.services.workspace_publisher import PublishResult
+
+        mock_db.available = True
+        with patch(
+            "app.services.silver_deploy_service.publish_files",
+            return_value=PublishResult(uploaded=["orders.yaml"], deleted=["old.yaml"], dry_run=True),
+        ) as publish:
+            resp = client.post(f"{BASE}/entities/sync", params={"dry_run": "true"})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["dry_run"] is True
+        assert data["deleted"] == ["old.yaml"]
+        assert data["remote_dir"].endswith("/conf/entities")
+        assert "would sync" in data["message"].lower()
+        assert publish.call_args.kwargs["dry_run"] is True
+
+
+class TestSilverDagJobs:
+    NIGHTLY = {"cron_expression": "0 0 2 * * ?", "timezone": "UTC"}
+
+    @staticmethod
+    def _customers_source(client, **overrides):
+        from tests.conftest import make_file_source
+
+        client.post(
+            "/api/v1/bronze/sources",
+            json=make_file_source(
+                "customers_src", target={"catalog": "dev", "schema": "bronze", "table": "customers"}, **overrides,
+            ),
+        )
+
+    def test_plan_orders_entities_after_their_bronze_sources(self, client):
+        self._customers_source(client)
+        client.post(f"{BASE}/entities", json=make_silver_entity("dag_customer"))
+        resp = client.get(f"{BASE}/dags")
+        assert resp.status_code == 200
+        [dag] = resp.json()["dags"]
+        assert dag["name"] == "dag-dag_customer"
+        assert dag["waves"] == [["bronze__customers_src"], ["dag_customer"]]
+
+    def test_scheduled_source_triggers_the_dag(self, client):
+        self._customers_source(client, schedule={"cron_expression": "0 0 1 * * ?", "timezone": "UTC"})
+        client.post(f"{BASE}/entities", json=make_silver_entity("dag_customer", schedule=self.NIGHTLY))
+        [dag] = client.get(f"{BASE}/dags").json()["dags"]
+        # Already ingested by its own scheduled job — waited for, not run again
+        assert dag["waves"] == [["dag_customer"]]
+        assert dag["trigger_tables"] == ["dev.bronze.customers"]
+
+    def test_cycle_is_rejected_before_anything_is_written(self, client, mock_db):
+        mock_db.available = True
+        mock_db._client = MagicMock()
+        client.post(f"{BASE}/entities", json=make_silver_entity("a"))
+        sources = [{"bronze_table": "dev.slv_customer.a", "columns": [{"source": "customer_id", "target": "customer_id"}]}]
+        client.post(f"{BASE}/entities", json=make_silver_entity("b", sources=sources))
+        mock_db._client.reset_mock()
+
+        resp = client.put(f"{BASE}/entities/a", json={"sources": [{**sources[0], "bronze_table": "dev.slv_customer.b"}]})
+        assert resp.status_code == 422
+        assert "cycle" in resp.json()["detail"]
+        assert client.get(f"{BASE}/entities/a").json()["sources"][0]["bronze_table"] == "dev.bronze.customers"
+        mock_db._client.workspace.import_.assert_not_called()
+
+    def test_dag_mode_deploys_and_triggers_via_dag_job(self, client, mock_db, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "silver_dag_jobs", True)
+        self._customers_source(client)
+        mock_db.available = True
+        mock_db._client = MagicMock()
+        mock_db.registered_jobs.return_value = [
+            {"name": "dag-old", "environment": settings.default_environment},
+            {"name": "dag_entity", "environment": settings.default_environment},
+        ]
+        mock_db.create_or_update_dag_job.return_value = "321"
+        mock_db.run_job_now.return_value = "9"
+
+        resp = client.post(f"{BASE}/entities", json=make_silver_entity("dag_entity"))
+        assert resp.json()["job_id"] == "321"
+        name, _, tasks, _ = mock_db.create_or_update_dag_job.call_args.args
+        assert name == "dag-dag_entity"
+        assert [t.key for t in tasks] == ["bronze__customers_src", "dag_entity"]
+        mock_db.delete_job_by_key.assert_any_call("silver", "dag-old", settings.default_environment)
+        # The standalone job the DAG replaces is retired
+        mock_db.delete_job_by_key.assert_any_call("silver", "dag_entity", settings.default_environment)
+
+        client.post(f"{BASE}/entities/dag_entity/trigger")
+        assert mock_db.run_job_now.call_args.args[1] == "dag-dag_entity"
+        assert mock_db.run_job_now.call_args.kwargs["only"] == ["dag_entity"]
+
+    def test_dag_mode_keeps_standalone_job_without_edges(self, client, mock_db, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "silver_dag_jobs", True)
+        mock_db.available = True
+        mock_db._client = MagicMock()
+        mock_db.registered_jobs.return_value = []
+        mock_db.find_job_id.return_value = None
+        mock_db._client.jobs.create.return_value = MagicMock(job_id=55)
+
+        resp = client.post(f"{BASE}/entities", json=make_silver_entity("lonely", schedule=self.NIGHTLY))
+        assert resp.json()["job_id"] == "55"
+        mock_db.create_or_update_dag_job.assert_not_called()
+        assert mock_db._client.jobs.create.call_args.kwargs["schedule"].quartz_cron_expression == "0 0 2 * * ?"
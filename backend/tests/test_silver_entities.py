@@ -208,6 +208,16 @@ class TestGetEntity:
         assert resp.status_code == 404
         assert "not found" in resp.json()["detail"].lower()
 
+    def test_conditional_get(self, client):
+        client.post(f"{BASE}/entities", json=make_silver_entity("etag_entity"))
+        for url in (f"{BASE}/entities/etag_entity", f"{BASE}/entities"):
+            etag = client.get(url).headers["etag"]
+            assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        etag = client.get(f"{BASE}/entities/etag_entity").headers["etag"]
+        client.put(f"{BASE}/entities/etag_entity", json={"description": "Updated"})
+        resp = client.get(f"{BASE}/entities/etag_entity", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+
 
 # ──────────────────────────────────────────────────────────────────────
 # Update entity
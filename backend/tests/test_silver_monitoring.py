@@ -1,4 +1,4 @@
-"""Tests for Silver monitoring endpoints: stats, run history, diagram."""
+"""Tests for Silver monitoring endpoints: stats, run history, diagram, lineage."""
 
 from tests.conftest import make_silver_entity
 
@@ -116,3 +116,42 @@ class TestSilverDiagram:
         resp = client.get(f"{BASE}/diagram")
         assert resp.status_code == 200
         assert "special_entity" in resp.json()["mermaid"]
+
+
+class TestSilverLineage:
+    def test_lineage_empty(self, client):
+        resp = client.get(f"{BASE}/lineage")
+        assert resp.status_code == 200
+        assert resp.json() == {"bronze_tables": {}, "business_keys": {}}
+
+    def test_lineage_maps_bronze_table_to_entities(self, client):
+        client.post(f"{BASE}/entities", json=make_silver_entity("lin_a"))
+        client.post(f"{BASE}/entities", json=make_silver_entity("lin_b"))
+        data = client.get(f"{BASE}/lineage").json()
+        assert data["bronze_tables"]["dev.bronze.raw"] == ["lin_a", "lin_b"]
+        assert data["business_keys"]["id"] == "lin_a"
+
+    def test_consumers_follow_update_and_delete(self, client):
+        client.post(f"{BASE}/entities", json=make_silver_entity("lin_upd"))
+        url = f"{BASE}/lineage/consumers?bronze_table=dev.bronze.raw"
+        assert client.get(url).json()["entities"] == ["lin_upd"]
+
+        sources = make_silver_entity("x")["sources"]
+        sources[0]["bronze_table"] = "dev.bronze.accounts"
+        client.put(f"{BASE}/entities/lin_upd", json={"sources": sources})
+        assert client.get(url).json()["entities"] == []
+        accounts = f"{BASE}/lineage/consumers?bronze_table=dev.bronze.accounts"
+        assert client.get(accounts).json()["entities"] == ["lin_upd"]
+
+        client.delete(f"{BASE}/entities/lin_upd")
+        assert client.get(accounts).json()["entities"] == []
+
+    def test_consumers_match_catalog_placeholder(self, client):
+        entity = make_silver_entity("lin_var")
+        entity["sources"][0]["bronze_table"] = "${catalog}.bronze.orders"
+        client.post(f"{BASE}/entities", json=entity)
+        resp = client.get(f"{BASE}/lineage/consumers?bronze_table=prod.bronze.orders")
+        assert resp.json()["entities"] == ["lin_var"]
+
+    def test_consumers_requires_bronze_table(self, client):
+        assert client.get(f"{BASE}/lineage/consumers").status_code == 422
@@ -313,3 +313,32 @@ class TestRunSingleTcPersists:
         with patch.object(svc, "_ensure_test_job"):
             with pytest.raises(ValueError, match="TC999"):
                 svc.run_single_tc(source, "TC999")
+
+
+class TestRunTestCaseReadsFreshData:
+    """Assertions must see the data the job just wrote, never a cached result."""
+
+    def test_assertions_bypass_the_cache_and_run_tables_are_registered(self, svc, testing_root):
+        from app.models.testing import AssertionSpec, TestSuite
+
+        suite = TestSuite.model_validate({
+            "source_name": "orders", "source_type": "file", "primary_keys": ["id"],
+            "target_table": "orders", "test_catalog": "dev", "test_schema": "bronze_test",
+            "test_cases": [{"id": "TC001", "name": "Insert", "category": "insert", "positive": True}],
+        })
+        tc = suite.test_cases[0].model_copy(update={"assertions": [
+            AssertionSpec(type="row_count", description="two rows", expected=2, sql="SELECT COUNT(*) FROM t"),
+        ]})
+        svc._db_svc.trigger_job.return_value = "77"
+        svc._db_svc.wait_for_run_by_id.return_value = True
+        svc._db_svc.iter_sql_rows.return_value = iter([{"n": "2"}])
+
+        result = svc._run_test_case(tc, suite, "dev")
+
+        assert result.status == "PASSED"
+        svc._db_svc.query_sql.assert_not_called()
+        assert svc._db_svc.wait_for_run_by_id.call_args.kwargs["tables"] == [
+            "dev.bronze_test.orders",
+            "dev.bronze_meta.ingestion_audit_log",
+            "dev.bronze_meta.dead_letter_orders",
+        ]